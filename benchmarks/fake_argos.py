@@ -0,0 +1,124 @@
+"""
+Deterministic stand-in for the Argos Translate engine
+"""
+
+import threading
+import time
+from typing import List, Optional, Tuple, Union
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.utils.langdetect import get_detector
+from benchmarks.stub_google import fake_translate
+
+
+class FakeArgosEngine(TranslationEngine):
+    """
+    Engine with the cost profile of local inference and no models
+    
+    A call costs latency + per_char * characters of CPU time. Only
+    `parallelism` calls run at once (like inference threads competing for
+    cores), a batch pays the fixed cost once, and the first call per
+    language pair additionally pays load_time (model loading).
+    """
+    
+    name = 'argos'
+    
+    LANGUAGES = [
+        ('ar', 'Arabic'), ('de', 'German'), ('en', 'English'), ('es', 'Spanish'),
+        ('fr', 'French'), ('it', 'Italian'), ('ja', 'Japanese'), ('ko', 'Korean'),
+        ('pt', 'Portuguese'), ('ru', 'Russian'), ('zh', 'Chinese'),
+    ]
+    
+    def __init__(self, latency: float = 0.01, per_char: float = 0.0002,
+                 load_time: float = 0.0, parallelism: int = 1):
+        """
+        Initialize fake engine
+        
+        Args:
+            latency: Fixed cost of a call in seconds
+            per_char: Cost per character in seconds
+            load_time: One-off cost of the first call per language pair
+            parallelism: Number of calls that may run at once
+        """
+        self.latency = latency
+        self.per_char = per_char
+        self.load_time = load_time
+        self._slots = threading.Semaphore(max(1, parallelism))
+        self._loaded = set()
+        self._lock = threading.Lock()
+    
+    def _run(self, chars: int, source_lang: str, target_lang: str):
+        """Spend the simulated inference time"""
+        with self._lock:
+            cost = self.latency + self.per_char * chars
+            if (source_lang, target_lang) not in self._loaded:
+                self._loaded.add((source_lang, target_lang))
+                cost += self.load_time
+        with self._slots:
+            time.sleep(cost)
+    
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text deterministically
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated text
+        """
+        self._run(len(text), source_lang, target_lang)
+        return fake_translate(text, target_lang)
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts in one simulated model call
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations in input order
+        """
+        if not texts:
+            return []
+        self._run(sum(len(text) for text in texts), source_lang, target_lang)
+        return [fake_translate(text, target_lang) for text in texts]
+    
+    def get_supported_languages(self) -> List[Tuple[str, str]]:
+        """
+        Get supported languages
+        
+        Returns:
+            List of tuples (language_code, language_name)
+        """
+        return list(self.LANGUAGES)
+    
+    def detect_language(self, text: str) -> Optional[str]:
+        """
+        Detect language with the offline detector
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Language code or None
+        """
+        return get_detector().detect(text)
+    
+    def supports_pair(self, source_lang: str, target_lang: str) -> bool:
+        """Every pair is supported"""
+        return True
+    
+    def is_available(self) -> bool:
+        """
+        Check availability
+        
+        Returns:
+            Always True
+        """
+        return True
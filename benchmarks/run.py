@@ -0,0 +1,442 @@
+"""
+Run translation benchmarks against local stand-ins
+
+Usage:
+    python -m benchmarks.run [--engines google,argos,auto] [--output FILE]
+                             [--baseline FILE]
+                             
+Google requests go to a local StubGoogleServer and Argos is replaced by
+FakeArgosEngine, so results are reproducible and need no network or
+language packages. Results are written as JSON; pass an earlier result
+file as --baseline to print the changes.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.engines.factory import create_base_engine, create_router, wrap_engine
+from lingosnap.utils.config import Config
+from lingosnap.utils.streaming import stream_batch
+from benchmarks.fake_argos import FakeArgosEngine
+from benchmarks.stub_google import StubGoogleServer
+
+
+ENGINES = ('google', 'argos', 'auto')
+SCENARIOS = ('single', 'batch', 'concurrent', 'stream')
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+WORDS = (
+    'the quick brown fox jumps over lazy dog while translation engines answer '
+    'requests from users who copy text from terminals browsers and documents '
+    'every sentence should arrive fast even when the network is slow or the '
+    'local model needs time to load into memory before the first request'
+).split()
+
+
+def make_corpus(count: int, min_words: int, max_words: int, seed: int) -> List[str]:
+    """
+    Generate reproducible English-like texts
+    
+    Args:
+        count: Number of texts
+        min_words: Minimum words per text
+        max_words: Maximum words per text
+        seed: Random seed
+        
+    Returns:
+        List of texts
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+        corpus.append(' '.join(words).capitalize() + '.')
+    return corpus
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """
+    Percentile with linear interpolation
+    
+    Args:
+        values: Samples
+        fraction: Percentile between 0 and 1
+        
+    Returns:
+        Interpolated value, or None without samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float], wall: float, items: int, chars: int,
+              errors: int, first_outputs: Optional[List[float]] = None) -> Dict[str, object]:
+    """
+    Build the statistics of one scenario
+    
+    Args:
+        latencies: Duration of every call in seconds
+        wall: Total duration in seconds
+        items: Number of texts translated
+        chars: Number of characters translated
+        errors: Number of texts that failed
+        first_outputs: Time to first output of every streamed call in
+            seconds (streaming scenarios only)
+        
+    Returns:
+        Dictionary with latency percentiles (ms) and throughput
+    """
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+    
+    stats = {
+        'calls': len(latencies),
+        'items': items,
+        'errors': errors,
+        'p50_ms': ms(percentile(latencies, 0.50)),
+        'p95_ms': ms(percentile(latencies, 0.95)),
+        'p99_ms': ms(percentile(latencies, 0.99)),
+        'mean_ms': ms(sum(latencies) / len(latencies) if latencies else None),
+        'max_ms': ms(max(latencies) if latencies else None),
+        'wall_s': round(wall, 4),
+        'items_per_s': round(items / wall, 2) if wall > 0 else None,
+        'chars_per_s': round(chars / wall, 1) if wall > 0 else None,
+    }
+    if first_outputs is not None:
+        stats['ttfo_p50_ms'] = ms(percentile(first_outputs, 0.50))
+        stats['ttfo_p95_ms'] = ms(percentile(first_outputs, 0.95))
+    return stats
+
+
+def timed(call: Callable[[], object]):
+    """Run call and return (seconds, result or exception)"""
+    started = time.perf_counter()
+    try:
+        result = call()
+    except Exception as e:
+        result = e
+    return time.perf_counter() - started, result
+
+
+def run_single(engine: TranslationEngine, corpus: List[str], args) -> Dict[str, object]:
+    """Translate the texts one after another"""
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for text in corpus:
+        seconds, result = timed(lambda: engine.translate(text, args.source, args.target))
+        latencies.append(seconds)
+        errors += isinstance(result, Exception)
+    wall = time.perf_counter() - started
+    return summarize(latencies, wall, len(corpus), sum(map(len, corpus)), errors)
+
+
+def run_batch(engine: TranslationEngine, corpus: List[str], args) -> Dict[str, object]:
+    """Translate the texts in batches of args.batch_size"""
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for start in range(0, len(corpus), args.batch_size):
+        batch = corpus[start:start + args.batch_size]
+        seconds, results = timed(
+            lambda: engine.translate_batch(batch, args.source, args.target)
+        )
+        latencies.append(seconds)
+        if isinstance(results, Exception):
+            errors += len(batch)
+        else:
+            errors += sum(isinstance(result, Exception) for result in results)
+    wall = time.perf_counter() - started
+    return summarize(latencies, wall, len(corpus), sum(map(len, corpus)), errors)
+
+
+def run_concurrent(engine: TranslationEngine, corpus: List[str], args) -> Dict[str, object]:
+    """Translate the texts from args.concurrency threads"""
+    def call(text):
+        return timed(lambda: engine.translate(text, args.source, args.target))
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        outcomes = list(executor.map(call, corpus))
+    wall = time.perf_counter() - started
+    
+    latencies = [seconds for seconds, _ in outcomes]
+    errors = sum(isinstance(result, Exception) for _, result in outcomes)
+    return summarize(latencies, wall, len(corpus), sum(map(len, corpus)), errors)
+
+
+def run_stream(engine: TranslationEngine, corpus: List[str], args) -> Dict[str, object]:
+    """Stream documents of args.batch_size texts, timing the first result"""
+    latencies = []
+    first_outputs = []
+    errors = 0
+    started = time.perf_counter()
+    for start in range(0, len(corpus), args.batch_size):
+        document = corpus[start:start + args.batch_size]
+        call_started = time.perf_counter()
+        first = None
+        for _, result in stream_batch(engine, document, args.source, args.target):
+            if first is None:
+                first = time.perf_counter() - call_started
+            errors += isinstance(result, Exception)
+        latencies.append(time.perf_counter() - call_started)
+        first_outputs.append(first)
+    wall = time.perf_counter() - started
+    return summarize(latencies, wall, len(corpus), sum(map(len, corpus)), errors,
+                     first_outputs)
+
+
+RUNNERS = {
+    'single': run_single,
+    'batch': run_batch,
+    'concurrent': run_concurrent,
+    'stream': run_stream,
+}
+
+
+def build_engine(engine_type: str, config: dict, args) -> TranslationEngine:
+    """
+    Build an engine stack wired to the stand-ins
+    
+    Args:
+        engine_type: 'google', 'argos' or 'auto'
+        config: Configuration dictionary
+        args: Parsed command line arguments
+        
+    Returns:
+        Engine (decorated like in the application unless --raw is given)
+    """
+    def fake_argos():
+        return FakeArgosEngine(latency=args.argos_latency, per_char=args.argos_per_char,
+                               load_time=args.argos_load_time,
+                               parallelism=args.argos_parallelism)
+    
+    if engine_type == 'google':
+        engine = create_base_engine('google', config)
+    elif engine_type == 'argos':
+        engine = fake_argos()
+    else:
+        engine = create_router({
+            'google': create_base_engine('google', config),
+            'argos': fake_argos(),
+        }, config)
+    
+    if args.raw:
+        return engine
+    return wrap_engine(engine, config)
+
+
+def close_engine(engine: TranslationEngine):
+    """Release the resources of an engine stack"""
+    while engine is not None:
+        close = getattr(engine, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+            return
+        engine = getattr(engine, 'engine', None)
+
+
+def git_revision() -> Optional[str]:
+    """Current commit of the source tree, if available"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).resolve().parent, capture_output=True,
+            text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run(args) -> Dict[str, object]:
+    """
+    Run every requested engine and scenario
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        Result document (meta + results)
+    """
+    corpus = make_corpus(args.requests, args.min_words, args.max_words, args.seed)
+    results = {}
+    
+    with StubGoogleServer(latency=args.latency, per_char=args.per_char,
+                          jitter=args.jitter, error_rate=args.error_rate,
+                          throttle_rate=args.throttle_rate, seed=args.seed) as server:
+        config = dict(Config.DEFAULT_CONFIG)
+        config.update({
+            'google_service_url': server.url,
+            # Every scenario must reach the backends
+            'cache_enabled': False,
+        })
+        if args.rate_limit is not None:
+            config['google_rate_limit'] = args.rate_limit
+        
+        for engine_type in args.engines:
+            results[engine_type] = {}
+            for scenario in args.scenarios:
+                engine = build_engine(engine_type, config, args)
+                requests_before = server.requests
+                try:
+                    stats = RUNNERS[scenario](engine, corpus, args)
+                finally:
+                    close_engine(engine)
+                stats['upstream_requests'] = server.requests - requests_before
+                routing = getattr(engine.unwrap() if hasattr(engine, 'unwrap') else engine,
+                                  'get_routing_stats', None)
+                if routing is not None:
+                    stats['routing'] = routing()
+                results[engine_type][scenario] = stats
+                ttfo = (f"  first {stats['ttfo_p50_ms']:>8.2f} ms"
+                        if 'ttfo_p50_ms' in stats else '')
+                print(f'{engine_type:>7} {scenario:<10} '
+                      f"p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms  "
+                      f"p99 {stats['p99_ms']:>9.2f} ms  {stats['items_per_s']:>9.2f} items/s  "
+                      f"errors {stats['errors']}{ttfo}", file=sys.stderr)
+    
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'parameters': {key: value for key, value in vars(args).items()
+                           if key not in ('output', 'baseline')},
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: Dict[str, object], current: Dict[str, object]) -> List[str]:
+    """
+    Describe the changes between two result documents
+    
+    Args:
+        baseline: Earlier result document
+        current: New result document
+        
+    Returns:
+        One line per engine/scenario present in both
+    """
+    def change(old, new):
+        if not old or new is None:
+            return '     n/a'
+        return f'{(new - old) / old * 100:+7.1f}%'
+    
+    lines = []
+    for engine_type, scenarios in current['results'].items():
+        for scenario, stats in scenarios.items():
+            old = baseline.get('results', {}).get(engine_type, {}).get(scenario)
+            if old is None:
+                continue
+            line = (
+                f'{engine_type:>7} {scenario:<10} '
+                f"p50 {change(old['p50_ms'], stats['p50_ms'])}  "
+                f"p95 {change(old['p95_ms'], stats['p95_ms'])}  "
+                f"p99 {change(old['p99_ms'], stats['p99_ms'])}  "
+                f"throughput {change(old['items_per_s'], stats['items_per_s'])}"
+            )
+            if 'ttfo_p50_ms' in stats:
+                line += f"  first output {change(old.get('ttfo_p50_ms'), stats['ttfo_p50_ms'])}"
+            lines.append(line)
+    return lines
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.run',
+        description='Benchmark the translation engines against local stand-ins'
+    )
+    
+    def names(choices):
+        def parse(value):
+            items = [item.strip() for item in value.split(',') if item.strip()]
+            unknown = set(items) - set(choices)
+            if unknown:
+                raise argparse.ArgumentTypeError(f"unknown: {', '.join(sorted(unknown))}")
+            return items
+        return parse
+    
+    parser.add_argument('--engines', type=names(ENGINES), default=list(ENGINES),
+                        help='Comma-separated engines (default: google,argos,auto)')
+    parser.add_argument('--scenarios', type=names(SCENARIOS), default=list(SCENARIOS),
+                        help='Comma-separated scenarios (default: single,batch,concurrent,stream)')
+    parser.add_argument('--requests', type=int, default=100, help='Texts per scenario')
+    parser.add_argument('--batch-size', type=int, default=20,
+                        help='Texts per batch call or streamed document')
+    parser.add_argument('--concurrency', type=int, default=8, help='Threads in concurrent runs')
+    parser.add_argument('--min-words', type=int, default=3)
+    parser.add_argument('--max-words', type=int, default=40)
+    parser.add_argument('--source', default='en')
+    parser.add_argument('--target', default='de')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--raw', action='store_true',
+                        help='Benchmark undecorated engines (no coalescing/chunking)')
+    
+    google = parser.add_argument_group('Google stand-in')
+    google.add_argument('--latency', type=float, default=0.05, help='Base latency (s)')
+    google.add_argument('--per-char', type=float, default=0.0, help='Latency per character (s)')
+    google.add_argument('--jitter', type=float, default=0.2, help='Relative latency spread')
+    google.add_argument('--error-rate', type=float, default=0.0, help='Probability of a 503')
+    google.add_argument('--throttle-rate', type=float, default=0.0, help='Probability of a 429')
+    google.add_argument('--rate-limit', type=float,
+                        help='Override google_rate_limit of the engine (0 = unlimited)')
+    
+    argos = parser.add_argument_group('Argos stand-in')
+    argos.add_argument('--argos-latency', type=float, default=0.01, help='Fixed cost (s)')
+    argos.add_argument('--argos-per-char', type=float, default=0.0002, help='Cost per character (s)')
+    argos.add_argument('--argos-load-time', type=float, default=0.0,
+                       help='Model load time on first use (s)')
+    argos.add_argument('--argos-parallelism', type=int, default=1,
+                       help='Calls that may run at once')
+    
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/<time>.json)')
+    parser.add_argument('--baseline', help='Earlier result file to compare against')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = parse_args(argv)
+    document = run(args)
+    
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    print(f'Results written to {output}', file=sys.stderr)
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f'Changes against {args.baseline}:', file=sys.stderr)
+        for line in compare(baseline, document):
+            print(line, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
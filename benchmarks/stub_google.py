@@ -0,0 +1,173 @@
+"""
+Local stand-in for the Google Translate batchexecute endpoint
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from googletrans import urls
+from googletrans.client import RPC_ID
+
+
+# Path googletrans posts translation requests to
+RPC_PATH = urlparse(urls.TRANSLATE_RPC).path
+
+
+def fake_translate(text: str, target_lang: str) -> str:
+    """
+    Deterministic stand-in translation
+    
+    Line structure is preserved so packed batch requests split back
+    correctly, like real Google answers.
+    
+    Args:
+        text: Text to translate
+        target_lang: Target language code
+        
+    Returns:
+        Every non-empty line prefixed with the target code and swapcased
+    """
+    return '\n'.join(f'[{target_lang}] {line.swapcase()}' if line else line
+                     for line in text.split('\n'))
+
+
+class StubGoogleServer:
+    """
+    Threaded HTTP server answering batchexecute translation requests
+    
+    Every request sleeps latency + per_char * len(text) seconds, scaled by a
+    random jitter factor, and fails with HTTP 503 (or 429) with probability
+    error_rate. The random generator is seeded, so runs are reproducible.
+    """
+    
+    def __init__(self, latency: float = 0.05, per_char: float = 0.0,
+                 jitter: float = 0.2, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, seed: int = 0):
+        """
+        Initialize stub server (call start() to serve)
+        
+        Args:
+            latency: Base latency of a request in seconds
+            per_char: Extra latency per character in seconds
+            jitter: Relative latency spread (0.2 = +/-20%)
+            error_rate: Probability of a 503 answer
+            throttle_rate: Probability of a 429 answer
+            seed: Seed of the latency/error generator
+        """
+        self.latency = latency
+        self.per_char = per_char
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL to pass as service_url"""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+    
+    def _draw(self, chars: int):
+        """Pick the delay and status of one request"""
+        with self._lock:
+            self.requests += 1
+            spread = 1 + self._random.uniform(-self.jitter, self.jitter)
+            roll = self._random.random()
+        delay = max(0.0, (self.latency + self.per_char * chars) * spread)
+        
+        status = 200
+        if roll < self.error_rate:
+            status = 503
+        elif roll < self.error_rate + self.throttle_rate:
+            status = 429
+        if status != 200:
+            with self._lock:
+                self.errors += 1
+        return delay, status
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately; without this,
+            # delayed ACKs add ~40ms to every answer
+            disable_nagle_algorithm = True
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def _send(self, status: int, body: bytes):
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (timeout, losing hedged request)
+                    self.close_connection = True
+            
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length).decode('utf-8')
+                if urlparse(self.path).path != RPC_PATH:
+                    self._send(404, b'')
+                    return
+                
+                try:
+                    request = json.loads(parse_qs(body)['f.req'][0])
+                    text, source_lang, target_lang, _ = json.loads(request[0][0][1])[0]
+                except (KeyError, IndexError, ValueError):
+                    self._send(400, b'')
+                    return
+                
+                delay, status = server._draw(len(text))
+                time.sleep(delay)
+                if status != 200:
+                    self._send(status, b'')
+                    return
+                
+                detected = 'en' if source_lang == 'auto' else source_lang
+                translated = fake_translate(text, target_lang)
+                inner = [
+                    [None, None, detected],
+                    [[[None, None, None, False, None, [[translated]]]], target_lang],
+                    detected,
+                ]
+                line = json.dumps([['wrb.fr', RPC_ID, json.dumps(inner),
+                                    None, None, None, 'generic']])
+                self._send(200, f")]}}'\n\n{len(line)}\n{line}\n".encode('utf-8'))
+        
+        return Handler
+    
+    def start(self) -> 'StubGoogleServer':
+        """Start serving on a free local port"""
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='stub-google', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
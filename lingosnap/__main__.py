@@ -2,15 +2,34 @@
 LingoSnap main entry point
 """
 
+import argparse
 import sys
 import os
 import setproctitle
 from PyQt6.QtWidgets import QApplication
-from lingosnap.gui.main_window import MainWindow
+from lingosnap.utils.config import Config
+from lingosnap.utils.profiling import get_profiler, operation
+from lingosnap.utils.timing import PhaseTimer
 
 
 def main():
     """Main entry point for LingoSnap application"""
+    timer = PhaseTimer()
+    
+    # Unknown arguments are passed on to Qt (-platform, -style, ...)
+    parser = argparse.ArgumentParser(prog='lingosnap', description='LingoSnap translator')
+    parser.add_argument(
+        '--timing',
+        action='store_true',
+        help='Print how long each startup phase took (after the engines are loaded)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile startup, translations and OCR into ~/.lingosnap/profiles'
+    )
+    args, qt_args = parser.parse_known_args()
+    
     # Set process title for easier identification
     setproctitle.setproctitle('lingosnap')
     
@@ -27,15 +46,38 @@ def main():
             os.environ['QT_QPA_PLATFORM'] = 'wayland'
         # Otherwise let Qt auto-detect
     
+    # The profiler is created from the config before anything uses it
+    with timer.phase('load config'):
+        config = Config()
+    profiler = get_profiler(config)
+    if args.profile:
+        profiler.set_enabled(True)
+    
     # Create Qt application
-    app = QApplication(sys.argv)
-    app.setApplicationName('LingoSnap')
-    app.setOrganizationName('LingoSnap')
-    app.setQuitOnLastWindowClosed(False)  # Keep running in system tray
-    
-    # Create and show main window
-    window = MainWindow()
-    window.show()
+    with timer.phase('create application'):
+        app = QApplication(sys.argv[:1] + qt_args)
+        app.setApplicationName('LingoSnap')
+        app.setOrganizationName('LingoSnap')
+        app.setQuitOnLastWindowClosed(False)  # Keep running in system tray
+    
+    with operation('startup'):
+        # The window module is imported here so --timing can measure it
+        with timer.phase('import main window'):
+            from lingosnap.gui.main_window import MainWindow
+        
+        # Create and show main window; the engines are loaded afterwards
+        with timer.phase('create main window'):
+            window = MainWindow(timer, config)
+        with timer.phase('show window'):
+            window.show()
+    
+    if args.profile:
+        print(f"Writing profiles to {profiler.profile_dir}", file=sys.stderr)
+    
+    if args.timing:
+        window.engine_loader.finished.connect(
+            lambda: print(timer.report(), file=sys.stderr, flush=True)
+        )
     
     # Run application
     sys.exit(app.exec())
@@ -7,15 +7,26 @@ Command-line tool for translating terminal output
 import sys
 import argparse
 import subprocess
+import signal
 import os
+import stat
+import time
+from collections import deque
+from itertools import chain
 from pathlib import Path
+from typing import Iterable
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from lingosnap.utils.config import Config
-from lingosnap.engines.google_engine import GoogleTranslateEngine
-from lingosnap.engines.argos_engine import ArgosTranslateEngine
+from lingosnap.utils.daemon import (DaemonClient, DaemonUnavailable, TranslationDaemon,
+                                    create_daemon_engines, detect_source_language,
+                                    ensure_available, resolve_target_language)
+from lingosnap.utils.file_formats import FORMATS
+from lingosnap.utils.profiling import get_profiler, operation
+from lingosnap.utils.streaming import stream_lines
+from lingosnap.utils.usage import get_usage_meter
 
 
 def get_previous_terminal_output(n: int) -> str:
@@ -76,18 +87,39 @@ def get_previous_terminal_output(n: int) -> str:
         return ""
 
 
+def print_usage(meter, days: int):
+    """
+    Print recorded engine usage as a table
+    
+    Args:
+        meter: UsageMeter to read
+        days: Number of days to show
+    """
+    rows = meter.get_usage(days=days)
+    if not rows:
+        print(f"No usage recorded in the last {days} day(s).")
+        return
+    
+    print(f"{'Day':<12}{'Engine':<10}{'Characters':>12}{'Requests':>10}"
+          f"{'Errors':>8}{'Avg ms':>9}{'Max ms':>9}")
+    for row in rows:
+        print(f"{row['day']:<12}{row['engine']:<10}{row['characters']:>12}"
+              f"{row['requests']:>10}{row['errors']:>8}"
+              f"{row['avg_latency'] * 1000:>9.0f}{row['max_latency'] * 1000:>9.0f}")
+
+
 def main():
     """Main entry point for terminal integration"""
     parser = argparse.ArgumentParser(
         description='LingoSnap Terminal - Translate terminal output',
-        epilog='Example: lingo -t 1 -l fr'
+        epilog='Examples: lingo -t 1 -l fr, some_command | lingo -l zh'
     )
     
     parser.add_argument(
         '-t', '--target-line',
         type=int,
-        default=1,
-        help='Number of previous terminal output lines to translate (default: 1)'
+        help='Number of previous terminal output lines to translate (default: 1; '
+             'with piped input, the last N lines instead of all of them)'
     )
     
     parser.add_argument(
@@ -96,74 +128,405 @@ def main():
         help='Target language code (e.g., zh, fr, es). If not specified, uses default from settings.'
     )
     
+    parser.add_argument(
+        '--usage',
+        type=int,
+        nargs='?',
+        const=30,
+        metavar='DAYS',
+        help='Show characters, requests and latency per engine and day (default: 30 days)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile this run into ~/.lingosnap/profiles (cProfile and a Chrome trace)'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep the engines loaded and serve later lingo calls (runs until Ctrl+C)'
+    )
+    
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Translate in this process even if a daemon is running'
+    )
+    
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    files_parser = subparsers.add_parser(
+        'translate-files',
+        help='Translate text, SRT/VTT subtitle, PO and JSON files',
+        description='Translate files segment by segment. Interrupted runs resume '
+                    'where they stopped.',
+        epilog='Example: lingo translate-files -l de movie.srt messages.pot'
+    )
+    files_parser.add_argument('files', nargs='+', type=Path, help='Files to translate')
+    files_parser.add_argument(
+        '-l', '--language',
+        type=str,
+        default=argparse.SUPPRESS,
+        help='Target language code. If not specified, uses default from settings.'
+    )
+    files_parser.add_argument(
+        '-o', '--output-dir',
+        type=Path,
+        help='Directory of the translated files (default: next to each file, '
+             'e.g. movie.de.srt)'
+    )
+    files_parser.add_argument(
+        '--format',
+        choices=sorted(FORMATS),
+        help='File format (default: from the extension; unknown ones are text)'
+    )
+    files_parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        help='Batches translated at the same time (default: chunk_max_workers)'
+    )
+    files_parser.add_argument(
+        '--restart',
+        action='store_true',
+        help='Ignore the checkpoints of interrupted runs'
+    )
+    
     args = parser.parse_args()
     
     # Load configuration
     config = Config()
+    meter = get_usage_meter(config)
+    
+    if args.usage is not None:
+        print_usage(meter, max(args.usage, 1))
+        return
     
-    # Get engine
+    if args.daemon:
+        run_daemon(config, meter)
+        return
+    
+    profiler = get_profiler(config)
+    if args.profile:
+        profiler.set_enabled(True)
+    
+    try:
+        with operation('lingo'):
+            if args.command == 'translate-files':
+                translate_files(args, config, meter)
+            elif stdin_is_piped():
+                translate_stdin(args, config, meter)
+            else:
+                translate_terminal_output(args, config, meter)
+    finally:
+        if profiler.enabled:
+            print(f"Profile written to {profiler.profile_dir}", file=sys.stderr)
+
+
+def run_daemon(config, meter):
+    """
+    Serve translations to other lingo calls until interrupted
+    
+    Args:
+        config: Config instance
+        meter: Usage meter
+    """
     engine_type = config.get('engine', 'google')
-    if engine_type == 'google':
-        engine = GoogleTranslateEngine()
-    else:
-        engine = ArgosTranslateEngine()
-    
-    # Check if engine is available
-    if not engine.is_available():
-        print(f"Error: {engine_type.capitalize()} engine is not available.", 
-              file=sys.stderr)
-        if engine_type == 'argos':
-            print("Please install Argos language packages first.", file=sys.stderr)
+    engines = create_daemon_engines(config, meter)
+    daemon = TranslationDaemon(engines, config)
+    
+    # Stop cleanly on SIGTERM as well (the socket is removed)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    try:
+        if not daemon.bind():
+            print(f"Error: A LingoSnap daemon is already running on {daemon.socket_path}",
+                  file=sys.stderr)
+            sys.exit(1)
+        
+        # Clients connecting meanwhile wait until the engine is loaded
+        print(f"Loading {engine_type} engine...", file=sys.stderr, flush=True)
+        try:
+            daemon.warm_up(engine_type)
+        except Exception as e:
+            print(f"Warning: {e}", file=sys.stderr)
+        
+        print(f"Listening on {daemon.socket_path} (Ctrl+C to stop)", file=sys.stderr, flush=True)
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        for engine in engines.values():
+            try:
+                engine.close()
+            except Exception:
+                pass
+
+
+def create_local_translator(engine_type: str, target_lang: str, config, meter):
+    """
+    Create the engine in this process and check the target language
+    
+    Exits with an error message if the engine or language is not usable.
+    
+    Args:
+        engine_type: 'google', 'argos' or 'auto'
+        target_lang: Target language code given by the user
+        config: Config instance
+        meter: Usage meter
+        
+    Returns:
+        Function translating a list of lines (see stream_lines())
+    """
+    from lingosnap.engines.factory import create_engine
+    
+    engine = create_engine(engine_type, config, meter=meter)
+    try:
+        ensure_available(engine, engine_type)
+        target_lang = resolve_target_language(engine, engine_type, target_lang)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
     
+    def translate_batch(lines):
+        source_lang = detect_source_language(engine, '\n'.join(lines))
+        return engine.translate_batch(lines, source_lang, target_lang)
+    
+    return translate_batch
+
+
+def create_translator(args, config, meter):
+    """
+    Create the function translating lines for this lingo call
+    
+    A running daemon (lingo --daemon or the GUI) is used if there is one,
+    so the engine does not have to be loaded again. Exits with an error
+    message if the engine or language is not usable.
+    
+    Args:
+        args: Parsed command line arguments
+        config: Config instance
+        meter: Usage meter
+        
+    Returns:
+        Function translating a list of lines (see stream_lines())
+    """
+    engine_type = config.get('engine', 'google')
+    
     # Get target language
     target_lang = args.language
     if not target_lang:
         target_lang = config.get('terminal_default_target', 'zh')
     
-    # Normalize language code for the engine
-    # Google uses 'zh-cn', Argos uses 'zh'
-    if engine_type == 'google':
-        # Convert simplified codes to Google format
-        if target_lang == 'zh':
-            target_lang = 'zh-cn'
-    else:  # argos
-        # Convert Google format to simplified codes
-        if target_lang == 'zh-cn' or target_lang == 'zh-tw':
-            target_lang = 'zh'
-    
-    # Validate target language
-    supported_langs = engine.get_supported_languages()
-    lang_codes = [code for code, _ in supported_langs]
-    
-    if target_lang not in lang_codes:
-        print(f"Error: Language '{target_lang}' is not supported by {engine_type} engine.", 
-              file=sys.stderr)
-        print(f"Supported languages: {', '.join(sorted(set(lang_codes)))}", 
-              file=sys.stderr)
-        sys.exit(1)
+    client = DaemonClient.from_config(config)
+    if not args.no_daemon and client.is_running():
+        try:
+            # An empty request only checks the engine and language
+            client.translate_batch([], target_lang, engine_type=engine_type)
+        except DaemonUnavailable:
+            pass  # The daemon stopped in the meantime
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        else:
+            return lambda lines: client.translate_batch(lines, target_lang,
+                                                        engine_type=engine_type)
+    
+    return create_local_translator(engine_type, target_lang, config, meter)
+
+
+def stdin_is_piped() -> bool:
+    """
+    Check whether lingo reads its input from a pipe or a file
+    
+    Terminals, /dev/null and a closed stdin (key bindings, tmux run-shell,
+    cron) are not input; lingo captures the terminal instead.
+    
+    Returns:
+        True if stdin is a pipe, socket or regular file
+    """
+    if sys.stdin is None:
+        return False
+    try:
+        mode = os.fstat(sys.stdin.fileno()).st_mode
+    except (OSError, ValueError):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISREG(mode)
+
+
+def translate_terminal_output(args, config, meter, translate_batch=None):
+    """
+    Translate the previous terminal output and print it line by line
+    
+    Args:
+        args: Parsed command line arguments
+        config: Config instance
+        meter: Usage meter
+        translate_batch: Translator already created for this call
+            (created if omitted)
+    """
+    if translate_batch is None:
+        translate_batch = create_translator(args, config, meter)
     
     # Get terminal output
-    text = get_previous_terminal_output(args.target_line)
+    text = get_previous_terminal_output(args.target_line or 1)
     
     if not text or not text.strip():
         print("Error: No text captured from terminal.", file=sys.stderr)
         sys.exit(1)
     
-    # Detect source language
-    try:
-        source_lang = engine.detect_language(text)
-        if not source_lang:
-            source_lang = 'auto'
-    except:
-        source_lang = 'auto'
+    print_translations(translate_batch, text.split('\n'), config)
+
+
+def translate_stdin(args, config, meter):
+    """
+    Translate piped input line by line while it is being read
+    
+    Memory use does not depend on the input size. With -t N only the last
+    N lines are translated (after the input has ended). If the input is
+    empty (e.g. the pipe cron gives a job), the terminal output is
+    translated instead.
+    
+    Args:
+        args: Parsed command line arguments
+        config: Config instance
+        meter: Usage meter
+    """
+    # The engine loads while the producing command is still running
+    translate_batch = create_translator(args, config, meter)
+    
+    if hasattr(sys.stdin, 'reconfigure'):
+        sys.stdin.reconfigure(errors='replace')
+    first = sys.stdin.readline()
+    if not first:
+        translate_terminal_output(args, config, meter, translate_batch)
+        return
+    
+    lines = (line.rstrip('\r\n') for line in chain([first], sys.stdin))
+    if args.target_line:
+        lines = deque(lines, maxlen=args.target_line)
+    
+    print_translations(translate_batch, lines, config)
+
+
+def print_translations(translate_batch, lines: Iterable[str], config):
+    """
+    Translate lines and print them in order as soon as they are ready
     
-    # Translate
+    Lines are independent, so they are sent in batches, a few at a time.
+    Exits with status 1 on errors or if no line could be translated.
+    
+    Args:
+        translate_batch: Function translating a list of lines
+        lines: Lines to translate
+        config: Config instance
+    """
+    translatable = 0
+    failed = 0
+    stream = stream_lines(translate_batch, lines,
+                          max_workers=config.get('chunk_max_workers', 4),
+                          max_batch_chars=config.get('chunk_max_chars', 1000))
     try:
-        translated = engine.translate(text, source_lang, target_lang)
-        print(translated)
+        for line, result in stream:
+            if not line.strip():
+                print(line, flush=True)
+                continue
+            translatable += 1
+            if isinstance(result, Exception):
+                failed += 1
+                print(f"Translation failed for line: {result}", file=sys.stderr)
+                print(line, flush=True)
+            else:
+                print(result, flush=True)
+    except BrokenPipeError:
+        # The reader went away (lingo ... | head); keep Python quiet at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
     except Exception as e:
-        print(f"Translation failed: {e}", file=sys.stderr)
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        stream.close()
+    
+    if translatable and failed == translatable:
+        sys.exit(1)
+
+
+def translate_files(args, config, meter):
+    """
+    Translate files and report segments per second
+    
+    Exits with status 1 if a file could not be translated completely (its
+    checkpoint is kept, so running the command again retries the rest).
+    
+    Args:
+        args: Parsed command line arguments
+        config: Config instance
+        meter: Usage meter
+    """
+    from lingosnap.utils.file_translation import FileTranslator, default_output_path
+    
+    engine_type = config.get('engine', 'google')
+    target_lang = args.language or config.get('terminal_default_target', 'zh')
+    translate_batch = create_translator(args, config, meter)
+    translator = FileTranslator(
+        translate_batch, engine_type, target_lang,
+        max_workers=max(1, args.workers or config.get('chunk_max_workers', 4)),
+        max_batch_chars=config.get('chunk_max_chars', 1000)
+    )
+    
+    interactive = sys.stderr.isatty()
+    shown = [0.0]
+    
+    def show_progress(result, done):
+        now = time.monotonic()
+        if now - shown[0] < 0.2 and done < result.segments:
+            return
+        shown[0] = now
+        print(f"\r{result.path.name}: {done}/{result.segments} segments, "
+              f"{result.rate:.1f} segments/s", end='', file=sys.stderr, flush=True)
+    
+    failed_files = 0
+    translated = 0
+    seconds = 0.0
+    for path in args.files:
+        output = default_output_path(path, target_lang, args.output_dir)
+        try:
+            result = translator.translate_file(path, output, args.format, args.restart,
+                                               show_progress if interactive else None)
+        except KeyboardInterrupt:
+            if interactive:
+                print(file=sys.stderr)
+            print("Interrupted; run the same command again to resume.", file=sys.stderr)
+            sys.exit(130)
+        except Exception as e:
+            if interactive:
+                print(file=sys.stderr)
+            print(f"Error: {path}: {e}", file=sys.stderr)
+            failed_files += 1
+            continue
+        
+        if interactive:
+            print('\r\033[K', end='', file=sys.stderr)
+        translated += result.translated
+        seconds += result.seconds
+        resumed = f", {result.resumed} from checkpoint" if result.resumed else ""
+        summary = (f"{result.translated} segments{resumed} in {result.seconds:.1f} s "
+                   f"({result.rate:.1f} segments/s)")
+        if result.complete:
+            print(f"{path} -> {result.output}: {summary}", file=sys.stderr)
+        else:
+            failed_files += 1
+            print(f"{path}: {result.failed} of {result.segments} segments failed "
+                  f"({summary}); run again to retry them", file=sys.stderr)
+            for error in result.errors:
+                print(f"  {error}", file=sys.stderr)
+    
+    if len(args.files) > 1 and seconds > 0:
+        print(f"Total: {translated} segments in {seconds:.1f} s "
+              f"({translated / seconds:.1f} segments/s)", file=sys.stderr)
+    if failed_files:
         sys.exit(1)
 
 
@@ -2,22 +2,71 @@
 Argos Translate engine implementation
 """
 
-from typing import List, Tuple, Optional
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional, Union
 import argostranslate.package
+import argostranslate.settings
 import argostranslate.translate
+from lingosnap.engines.argos_pool import ArgosWorkerPool
 from lingosnap.engines.base import TranslationEngine
+from lingosnap.utils.langdetect import get_detector
+from lingosnap.utils.languages import get_registry
+from lingosnap.utils.profiling import span
 
 
 class ArgosTranslateEngine(TranslationEngine):
     """Argos Translate engine for offline translation"""
     
-    def __init__(self):
-        """Initialize Argos Translate engine"""
-        # Update package index
-        try:
-            argostranslate.package.update_package_index()
-        except Exception:
-            pass  # Ignore errors during initialization
+    name = 'argos'
+    
+    # Maximum number of sentences CTranslate2 translates per internal batch
+    MAX_BATCH_SIZE = 32
+    
+    def __init__(self, index_ttl_hours: float = 24, workers: int = 0,
+                 threads_per_worker: int = 0):
+        """
+        Initialize Argos Translate engine
+        
+        No network I/O happens here: the package index is only refreshed
+        from the package management UI (see refresh_package_index).
+        
+        Args:
+            index_ttl_hours: Age after which the cached package index is
+                considered stale
+            workers: Number of worker processes translation is spread over
+                (0 = translate in the calling thread)
+            threads_per_worker: Inference thread limit of each worker, or of
+                this process when workers is 0 (0 = CTranslate2 default)
+        """
+        self.index_ttl = index_ttl_hours * 3600
+        self.threads_per_worker = threads_per_worker
+        self._index_lock = threading.Lock()
+        
+        # Resident translator registry: (source, target) -> list of direct
+        # package translations to apply in order (several hops for pivots)
+        self._translation_paths = {}
+        self._package_graph = None
+        self._registry_lock = threading.RLock()
+        
+        # Serializes CTranslate2 model loading, so concurrent batches never
+        # build two translators for the same model
+        self._model_lock = threading.Lock()
+        
+        # Stanza sentence splitters, keyed by package path; pipelines are
+        # not thread-safe, so creating and running them holds the lock
+        self._sentence_splitters = {}
+        self._splitter_lock = threading.Lock()
+        
+        # Supported languages, derived from the installed packages
+        self._languages = None
+        
+        # Multi-core mode: models live in the worker processes
+        self._pool = None
+        if workers > 0:
+            self._pool = ArgosWorkerPool(workers, threads_per_worker, index_ttl_hours)
     
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
         """
@@ -32,11 +81,387 @@ class ArgosTranslateEngine(TranslationEngine):
             Translated text
         """
         try:
-            # Argos uses 2-letter codes
-            translated = argostranslate.translate.translate(text, source_lang, target_lang)
-            return translated if translated else text
+            if source_lang == 'auto':
+                source_lang = self.detect_language(text) or 'en'
+            
+            with span('argos.inference', chars=len(text)):
+                if self._pool is None:
+                    # Argos uses 2-letter codes
+                    path = self._get_translation_path(source_lang, target_lang)
+                    self._load_path_models(path)
+                    translated = text
+                    for hop in path:
+                        translated = hop.translate(translated)
+                    return translated if translated else text
+                
+                translated = self._pool.translate_batch([text], source_lang, target_lang)[0]
         except Exception as e:
             raise Exception(f"Translation failed: {str(e)}")
+        
+        if isinstance(translated, Exception):
+            raise translated
+        return translated if translated else text
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts with one CTranslate2 batch call per hop
+        
+        All sentences of all texts are tokenized and handed to the model
+        together, then regrouped per text. Pivot pairs run one batch per
+        hop. Falls back to translating the texts one by one when the batched
+        call is not possible or fails. In multi-core mode the sentences are
+        spread over the worker processes instead.
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        if not texts:
+            return []
+        
+        try:
+            if source_lang == 'auto':
+                source_lang = self.detect_language('\n'.join(texts)) or 'en'
+            path = self._get_translation_path(source_lang, target_lang)
+        except Exception as e:
+            error = Exception(f"Translation failed: {str(e)}")
+            return [error for _ in texts]
+        
+        with span('argos.inference', texts=len(texts)):
+            if self._pool is not None:
+                return self._pool.translate_batch(texts, source_lang, target_lang)
+            
+            results: List[Union[str, Exception]] = list(texts)
+            for hop in path:
+                pending = [i for i, result in enumerate(results)
+                           if not isinstance(result, Exception)]
+                translated = self._translate_hop_batch(hop, [results[i] for i in pending])
+                for index, result in zip(pending, translated):
+                    results[index] = result
+            return results
+    
+    def _translate_hop_batch(self, hop, texts: List[str]) -> List[Union[str, Exception]]:
+        """
+        Translate texts through a single package translation
+        
+        Args:
+            hop: argostranslate translation for one language pair
+            texts: Texts to translate
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        package_translation = self._find_package_translation(hop)
+        if package_translation is not None:
+            try:
+                # Load through _load_model so the thread limit also applies
+                # to argos' own translation path
+                self._load_model(package_translation)
+                if argostranslate.settings.stanza_available:
+                    return self._translate_packaged_batch(package_translation, texts)
+            except Exception:
+                pass  # Retry item by item so errors are reported per text
+        
+        results = []
+        for text in texts:
+            try:
+                results.append(hop.translate(text))
+            except Exception as e:
+                results.append(Exception(f"Translation failed: {str(e)}"))
+        return results
+    
+    def _get_translation_path(self, source_lang: str, target_lang: str) -> list:
+        """
+        Resolve a language pair to the package translations that implement it
+        
+        The result is kept in the resident registry, so the package objects
+        (and the CTranslate2 models they load on first use) stay in memory
+        for follow-up requests on the same pair.
+        
+        Args:
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            List of translations to apply in order (empty if codes are equal)
+        """
+        key = (source_lang, target_lang)
+        with self._registry_lock:
+            path = self._translation_paths.get(key)
+            if path is not None:
+                return path
+            
+            if source_lang == target_lang:
+                path = []
+            else:
+                path = self._find_path(self._get_package_graph(), source_lang, target_lang)
+                if path is None:
+                    raise Exception(
+                        f"No installed language package for {source_lang} → {target_lang}"
+                    )
+            
+            self._translation_paths[key] = path
+            return path
+    
+    def _get_package_graph(self) -> Dict[str, Dict[str, object]]:
+        """
+        Build (once) the graph of directly installed translations
+        
+        Returns:
+            Mapping from_code -> {to_code: translation}
+        """
+        if self._package_graph is None:
+            graph = {}
+            for language in argostranslate.translate.get_installed_languages():
+                for translation in language.translations_from:
+                    # Skip identity and argos' own composite translations;
+                    # pivots are resolved by _find_path
+                    underlying = getattr(translation, 'underlying', translation)
+                    if getattr(underlying, 'pkg', None) is None:
+                        continue
+                    graph.setdefault(language.code, {})[translation.to_lang.code] = translation
+            self._package_graph = graph
+        return self._package_graph
+    
+    @staticmethod
+    def _find_path(graph: Dict[str, Dict[str, object]], source_lang: str,
+                   target_lang: str) -> Optional[list]:
+        """
+        Find the shortest chain of translations between two languages
+        
+        Args:
+            graph: Mapping from_code -> {to_code: translation}
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            List of translations (e.g. ja→en, en→zh) or None if unreachable
+        """
+        previous = {source_lang: None}
+        queue = deque([source_lang])
+        while queue:
+            code = queue.popleft()
+            if code == target_lang:
+                break
+            for next_code in graph.get(code, {}):
+                if next_code not in previous:
+                    previous[next_code] = code
+                    queue.append(next_code)
+        
+        if target_lang not in previous:
+            return None
+        
+        path = []
+        code = target_lang
+        while previous[code] is not None:
+            path.append(graph[previous[code]][code])
+            code = previous[code]
+        path.reverse()
+        return path
+    
+    def preload(self, source_lang: str, target_lang: str):
+        """
+        Resolve a pair and load its models ahead of the first translation
+        
+        In multi-core mode only the pair is checked; each worker loads its
+        models on first use.
+        
+        Args:
+            source_lang: Source language code
+            target_lang: Target language code
+        """
+        path = self._get_translation_path(source_lang, target_lang)
+        if self._pool is None:
+            self._load_path_models(path)
+    
+    def _load_path_models(self, path: list):
+        """
+        Load the models of every hop of a translation path
+        
+        Models loaded here get the configured thread limit; argos would
+        otherwise load them lazily with CTranslate2's defaults.
+        
+        Args:
+            path: Translations to apply in order
+        """
+        for hop in path:
+            package_translation = self._find_package_translation(hop)
+            if package_translation is not None:
+                self._load_model(package_translation)
+    
+    def invalidate_translations(self):
+        """Drop the resident registry after the installed set changed"""
+        with self._registry_lock:
+            self._translation_paths.clear()
+            self._package_graph = None
+            self._languages = None
+        with self._splitter_lock:
+            self._sentence_splitters.clear()
+        
+        # Language lists of every engine (including the router) may change
+        get_registry().invalidate()
+        
+        if self._pool is not None:
+            # Workers keep their own registry; restart them on next use
+            self._pool.shutdown()
+    
+    def close(self):
+        """Stop the worker processes (multi-core mode)"""
+        if self._pool is not None:
+            self._pool.shutdown()
+    
+    @staticmethod
+    def _find_package_translation(translation):
+        """
+        Find the package-backed translation behind argos' wrappers
+        
+        Args:
+            translation: argostranslate ITranslation
+            
+        Returns:
+            PackageTranslation or None for composite/identity translations
+        """
+        # get_installed_languages() wraps package translations in a
+        # CachedTranslation
+        translation = getattr(translation, 'underlying', translation)
+        pkg = getattr(translation, 'pkg', None)
+        if pkg is None or getattr(pkg, 'type', 'translate') != 'translate':
+            return None
+        if not hasattr(pkg, 'tokenizer'):
+            return None
+        return translation
+    
+    def _split_sentences(self, pkg, paragraph: str) -> List[str]:
+        """
+        Split a paragraph into sentences with the package's stanza model
+        
+        Args:
+            pkg: Installed argos package
+            paragraph: Paragraph without newlines
+            
+        Returns:
+            List of sentences
+        """
+        if not paragraph.strip():
+            return []
+        
+        key = str(pkg.package_path)
+        with self._splitter_lock:
+            splitter = self._sentence_splitters.get(key)
+            if splitter is None:
+                import stanza
+                splitter = stanza.Pipeline(
+                    lang=pkg.from_code,
+                    dir=str(pkg.package_path / 'stanza'),
+                    processors='tokenize',
+                    use_gpu=argostranslate.settings.device == 'cuda',
+                    logging_level='WARNING',
+                )
+                self._sentence_splitters[key] = splitter
+            
+            return [sentence.text for sentence in splitter(paragraph).sentences]
+    
+    def _translate_packaged_batch(self, translation, texts: List[str]) -> List[str]:
+        """
+        Translate texts through one CTranslate2 translate_batch call
+        
+        Mirrors argostranslate's apply_packaged_translation, but across
+        every sentence of every text at once.
+        
+        Args:
+            translation: argostranslate PackageTranslation
+            texts: Texts to translate
+            
+        Returns:
+            Translated texts in input order
+        """
+        pkg = translation.pkg
+        self._load_model(translation)
+        
+        # Flatten texts -> paragraphs -> sentences, remembering the owner
+        tokenized = []
+        owners = []
+        paragraph_counts = []
+        for text_index, text in enumerate(texts):
+            paragraphs = text.split('\n')
+            paragraph_counts.append(len(paragraphs))
+            for paragraph_index, paragraph in enumerate(paragraphs):
+                for sentence in self._split_sentences(pkg, paragraph):
+                    tokenized.append(pkg.tokenizer.encode(sentence))
+                    owners.append((text_index, paragraph_index))
+        
+        translated_tokens = {}
+        if tokenized:
+            target_prefix = None
+            if pkg.target_prefix != '':
+                target_prefix = [[pkg.target_prefix]] * len(tokenized)
+            
+            batch_results = translation.translator.translate_batch(
+                tokenized,
+                target_prefix=target_prefix,
+                replace_unknowns=True,
+                max_batch_size=self.MAX_BATCH_SIZE,
+                beam_size=4,
+                num_hypotheses=1,
+                length_penalty=0.2,
+            )
+            for owner, result in zip(owners, batch_results):
+                translated_tokens.setdefault(owner, []).extend(result.hypotheses[0])
+        
+        results = []
+        for text_index, count in enumerate(paragraph_counts):
+            paragraphs = [
+                self._decode_tokens(pkg, translated_tokens.get((text_index, i), []))
+                for i in range(count)
+            ]
+            results.append('\n'.join(paragraphs))
+        return results
+    
+    def _load_model(self, translation):
+        """
+        Load the CTranslate2 model of a package translation if needed
+        
+        Args:
+            translation: argostranslate PackageTranslation
+        """
+        if translation.translator is not None:
+            return
+        with self._model_lock:
+            if translation.translator is None:
+                import ctranslate2
+                translation.translator = ctranslate2.Translator(
+                    str(translation.pkg.package_path / 'model'),
+                    device=argostranslate.settings.device,
+                    intra_threads=self.threads_per_worker
+                )
+    
+    @staticmethod
+    def _decode_tokens(pkg, tokens: List[str]) -> str:
+        """
+        Detokenize model output the same way argostranslate does
+        
+        Args:
+            pkg: Installed argos package
+            tokens: Output tokens of one paragraph
+            
+        Returns:
+            Paragraph text
+        """
+        if not tokens:
+            return ''
+        
+        value = pkg.tokenizer.decode(tokens)
+        if pkg.target_prefix != '' and value.startswith(pkg.target_prefix):
+            value = value[len(pkg.target_prefix):]
+        if value.startswith(' '):
+            # Remove space added at the beginning by the tokenizer
+            value = value[1:]
+        return value
     
     def get_supported_languages(self) -> List[Tuple[str, str]]:
         """
@@ -45,19 +470,22 @@ class ArgosTranslateEngine(TranslationEngine):
         Returns:
             List of tuples (language_code, language_name)
         """
-        installed_languages = argostranslate.package.get_installed_packages()
-        
-        # Get unique languages from installed packages
-        languages = set()
-        for pkg in installed_languages:
-            languages.add((pkg.from_code, pkg.from_name))
-            languages.add((pkg.to_code, pkg.to_name))
-        
-        return sorted(list(languages), key=lambda x: x[1])
+        with self._registry_lock:
+            if self._languages is None:
+                installed_languages = argostranslate.package.get_installed_packages()
+                
+                # Get unique languages from installed packages
+                languages = set()
+                for pkg in installed_languages:
+                    languages.add((pkg.from_code, pkg.from_name))
+                    languages.add((pkg.to_code, pkg.to_name))
+                
+                self._languages = sorted(list(languages), key=lambda x: x[1])
+            return list(self._languages)
     
     def detect_language(self, text: str) -> Optional[str]:
         """
-        Detect language (basic implementation)
+        Detect language with the offline detector
         Note: Argos doesn't have built-in language detection
         
         Args:
@@ -66,11 +494,11 @@ class ArgosTranslateEngine(TranslationEngine):
         Returns:
             Language code or None
         """
-        # Simple heuristic: check if text contains Chinese characters
-        if any('\u4e00' <= char <= '\u9fff' for char in text):
+        code = get_detector().detect(text)
+        # Argos uses 'zh' for both Chinese scripts
+        if code == 'zh-tw':
             return 'zh'
-        # Default to English
-        return 'en'
+        return code
     
     def is_available(self) -> bool:
         """
@@ -85,6 +513,25 @@ class ArgosTranslateEngine(TranslationEngine):
         except Exception:
             return False
     
+    def supports_pair(self, source_lang: str, target_lang: str) -> bool:
+        """
+        Check if the installed packages can translate a language pair
+        
+        Args:
+            source_lang: Source language code ('auto' checks availability only)
+            target_lang: Target language code
+            
+        Returns:
+            True if a direct or pivot translation path exists
+        """
+        if source_lang == 'auto':
+            return self.is_available()
+        try:
+            self._get_translation_path(source_lang, target_lang)
+            return True
+        except Exception:
+            return False
+    
     def get_installed_packages(self) -> List[dict]:
         """
         Get list of installed language packages
@@ -104,15 +551,70 @@ class ArgosTranslateEngine(TranslationEngine):
             for pkg in packages
         ]
     
+    def get_package_index_age(self) -> Optional[float]:
+        """
+        Get the age of the on-disk package index
+        
+        Returns:
+            Age in seconds, or None if no index has been downloaded yet
+        """
+        try:
+            index_file = Path(argostranslate.settings.local_package_index)
+            return max(0.0, time.time() - index_file.stat().st_mtime)
+        except (OSError, AttributeError):
+            return None
+    
+    def is_package_index_stale(self) -> bool:
+        """
+        Check whether the on-disk package index is missing or older than the TTL
+        
+        Returns:
+            True if the index should be refreshed
+        """
+        age = self.get_package_index_age()
+        return age is None or age > self.index_ttl
+    
+    def refresh_package_index(self, force: bool = False) -> bool:
+        """
+        Download the package index if it is stale
+        
+        This is the only method that touches the network for the index; it
+        is called from the package management UI, never at startup.
+        
+        Args:
+            force: Refresh even if the cached index is still fresh
+            
+        Returns:
+            True if a usable index is available afterwards
+        """
+        with self._index_lock:
+            if not force and not self.is_package_index_stale():
+                return True
+            
+            try:
+                argostranslate.package.update_package_index()
+            except Exception:
+                pass
+            
+            # update_package_index() swallows network errors; fall back to
+            # whatever index is already on disk
+            return self.get_package_index_age() is not None
+    
     def get_available_packages(self) -> List[dict]:
         """
-        Get list of available packages for download
+        Get list of available packages for download from the cached index
+        
+        Does no network I/O; call refresh_package_index() first to update
+        the index.
         
         Returns:
             List of available package information
         """
+        if self.get_package_index_age() is None:
+            # argostranslate would try to download the index here
+            return []
+        
         try:
-            argostranslate.package.update_package_index()
             available_packages = argostranslate.package.get_available_packages()
             return [
                 {
@@ -139,19 +641,34 @@ class ArgosTranslateEngine(TranslationEngine):
             True if installation succeeded
         """
         try:
-            argostranslate.package.update_package_index()
-            available_packages = argostranslate.package.get_available_packages()
-            
-            # Find the package
-            package_to_install = None
-            for pkg in available_packages:
-                if pkg.from_code == from_code and pkg.to_code == to_code:
-                    package_to_install = pkg
-                    break
+            package_to_install = self._find_available_package(from_code, to_code)
+            if package_to_install is None and self.refresh_package_index(force=True):
+                # The cached index may predate this package
+                package_to_install = self._find_available_package(from_code, to_code)
             
             if package_to_install:
                 argostranslate.package.install_from_path(package_to_install.download())
+                self.invalidate_translations()
                 return True
             return False
         except Exception:
             return False
+    
+    def _find_available_package(self, from_code: str, to_code: str):
+        """
+        Find a package in the cached index
+        
+        Args:
+            from_code: Source language code
+            to_code: Target language code
+            
+        Returns:
+            argostranslate AvailablePackage or None
+        """
+        if self.get_package_index_age() is None:
+            return None
+        
+        for pkg in argostranslate.package.get_available_packages():
+            if pkg.from_code == from_code and pkg.to_code == to_code:
+                return pkg
+        return None
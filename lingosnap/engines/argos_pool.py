@@ -0,0 +1,213 @@
+"""
+Process pool that runs Argos Translate on several cores
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Union
+from lingosnap.utils.segmentation import split_segments, join_segments
+
+
+# Engine owned by the current worker process (see _init_worker)
+_worker_engine = None
+
+
+def _init_worker(threads_per_worker: int, index_ttl_hours: float):
+    """
+    Set up a worker process
+    
+    Runs before argostranslate is imported in the worker, so the thread
+    limits also apply to the OpenMP/BLAS runtimes used by stanza.
+    
+    Args:
+        threads_per_worker: Thread limit per worker (0 = library default)
+        index_ttl_hours: Passed on to the worker's engine
+    """
+    global _worker_engine
+    
+    if threads_per_worker > 0:
+        for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+            os.environ[variable] = str(threads_per_worker)
+    
+    from lingosnap.engines.argos_engine import ArgosTranslateEngine
+    _worker_engine = ArgosTranslateEngine(index_ttl_hours=index_ttl_hours,
+                                          threads_per_worker=threads_per_worker)
+
+
+def _translate_shard(texts: List[str], source_lang: str,
+                     target_lang: str) -> List[Union[str, Exception]]:
+    """Translate one shard in a worker process"""
+    return _worker_engine.translate_batch(texts, source_lang, target_lang)
+
+
+class ArgosWorkerPool:
+    """
+    Farm of worker processes, each holding its own Argos models
+    
+    Input texts are split into sentences, the sentences are spread over
+    the workers in contiguous shards of similar size and the translations
+    are stitched back together in the original order.
+    """
+    
+    def __init__(self, workers: int, threads_per_worker: int = 0,
+                 index_ttl_hours: float = 24):
+        """
+        Initialize worker pool (processes are started on first use)
+        
+        Args:
+            workers: Number of worker processes
+            threads_per_worker: Inference thread limit per worker (0 = default)
+            index_ttl_hours: Package index TTL passed on to the workers
+        """
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker
+        self.index_ttl_hours = index_ttl_hours
+        
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes if needed"""
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs Qt and the event loop
+                # thread is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.threads_per_worker, self.index_ttl_hours),
+                )
+            return self._executor
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate texts across the worker processes
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code (not 'auto')
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        # Flatten every text into sentences, remembering the owner
+        segmented = [split_segments(text) for text in texts]
+        sentences = []
+        owners = []
+        for text_index, segments in enumerate(segmented):
+            for segment_index, (segment, _) in enumerate(segments):
+                if segment:
+                    sentences.append(segment)
+                    owners.append((text_index, segment_index))
+        
+        translated = self._translate_sentences(sentences, source_lang, target_lang)
+        
+        # Regroup sentences per text
+        pieces = [[segment for segment, _ in segments] for segments in segmented]
+        errors = {}
+        for (text_index, segment_index), result in zip(owners, translated):
+            if isinstance(result, Exception):
+                errors.setdefault(text_index, result)
+            else:
+                pieces[text_index][segment_index] = result
+        
+        results: List[Union[str, Exception]] = []
+        for text_index, segments in enumerate(segmented):
+            if text_index in errors:
+                results.append(errors[text_index])
+            else:
+                results.append(join_segments(pieces[text_index], segments))
+        return results
+    
+    def _translate_sentences(self, sentences: List[str], source_lang: str,
+                             target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Shard sentences over the workers and collect the results in order
+        
+        Args:
+            sentences: Sentences to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        if not sentences:
+            return []
+        
+        shards = self.make_shards([len(sentence) for sentence in sentences], self.workers)
+        
+        try:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_translate_shard, sentences[start:end],
+                                source_lang, target_lang)
+                for start, end in shards
+            ]
+        except Exception as e:
+            error = Exception(f"Translation failed: {str(e)}")
+            return [error for _ in sentences]
+        
+        results: List[Union[str, Exception]] = []
+        for (start, end), future in zip(shards, futures):
+            try:
+                results.extend(future.result())
+            except BrokenProcessPool as e:
+                # A worker died (e.g. out of memory); start fresh next time
+                self.shutdown(wait=False)
+                error = Exception(f"Translation failed: worker process crashed ({str(e)})")
+                results.extend(error for _ in range(end - start))
+            except Exception as e:
+                error = Exception(f"Translation failed: {str(e)}")
+                results.extend(error for _ in range(end - start))
+        return results
+    
+    @staticmethod
+    def make_shards(lengths: List[int], count: int) -> List[tuple]:
+        """
+        Cut a sequence into at most count contiguous shards of similar size
+        
+        Args:
+            lengths: Size (characters) of every item
+            count: Maximum number of shards
+            
+        Returns:
+            List of (start, end) index ranges covering every item in order
+        """
+        total = sum(lengths)
+        count = max(1, min(count, len(lengths)))
+        target = total / count
+        
+        shards = []
+        start = 0
+        size = 0
+        for index, length in enumerate(lengths):
+            size += length
+            remaining_items = len(lengths) - index - 1
+            remaining_shards = count - len(shards) - 1
+            if remaining_shards > 0 and (size >= target or remaining_items == remaining_shards):
+                shards.append((start, index + 1))
+                start = index + 1
+                size = 0
+        if start < len(lengths):
+            shards.append((start, len(lengths)))
+        return shards
+    
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker processes
+        
+        Args:
+            wait: Wait for running shards to finish
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -2,13 +2,17 @@
 Abstract base class for translation engines
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 
 
 class TranslationEngine(ABC):
     """Abstract base class for translation engines"""
     
+    # Short identifier used for cache keys and settings ('google', 'argos', ...)
+    name = 'engine'
+    
     @abstractmethod
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
         """
@@ -24,6 +28,32 @@ class TranslationEngine(ABC):
         """
         pass
     
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several independent texts
+        
+        The default implementation calls translate() once per text. Engines
+        that can translate many segments in one request or one model
+        invocation override this.
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            One entry per input text, in input order: the translated text,
+            or the Exception raised while translating that text
+        """
+        results = []
+        for text in texts:
+            try:
+                results.append(self.translate(text, source_lang, target_lang))
+            except Exception as e:
+                results.append(e)
+        return results
+    
     @abstractmethod
     def get_supported_languages(self) -> List[Tuple[str, str]]:
         """
@@ -56,3 +86,137 @@ class TranslationEngine(ABC):
             True if engine is available, False otherwise
         """
         pass
+    
+    def is_loaded(self) -> bool:
+        """
+        Check if the engine can be used without importing or building anything
+        
+        Returns:
+            True unless the engine is still loading (see LazyTranslationEngine)
+        """
+        return True
+
+
+class TranslationEngineWrapper(TranslationEngine):
+    """
+    Base class for engines that decorate another engine
+    
+    Every method is forwarded to the wrapped engine, and attributes that are
+    not defined on the wrapper (e.g. get_character_count, install_package)
+    are looked up on the wrapped engine, so a wrapper can be used anywhere
+    the original engine was used.
+    """
+    
+    def __init__(self, engine: TranslationEngine):
+        """
+        Initialize wrapper
+        
+        Args:
+            engine: Engine to wrap
+        """
+        self.engine = engine
+    
+    @property
+    def name(self) -> str:
+        """Name of the wrapped engine"""
+        return self.engine.name
+    
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        return self.engine.translate(text, source_lang, target_lang)
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        return self.engine.translate_batch(texts, source_lang, target_lang)
+    
+    def get_supported_languages(self) -> List[Tuple[str, str]]:
+        return self.engine.get_supported_languages()
+    
+    def detect_language(self, text: str) -> Optional[str]:
+        return self.engine.detect_language(text)
+    
+    def is_available(self) -> bool:
+        return self.engine.is_available()
+    
+    def is_loaded(self) -> bool:
+        return self.engine.is_loaded()
+    
+    def unwrap(self) -> TranslationEngine:
+        """
+        Get the innermost (undecorated) engine
+        
+        Returns:
+            The engine at the bottom of the wrapper chain
+        """
+        engine = self.engine
+        while isinstance(engine, TranslationEngineWrapper):
+            engine = engine.engine
+        return engine
+    
+    def __getattr__(self, attr):
+        # Only called when normal lookup fails; guard against recursion
+        # before self.engine has been assigned
+        if attr == 'engine':
+            raise AttributeError(attr)
+        return getattr(self.engine, attr)
+
+
+class AsyncTranslationEngine(ABC):
+    """
+    Abstract base class for asyncio-native translation engines
+    
+    Async engines are driven from the shared event loop in
+    lingosnap.engines.event_loop; synchronous TranslationEngine classes
+    wrap them for the GUI and the CLI.
+    """
+    
+    name = 'engine'
+    
+    @abstractmethod
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text from source language to target language
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated text
+        """
+        pass
+    
+    @abstractmethod
+    async def detect_language(self, text: str) -> Optional[str]:
+        """
+        Detect the language of the given text
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Language code or None if detection fails
+        """
+        pass
+    
+    async def translate_batch(self, texts: List[str], source_lang: str,
+                              target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts concurrently
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        return await asyncio.gather(
+            *(self.translate(text, source_lang, target_lang) for text in texts),
+            return_exceptions=True
+        )
+    
+    async def aclose(self):
+        """Release network resources held by the engine"""
+        pass
@@ -0,0 +1,81 @@
+"""
+Caching decorator for translation engines
+"""
+
+from typing import List, Optional, Union
+from lingosnap.engines.base import TranslationEngine, TranslationEngineWrapper
+from lingosnap.utils.cache import TranslationCache
+
+
+class CachedTranslationEngine(TranslationEngineWrapper):
+    """Translation engine that serves repeated requests from a TranslationCache"""
+    
+    def __init__(self, engine: TranslationEngine,
+                 cache: Optional[TranslationCache] = None):
+        """
+        Initialize cached engine
+        
+        Args:
+            engine: Engine to wrap
+            cache: Cache to use (a default TranslationCache if omitted)
+        """
+        super().__init__(engine)
+        self.cache = cache if cache is not None else TranslationCache()
+    
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text, consulting the cache first
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated text
+        """
+        cached = self.cache.get(self.name, text, source_lang, target_lang)
+        if cached is not None:
+            return cached
+        
+        translated = self.engine.translate(text, source_lang, target_lang)
+        self.cache.put(self.name, text, source_lang, target_lang, translated)
+        return translated
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts, sending only cache misses to the engine
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        results: List[Union[str, Exception, None]] = [
+            self.cache.get(self.name, text, source_lang, target_lang) for text in texts
+        ]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        
+        translated = self.engine.translate_batch(
+            [texts[i] for i in missing], source_lang, target_lang
+        )
+        for i, result in zip(missing, translated):
+            results[i] = result
+            if not isinstance(result, Exception):
+                self.cache.put(self.name, texts[i], source_lang, target_lang, result)
+        return results
+    
+    def get_cache_stats(self) -> dict:
+        """
+        Get cache hit/miss counters
+        
+        Returns:
+            Dictionary of cache statistics
+        """
+        return self.cache.get_stats()
@@ -0,0 +1,137 @@
+"""
+Segmentation decorator for translation engines
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Union
+from lingosnap.engines.base import TranslationEngine, TranslationEngineWrapper
+from lingosnap.engines.resilience import CircuitOpenError
+from lingosnap.utils.segmentation import split_segments, group_segments, join_segments
+
+
+class ChunkedTranslationEngine(TranslationEngineWrapper):
+    """
+    Translation engine that splits long texts into chunks
+    
+    Texts longer than max_chunk_chars are split on sentence boundaries,
+    grouped into chunks of at most max_chunk_chars, translated concurrently
+    (at most max_workers chunks at a time) and stitched back together with
+    the original whitespace and line breaks. A failed chunk is retried on
+    its own before the whole translation is given up, unless the upstream
+    circuit is open.
+    """
+    
+    # Base delay between two attempts of the same chunk (seconds)
+    RETRY_DELAY = 0.2
+    
+    def __init__(self, engine: TranslationEngine, max_chunk_chars: int = 1000,
+                 max_workers: int = 4, max_retries: int = 2,
+                 mode: str = 'sentence'):
+        """
+        Initialize chunked engine
+        
+        Args:
+            engine: Engine to wrap
+            max_chunk_chars: Maximum characters sent to the engine at once
+            max_workers: Maximum number of chunks translated concurrently
+            max_retries: Extra attempts for a failed chunk (use 0 for
+                engines that retry requests themselves)
+            mode: Segment boundaries, 'sentence' or 'paragraph'
+        """
+        super().__init__(engine)
+        self.max_chunk_chars = max_chunk_chars
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.mode = mode
+    
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text chunk by chunk
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated text
+        """
+        if len(text) <= self.max_chunk_chars:
+            return self.engine.translate(text, source_lang, target_lang)
+        
+        chunks = group_segments(split_segments(text, self.mode), self.max_chunk_chars)
+        pending = [i for i, (chunk, _) in enumerate(chunks) if chunk]
+        translations = [chunk for chunk, _ in chunks]
+        
+        workers = min(self.max_workers, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                i: executor.submit(self._translate_chunk, chunks[i][0],
+                                   source_lang, target_lang)
+                for i in pending
+            }
+            for i, future in futures.items():
+                translations[i] = future.result()
+        
+        return join_segments(translations, chunks)
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts, chunking the long ones
+        
+        Short texts go to the engine as one batch; long texts are chunked
+        as in translate().
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        short = [i for i, text in enumerate(texts) if len(text) <= self.max_chunk_chars]
+        if len(short) == len(texts):
+            return self.engine.translate_batch(texts, source_lang, target_lang)
+        
+        results: List[Union[str, Exception, None]] = [None] * len(texts)
+        if short:
+            translated = self.engine.translate_batch(
+                [texts[i] for i in short], source_lang, target_lang
+            )
+            for i, result in zip(short, translated):
+                results[i] = result
+        
+        for i, text in enumerate(texts):
+            if results[i] is None:
+                try:
+                    results[i] = self.translate(text, source_lang, target_lang)
+                except Exception as e:
+                    results[i] = e
+        return results
+    
+    def _translate_chunk(self, chunk: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate one chunk, retrying on failure
+        
+        Args:
+            chunk: Chunk text
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated chunk
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.engine.translate(chunk, source_lang, target_lang)
+            except CircuitOpenError:
+                # The upstream is known to be down; a retry would only wait
+                raise
+            except Exception as e:
+                error = e
+                if attempt < self.max_retries:
+                    time.sleep(self.RETRY_DELAY * (attempt + 1))
+        raise error
@@ -0,0 +1,157 @@
+"""
+Single-flight decorator for translation engines
+"""
+
+import threading
+from typing import Dict, List, Tuple, Union
+from lingosnap.engines.base import TranslationEngine, TranslationEngineWrapper
+
+
+class _Flight:
+    """An upstream request that other callers can wait for"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CoalescingTranslationEngine(TranslationEngineWrapper):
+    """
+    Translation engine that merges concurrent identical requests
+    
+    While a (text, source_lang, target_lang) request is in flight, further
+    identical requests wait for it instead of calling the engine again, and
+    every waiter receives the same translation or the same exception.
+    Nothing is remembered once the request completes; that is the cache's
+    job.
+    """
+    
+    def __init__(self, engine: TranslationEngine):
+        """
+        Initialize coalescing engine
+        
+        Args:
+            engine: Engine to wrap
+        """
+        super().__init__(engine)
+        self._flights: Dict[Tuple[str, str, str], _Flight] = {}
+        self._lock = threading.Lock()
+        
+        self.requests = 0
+        self.coalesced = 0
+    
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text, joining an identical request already in flight
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated text
+        """
+        key = (text, source_lang, target_lang)
+        with self._lock:
+            self.requests += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+            else:
+                self.coalesced += 1
+        
+        if leader:
+            try:
+                flight.result = self.engine.translate(text, source_lang, target_lang)
+            except Exception as e:
+                flight.error = e
+            finally:
+                self._land([key], [flight])
+        else:
+            flight.done.wait()
+        
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts, sending only texts not already in flight
+        
+        Duplicates within the batch are sent once as well.
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        owned: Dict[Tuple[str, str, str], _Flight] = {}
+        flights = []
+        with self._lock:
+            for text in texts:
+                key = (text, source_lang, target_lang)
+                self.requests += 1
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = _Flight()
+                    self._flights[key] = flight
+                    owned[key] = flight
+                else:
+                    self.coalesced += 1
+                flights.append(flight)
+        
+        # Send our own texts before waiting on anybody else's, so two
+        # overlapping batches can never wait on each other
+        if owned:
+            keys = list(owned)
+            try:
+                translated = self.engine.translate_batch(
+                    [key[0] for key in keys], source_lang, target_lang
+                )
+            except Exception as e:
+                translated = [e for _ in keys]
+            try:
+                for key, result in zip(keys, translated):
+                    if isinstance(result, Exception):
+                        owned[key].error = result
+                    else:
+                        owned[key].result = result
+            finally:
+                self._land(keys, [owned[key] for key in keys])
+        
+        results: List[Union[str, Exception]] = []
+        for flight in flights:
+            flight.done.wait()
+            results.append(flight.error if flight.error is not None else flight.result)
+        return results
+    
+    def _land(self, keys: List[Tuple[str, str, str]], flights: List[_Flight]):
+        """Forget completed flights and wake up their waiters"""
+        with self._lock:
+            for key in keys:
+                self._flights.pop(key, None)
+        for flight in flights:
+            flight.done.set()
+    
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """
+        Get request counters
+        
+        Returns:
+            Dictionary with requests, coalesced (served by another caller's
+            upstream call) and in_flight
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._flights),
+            }
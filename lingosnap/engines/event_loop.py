@@ -0,0 +1,59 @@
+"""
+Shared asyncio event loop for async engines
+"""
+
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the shared event loop, starting its thread on first use
+    
+    All async engines run on this loop so that their connection pools and
+    semaphores are shared by every caller in the process.
+    
+    Returns:
+        Running event loop
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever,
+                name='lingosnap-event-loop',
+                daemon=True
+            )
+            _thread.start()
+        return _loop
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared loop and wait for its result
+    
+    Args:
+        coro: Coroutine to run
+        timeout: Maximum number of seconds to wait
+        
+    Returns:
+        Result of the coroutine
+    """
+    loop = get_event_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError('run_sync() cannot be called from the event loop thread')
+    
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
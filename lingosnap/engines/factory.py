@@ -0,0 +1,199 @@
+"""
+Helpers for building the engine stack used by the GUI and the CLI
+"""
+
+from typing import Dict, Optional
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.engines.cached_engine import CachedTranslationEngine
+from lingosnap.engines.chunked_engine import ChunkedTranslationEngine
+from lingosnap.engines.coalescing_engine import CoalescingTranslationEngine
+from lingosnap.engines.lazy_engine import LazyTranslationEngine
+from lingosnap.engines.masking_engine import MaskingTranslationEngine
+from lingosnap.engines.memory_engine import MemoryTranslationEngine
+from lingosnap.engines.metered_engine import MeteredTranslationEngine
+from lingosnap.utils.cache import TranslationCache
+from lingosnap.utils.masking import Masker
+from lingosnap.utils.translation_memory import TranslationMemory
+from lingosnap.utils.usage import UsageMeter
+
+
+# Engines that retry failed requests themselves
+SELF_RETRYING_ENGINES = ('google', 'auto')
+
+
+def create_base_engine(engine_type: str, config=None,
+                       meter: Optional[UsageMeter] = None) -> TranslationEngine:
+    """
+    Create an engine without cache, memory or masking layers
+    
+    Args:
+        engine_type: 'google', 'argos' or 'auto'
+        config: Config instance (defaults are used if omitted)
+        meter: Usage meter recording every upstream call (optional; the
+            router's backends are metered individually)
+        
+    Returns:
+        Translation engine instance
+    """
+    get = config.get if config is not None else (lambda key, default=None: default)
+    
+    if engine_type == 'auto':
+        return create_router({
+            'google': create_base_engine('google', config, meter),
+            'argos': create_base_engine('argos', config, meter),
+        }, config)
+    
+    engine = _create_backend(engine_type, get)
+    if meter is not None and get('usage_metering_enabled', True):
+        engine = MeteredTranslationEngine(engine, meter)
+    return engine
+
+
+def create_lazy_engine(engine_type: str, config=None,
+                       meter: Optional[UsageMeter] = None) -> LazyTranslationEngine:
+    """
+    Create a base engine that is only imported and built when first used
+    
+    Args:
+        engine_type: 'google' or 'argos'
+        config: Config instance (defaults are used if omitted)
+        meter: Usage meter recording every upstream call (optional)
+        
+    Returns:
+        LazyTranslationEngine wrapping create_base_engine()
+    """
+    return LazyTranslationEngine(
+        engine_type, lambda: create_base_engine(engine_type, config, meter)
+    )
+
+
+def _create_backend(engine_type: str, get) -> TranslationEngine:
+    """Create the Google or Argos engine"""
+    if engine_type == 'google':
+        from lingosnap.engines.google_engine import GoogleTranslateEngine
+        from lingosnap.engines.resilience import RequestGovernor
+        governor = RequestGovernor(
+            rate=get('google_rate_limit', 10.0),
+            burst=get('google_rate_burst', 20),
+            max_concurrency=get('google_max_concurrency', 8),
+            min_concurrency=get('google_min_concurrency', 1),
+            latency_target=get('google_latency_target', 2.0),
+            max_retries=get('google_max_retries', 3),
+            retry_base_delay=get('google_retry_base_delay', 0.5),
+            retry_max_delay=get('google_retry_max_delay', 8.0),
+            failure_threshold=get('google_breaker_threshold', 5),
+            reset_timeout=get('google_breaker_reset', 30.0)
+        )
+        return GoogleTranslateEngine(
+            api_key=get('google_api_key', '') or None,
+            max_concurrency=get('google_max_concurrency', 8),
+            request_timeout=get('google_request_timeout', 10.0),
+            service_url=get('google_service_url', 'https://translate.google.com'),
+            local_detection=get('local_language_detection', True),
+            governor=governor
+        )
+    
+    from lingosnap.engines.argos_engine import ArgosTranslateEngine
+    return ArgosTranslateEngine(
+        index_ttl_hours=get('argos_index_ttl_hours', 24),
+        workers=get('argos_workers', 0),
+        threads_per_worker=get('argos_threads_per_worker', 0)
+    )
+
+
+def create_router(backends: Dict[str, TranslationEngine], config=None) -> TranslationEngine:
+    """
+    Create a router choosing between undecorated engines per request
+    
+    Args:
+        backends: Engines by name, in order of preference
+        config: Config instance (defaults are used if omitted)
+        
+    Returns:
+        RoutingTranslationEngine instance
+    """
+    from lingosnap.engines.router_engine import RoutingTranslationEngine
+    get = config.get if config is not None else (lambda key, default=None: default)
+    return RoutingTranslationEngine(
+        backends,
+        hedging=get('routing_hedging', True),
+        cooldown=get('routing_cooldown', 30.0),
+        min_hedge_delay=get('routing_min_hedge_delay', 0.3)
+    )
+
+
+def wrap_engine(engine: TranslationEngine, config,
+                cache: Optional[TranslationCache] = None,
+                memory: Optional[TranslationMemory] = None,
+                masker: Optional[Masker] = None) -> TranslationEngine:
+    """
+    Decorate an engine according to the configuration
+    
+    The resulting stack is MemoryTranslationEngine ->
+    MaskingTranslationEngine -> ChunkedTranslationEngine ->
+    CoalescingTranslationEngine -> CachedTranslationEngine -> engine, so
+    texts differing only in masked spans share cache entries, chunks of long
+    texts are cached individually and concurrent identical chunks share one
+    upstream call. The memory sits on top: it sees the same unmasked, whole
+    texts the history stores, and its fuzzy matches are never stored as
+    exact translations of the new text.
+    
+    Args:
+        engine: Engine to decorate
+        config: Config instance
+        cache: Shared translation cache (created from config if omitted)
+        memory: Translation memory over the history (not used if omitted)
+        masker: Shared do-not-translate masker (created from config if omitted)
+        
+    Returns:
+        Decorated engine
+    """
+    if config.get('cache_enabled', True):
+        if cache is None:
+            cache = TranslationCache.from_config(config)
+        engine = CachedTranslationEngine(engine, cache)
+    
+    if config.get('coalescing_enabled', True):
+        engine = CoalescingTranslationEngine(engine)
+    
+    if config.get('chunking_enabled', True):
+        # Google's RequestGovernor already retries transient failures and
+        # the router falls back between backends; retrying chunks on top
+        # would multiply the upstream attempts
+        retries = config.get('chunk_max_retries', 2)
+        if engine.name in SELF_RETRYING_ENGINES:
+            retries = 0
+        engine = ChunkedTranslationEngine(
+            engine,
+            max_chunk_chars=config.get('chunk_max_chars', 1000),
+            max_workers=config.get('chunk_max_workers', 4),
+            max_retries=retries
+        )
+    
+    if config.get('masking_enabled', True):
+        if masker is None:
+            masker = Masker.from_config(config)
+        engine = MaskingTranslationEngine(engine, masker)
+    
+    if memory is not None and config.get('memory_enabled', True):
+        engine = MemoryTranslationEngine(engine, memory)
+    
+    return engine
+
+
+def create_engine(engine_type: str, config,
+                  cache: Optional[TranslationCache] = None,
+                  meter: Optional[UsageMeter] = None) -> TranslationEngine:
+    """
+    Create a fully decorated engine
+    
+    Args:
+        engine_type: 'google', 'argos' or 'auto'
+        config: Config instance
+        cache: Shared translation cache (created from config if omitted)
+        meter: Usage meter (upstream calls are not metered if omitted)
+        
+    Returns:
+        Decorated translation engine
+    """
+    return wrap_engine(create_base_engine(engine_type, config, meter), config, cache)
@@ -2,24 +2,445 @@
 Google Translate API engine implementation
 """
 
-from typing import List, Tuple, Optional
-from googletrans import Translator, LANGUAGES
-from lingosnap.engines.base import TranslationEngine
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional, Union
+import httpx
+from googletrans import Translator
+from googletrans.constants import LANGCODES, LANGUAGES, SPECIAL_CASES
+from lingosnap.engines.base import AsyncTranslationEngine, TranslationEngine
+from lingosnap.engines.event_loop import run_sync
+from lingosnap.engines.resilience import CircuitOpenError, RequestGovernor
+from lingosnap.utils.langdetect import get_detector
+from lingosnap.utils.profiling import span
+
+
+# (code, name) of every language, sorted by name; built once
+SUPPORTED_LANGUAGES = tuple(sorted(
+    ((code, name.capitalize()) for code, name in LANGUAGES.items()),
+    key=lambda x: x[1]
+))
+
+
+class GoogleHTTPError(Exception):
+    """Raised when the Google endpoint answers with a non-200 status"""
+    
+    def __init__(self, status_code: int, message: str = '',
+                 retry_after: Optional[float] = None):
+        super().__init__(message or f'Unexpected status code {status_code}')
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# Transport errors worth retrying; httpx 0.13 raises httpcore exceptions
+# that do not derive from httpx.HTTPError
+_TRANSIENT_ERRORS = (asyncio.TimeoutError, OSError) + tuple(
+    getattr(httpx, name) for name in (
+        'HTTPError', 'NetworkError', 'TimeoutException', 'Timeout', 'ProtocolError'
+    ) if isinstance(getattr(httpx, name, None), type)
+)
+
+
+# Statuses meaning the upstream is healthy but rejected this request
+REQUEST_ERROR_STATUSES = (400, 413, 414)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Tell transient upstream failures from permanent ones
+    
+    Args:
+        error: Exception raised by a request attempt
+        
+    Returns:
+        True for timeouts, connection errors, 429 and 5xx answers
+    """
+    if isinstance(error, GoogleHTTPError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, _TRANSIENT_ERRORS)
+
+
+def is_request_error(error: Exception) -> bool:
+    """
+    Tell errors caused by the request from a failing upstream
+    
+    Args:
+        error: Exception raised by a request attempt
+        
+    Returns:
+        True for answers rejecting the request itself (400, 413, 414);
+        auth failures, unknown endpoints and unparsable answers are False
+    """
+    return isinstance(error, GoogleHTTPError) and error.status_code in REQUEST_ERROR_STATUSES
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds"""
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def normalize_language_code(code: str, allow_auto: bool = False) -> str:
+    """
+    Convert a language code or name to the form Google expects
+    
+    Args:
+        code: Language code or name (e.g. 'zh-CN', 'zh_cn', 'french')
+        allow_auto: Whether 'auto' is accepted
+        
+    Returns:
+        Google language code
+    """
+    code = code.lower().split('_', 1)[0]
+    if allow_auto and code == 'auto':
+        return code
+    if code in LANGUAGES:
+        return code
+    if code in SPECIAL_CASES:
+        return SPECIAL_CASES[code]
+    if code in LANGCODES:
+        return LANGCODES[code]
+    raise ValueError(f'invalid language code: {code}')
+
+
+class _ServiceClient(httpx.Client):
+    """httpx client sending googletrans' requests to the configured service"""
+    
+    def __init__(self, service_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.service_url = httpx.URL(service_url)
+    
+    def post(self, url, **kwargs):
+        # googletrans always builds https://<host>/... URLs
+        url = httpx.URL(url).copy_with(scheme=self.service_url.scheme,
+                                       host=self.service_url.host,
+                                       port=self.service_url.port)
+        return super().post(url, **kwargs)
+
+
+class _GoogleTranslator(Translator):
+    """
+    googletrans client for one worker thread
+    
+    Requests and response parsing are googletrans' own; this subclass only
+    points them at service_url and reports non-200 answers as
+    GoogleHTTPError so the governor can classify them.
+    """
+    
+    # googletrans 4.0.0rc1 checks this misspelt attribute on non-200
+    # answers; the status is checked in _translate instead
+    raise_Exception = False
+    
+    def __init__(self, service_url: str, timeout: float):
+        """
+        Initialize translator
+        
+        Args:
+            service_url: Base URL of the translate web service
+            timeout: Timeout of a single request in seconds
+        """
+        super().__init__(timeout=timeout)
+        headers = self.client.headers
+        self.client.close()
+        self.client = _ServiceClient(service_url, headers=headers, timeout=timeout)
+    
+    def _translate(self, text: str, dest: str, src: str):
+        data, response = super()._translate(text, dest, src)
+        if response.status_code != 200:
+            raise GoogleHTTPError(
+                response.status_code,
+                retry_after=_parse_retry_after(response.headers.get('Retry-After'))
+            )
+        return data, response
+
+
+class AsyncGoogleTranslateEngine(AsyncTranslationEngine):
+    """
+    asyncio-native Google Translate engine
+    
+    Requests are sent with googletrans' client, one keep-alive client per
+    thread of a small worker pool, and every request has its own timeout.
+    A RequestGovernor throttles the request rate, adapts the number of
+    requests in flight to 429/5xx answers and latency, retries transient
+    failures with jittered backoff and fails fast while the upstream is
+    unhealthy.
+    """
+    
+    name = 'google'
+    
+    # Maximum number of characters sent in a single request
+    MAX_PAYLOAD_CHARS = 5000
+    
+    # Separator used to pack several segments into one request
+    SEGMENT_SEPARATOR = '\n'
+    
+    def __init__(self, service_url: str = 'https://translate.google.com',
+                 max_concurrency: int = 8, request_timeout: float = 10.0,
+                 governor: Optional[RequestGovernor] = None):
+        """
+        Initialize async Google Translate engine
+        
+        Args:
+            service_url: Base URL of the translate web service
+            max_concurrency: Maximum number of requests in flight
+            request_timeout: Timeout of a single request in seconds
+            governor: Rate limiter/retry policy (defaults derived from
+                max_concurrency if omitted)
+        """
+        self.service_url = service_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.character_count = 0
+        
+        self.governor = governor or RequestGovernor(max_concurrency=max_concurrency)
+        self.governor.is_retryable = is_retryable_error
+        self.governor.is_request_error = is_request_error
+        
+        # googletrans is blocking; requests run on worker threads that each
+        # keep their own client. Created lazily, dropped by aclose()
+        self._executor = None
+        self._local = threading.local()
+        self._translators = []
+        self._lock = threading.Lock()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the request worker pool, creating it on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                    thread_name_prefix='google')
+            return self._executor
+    
+    def _get_translator(self) -> _GoogleTranslator:
+        """Get the googletrans client of the calling worker thread"""
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = _GoogleTranslator(self.service_url, self.request_timeout)
+            self._local.translator = translator
+            with self._lock:
+                self._translators.append(translator)
+        return translator
+    
+    async def _request(self, text: str, source_lang: str, target_lang: str) -> Tuple[str, str]:
+        """
+        Send one translation request
+        
+        Args:
+            text: Text to translate
+            source_lang: Google source language code or 'auto'
+            target_lang: Google target language code
+            
+        Returns:
+            Tuple (translated_text, detected_source_lang)
+        """
+        def send_blocking():
+            result = self._get_translator().translate(text, dest=target_lang, src=source_lang)
+            return result.text, result.src
+        
+        async def send():
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._get_executor(), send_blocking),
+                timeout=self.request_timeout
+            )
+        
+        with span('google.http', lane='google http', chars=len(text)):
+            return await self.governor.call(send)
+    
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text using Google Translate
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code (e.g., 'en' or 'auto')
+            target_lang: Target language code (e.g., 'zh-cn')
+            
+        Returns:
+            Translated text
+            
+        Raises:
+            CircuitOpenError: The circuit breaker is refusing requests
+            GoogleHTTPError: The endpoint answered with a non-200 status
+        """
+        try:
+            translated, _ = await self._request(
+                text,
+                normalize_language_code(source_lang, allow_auto=True),
+                normalize_language_code(target_lang)
+            )
+            self.character_count += len(text)
+            return translated
+        except (CircuitOpenError, GoogleHTTPError):
+            # Typed so callers can back off for the right amount of time
+            raise
+        except asyncio.TimeoutError as e:
+            raise Exception(f"Translation failed: request timed out after {self.request_timeout}s") from e
+        except Exception as e:
+            raise Exception(f"Translation failed: {str(e)}") from e
+    
+    async def translate_batch(self, texts: List[str], source_lang: str,
+                              target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts using as few requests as possible
+        
+        Segments are joined with newlines into requests of at most
+        MAX_PAYLOAD_CHARS characters and the requests are sent concurrently.
+        If a packed response does not split back into the expected number of
+        lines, the segments of that request are translated one by one.
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        # Blank segments are returned untouched
+        results: List[Union[str, Exception]] = list(texts)
+        
+        async def translate_group(group: List[int]):
+            if len(group) == 1:
+                try:
+                    results[group[0]] = await self.translate(
+                        texts[group[0]], source_lang, target_lang
+                    )
+                except Exception as e:
+                    results[group[0]] = e
+                return
+            
+            packed = self.SEGMENT_SEPARATOR.join(texts[i] for i in group)
+            try:
+                translated = await self.translate(packed, source_lang, target_lang)
+            except Exception as e:
+                for index in group:
+                    results[index] = e
+                return
+            
+            lines = translated.split(self.SEGMENT_SEPARATOR)
+            if len(lines) == len(group):
+                for index, line in zip(group, lines):
+                    results[index] = line
+                return
+            
+            # Segment boundaries were not preserved; retry individually
+            await asyncio.gather(*(translate_group([index]) for index in group))
+        
+        await asyncio.gather(*(translate_group(group)
+                               for group in self._pack_segments(texts)))
+        return results
+    
+    def _pack_segments(self, texts: List[str]) -> List[List[int]]:
+        """
+        Group segment indices into requests that fit the payload limit
+        
+        Args:
+            texts: Texts to pack
+            
+        Returns:
+            List of index groups; blank segments are left out
+        """
+        groups = []
+        current = []
+        current_size = 0
+        
+        for index, text in enumerate(texts):
+            if not text.strip():
+                continue
+            
+            # Segments that contain the separator or fill a request on their
+            # own are always sent alone
+            if self.SEGMENT_SEPARATOR in text or len(text) >= self.MAX_PAYLOAD_CHARS:
+                groups.append([index])
+                continue
+            
+            size = len(text) + len(self.SEGMENT_SEPARATOR)
+            if current and current_size + size > self.MAX_PAYLOAD_CHARS:
+                groups.append(current)
+                current = []
+                current_size = 0
+            current.append(index)
+            current_size += size
+        
+        if current:
+            groups.append(current)
+        
+        return groups
+    
+    async def detect_language(self, text: str) -> Optional[str]:
+        """
+        Detect the language of the given text
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Language code or None if detection fails
+        """
+        try:
+            _, detected = await self._request(text, 'auto', 'en')
+            return detected if detected != 'auto' else None
+        except Exception:
+            return None
+    
+    def get_stats(self) -> dict:
+        """
+        Get request counters, concurrency limit and circuit state
+        
+        Returns:
+            Dictionary of RequestGovernor statistics
+        """
+        return self.governor.get_stats()
+    
+    async def aclose(self):
+        """Close the HTTP clients and stop the worker threads"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            translators, self._translators = self._translators, []
+            self._local = threading.local()
+        if executor is not None:
+            executor.shutdown(wait=False)
+        for translator in translators:
+            translator.client.close()
 
 
 class GoogleTranslateEngine(TranslationEngine):
     """Google Translate API engine for online translation"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    name = 'google'
+    
+    def __init__(self, api_key: Optional[str] = None, max_concurrency: int = 8,
+                 request_timeout: float = 10.0,
+                 service_url: str = 'https://translate.google.com',
+                 local_detection: bool = True,
+                 governor: Optional[RequestGovernor] = None):
         """
         Initialize Google Translate engine
         
+        Synchronous facade over AsyncGoogleTranslateEngine; every call is run
+        on the shared event loop.
+        
         Args:
             api_key: Google Translate API key (optional for now)
+            max_concurrency: Maximum number of requests in flight
+            request_timeout: Timeout of a single request in seconds
+            service_url: Base URL of the translate web service
+            local_detection: Detect languages with the offline detector
+                instead of a request to Google
+            governor: Rate limiter/retry policy for the requests
         """
         self.api_key = api_key
-        self.translator = Translator()
-        self.character_count = 0
+        self.local_detection = local_detection
+        self.async_engine = AsyncGoogleTranslateEngine(
+            service_url=service_url,
+            max_concurrency=max_concurrency,
+            request_timeout=request_timeout,
+            governor=governor
+        )
     
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
         """
@@ -33,19 +454,22 @@ class GoogleTranslateEngine(TranslationEngine):
         Returns:
             Translated text
         """
-        try:
-            # Handle auto-detection
-            if source_lang == 'auto':
-                result = self.translator.translate(text, dest=target_lang)
-            else:
-                result = self.translator.translate(text, src=source_lang, dest=target_lang)
-            
-            # Update character count
-            self.character_count += len(text)
+        return run_sync(self.async_engine.translate(text, source_lang, target_lang))
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts with packed, concurrent requests
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
             
-            return result.text
-        except Exception as e:
-            raise Exception(f"Translation failed: {str(e)}")
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        return run_sync(self.async_engine.translate_batch(texts, source_lang, target_lang))
     
     def get_supported_languages(self) -> List[Tuple[str, str]]:
         """
@@ -55,8 +479,7 @@ class GoogleTranslateEngine(TranslationEngine):
             List of tuples (language_code, language_name)
         """
         # Return all Google Translate supported languages
-        return sorted([(code, name.capitalize()) for code, name in LANGUAGES.items()], 
-                     key=lambda x: x[1])
+        return list(SUPPORTED_LANGUAGES)
     
     def detect_language(self, text: str) -> Optional[str]:
         """
@@ -68,11 +491,13 @@ class GoogleTranslateEngine(TranslationEngine):
         Returns:
             Language code or None if detection fails
         """
-        try:
-            detection = self.translator.detect(text)
-            return detection.lang
-        except Exception:
-            return None
+        if not self.local_detection:
+            return run_sync(self.async_engine.detect_language(text))
+        
+        code = get_detector().detect(text)
+        if code == 'zh':
+            return 'zh-cn'
+        return code if code in LANGUAGES else None
     
     def is_available(self) -> bool:
         """
@@ -90,8 +515,22 @@ class GoogleTranslateEngine(TranslationEngine):
         Returns:
             Character count
         """
-        return self.character_count
+        return self.async_engine.character_count
     
     def reset_character_count(self):
         """Reset the character count to zero"""
-        self.character_count = 0
+        self.async_engine.character_count = 0
+    
+    def get_resilience_stats(self) -> dict:
+        """
+        Get request counters, concurrency limit and circuit state
+        
+        Returns:
+            Dictionary with requests, successes, failures, retries, rejected,
+            throttle_wait, concurrency_limit, in_flight and circuit_state
+        """
+        return self.async_engine.get_stats()
+    
+    def close(self):
+        """Close the HTTP connection pool"""
+        run_sync(self.async_engine.aclose())
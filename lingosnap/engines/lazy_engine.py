@@ -0,0 +1,81 @@
+"""
+Engine that is imported and built on first use
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+from lingosnap.engines.base import TranslationEngine, TranslationEngineWrapper
+
+
+class LazyTranslationEngine(TranslationEngineWrapper):
+    """
+    Defers creating an engine until it is needed
+    
+    Engine modules pull in heavy dependencies (argostranslate loads its
+    whole ML stack), so the GUI creates its engines through this wrapper and
+    calls load() from a background thread after the window is shown. Any
+    other use (translate, attribute access, ...) loads the engine in the
+    calling thread, waiting for a load already in progress.
+    """
+    
+    def __init__(self, name: str, factory: Callable[[], TranslationEngine]):
+        """
+        Initialize lazy engine
+        
+        Args:
+            name: Name of the engine the factory creates
+            factory: Function creating the engine (called once; called again
+                on the next use if it raised)
+        """
+        self._name = name
+        self._factory = factory
+        self._engine: Optional[TranslationEngine] = None
+        self._lock = threading.Lock()
+        
+        # Seconds spent in the factory
+        self.load_time: Optional[float] = None
+    
+    @property
+    def name(self) -> str:
+        """Name of the engine (known before it is loaded)"""
+        return self._name
+    
+    @property
+    def engine(self) -> TranslationEngine:
+        """The wrapped engine, loaded on first access"""
+        return self.load()
+    
+    def load(self) -> TranslationEngine:
+        """
+        Create the engine unless it exists already (thread-safe)
+        
+        Returns:
+            The wrapped engine
+        """
+        engine = self._engine
+        if engine is not None:
+            return engine
+        
+        with self._lock:
+            if self._engine is None:
+                started = time.perf_counter()
+                self._engine = self._factory()
+                self.load_time = time.perf_counter() - started
+            return self._engine
+    
+    def is_loaded(self) -> bool:
+        """
+        Check if the engine was created and is loaded itself
+        
+        Returns:
+            True if using the engine will not block on loading
+        """
+        engine = self._engine
+        return engine is not None and engine.is_loaded()
+    
+    def close(self):
+        """Close the engine if it was ever created"""
+        engine = self._engine
+        if engine is not None and hasattr(engine, 'close'):
+            engine.close()
@@ -0,0 +1,120 @@
+"""
+Do-not-translate masking decorator for translation engines
+"""
+
+from typing import List, Union
+from lingosnap.engines.base import TranslationEngine, TranslationEngineWrapper
+from lingosnap.utils.masking import Masker
+
+
+class MaskingTranslationEngine(TranslationEngineWrapper):
+    """
+    Translation engine that hides paths, URLs, identifiers and glossary
+    terms from the wrapped engine
+    
+    Texts whose placeholders do not survive translation are translated
+    again without masking.
+    """
+    
+    def __init__(self, engine: TranslationEngine, masker: Masker):
+        """
+        Initialize masking engine
+        
+        Args:
+            engine: Engine to wrap
+            masker: Masker finding and restoring the spans
+        """
+        super().__init__(engine)
+        self.masker = masker
+    
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text with do-not-translate spans masked
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated text
+        """
+        masked, replacements = self.masker.mask(text, target_lang)
+        if not replacements:
+            return self.engine.translate(text, source_lang, target_lang)
+        
+        if Masker.is_only_placeholders(masked):
+            self.masker.record(text, masked, replacements, skipped=True)
+            return Masker.restore(masked, replacements)
+        
+        restored = Masker.restore(
+            self.engine.translate(masked, source_lang, target_lang), replacements
+        )
+        if restored is None:
+            self.masker.record_fallback()
+            return self.engine.translate(text, source_lang, target_lang)
+        
+        self.masker.record(text, masked, replacements)
+        return restored
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts with do-not-translate spans masked
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        results: List[Union[str, Exception, None]] = [None] * len(texts)
+        masked_texts = []
+        pending = []
+        for i, text in enumerate(texts):
+            masked, replacements = self.masker.mask(text, target_lang)
+            if replacements and Masker.is_only_placeholders(masked):
+                self.masker.record(text, masked, replacements, skipped=True)
+                results[i] = Masker.restore(masked, replacements)
+            else:
+                masked_texts.append((masked, replacements))
+                pending.append(i)
+        
+        if not pending:
+            return results
+        
+        translated = self.engine.translate_batch(
+            [masked for masked, _ in masked_texts], source_lang, target_lang
+        )
+        
+        retry = []
+        for i, (masked, replacements), result in zip(pending, masked_texts, translated):
+            if isinstance(result, Exception) or not replacements:
+                results[i] = result
+                continue
+            restored = Masker.restore(result, replacements)
+            if restored is None:
+                self.masker.record_fallback()
+                retry.append(i)
+            else:
+                self.masker.record(texts[i], masked, replacements)
+                results[i] = restored
+        
+        if retry:
+            translated = self.engine.translate_batch(
+                [texts[i] for i in retry], source_lang, target_lang
+            )
+            for i, result in zip(retry, translated):
+                results[i] = result
+        return results
+    
+    def get_masking_stats(self) -> dict:
+        """
+        Get masking counters
+        
+        Returns:
+            Dictionary of masking statistics
+        """
+        return self.masker.get_stats()
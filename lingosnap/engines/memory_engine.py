@@ -0,0 +1,87 @@
+"""
+Translation memory decorator for translation engines
+"""
+
+from typing import List, Union
+from lingosnap.engines.base import TranslationEngine, TranslationEngineWrapper
+from lingosnap.utils.translation_memory import TranslationMemory
+
+
+class MemoryTranslationEngine(TranslationEngineWrapper):
+    """
+    Translation engine that reuses near-identical past translations
+    
+    Only translations of the wrapped engine are reused, and every fresh
+    translation is added to the memory in the form it was looked up.
+    """
+    
+    def __init__(self, engine: TranslationEngine, memory: TranslationMemory):
+        """
+        Initialize memory engine
+        
+        Args:
+            engine: Engine to wrap
+            memory: Translation memory to consult
+        """
+        super().__init__(engine)
+        self.memory = memory
+    
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text, serving close matches from the translation memory
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated text
+        """
+        match = self.memory.lookup(text, source_lang, target_lang, self.name)
+        if match is not None:
+            return match['translated_text']
+        
+        translated = self.engine.translate(text, source_lang, target_lang)
+        self.memory.learn(self.name, source_lang, target_lang, text, translated)
+        return translated
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts, sending only texts without a match
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        results: List[Union[str, Exception, None]] = []
+        for text in texts:
+            match = self.memory.lookup(text, source_lang, target_lang, self.name)
+            results.append(match['translated_text'] if match is not None else None)
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        
+        translated = self.engine.translate_batch(
+            [texts[i] for i in missing], source_lang, target_lang
+        )
+        for i, result in zip(missing, translated):
+            results[i] = result
+            if not isinstance(result, Exception):
+                self.memory.learn(self.name, source_lang, target_lang, texts[i], result)
+        return results
+    
+    def get_memory_stats(self) -> dict:
+        """
+        Get translation memory counters
+        
+        Returns:
+            Dictionary of memory statistics
+        """
+        return self.memory.get_stats()
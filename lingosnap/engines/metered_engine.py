@@ -0,0 +1,88 @@
+"""
+Usage metering decorator for translation engines
+"""
+
+import time
+from typing import List, Union
+from lingosnap.engines.base import TranslationEngine, TranslationEngineWrapper
+from lingosnap.utils.usage import UsageMeter
+
+
+class MeteredTranslationEngine(TranslationEngineWrapper):
+    """Translation engine that records characters, requests and latency"""
+    
+    def __init__(self, engine: TranslationEngine, meter: UsageMeter):
+        """
+        Initialize metered engine
+        
+        Args:
+            engine: Engine to wrap (an undecorated backend)
+            meter: Usage meter to record into
+        """
+        super().__init__(engine)
+        self.meter = meter
+    
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text and record the request
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated text
+        """
+        started = time.monotonic()
+        try:
+            result = self.engine.translate(text, source_lang, target_lang)
+        except Exception:
+            self.meter.record(self.name, 0, time.monotonic() - started, error=True)
+            raise
+        self.meter.record(self.name, len(text), time.monotonic() - started)
+        return result
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts and record them as one call
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        started = time.monotonic()
+        try:
+            results = self.engine.translate_batch(texts, source_lang, target_lang)
+        except Exception:
+            self.meter.record(self.name, 0, time.monotonic() - started,
+                              requests=len(texts), error=True)
+            raise
+        latency = time.monotonic() - started
+        
+        succeeded = [text for text, result in zip(texts, results)
+                     if not isinstance(result, Exception)]
+        if succeeded:
+            self.meter.record(self.name, sum(len(text) for text in succeeded), latency,
+                              requests=len(succeeded))
+        if len(succeeded) < len(texts):
+            self.meter.record(self.name, 0, 0.0, requests=len(texts) - len(succeeded),
+                              error=True)
+        return results
+    
+    def get_usage(self, days: int = 30) -> List[dict]:
+        """
+        Get daily usage of this engine
+        
+        Args:
+            days: Number of days to return
+            
+        Returns:
+            Usage rows as returned by UsageMeter.get_usage
+        """
+        return self.meter.get_usage(self.name, days)
@@ -0,0 +1,359 @@
+"""
+Rate limiting, retry and circuit breaking for network engines
+"""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit is open"""
+    
+    def __init__(self, retry_in: float):
+        super().__init__(
+            f'upstream is unhealthy, requests paused for {retry_in:.0f}s'
+        )
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate"""
+    
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize token bucket
+        
+        Args:
+            rate: Tokens added per second (0 disables the limit)
+            burst: Bucket capacity
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = None
+    
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting until one is available
+        
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            wait = 0.0
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                await asyncio.sleep(wait)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
+            return wait
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adjusted with AIMD
+    
+    The limit grows by roughly one slot per round of successful requests
+    (additive increase) and is halved when the upstream signals congestion
+    through 429/5xx answers, timeouts or latency above the target
+    (multiplicative decrease, at most once per latency target window).
+    """
+    
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 8,
+                 latency_target: float = 2.0):
+        """
+        Initialize limiter
+        
+        Args:
+            initial: Starting concurrency limit
+            minimum: Lowest limit
+            maximum: Highest limit
+            latency_target: Latency (seconds) above which requests count as
+                congested
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = None
+    
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+    
+    async def __aenter__(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+    
+    def on_success(self, latency: float):
+        """
+        Record a successful request
+        
+        Args:
+            latency: Request duration in seconds
+        """
+        if latency > self.latency_target:
+            self.on_congestion()
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+    
+    def on_congestion(self):
+        """Record a congestion signal"""
+        now = time.monotonic()
+        if now - self._last_decrease < self.latency_target:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit / 2)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that fails fast while the upstream is unhealthy
+    
+    After failure_threshold consecutive failures the circuit opens and
+    requests are rejected for reset_timeout seconds. Then a single trial
+    request is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize circuit breaker
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+                (0 disables the breaker)
+            reset_timeout: Seconds the circuit stays open
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+    
+    def check(self) -> bool:
+        """
+        Check whether a request may be sent
+        
+        Returns:
+            True if the request is the half-open trial; its outcome must be
+            recorded, or the trial released if it ends without one
+            
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if self.state == self.CLOSED:
+            return False
+        
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        raise CircuitOpenError(max(remaining, 0.0))
+    
+    def release_trial(self):
+        """Let another request run the trial (the trial was cancelled)"""
+        self._trial_running = False
+    
+    def record_success(self):
+        """Record a request the upstream answered"""
+        self.failures = 0
+        self._trial_running = False
+        self.state = self.CLOSED
+    
+    def record_failure(self):
+        """Record a request that failed because of the upstream"""
+        self.failures += 1
+        self._trial_running = False
+        if self.state == self.HALF_OPEN or (
+                self.failure_threshold > 0 and self.failures >= self.failure_threshold):
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+class RequestGovernor:
+    """
+    Runs requests through a token bucket, an adaptive concurrency limit,
+    jittered exponential retries and a circuit breaker
+    
+    All methods must be called from the event loop the requests run on.
+    """
+    
+    def __init__(self, rate: float = 10.0, burst: int = 20,
+                 max_concurrency: int = 8, min_concurrency: int = 1,
+                 latency_target: float = 2.0, max_retries: int = 3,
+                 retry_base_delay: float = 0.5, retry_max_delay: float = 8.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 is_retryable: Optional[Callable[[Exception], bool]] = None,
+                 is_request_error: Optional[Callable[[Exception], bool]] = None):
+        """
+        Initialize governor
+        
+        Args:
+            rate: Requests per second (0 = unlimited)
+            burst: Requests that may be sent at once after an idle period
+            max_concurrency: Highest (and initial) concurrency limit
+            min_concurrency: Lowest concurrency limit
+            latency_target: Latency above which the limit is reduced
+            max_retries: Extra attempts for retryable failures
+            retry_base_delay: Base of the exponential backoff in seconds
+            retry_max_delay: Cap of the backoff in seconds
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open
+            is_retryable: Predicate telling transient upstream failures
+                apart from permanent ones (default: every exception)
+            is_request_error: Predicate telling permanent errors caused by
+                the request itself, which prove the upstream is healthy;
+                other permanent errors count against the circuit breaker
+                (default: none)
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AdaptiveLimiter(max_concurrency, min_concurrency,
+                                       max_concurrency, latency_target)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.is_retryable = is_retryable or (lambda error: True)
+        self.is_request_error = is_request_error or (lambda error: False)
+        
+        self.counters = {
+            'requests': 0,
+            'successes': 0,
+            'failures': 0,
+            'retries': 0,
+            'rejected': 0,
+            'throttle_wait': 0.0,
+        }
+    
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before the next attempt (full jitter)
+        
+        Args:
+            attempt: Number of the failed attempt (0-based)
+            retry_after: Delay requested by the server, if any
+            
+        Returns:
+            Seconds to wait
+        """
+        delay = random.uniform(0, min(self.retry_max_delay,
+                                      self.retry_base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_max_delay))
+        return delay
+    
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a request with throttling, retries and circuit breaking
+        
+        Args:
+            request: Coroutine function performing one attempt
+            
+        Returns:
+            Result of the first successful attempt
+            
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: The last error once retries are exhausted, or the
+                first non-retryable error
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                trial = self.breaker.check()
+            except CircuitOpenError:
+                self.counters['rejected'] += 1
+                raise
+            
+            try:
+                self.counters['throttle_wait'] += await self.bucket.acquire()
+                self.counters['requests'] += 1
+                
+                async with self.limiter:
+                    started = time.monotonic()
+                    try:
+                        result = await request()
+                    except Exception as e:
+                        error = e
+                    else:
+                        self.limiter.on_success(time.monotonic() - started)
+                        self.breaker.record_success()
+                        self.counters['successes'] += 1
+                        return result
+            except BaseException:
+                # Cancelled (e.g. a losing hedge) before the upstream
+                # answered; a stuck trial would keep the circuit open
+                if trial:
+                    self.breaker.release_trial()
+                raise
+            
+            self.counters['failures'] += 1
+            if not self.is_retryable(error):
+                if self.is_request_error(error):
+                    # The upstream answered; the request itself is at fault
+                    self.breaker.record_success()
+                else:
+                    # Blocked, moved or changed upstream: not worth a retry,
+                    # but it must be able to open the circuit
+                    self.breaker.record_failure()
+                raise error
+            
+            self.limiter.on_congestion()
+            self.breaker.record_failure()
+            if attempt == self.max_retries or self.breaker.state == CircuitBreaker.OPEN:
+                raise error
+            
+            self.counters['retries'] += 1
+            await asyncio.sleep(self.backoff(attempt, getattr(error, 'retry_after', None)))
+        
+        raise error
+    
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Get counters and current state
+        
+        Returns:
+            Dictionary with request counters, concurrency_limit, in_flight
+            and circuit_state
+        """
+        stats = dict(self.counters)
+        stats['concurrency_limit'] = int(self.limiter.limit)
+        stats['in_flight'] = self.limiter.in_flight
+        stats['circuit_state'] = self.breaker.state
+        return stats
@@ -0,0 +1,445 @@
+"""
+Latency-aware router over several translation engines
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import (CancelledError, Future, ThreadPoolExecutor,
+                                FIRST_COMPLETED, wait)
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.engines.resilience import CircuitOpenError
+from lingosnap.utils.languages import to_canonical_code, to_engine_code
+
+
+class BackendStats:
+    """Sliding window of latency samples for one backend"""
+    
+    # Number of samples kept per backend
+    WINDOW = 50
+    
+    def __init__(self, base_latency: float, seconds_per_char: float):
+        """
+        Initialize statistics with prior estimates
+        
+        Args:
+            base_latency: Expected fixed cost of a request in seconds
+            seconds_per_char: Expected additional cost per character
+        """
+        self.base_latency = base_latency
+        self.seconds_per_char = seconds_per_char
+        self.samples = deque(maxlen=self.WINDOW)  # (chars, seconds)
+        self.requests = 0
+        self.errors = 0
+        self.wins = 0
+        self.unhealthy_until = 0.0
+    
+    def record(self, chars: int, seconds: float):
+        """Add a latency sample of a successful request"""
+        self.samples.append((chars, seconds))
+        self._fit()
+    
+    def _fit(self):
+        """Least-squares fit of latency = base + per_char * chars"""
+        if len(self.samples) < 5:
+            return
+        n = len(self.samples)
+        mean_x = sum(x for x, _ in self.samples) / n
+        mean_y = sum(y for _, y in self.samples) / n
+        variance = sum((x - mean_x) ** 2 for x, _ in self.samples)
+        if variance > 0:
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in self.samples) / variance
+            self.seconds_per_char = max(0.0, slope)
+        self.base_latency = max(0.0, mean_y - self.seconds_per_char * mean_x)
+    
+    def estimate(self, chars: int) -> float:
+        """
+        Expected latency of a request
+        
+        Args:
+            chars: Number of characters to translate
+            
+        Returns:
+            Estimated seconds
+        """
+        return self.base_latency + self.seconds_per_char * chars
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Observed latency percentile
+        
+        Args:
+            fraction: Percentile between 0 and 1
+            
+        Returns:
+            Seconds, or None without samples
+        """
+        if not self.samples:
+            return None
+        values = sorted(seconds for _, seconds in self.samples)
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class RoutingTranslationEngine(TranslationEngine):
+    """
+    Translation engine that picks the fastest healthy backend per request
+    
+    Each request goes to the backend with the lowest expected latency for
+    its length (fitted from live samples). If the answer takes longer than
+    that backend's p95 latency, a hedged request is sent to the next backend
+    and whichever answers first wins. A failing or unavailable backend is
+    skipped for a cool-down period and its requests fall back to the others.
+    """
+    
+    name = 'auto'
+    
+    # Prior latency model per backend: (base seconds, seconds per character)
+    PRIORS = {
+        'google': (0.4, 0.0001),
+        'argos': (0.1, 0.002),
+    }
+    
+    # Minimum samples before the observed p95 is trusted for hedging
+    MIN_HEDGE_SAMPLES = 10
+    
+    def __init__(self, backends: Dict[str, TranslationEngine],
+                 hedging: bool = True, cooldown: float = 30.0,
+                 min_hedge_delay: float = 0.3):
+        """
+        Initialize router
+        
+        Args:
+            backends: Engines by name, in order of preference
+            hedging: Send a second request when the first one is slow
+            cooldown: Seconds a failed backend is skipped
+            min_hedge_delay: Never hedge earlier than this (seconds)
+        """
+        self.backends = backends
+        self.hedging = hedging
+        self.cooldown = cooldown
+        self.min_hedge_delay = min_hedge_delay
+        
+        self.stats = {
+            name: BackendStats(*self.PRIORS.get(name, (0.5, 0.001)))
+            for name in backends
+        }
+        self.hedges = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=8,
+                                            thread_name_prefix='lingosnap-router')
+    
+    def _convert_code(self, backend: str, code: str) -> str:
+        """Convert a router (canonical) language code for a backend"""
+        return to_engine_code(code, backend)
+    
+    def _is_healthy(self, name: str, source_lang: str, target_lang: str) -> bool:
+        """
+        Check whether a backend can take a request right now
+        
+        Args:
+            name: Backend name
+            source_lang: Source language code (router form)
+            target_lang: Target language code (router form)
+            
+        Returns:
+            True if the backend is usable for this pair
+        """
+        if time.monotonic() < self.stats[name].unhealthy_until:
+            return False
+        
+        engine = self.backends[name]
+        try:
+            # Probing a lazy backend would load it here (Argos imports its
+            # whole ML stack); it is only routed to once loaded
+            if not engine.is_loaded():
+                return False
+            
+            # Engines with a circuit breaker report an open circuit
+            get_stats = getattr(engine, 'get_resilience_stats', None)
+            if get_stats is not None and get_stats()['circuit_state'] == 'open':
+                return False
+            
+            supports_pair = getattr(engine, 'supports_pair', None)
+            if supports_pair is not None:
+                return supports_pair(self._convert_code(name, source_lang),
+                                     self._convert_code(name, target_lang))
+            return engine.is_available()
+        except Exception:
+            return False
+    
+    def rank_backends(self, chars: int, source_lang: str,
+                      target_lang: str) -> List[str]:
+        """
+        Order healthy backends by expected latency
+        
+        Args:
+            chars: Number of characters to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Backend names, fastest first
+        """
+        healthy = [name for name in self.backends
+                   if self._is_healthy(name, source_lang, target_lang)]
+        with self._lock:
+            return sorted(healthy, key=lambda name: self.stats[name].estimate(chars))
+    
+    def _hedge_delay(self, name: str, chars: int) -> float:
+        """Time to wait for a backend before sending a hedged request"""
+        stats = self.stats[name]
+        with self._lock:
+            p95 = stats.percentile(0.95)
+            if p95 is None or len(stats.samples) < self.MIN_HEDGE_SAMPLES:
+                p95 = 2 * stats.estimate(chars)
+            # Long texts legitimately take longer than typical requests
+            p95 = max(p95, stats.estimate(chars))
+        return max(self.min_hedge_delay, p95)
+    
+    def _timed_call(self, name: str, chars: int,
+                    call: Callable[[TranslationEngine, str, str], object],
+                    source_lang: str, target_lang: str, settled: threading.Event):
+        """Run one backend request and record its outcome"""
+        if settled.is_set():
+            # A hedge that only got a worker after the request was answered
+            raise CancelledError()
+        started = time.monotonic()
+        with self._lock:
+            self.stats[name].requests += 1
+        try:
+            result = call(self.backends[name],
+                          self._convert_code(name, source_lang),
+                          self._convert_code(name, target_lang))
+        except Exception as e:
+            # An open circuit knows when it will accept requests again
+            cooldown = e.retry_in if isinstance(e, CircuitOpenError) else self.cooldown
+            with self._lock:
+                self.stats[name].errors += 1
+                self.stats[name].unhealthy_until = time.monotonic() + cooldown
+            raise
+        with self._lock:
+            self.stats[name].record(chars, time.monotonic() - started)
+        settled.set()
+        return result
+    
+    def _route(self, chars: int, source_lang: str, target_lang: str,
+               call: Callable[[TranslationEngine, str, str], object]):
+        """
+        Run a request on the best backend with hedging and fallback
+        
+        Args:
+            chars: Number of characters to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            call: Function (engine, source, target) performing the request
+            
+        Returns:
+            Result of the first backend that succeeds
+        """
+        candidates = self.rank_backends(chars, source_lang, target_lang)
+        if not candidates:
+            # Everything looks unhealthy or is still loading; try anyway in
+            # order of preference
+            candidates = list(self.backends)
+        
+        pending = {}
+        settled = threading.Event()
+        error = None
+        next_index = 0
+        
+        def launch():
+            nonlocal next_index
+            name = candidates[next_index]
+            next_index += 1
+            future = self._executor.submit(self._timed_call, name, chars, call,
+                                           source_lang, target_lang, settled)
+            pending[future] = name
+        
+        launch()
+        while pending:
+            timeout = None
+            if self.hedging and next_index < len(candidates) and len(pending) == 1:
+                timeout = self._hedge_delay(next(iter(pending.values())), chars)
+            
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Slower than usual: hedge on the next backend
+                with self._lock:
+                    self.hedges += 1
+                launch()
+                continue
+            
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                with self._lock:
+                    self.stats[name].wins += 1
+                self._abandon(pending)
+                return result
+            
+            if not pending and next_index < len(candidates):
+                with self._lock:
+                    self.fallbacks += 1
+                launch()
+        
+        raise error
+    
+    @staticmethod
+    def _abandon(pending: Dict[Future, str]):
+        """
+        Drop the losing requests of a hedge
+        
+        Requests still queued on the executor are cancelled (or give up as
+        soon as they get a worker) so they never call a backend; one already
+        running cannot be interrupted and its result is ignored.
+        """
+        for future in pending:
+            future.cancel()
+        pending.clear()
+    
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        Translate text on the fastest available backend
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translated text
+        """
+        return self._route(
+            len(text), source_lang, target_lang,
+            lambda engine, source, target: engine.translate(text, source, target)
+        )
+    
+    def translate_batch(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Union[str, Exception]]:
+        """
+        Translate several texts on the fastest available backend
+        
+        A batch in which every item failed counts as a backend failure and
+        falls back like a single request.
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Translations or per-item exceptions, in input order
+        """
+        if not texts:
+            return []
+        
+        def call(engine, source, target):
+            results = engine.translate_batch(texts, source, target)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors and len(errors) == len(results):
+                raise errors[0]
+            return results
+        
+        try:
+            return self._route(sum(len(text) for text in texts),
+                               source_lang, target_lang, call)
+        except Exception as e:
+            return [e for _ in texts]
+    
+    def get_supported_languages(self) -> List[Tuple[str, str]]:
+        """
+        Get languages supported by any backend (router codes)
+        
+        Returns:
+            List of tuples (language_code, language_name)
+        """
+        languages = {}
+        for engine in self.backends.values():
+            try:
+                for code, language in engine.get_supported_languages():
+                    languages.setdefault(to_canonical_code(code), language)
+            except Exception:
+                continue
+        return sorted(languages.items(), key=lambda x: x[1])
+    
+    def detect_language(self, text: str) -> Optional[str]:
+        """
+        Detect the language with the first backend that answers
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Language code or None
+        """
+        for engine in self.backends.values():
+            try:
+                code = engine.detect_language(text)
+            except Exception:
+                continue
+            if code:
+                return to_canonical_code(code)
+        return None
+    
+    def is_loaded(self) -> bool:
+        """
+        Check if every backend is loaded
+        
+        Returns:
+            True if no backend is still loading
+        """
+        return all(engine.is_loaded() for engine in self.backends.values())
+    
+    def is_available(self) -> bool:
+        """
+        Check if any backend is available
+        
+        Returns:
+            True if at least one backend is available
+        """
+        for engine in self.backends.values():
+            try:
+                if engine.is_available():
+                    return True
+            except Exception:
+                continue
+        return False
+    
+    def get_routing_stats(self) -> Dict[str, object]:
+        """
+        Get per-backend request counters and latencies
+        
+        Returns:
+            Dictionary with hedges, fallbacks and one entry per backend
+            (requests, errors, wins, p50, p95, healthy)
+        """
+        now = time.monotonic()
+        with self._lock:
+            stats = {'hedges': self.hedges, 'fallbacks': self.fallbacks}
+            for name, backend in self.stats.items():
+                stats[name] = {
+                    'requests': backend.requests,
+                    'errors': backend.errors,
+                    'wins': backend.wins,
+                    'p50': backend.percentile(0.5),
+                    'p95': backend.percentile(0.95),
+                    'healthy': now >= backend.unhealthy_until,
+                }
+            return stats
+    
+    def close(self):
+        """Close every backend"""
+        for engine in self.backends.values():
+            close = getattr(engine, 'close', None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+        self._executor.shutdown(wait=False)
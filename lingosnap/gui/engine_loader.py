@@ -0,0 +1,72 @@
+"""
+Background loading of translation engines
+"""
+
+import threading
+from typing import Dict, List, Optional
+from PyQt6.QtCore import QObject, pyqtSignal
+from lingosnap.engines.lazy_engine import LazyTranslationEngine
+from lingosnap.utils.languages import get_registry
+from lingosnap.utils.timing import PhaseTimer
+
+
+class EngineLoader(QObject):
+    """
+    Loads lazy engines one after another in a background thread
+    
+    Every engine is created and its language list is put into the shared
+    registry, so the GUI can use it afterwards without blocking. Signals
+    are delivered in the GUI thread.
+    """
+    
+    engine_loaded = pyqtSignal(str)
+    engine_failed = pyqtSignal(str, str)
+    finished = pyqtSignal()
+    
+    def __init__(self, engines: Dict[str, LazyTranslationEngine],
+                 timer: Optional[PhaseTimer] = None, parent=None):
+        """
+        Initialize engine loader
+        
+        Args:
+            engines: Lazy engines by name
+            timer: Records a phase per engine (optional)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.engines = engines
+        self.timer = timer or PhaseTimer()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self, first: Optional[str] = None):
+        """
+        Start loading every engine
+        
+        Args:
+            first: Engine to load before the others (the one in use)
+        """
+        if self._thread is not None:
+            return
+        names: List[str] = sorted(self.engines, key=lambda name: name != first)
+        self._thread = threading.Thread(target=self._run, args=(names,),
+                                        name='engine-loader', daemon=True)
+        self._thread.start()
+    
+    def is_running(self) -> bool:
+        """Check whether engines are still being loaded"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _run(self, names: List[str]):
+        """Load engines (loader thread)"""
+        for name in names:
+            engine = self.engines[name]
+            try:
+                with self.timer.phase(f'load {name} engine'):
+                    engine.load()
+                with self.timer.phase(f'load {name} languages'):
+                    get_registry().get(engine)
+            except Exception as e:
+                self.engine_failed.emit(name, str(e))
+            else:
+                self.engine_loaded.emit(name)
+        self.finished.emit()
@@ -167,21 +167,8 @@ class HistoryTab(QWidget):
         self.text_translate_tab.source_text.setPlainText(entry['source_text'])
         self.text_translate_tab.target_text.setPlainText(entry['translated_text'])
         
-        # Set language selections
-        source_lang = entry['source_lang']
-        target_lang = entry['target_lang']
-        
-        # Find and set source language
-        for i in range(self.text_translate_tab.source_lang_combo.count()):
-            if self.text_translate_tab.source_lang_combo.itemData(i) == source_lang:
-                self.text_translate_tab.source_lang_combo.setCurrentIndex(i)
-                break
-        
-        # Find and set target language
-        for i in range(self.text_translate_tab.target_lang_combo.count()):
-            if self.text_translate_tab.target_lang_combo.itemData(i) == target_lang:
-                self.text_translate_tab.target_lang_combo.setCurrentIndex(i)
-                break
+        # Set language selections (the entry may come from another engine)
+        self.text_translate_tab.select_languages(entry['source_lang'], entry['target_lang'])
     
     def clear_history(self):
         """Clear all history"""
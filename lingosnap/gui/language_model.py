@@ -0,0 +1,68 @@
+"""
+Qt model exposing a language set to combo boxes
+"""
+
+from typing import List, Optional, Tuple
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from lingosnap.utils.languages import LanguageSet
+
+
+class LanguageListModel(QAbstractListModel):
+    """
+    Read-only list model over a LanguageSet
+    
+    Rows show the language name (DisplayRole) and carry the code as
+    UserRole data, so QComboBox.currentData() keeps returning the code.
+    Optional extra rows (e.g. 'Auto Detect') come first. index_of() maps a
+    code to its row without scanning the combo box.
+    """
+    
+    def __init__(self, languages: LanguageSet,
+                 extra_rows: Optional[List[Tuple[str, str]]] = None, parent=None):
+        """
+        Initialize model
+        
+        Args:
+            languages: Languages to show
+            extra_rows: (code, name) rows shown before the languages
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.languages = languages
+        self.extra_rows = list(extra_rows or [])
+        self._extra_index = {code: i for i, (code, _) in enumerate(self.extra_rows)}
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.extra_rows) + len(self.languages)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if row < len(self.extra_rows):
+            code, name = self.extra_rows[row]
+        else:
+            code, name = self.languages[row - len(self.extra_rows)]
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return name
+        if role == Qt.ItemDataRole.UserRole:
+            return code
+        return None
+    
+    def index_of(self, code: str) -> int:
+        """
+        Row of a language code
+        
+        Args:
+            code: Language code
+            
+        Returns:
+            Row, or -1 if the code is not in the model
+        """
+        if code in self._extra_index:
+            return self._extra_index[code]
+        index = self.languages.index_of(code)
+        return -1 if index < 0 else index + len(self.extra_rows)
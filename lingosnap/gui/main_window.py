@@ -3,6 +3,7 @@ Main application window with system tray
 """
 
 import sys
+from typing import Optional
 from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QSystemTrayIcon, 
                              QMenu, QApplication, QMessageBox)
 from PyQt6.QtCore import Qt, QTimer
@@ -12,44 +13,122 @@ from lingosnap.gui.history_tab import HistoryTab
 from lingosnap.gui.settings_tab import SettingsTab
 from lingosnap.utils.config import Config
 from lingosnap.utils.history import HistoryDatabase
-from lingosnap.engines.google_engine import GoogleTranslateEngine
-from lingosnap.engines.argos_engine import ArgosTranslateEngine
+from lingosnap.engines.factory import create_lazy_engine, create_router, wrap_engine
+from lingosnap.gui.engine_loader import EngineLoader
+from lingosnap.utils.cache import TranslationCache
+from lingosnap.utils.daemon import TranslationDaemon
+from lingosnap.utils.masking import Masker
+from lingosnap.utils.translation_memory import TranslationMemory
+from lingosnap.utils.usage import get_usage_meter
 from lingosnap.gui.hotkey_manager import HotkeyManager
 from lingosnap.gui.screenshot_tool import ScreenshotTool
 from lingosnap.utils.ocr import OCREngine
+from lingosnap.utils.profiling import get_profiler, operation
+from lingosnap.utils.timing import PhaseTimer
 
 
 class MainWindow(QMainWindow):
     """Main application window"""
     
-    def __init__(self):
+    def __init__(self, startup_timer: Optional[PhaseTimer] = None,
+                 config: Optional[Config] = None):
+        """
+        Initialize main window
+        
+        Args:
+            startup_timer: Records the startup phases (lingosnap --timing)
+            config: Configuration loaded by the caller (loaded here if omitted)
+        """
         super().__init__()
+        timer = self.startup_timer = startup_timer or PhaseTimer()
         
         # Initialize configuration and database
-        self.config = Config()
-        self.history_db = HistoryDatabase()
+        with timer.phase('config and history'):
+            self.config = config or Config()
+            self.history_db = HistoryDatabase()
+        
+        # Profiling (lingosnap --profile or the settings toggle)
+        self.profiler = get_profiler(self.config)
+        if self.config.get('profiling_enabled', False):
+            self.profiler.set_enabled(True)
         
-        # Initialize engines
-        self.google_engine = GoogleTranslateEngine()
-        self.argos_engine = ArgosTranslateEngine()
+        # Engines are only imported and built by the engine loader after the
+        # window is shown (every upstream call is metered)
+        self.usage_meter = get_usage_meter(self.config)
+        self.google_engine = create_lazy_engine('google', self.config, self.usage_meter)
+        self.argos_engine = create_lazy_engine('argos', self.config, self.usage_meter)
         self.ocr_engine = OCREngine()
         
+        # Decorated engines (cache, ...) used for translation; the settings
+        # tab keeps talking to the raw engines
+        with timer.phase('cache and memory'):
+            self.translation_cache = TranslationCache.from_config(self.config)
+            self.translation_memory = TranslationMemory(
+                self.history_db,
+                threshold=self.config.get('memory_threshold', 0.9),
+                max_entries=self.config.get('memory_max_entries', 20000)
+            )
+            if self.config.get('memory_enabled', True):
+                self.translation_memory.load_async()
+            self.masker = Masker.from_config(self.config)
+        
+        self.router_engine = create_router(
+            {'google': self.google_engine, 'argos': self.argos_engine}, self.config
+        )
+        self.engines = {
+            'google': wrap_engine(self.google_engine, self.config,
+                                  self.translation_cache, self.translation_memory,
+                                  self.masker),
+            'argos': wrap_engine(self.argos_engine, self.config,
+                                 self.translation_cache, self.translation_memory,
+                                 self.masker),
+            'auto': wrap_engine(self.router_engine, self.config,
+                                self.translation_cache, self.translation_memory,
+                                self.masker),
+        }
+        
         # Get current engine
-        engine_type = self.config.get('engine', 'google')
-        self.current_engine = (self.google_engine if engine_type == 'google' 
-                              else self.argos_engine)
+        self.engine_type = self.config.get('engine', 'google')
+        self.current_engine = self.engines.get(self.engine_type, self.engines['argos'])
         
         # Initialize UI
-        self.init_ui()
+        with timer.phase('user interface'):
+            self.init_ui()
         
         # Initialize system tray
-        self.init_tray()
+        with timer.phase('system tray'):
+            self.init_tray()
         
         # Initialize hotkey manager
-        self.init_hotkeys()
+        with timer.phase('hotkeys'):
+            self.init_hotkeys()
         
         # Apply translations
         self.apply_translations()
+        
+        # Load the engines in the background once the event loop runs
+        self.engine_loader = EngineLoader(
+            {'google': self.google_engine, 'argos': self.argos_engine}, timer, self
+        )
+        self.engine_loader.engine_loaded.connect(self.on_engine_loaded)
+        self.engine_loader.engine_failed.connect(self.on_engine_load_failed)
+        self.engine_loader.finished.connect(self.on_engines_loaded)
+        QTimer.singleShot(0, self.start_engine_loader)
+        
+        # Serve lingo calls with these engines (unless lingo --daemon does)
+        self.daemon = None
+        if self.config.get('daemon_enabled', False):
+            with timer.phase('translation daemon'):
+                self.start_daemon()
+    
+    def start_daemon(self):
+        """Start the translation daemon used by the lingo command"""
+        daemon = TranslationDaemon(self.engines, self.config)
+        try:
+            if daemon.start():
+                self.daemon = daemon
+        except Exception as e:
+            print(f"Failed to start the translation daemon: {e}", file=sys.stderr)
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -64,7 +143,8 @@ class MainWindow(QMainWindow):
         self.text_translate_tab = TextTranslateTab(
             self.current_engine, 
             self.config, 
-            self.history_db
+            self.history_db,
+            engine_ready=self.current_engine.is_loaded()
         )
         self.history_tab = HistoryTab(self.history_db, self.text_translate_tab)
         self.settings_tab = SettingsTab(
@@ -175,7 +255,8 @@ class MainWindow(QMainWindow):
         if image:
             try:
                 # Perform OCR
-                text = self.ocr_engine.extract_text(image)
+                with operation('ocr', pixels=image.width * image.height):
+                    text = self.ocr_engine.extract_text(image)
                 
                 if text:
                     # Show window and populate text
@@ -191,9 +272,37 @@ class MainWindow(QMainWindow):
     
     def on_engine_changed(self, engine_type: str):
         """Handle engine change"""
-        self.current_engine = (self.google_engine if engine_type == 'google' 
-                              else self.argos_engine)
-        self.text_translate_tab.set_engine(self.current_engine)
+        self.engine_type = engine_type
+        self.current_engine = self.engines.get(engine_type, self.engines['argos'])
+        # After the loader is done, a missing engine is loaded on first use
+        ready = self.current_engine.is_loaded() or not self.engine_loader.is_running()
+        self.text_translate_tab.set_engine(self.current_engine, ready)
+    
+    def start_engine_loader(self):
+        """Start loading the engines, the one in use first"""
+        self.startup_timer.mark('event loop started')
+        self.engine_loader.start(first='argos' if self.engine_type == 'argos' else 'google')
+    
+    def on_engine_loaded(self, name: str):
+        """Handle an engine that finished loading in the background"""
+        if self.current_engine.is_loaded() and not self.text_translate_tab.engine_ready:
+            self.text_translate_tab.set_engine_ready(True)
+        self.settings_tab.on_engine_loaded(name)
+    
+    def on_engine_load_failed(self, name: str, message: str):
+        """Handle an engine that could not be loaded"""
+        print(f"Failed to load {name} engine: {message}", file=sys.stderr)
+        self.settings_tab.on_engine_failed(name, message)
+        if self.engine_type == name:
+            self.text_translate_tab.status_label.setText(
+                f'Translation engine not available: {message}'
+            )
+    
+    def on_engines_loaded(self):
+        """Handle the end of background loading"""
+        # 'auto' still works if one backend failed to load
+        if not self.text_translate_tab.engine_ready and self.engine_type == 'auto':
+            self.text_translate_tab.set_engine_ready(True)
     
     def apply_translations(self):
         """Apply UI language translations"""
@@ -250,5 +359,28 @@ class MainWindow(QMainWindow):
         # Stop hotkey manager
         self.hotkey_manager.stop()
         
+        # Drop pending translations and wait briefly for running ones
+        self.text_translate_tab.jobs.shutdown()
+        self.text_translate_tab.speculation.shutdown()
+        
+        # Stop serving lingo calls
+        if self.daemon is not None:
+            self.daemon.shutdown()
+        
+        # Close pooled network connections
+        try:
+            self.google_engine.close()
+        except Exception:
+            pass
+        
+        # Stop Argos worker processes
+        try:
+            self.argos_engine.close()
+        except Exception:
+            pass
+        
+        # Write pending usage counters
+        self.usage_meter.close()
+        
         # Quit application
         QApplication.quit()
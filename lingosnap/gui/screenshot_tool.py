@@ -10,7 +10,7 @@ import time
 from PyQt6.QtWidgets import QWidget, QApplication
 from PyQt6.QtCore import Qt, QRect, QPoint, pyqtSignal, QTimer
 from PyQt6.QtGui import QPainter, QColor, QPen, QPixmap, QScreen
-from PIL import Image
+from lingosnap.utils.profiling import span
 
 
 class ScreenshotWidget(QWidget):
@@ -108,6 +108,7 @@ class ScreenshotWidget(QWidget):
     
     def capture_region(self):
         """Capture the selected region"""
+        from PIL import Image  # imported on first capture, not at startup
         if not self.start_point or not self.end_point or not self.screenshot:
             self.cancel_capture()
             return
@@ -157,19 +158,20 @@ class ScreenshotWidget(QWidget):
         height = qimage.height()
         
         try:
-            # QImage format is typically ARGB32 or RGB32
-            if qimage.format() == qimage.Format.Format_RGB32 or qimage.format() == qimage.Format.Format_ARGB32:
-                # Convert to RGB
-                pil_image = Image.frombytes('RGBA', (width, height), byte_array, 'raw', 'BGRA')
-                pil_image = pil_image.convert('RGB')
-            else:
-                # Fallback: convert to RGB888 first
-                qimage = qimage.convertToFormat(qimage.Format.Format_RGB888)
-                bits = qimage.bits()
-                if bits is None:
-                    raise ValueError("Failed to get bits after format conversion")
-                byte_array = bits.asarray(qimage.sizeInBytes())
-                pil_image = Image.frombytes('RGB', (width, height), byte_array, 'raw', 'RGB')
+            with span('screenshot.convert', pixels=width * height):
+                # QImage format is typically ARGB32 or RGB32
+                if qimage.format() == qimage.Format.Format_RGB32 or qimage.format() == qimage.Format.Format_ARGB32:
+                    # Convert to RGB
+                    pil_image = Image.frombytes('RGBA', (width, height), byte_array, 'raw', 'BGRA')
+                    pil_image = pil_image.convert('RGB')
+                else:
+                    # Fallback: convert to RGB888 first
+                    qimage = qimage.convertToFormat(qimage.Format.Format_RGB888)
+                    bits = qimage.bits()
+                    if bits is None:
+                        raise ValueError("Failed to get bits after format conversion")
+                    byte_array = bits.asarray(qimage.sizeInBytes())
+                    pil_image = Image.frombytes('RGB', (width, height), byte_array, 'raw', 'RGB')
         except Exception as e:
             print(f"Error: Failed to create PIL image: {e}", file=sys.stderr)
             self.cancel_capture()
@@ -337,6 +339,7 @@ class ScreenshotTool:
             process: The subprocess running flameshot
             retry_count: Number of times we've checked
         """
+        from PIL import Image
         max_retries = 60  # Check for up to 30 seconds (60 * 0.5s)
         
         # Check if process has finished
@@ -449,6 +452,7 @@ class ScreenshotTool:
             process: The subprocess running the screenshot tool
             retry_count: Number of times we've checked
         """
+        from PIL import Image
         max_retries = 60  # Check for up to 30 seconds (60 * 0.5s)
         
         # Check if process has finished
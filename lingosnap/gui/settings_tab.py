@@ -5,8 +5,12 @@ Settings tab
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QComboBox, QLineEdit, QPushButton, QGroupBox,
                              QListWidget, QMessageBox, QFormLayout, QDialog,
-                             QDialogButtonBox, QProgressDialog)
-from PyQt6.QtCore import pyqtSignal, Qt, QTimer
+                             QDialogButtonBox, QProgressDialog, QCheckBox,
+                             QApplication)
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, Qt, QTimer, QThread
+from lingosnap.gui.language_model import LanguageListModel
+from lingosnap.utils.languages import LanguageSet, get_registry
+from lingosnap.utils.profiling import get_profiler
 
 
 class SettingsTab(QWidget):
@@ -34,9 +38,22 @@ class SettingsTab(QWidget):
         self.engine_combo = QComboBox()
         self.engine_combo.addItem('Google Translate', 'google')
         self.engine_combo.addItem('Argos Translate (Offline)', 'argos')
+        self.engine_combo.addItem('Automatic (fastest available)', 'auto')
         self.engine_combo.currentIndexChanged.connect(self.on_engine_changed)
         engine_layout.addWidget(self.engine_combo)
         
+        # Translation cache statistics
+        cache_layout = QHBoxLayout()
+        self.cache_stats_label = QLabel('')
+        self.cache_stats_label.setStyleSheet('color: gray; font-size: 10px;')
+        cache_layout.addWidget(self.cache_stats_label)
+        cache_layout.addStretch()
+        
+        self.clear_cache_button = QPushButton('Clear Cache')
+        self.clear_cache_button.clicked.connect(self.clear_translation_cache)
+        cache_layout.addWidget(self.clear_cache_button)
+        engine_layout.addLayout(cache_layout)
+        
         engine_group.setLayout(engine_layout)
         layout.addWidget(engine_group)
         
@@ -56,6 +73,10 @@ class SettingsTab(QWidget):
         self.reset_count_button.clicked.connect(self.reset_google_counter)
         google_layout.addRow('', self.reset_count_button)
         
+        self.google_status_label = QLabel('')
+        self.google_status_label.setStyleSheet('color: gray; font-size: 10px;')
+        google_layout.addRow('Status:', self.google_status_label)
+        
         self.google_group.setLayout(google_layout)
         layout.addWidget(self.google_group)
         
@@ -80,6 +101,10 @@ class SettingsTab(QWidget):
         
         argos_layout.addLayout(argos_buttons_layout)
         
+        self.argos_usage_label = QLabel('')
+        self.argos_usage_label.setStyleSheet('color: gray; font-size: 10px;')
+        argos_layout.addWidget(self.argos_usage_label)
+        
         # Installation instructions
         install_note = QLabel(
             'Note: Installing packages requires internet connection and may take a few minutes. '
@@ -154,6 +179,22 @@ class SettingsTab(QWidget):
         save_button.clicked.connect(self.save_settings)
         layout.addWidget(save_button)
         
+        # Profiling
+        diagnostics_group = QGroupBox('Diagnostics')
+        diagnostics_layout = QVBoxLayout()
+        self.profiling_checkbox = QCheckBox('Record performance profiles')
+        self.profiling_checkbox.setToolTip(
+            'Profile translations and OCR (open .prof files with snakeviz, '
+            'trace.json with speedscope or Perfetto)'
+        )
+        diagnostics_layout.addWidget(self.profiling_checkbox)
+        profile_dir_label = QLabel(str(get_profiler().profile_dir))
+        profile_dir_label.setStyleSheet('color: gray; font-size: 10px;')
+        profile_dir_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        diagnostics_layout.addWidget(profile_dir_label)
+        diagnostics_group.setLayout(diagnostics_layout)
+        layout.addWidget(diagnostics_group)
+        
         # About section
         about_group = QGroupBox('About')
         about_layout = QVBoxLayout()
@@ -186,8 +227,10 @@ class SettingsTab(QWidget):
         self.api_key_input.setText(api_key)
         
         # Character count
-        char_count = self.google_engine.get_character_count()
-        self.char_count_label.setText(f'{char_count} characters')
+        self.update_character_count()
+        
+        # Cache statistics
+        self.update_cache_stats()
         
         # Hotkeys
         text_hotkey = self.config.get('text_capture_hotkey', 'ctrl+c+c')
@@ -202,13 +245,11 @@ class SettingsTab(QWidget):
         if index >= 0:
             self.ui_lang_combo.setCurrentIndex(index)
         
+        # Profiling (also on when started with --profile)
+        self.profiling_checkbox.setChecked(get_profiler().enabled)
+        
         # Terminal default language
         self.load_terminal_languages()
-        terminal_lang = self.config.get('terminal_default_target', 'zh')
-        for i in range(self.terminal_lang_combo.count()):
-            if self.terminal_lang_combo.itemData(i) == terminal_lang:
-                self.terminal_lang_combo.setCurrentIndex(i)
-                break
         
         # Refresh Argos packages
         self.refresh_argos_packages()
@@ -218,15 +259,54 @@ class SettingsTab(QWidget):
     
     def load_terminal_languages(self):
         """Load languages for terminal default"""
-        self.terminal_lang_combo.clear()
+        # Get current engine ('auto' speaks Google language codes)
+        engine = self.argos_engine if self.config.get('engine') == 'argos' else self.google_engine
+        registry = get_registry()
+        
+        # Still loading in the background: filled in by on_engine_loaded()
+        if not engine.is_loaded():
+            self.terminal_lang_model = LanguageListModel(LanguageSet([]), parent=self)
+            self.terminal_lang_combo.setModel(self.terminal_lang_model)
+            return
         
-        # Get current engine
-        engine = self.google_engine if self.config.get('engine') == 'google' else self.argos_engine
-        languages = engine.get_supported_languages()
+        self.terminal_lang_model = LanguageListModel(registry.get(engine), parent=self)
+        self.terminal_lang_combo.setModel(self.terminal_lang_model)
         
-        for code, name in languages:
-            if code != 'auto':
-                self.terminal_lang_combo.addItem(name, code)
+        # Stored code may be in another engine's form ('zh' vs 'zh-cn')
+        terminal_lang = registry.normalize(
+            self.config.get('terminal_default_target', 'zh'), engine
+        )
+        index = self.terminal_lang_model.index_of(terminal_lang or '')
+        if index >= 0:
+            self.terminal_lang_combo.setCurrentIndex(index)
+    
+    def on_engine_loaded(self, name: str):
+        """
+        Fill in what depends on an engine that finished loading
+        
+        Args:
+            name: 'google' or 'argos'
+        """
+        if name == 'argos':
+            self.refresh_argos_packages()
+        else:
+            self.update_google_status()
+        if (name == 'argos') == (self.config.get('engine') == 'argos'):
+            self.load_terminal_languages()
+    
+    def on_engine_failed(self, name: str, message: str):
+        """
+        Show that an engine could not be loaded
+        
+        Args:
+            name: 'google' or 'argos'
+            message: Error message
+        """
+        if name == 'argos':
+            self.package_list.clear()
+            self.package_list.addItem('Argos Translate not available - install with: pip install argostranslate')
+        else:
+            self.google_status_label.setText(f'Not available: {message}')
     
     def save_settings(self):
         """Save settings to config"""
@@ -254,6 +334,11 @@ class SettingsTab(QWidget):
         if terminal_lang:
             self.config.set('terminal_default_target', terminal_lang)
         
+        # Profiling
+        profiling = self.profiling_checkbox.isChecked()
+        self.config.set('profiling_enabled', profiling)
+        get_profiler().set_enabled(profiling)
+        
         QMessageBox.information(self, 'Settings Saved', 
                                'Settings have been saved successfully.')
     
@@ -269,21 +354,112 @@ class SettingsTab(QWidget):
         engine = self.engine_combo.currentData()
         
         # Enable/disable based on selected engine
-        self.google_group.setEnabled(engine == 'google')
-        self.argos_group.setEnabled(engine == 'argos')
+        self.google_group.setEnabled(engine in ('google', 'auto'))
+        self.argos_group.setEnabled(engine in ('argos', 'auto'))
     
     def reset_google_counter(self):
-        """Reset Google Translate character counter"""
+        """Reset Google Translate character counter and recorded usage"""
         self.google_engine.reset_character_count()
-        self.char_count_label.setText('0 characters')
+        meter = getattr(self.main_window, 'usage_meter', None)
+        if meter is not None:
+            try:
+                meter.reset('google')
+            except Exception as e:
+                QMessageBox.critical(self, 'Error', str(e))
+        masker = getattr(self.main_window, 'masker', None)
+        if masker is not None:
+            masker.reset_stats()
+        self.update_character_count()
         QMessageBox.information(self, 'Counter Reset', 
                                'Character counter has been reset.')
     
+    def showEvent(self, event):
+        """Refresh live statistics whenever the tab becomes visible"""
+        super().showEvent(event)
+        self.update_character_count()
+        self.update_cache_stats()
+        self.update_google_status()
+    
+    def update_character_count(self):
+        """Update Google/Argos usage and characters saved by masking"""
+        meter = getattr(self.main_window, 'usage_meter', None)
+        if meter is not None and self.config.get('usage_metering_enabled', True):
+            today = meter.get_totals('google', days=1)
+            month = meter.get_totals('google', days=30)
+            text = (f"{today['characters']} characters today, "
+                    f"{month['characters']} in 30 days")
+            
+            argos = meter.get_totals('argos', days=30)
+            self.argos_usage_label.setText(
+                f"Usage (30 days): {argos['requests']} texts, {argos['characters']} "
+                f"characters, {argos['avg_latency'] * 1000:.0f} ms average"
+            )
+        else:
+            text = f'{self.google_engine.get_character_count()} characters'
+        
+        masker = getattr(self.main_window, 'masker', None)
+        if masker is not None and self.config.get('masking_enabled', True):
+            text += f" ({masker.get_stats()['chars_saved']} saved by masking)"
+        self.char_count_label.setText(text)
+    
+    def update_cache_stats(self):
+        """Update translation cache hit/miss label"""
+        cache = getattr(self.main_window, 'translation_cache', None)
+        if cache is None:
+            self.cache_stats_label.setText('Cache disabled')
+            return
+        
+        stats = cache.get_stats()
+        hits = stats['memory_hits'] + stats['disk_hits']
+        text = (f"Cache: {hits} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%})")
+        
+        memory = getattr(self.main_window, 'translation_memory', None)
+        if memory is not None and self.config.get('memory_enabled', True):
+            memory_stats = memory.get_stats()
+            text += (f"; memory: {memory_stats['hits']} reused of "
+                     f"{memory_stats['entries']} entries")
+        self.cache_stats_label.setText(text)
+    
+    def update_google_status(self):
+        """Update Google request counters and circuit state"""
+        if not self.google_engine.is_loaded():
+            self.google_status_label.setText('Loading...')
+            return
+        
+        stats = self.google_engine.get_resilience_stats()
+        if stats['circuit_state'] == 'closed':
+            state = 'Healthy'
+        else:
+            state = 'Unavailable, requests paused'
+        self.google_status_label.setText(
+            f"{state} - {stats['requests']} requests, {stats['retries']} retries, "
+            f"{stats['failures']} failures, {stats['rejected']} rejected, "
+            f"concurrency {stats['concurrency_limit']}"
+        )
+    
+    def clear_translation_cache(self):
+        """Clear the translation cache"""
+        cache = getattr(self.main_window, 'translation_cache', None)
+        if cache is None:
+            return
+        
+        try:
+            cache.clear()
+            cache.reset_stats()
+            self.update_cache_stats()
+            QMessageBox.information(self, 'Cache Cleared',
+                                   'Translation cache has been cleared.')
+        except Exception as e:
+            QMessageBox.critical(self, 'Error', str(e))
+    
     def refresh_argos_packages(self):
         """Refresh Argos package list"""
         self.package_list.clear()
         
-        if self.argos_engine.is_available():
+        if not self.argos_engine.is_loaded():
+            self.package_list.addItem('Loading Argos Translate...')
+        elif self.argos_engine.is_available():
             packages = self.argos_engine.get_installed_packages()
             if packages:
                 for pkg in packages:
@@ -354,9 +530,32 @@ class SettingsTab(QWidget):
         if lang == 'zh':
             self.refresh_packages_button.setText('刷新语言包')
             self.install_package_button.setText('安装语言包')
+            self.clear_cache_button.setText('清除缓存')
+            self.profiling_checkbox.setText('记录性能分析')
         else:
             self.refresh_packages_button.setText('Refresh Packages')
             self.install_package_button.setText('Install Package')
+            self.clear_cache_button.setText('Clear Cache')
+            self.profiling_checkbox.setText('Record performance profiles')
+
+
+class PackageIndexRefresher(QThread):
+    """Thread that refreshes the Argos package index if it is stale"""
+    
+    refresh_finished = pyqtSignal(bool)
+    
+    def __init__(self, argos_engine, parent=None):
+        super().__init__(parent)
+        self.argos_engine = argos_engine
+    
+    def run(self):
+        """Refresh the index (network I/O happens here)"""
+        self.refresh_finished.emit(self.argos_engine.refresh_package_index())
+    
+    @pyqtSlot()
+    def wait_for_refresh(self):
+        """Block until run() returns (a Qt slot, so it is disconnected on deletion)"""
+        self.wait()
 
 
 class PackageInstallDialog(QDialog):
@@ -365,6 +564,7 @@ class PackageInstallDialog(QDialog):
     def __init__(self, argos_engine, parent=None):
         super().__init__(parent)
         self.argos_engine = argos_engine
+        self.index_refresher = None
         self.setWindowTitle('Install Language Package')
         self.setMinimumWidth(500)
         self.init_ui()
@@ -405,16 +605,50 @@ class PackageInstallDialog(QDialog):
         self.setLayout(layout)
     
     def load_available_packages(self):
-        """Load available packages from Argos"""
+        """Show the cached package index, refreshing it in the background if stale"""
         self.status_label.setText('Loading available packages...')
-        QTimer.singleShot(100, self._load_packages_async)
+        QTimer.singleShot(0, self._load_packages_async)
+        
+        if self.argos_engine.is_package_index_stale():
+            # Owned by the application, so a refresh still running when the
+            # dialog closes finishes (and is deleted) on its own
+            app = QApplication.instance()
+            refresher = PackageIndexRefresher(self.argos_engine, app)
+            refresher.refresh_finished.connect(self.on_index_refreshed)
+            refresher.finished.connect(refresher.deleteLater)
+            # Qt aborts if a running thread is destroyed with the application
+            app.aboutToQuit.connect(refresher.wait_for_refresh)
+            self.index_refresher = refresher
+            refresher.start()
+    
+    def on_index_refreshed(self, success: bool):
+        """Reload the list once the background index refresh is done"""
+        # The thread deletes itself once it has finished
+        self.index_refresher = None
+        self._load_packages_async()
+        if not success:
+            self.status_label.setText(
+                self.status_label.text() + '\n(Could not update the package index; '
+                'showing the cached list.)'
+            )
+    
+    def done(self, result):
+        """Detach from a running index refresh without waiting for it"""
+        if self.index_refresher is not None:
+            self.index_refresher.refresh_finished.disconnect(self.on_index_refreshed)
+            self.index_refresher = None
+        super().done(result)
     
     def _load_packages_async(self):
-        """Load packages asynchronously"""
+        """Load packages from the cached index"""
         try:
             packages = self.argos_engine.get_available_packages()
+            self.available_list.clear()
             
             if not packages:
+                if self.index_refresher is not None and self.index_refresher.isRunning():
+                    self.status_label.setText('Updating package index...')
+                    return
                 self.status_label.setText(
                     'No packages available. Please check your internet connection '
                     'or ensure Argos Translate is properly installed.'
@@ -2,10 +2,19 @@
 Text translation tab
 """
 
+import time
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
                              QPushButton, QTextEdit, QLabel)
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QFont, QTextCursor
+from lingosnap.gui.language_model import LanguageListModel
+from lingosnap.gui.translation_jobs import TranslationJobQueue
+from lingosnap.utils.debounce import AdaptiveDebounce
+from lingosnap.utils.incremental import SegmentMap, splice_range
+from lingosnap.utils.languages import LanguageSet, get_registry
+from lingosnap.utils.profiling import operation, span
+from lingosnap.utils.segmentation import ends_sentence
+from lingosnap.utils.streaming import StreamTimer
 
 
 class TextTranslateTab(QWidget):
@@ -13,15 +22,43 @@ class TextTranslateTab(QWidget):
     
     translation_completed = pyqtSignal()
     
-    def __init__(self, engine, config, history_db):
+    def __init__(self, engine, config, history_db, engine_ready: bool = True):
         super().__init__()
         self.engine = engine
+        # False while the engine is loaded in the background (no languages
+        # yet); a translation requested meanwhile runs once it is ready
+        self.engine_ready = engine_ready
+        self.translate_when_ready = False
         self.config = config
         self.history_db = history_db
         self.typing_timer = QTimer()
         self.typing_timer.timeout.connect(self.on_typing_timeout)
         self.typing_timer.setSingleShot(True)
         self.is_translating = False
+        
+        # Translations run in a worker pool; a new request supersedes the
+        # running one and only the newest result is shown
+        self.jobs = TranslationJobQueue(config.get('translation_workers', 2), self)
+        self.jobs.job_progress.connect(self.on_translation_progress)
+        self.jobs.job_finished.connect(self.on_translation_finished)
+        self.jobs.job_failed.connect(self.on_translation_failed)
+        
+        # Typing delay, following the measured engine latency
+        self.debounce = AdaptiveDebounce.from_config(config)
+        
+        # Sentence translations of the last result, so edits only
+        # re-translate the sentences they touch
+        self.segment_map = SegmentMap(on_latency=self.debounce.record)
+        self.last_translation = None
+        
+        # Completed sentences are translated while the user keeps typing
+        self.speculation = TranslationJobQueue(1, self)
+        self.speculation.job_finished.connect(self.on_speculation_finished)
+        self.speculated_key = None
+        
+        # Time to first output and total latency of the current translation
+        self.stream_timer = None
+        
         self.init_ui()
     
     def init_ui(self):
@@ -92,7 +129,7 @@ class TextTranslateTab(QWidget):
         self.setLayout(layout)
         
         # Load languages
-        self.load_languages()
+        self.set_engine_ready(self.engine_ready)
         
         # Sync scrolling
         self.source_text.verticalScrollBar().valueChanged.connect(
@@ -104,43 +141,116 @@ class TextTranslateTab(QWidget):
     
     def load_languages(self):
         """Load available languages into combo boxes"""
-        self.source_lang_combo.clear()
-        self.target_lang_combo.clear()
+        # Languages are cached per engine in the shared registry
+        languages = LanguageSet([])
+        if self.engine_ready:
+            try:
+                languages = get_registry().get(self.engine)
+            except Exception as e:
+                self.status_label.setText(f'Translation engine not available: {str(e)}')
+        
+        # Source gets an auto-detect option in front
+        self.source_model = LanguageListModel(languages, [('auto', 'Auto Detect')], self)
+        self.target_model = LanguageListModel(languages, parent=self)
+        self.source_lang_combo.setModel(self.source_model)
+        self.target_lang_combo.setModel(self.target_model)
         
-        # Get supported languages from engine
-        languages = self.engine.get_supported_languages()
+        # Set default selections
+        self.select_languages(self.config.get('default_source_lang', 'auto'),
+                              self.config.get('default_target_lang', 'zh-cn'))
+    
+    def set_engine_ready(self, ready: bool = True):
+        """
+        Show the engine as loaded or still loading
         
-        # Add auto-detect option for source
-        self.source_lang_combo.addItem('Auto Detect', 'auto')
+        Args:
+            ready: True once the engine can be used without blocking
+        """
+        self.engine_ready = ready
+        for widget in (self.source_lang_combo, self.target_lang_combo, self.swap_button):
+            widget.setEnabled(ready)
+        self.load_languages()
         
-        # Add languages
-        for code, name in languages:
-            self.source_lang_combo.addItem(name, code)
-            self.target_lang_combo.addItem(name, code)
+        if not ready:
+            self.status_label.setText('Loading translation engine...')
+        elif self.translate_when_ready:
+            self.translate_when_ready = False
+            self.translate()
+        elif self.status_label.text() == 'Loading translation engine...':
+            self.status_label.setText('')
+    
+    def select_languages(self, source_lang: str = None, target_lang: str = None):
+        """
+        Select languages by code
         
-        # Set default selections
-        default_source = self.config.get('default_source_lang', 'auto')
-        default_target = self.config.get('default_target_lang', 'zh-cn')
+        Codes are converted to the current engine's form (e.g. 'zh-cn' and
+        'zh'); unsupported codes leave the selection unchanged.
         
-        # Find and set source language
-        for i in range(self.source_lang_combo.count()):
-            if self.source_lang_combo.itemData(i) == default_source:
-                self.source_lang_combo.setCurrentIndex(i)
-                break
+        Args:
+            source_lang: Source language code
+            target_lang: Target language code
+        """
+        if not self.engine_ready:
+            return
         
-        # Find and set target language
-        for i in range(self.target_lang_combo.count()):
-            if self.target_lang_combo.itemData(i) == default_target:
-                self.target_lang_combo.setCurrentIndex(i)
-                break
+        registry = get_registry()
+        for code, combo, model in ((source_lang, self.source_lang_combo, self.source_model),
+                                   (target_lang, self.target_lang_combo, self.target_model)):
+            if not code:
+                continue
+            index = model.index_of(registry.normalize(code, self.engine) or '')
+            if index >= 0:
+                combo.setCurrentIndex(index)
     
     def on_source_text_changed(self):
         """Handle source text changes"""
-        if not self.is_translating:
-            # Restart typing timer (2 second delay)
-            self.typing_timer.stop()
-            self.typing_timer.start(2000)
-            self.status_label.setText('Waiting for input...')
+        # A running translation is for outdated text now
+        self.jobs.cancel()
+        self.is_translating = False
+        
+        # Restart typing timer
+        self.typing_timer.stop()
+        self.typing_timer.start(self.debounce.interval_ms())
+        self.status_label.setText('Waiting for input...')
+        
+        if ends_sentence(self.source_text.toPlainText()):
+            self.speculate()
+    
+    def speculate(self):
+        """Translate the completed sentences of the source text in the background"""
+        if not (self.config.get('speculative_translation', True)
+                and self.config.get('incremental_translation', True)):
+            return
+        
+        text = self.source_text.toPlainText()
+        source_lang = self.source_lang_combo.currentData()
+        target_lang = self.target_lang_combo.currentData()
+        key = (text.rstrip(), source_lang, target_lang)
+        if not target_lang or key == self.speculated_key:
+            return
+        self.speculated_key = key
+        
+        engine = self.engine
+        segment_map = self.segment_map
+        
+        def run(job):
+            # Worker thread: results go to the segment map only
+            with operation('speculate', chars=len(text)):
+                segment_map.prefetch(engine, text, source_lang, target_lang)
+            return text
+        
+        self.speculation.submit(run)
+    
+    def on_speculation_finished(self, job_id: int, text: str):
+        """
+        Show the translation early if nothing was typed since the sentence ended
+        
+        Args:
+            job_id: Job ID
+            text: Source text the sentences were taken from
+        """
+        if self.typing_timer.isActive() and self.source_text.toPlainText() == text:
+            self.translate()
     
     def on_typing_timeout(self):
         """Handle typing timeout - trigger translation"""
@@ -159,10 +269,18 @@ class TextTranslateTab(QWidget):
             self.translate()
     
     def translate(self):
-        """Perform translation"""
+        """Start translating the source text in the background"""
+        self.typing_timer.stop()
         source_text = self.source_text.toPlainText().strip()
         
+        if not self.engine_ready:
+            self.translate_when_ready = True
+            self.status_label.setText('Loading translation engine...')
+            return
+        
         if not source_text:
+            self.jobs.cancel()
+            self.is_translating = False
             self.target_text.clear()
             self.status_label.setText('')
             return
@@ -174,39 +292,117 @@ class TextTranslateTab(QWidget):
             self.status_label.setText('Please select a target language')
             return
         
-        try:
-            self.is_translating = True
-            self.status_label.setText('Translating...')
-            
-            # Perform translation
-            translated_text = self.engine.translate(source_text, source_lang, target_lang)
-            
-            # Update target text
-            self.target_text.setPlainText(translated_text)
-            self.status_label.setText('Translation complete')
-            
-            # Save to history
-            self.history_db.add_entry(source_lang, target_lang, 
-                                     source_text, translated_text)
-            
-            self.translation_completed.emit()
-            
-        except Exception as e:
-            self.status_label.setText(f'Translation failed: {str(e)}')
-        finally:
-            self.is_translating = False
+        engine = self.engine
+        history_db = self.history_db
+        debounce = self.debounce
+        segment_map = self.segment_map if self.config.get('incremental_translation', True) else None
+        streaming = self.config.get('streaming_translation', True)
+        
+        def run(job):
+            # Worker thread: no widget access here
+            with operation('translate', chars=len(source_text), engine=engine.name):
+                if segment_map is not None:
+                    translated_text = segment_map.translate(
+                        engine, source_text, source_lang, target_lang,
+                        on_progress=job.report if streaming else None
+                    )
+                else:
+                    started = time.monotonic()
+                    translated_text = engine.translate(source_text, source_lang, target_lang)
+                    debounce.record(time.monotonic() - started)
+                
+                # Save to history unless the result is already outdated
+                if not job.is_cancelled():
+                    try:
+                        history_db.add_entry(source_lang, target_lang,
+                                             source_text, translated_text, engine.name)
+                    except Exception:
+                        pass  # History must not hide a finished translation
+            return translated_text
+        
+        self.is_translating = True
+        self.status_label.setText('Translating...')
+        self.stream_timer = StreamTimer()
+        self.jobs.submit(run)
+    
+    def on_translation_progress(self, job_id: int, partial_text: str):
+        """
+        Show a partial translation while the rest is still being translated
+        
+        Args:
+            job_id: Job ID
+            partial_text: Translation with untranslated sentences in the
+                source language
+        """
+        self.stream_timer.output()
+        self.show_translation(partial_text)
+    
+    def on_translation_finished(self, job_id: int, translated_text: str):
+        """
+        Show the result of the current translation job
+        
+        Args:
+            job_id: Job ID
+            translated_text: Translated text
+        """
+        self.is_translating = False
+        self.show_translation(translated_text)
+        self.stream_timer.finish()
+        self.status_label.setText(
+            f'Translation complete (first output {self.stream_timer.first_output:.2f} s, '
+            f'total {self.stream_timer.total:.2f} s)'
+        )
+        self.translation_completed.emit()
+    
+    def on_translation_failed(self, job_id: int, message: str):
+        """
+        Report a failed translation job
+        
+        Args:
+            job_id: Job ID
+            message: Error message
+        """
+        self.is_translating = False
+        self.status_label.setText(f'Translation failed: {message}')
+    
+    def show_translation(self, translated_text: str):
+        """
+        Show a translation, replacing only the part that changed
+        
+        If the target box still shows the previous translation, the changed
+        range is spliced in with a text cursor (keeping scroll position and
+        undo history); otherwise the whole text is replaced.
+        
+        Args:
+            translated_text: Translation to show
+        """
+        with span('gui.show_translation', chars=len(translated_text)):
+            current = self.target_text.toPlainText()
+            if self.last_translation is None or current != self.last_translation:
+                self.target_text.setPlainText(translated_text)
+            else:
+                start, end, replacement = splice_range(current, translated_text)
+                if start != end or replacement:
+                    # Qt positions count UTF-16 code units
+                    start_pos = len(current[:start].encode('utf-16-le')) // 2
+                    end_pos = start_pos + len(current[start:end].encode('utf-16-le')) // 2
+                    cursor = QTextCursor(self.target_text.document())
+                    cursor.setPosition(start_pos)
+                    cursor.setPosition(end_pos, QTextCursor.MoveMode.KeepAnchor)
+                    cursor.insertText(replacement)
+        self.last_translation = translated_text
     
     def swap_languages(self):
         """Swap source and target languages"""
-        source_index = self.source_lang_combo.currentIndex()
-        target_index = self.target_lang_combo.currentIndex()
+        source_lang = self.source_lang_combo.currentData()
+        target_lang = self.target_lang_combo.currentData()
         
         # Don't swap if source is auto-detect
-        if self.source_lang_combo.currentData() == 'auto':
+        if source_lang == 'auto':
             return
         
-        self.source_lang_combo.setCurrentIndex(target_index)
-        self.target_lang_combo.setCurrentIndex(source_index)
+        # The source list has an extra row, so swap by code, not by index
+        self.select_languages(target_lang, source_lang)
         
         # Also swap text
         source_text = self.source_text.toPlainText()
@@ -215,15 +411,20 @@ class TextTranslateTab(QWidget):
         self.source_text.setPlainText(target_text)
         self.target_text.setPlainText(source_text)
     
-    def set_engine(self, engine):
+    def set_engine(self, engine, ready: bool = True):
         """
         Set translation engine
         
         Args:
             engine: Translation engine instance
+            ready: False if the engine is still being loaded
         """
+        self.jobs.cancel()
+        self.speculation.cancel()
+        self.speculated_key = None
         self.engine = engine
-        self.load_languages()
+        self.segment_map.reset()
+        self.set_engine_ready(ready)
     
     def on_ocr_button_clicked(self):
         """Handle OCR button click"""
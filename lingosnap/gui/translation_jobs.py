@@ -0,0 +1,165 @@
+"""
+Background translation jobs for the GUI
+"""
+
+import threading
+from typing import Callable
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal
+
+
+class _JobSignals(QObject):
+    """Signals emitted from worker threads (delivered in the GUI thread)"""
+    
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+    progress = pyqtSignal(int, object)
+
+
+class TranslationJob:
+    """One unit of work run on the queue's thread pool"""
+    
+    def __init__(self, job_id: int, func: Callable[['TranslationJob'], object],
+                 signals: _JobSignals):
+        """
+        Initialize job
+        
+        Args:
+            job_id: Increasing job ID
+            func: Function called with the job, returning the result
+            signals: Signals to report the outcome on
+        """
+        self.job_id = job_id
+        self.func = func
+        self.signals = signals
+        self._cancelled = threading.Event()
+    
+    def cancel(self):
+        """Mark the job as superseded (a running call is not interrupted)"""
+        self._cancelled.set()
+    
+    def is_cancelled(self) -> bool:
+        """Check whether a newer job has superseded this one"""
+        return self._cancelled.is_set()
+    
+    def report(self, partial):
+        """
+        Publish a partial result (called from the worker thread)
+        
+        Args:
+            partial: Partial result delivered with job_progress
+        """
+        if not self.is_cancelled():
+            self.signals.progress.emit(self.job_id, partial)
+    
+    def run(self):
+        """Run the job in a worker thread"""
+        if self.is_cancelled():
+            return
+        try:
+            result = self.func(self)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
+        else:
+            self.signals.finished.emit(self.job_id, result)
+
+
+class TranslationJobQueue(QObject):
+    """
+    Runs translations off the GUI thread, keeping only the newest result
+    
+    Every submit() supersedes the previous jobs: jobs that have not started
+    are skipped, and results of jobs that were already running are dropped,
+    so job_progress, job_finished and job_failed are only emitted for the
+    current job.
+    """
+    
+    job_progress = pyqtSignal(int, object)
+    job_finished = pyqtSignal(int, object)
+    job_failed = pyqtSignal(int, str)
+    
+    def __init__(self, max_threads: int = 2, parent=None):
+        """
+        Initialize job queue
+        
+        Args:
+            max_threads: Worker threads (superseded jobs may still occupy one)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, max_threads))
+        
+        self._signals = _JobSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.progress.connect(self._on_progress)
+        
+        self._next_id = 0
+        self._current = None
+    
+    def submit(self, func: Callable[[TranslationJob], object]) -> int:
+        """
+        Run a function in the pool, superseding all earlier jobs
+        
+        Args:
+            func: Function called with the TranslationJob in a worker thread;
+                long functions should check job.is_cancelled() between steps
+                
+        Returns:
+            Job ID
+        """
+        self.cancel()
+        self._next_id += 1
+        self._current = TranslationJob(self._next_id, func, self._signals)
+        self.pool.start(self._current.run)
+        return self._next_id
+    
+    def cancel(self):
+        """Supersede the current job without starting a new one"""
+        if self._current is not None:
+            self._current.cancel()
+            self._current = None
+    
+    def is_current(self, job_id: int) -> bool:
+        """
+        Check whether a job's result should still be applied
+        
+        Args:
+            job_id: Job ID returned by submit()
+            
+        Returns:
+            True if no newer job was submitted and it was not cancelled
+        """
+        return self._current is not None and self._current.job_id == job_id
+    
+    def is_busy(self) -> bool:
+        """Check whether the current job has not finished yet"""
+        return self._current is not None
+    
+    def shutdown(self, timeout_ms: int = 3000):
+        """
+        Cancel all jobs and wait for running ones to return
+        
+        Args:
+            timeout_ms: Maximum time to wait
+        """
+        self.cancel()
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)
+    
+    def _on_progress(self, job_id: int, partial):
+        """Forward partial results of the current job (GUI thread)"""
+        if self.is_current(job_id):
+            self.job_progress.emit(job_id, partial)
+    
+    def _on_finished(self, job_id: int, result):
+        """Forward the result of the current job (GUI thread)"""
+        if self.is_current(job_id):
+            self._current = None
+            self.job_finished.emit(job_id, result)
+    
+    def _on_failed(self, job_id: int, message: str):
+        """Forward the error of the current job (GUI thread)"""
+        if self.is_current(job_id):
+            self._current = None
+            self.job_failed.emit(job_id, message)
@@ -0,0 +1,311 @@
+"""
+Two-tier translation cache (in-memory LRU + persistent SQLite)
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from lingosnap.utils.profiling import span
+
+
+# Runs of horizontal whitespace between two words
+_INNER_SPACE = re.compile(r'(?<=\S)[ \t\u00a0\u3000]+(?=\S)')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for use in a cache key
+    
+    Applies Unicode NFC normalization and collapses runs of horizontal
+    whitespace between words. Leading and trailing whitespace (of the text
+    and of every line) is kept, since translations preserve it and texts
+    differing there must not share an entry.
+    
+    Args:
+        text: Text to normalize
+        
+    Returns:
+        Normalized text
+    """
+    return _INNER_SPACE.sub(' ', unicodedata.normalize('NFC', text))
+
+
+class TranslationCache:
+    """
+    Translation cache with a bounded in-memory LRU tier in front of a
+    persistent SQLite tier in ~/.lingosnap/cache.db
+    
+    The SQLite tier is shared by every process (GUI and the lingo CLI).
+    Entries are keyed by engine name, normalized text and language pair and
+    are evicted when older than max_age_days or when the table grows beyond
+    max_entries (oldest first).
+    """
+    
+    # Number of writes between two eviction passes on the SQLite tier
+    PRUNE_INTERVAL = 100
+    
+    def __init__(self, memory_entries: int = 512, max_entries: int = 20000,
+                 max_age_days: float = 30, db_dir: Optional[Path] = None):
+        """
+        Initialize translation cache
+        
+        Args:
+            memory_entries: Maximum number of entries kept in memory
+            max_entries: Maximum number of entries kept on disk
+            max_age_days: Entries older than this are discarded
+            db_dir: Directory of the cache database (default: ~/.lingosnap)
+        """
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.db_dir = db_dir or (Path.home() / '.lingosnap')
+        self.db_file = self.db_dir / 'cache.db'
+        
+        self._memory = OrderedDict()  # key -> (translated_text, created)
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        self.persistent = True
+        self._init_database()
+    
+    @classmethod
+    def from_config(cls, config) -> 'TranslationCache':
+        """
+        Create a cache using the limits stored in the configuration
+        
+        Args:
+            config: Config instance
+            
+        Returns:
+            TranslationCache instance
+        """
+        return cls(
+            memory_entries=config.get('cache_memory_entries', 512),
+            max_entries=config.get('cache_max_entries', 20000),
+            max_age_days=config.get('cache_max_age_days', 30),
+        )
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_file), timeout=5)
+    
+    def _init_database(self):
+        """Create database and tables if they don't exist"""
+        try:
+            self.db_dir.mkdir(parents=True, exist_ok=True)
+            
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            # WAL lets the GUI and lingo read while the other one writes
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translations (
+                    engine TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    PRIMARY KEY (engine, source_lang, target_lang, text_hash)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_created
+                ON translations(created)
+            ''')
+            
+            conn.commit()
+            conn.close()
+        except Exception:
+            # Fall back to the memory tier only
+            self.persistent = False
+    
+    @staticmethod
+    def make_key(engine: str, text: str, source_lang: str,
+                 target_lang: str) -> Tuple[str, str, str, str]:
+        """
+        Build the cache key for a translation request
+        
+        Args:
+            engine: Engine name
+            text: Source text
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Tuple (engine, source_lang, target_lang, text_hash)
+        """
+        digest = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+        return (engine, source_lang, target_lang, digest)
+    
+    def get(self, engine: str, text: str, source_lang: str,
+            target_lang: str) -> Optional[str]:
+        """
+        Look up a cached translation
+        
+        Args:
+            engine: Engine name
+            text: Source text
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Cached translation or None on a miss
+        """
+        key = self.make_key(engine, text, source_lang, target_lang)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                translated_text, created = entry
+                if now - created <= self.max_age:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return translated_text
+                del self._memory[key]
+        
+        row = None
+        if self.persistent:
+            try:
+                with span('cache.read'):
+                    conn = self._connect()
+                    cursor = conn.cursor()
+                    cursor.execute('''
+                        SELECT translated_text, created FROM translations
+                        WHERE engine = ? AND source_lang = ? AND target_lang = ?
+                              AND text_hash = ?
+                    ''', key)
+                    row = cursor.fetchone()
+                    conn.close()
+            except Exception:
+                row = None
+        
+        with self._lock:
+            if row is not None and now - row[1] <= self.max_age:
+                self.disk_hits += 1
+                self._remember(key, row[0], row[1])
+                return row[0]
+            self.misses += 1
+        return None
+    
+    def put(self, engine: str, text: str, source_lang: str,
+            target_lang: str, translated_text: str):
+        """
+        Store a translation in both tiers
+        
+        Args:
+            engine: Engine name
+            text: Source text
+            source_lang: Source language code
+            target_lang: Target language code
+            translated_text: Translation to store
+        """
+        key = self.make_key(engine, text, source_lang, target_lang)
+        now = time.time()
+        
+        with self._lock:
+            self._remember(key, translated_text, now)
+            self._writes_since_prune += 1
+            prune = self._writes_since_prune >= self.PRUNE_INTERVAL
+            if prune:
+                self._writes_since_prune = 0
+        
+        if not self.persistent:
+            return
+        
+        try:
+            with span('cache.write'):
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO translations
+                    (engine, source_lang, target_lang, text_hash, translated_text, created)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', key + (translated_text, now))
+                conn.commit()
+                conn.close()
+            
+            if prune:
+                self.prune()
+        except Exception:
+            pass  # The cache must never break a translation
+    
+    def _remember(self, key, translated_text: str, created: float):
+        """Insert into the memory tier (caller holds the lock)"""
+        self._memory[key] = (translated_text, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def prune(self):
+        """Evict expired entries and trim the SQLite tier to max_entries"""
+        if not self.persistent:
+            return
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM translations WHERE created < ?',
+                           (time.time() - self.max_age,))
+            cursor.execute('''
+                DELETE FROM translations WHERE rowid IN (
+                    SELECT rowid FROM translations
+                    ORDER BY created DESC
+                    LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+            conn.commit()
+            conn.close()
+        except Exception:
+            pass
+    
+    def clear(self):
+        """Remove all entries from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if not self.persistent:
+            return
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM translations')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            raise Exception(f"Failed to clear cache: {str(e)}")
+    
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get hit/miss counters
+        
+        Returns:
+            Dictionary with memory_hits, disk_hits, misses, memory_entries
+            and hit_rate
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'hit_rate': hits / lookups if lookups else 0.0,
+            }
+    
+    def reset_stats(self):
+        """Reset hit/miss counters"""
+        with self._lock:
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
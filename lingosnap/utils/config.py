@@ -12,16 +12,64 @@ class Config:
     """Configuration manager for LingoSnap"""
     
     DEFAULT_CONFIG = {
-        'engine': 'google',  # 'google' or 'argos'
+        'engine': 'google',  # 'google', 'argos' or 'auto'
         'ui_language': 'en',  # 'en' or 'zh'
         'text_capture_hotkey': 'ctrl+c+c',
         'ocr_capture_hotkey': 'ctrl+f8',
         'terminal_default_target': 'zh',
         'history_limit': 100,
         'google_api_key': '',
-        'google_character_count': 0,
+        'google_max_concurrency': 8,
+        'google_request_timeout': 10.0,
+        'google_service_url': 'https://translate.google.com',
+        'google_min_concurrency': 1,
+        'google_latency_target': 2.0,  # seconds; slower answers shrink concurrency
+        'google_rate_limit': 10.0,  # requests per second, 0 = unlimited
+        'google_rate_burst': 20,
+        'google_max_retries': 3,
+        'google_retry_base_delay': 0.5,
+        'google_retry_max_delay': 8.0,
+        'google_breaker_threshold': 5,  # consecutive failures that pause requests
+        'google_breaker_reset': 30.0,
+        'local_language_detection': True,
+        'argos_index_ttl_hours': 24,
+        'argos_workers': 0,  # 0 = translate in-process
+        'argos_threads_per_worker': 0,  # 0 = CTranslate2 default
         'default_source_lang': 'auto',
         'default_target_lang': 'zh-cn',
+        'cache_enabled': True,
+        'cache_memory_entries': 512,
+        'cache_max_entries': 20000,
+        'cache_max_age_days': 30,
+        'coalescing_enabled': True,
+        'memory_enabled': True,  # reuse near-identical translations from history
+        'memory_threshold': 0.9,  # trigram similarity, 0-1
+        'memory_max_entries': 20000,
+        'translation_workers': 2,  # GUI translation threads
+        'incremental_translation': True,  # text tab: re-translate edited sentences only
+        'streaming_translation': True,  # show sentences as they are translated
+        'speculative_translation': True,  # translate finished sentences while typing
+        'typing_delay_ms': 2000,  # text tab: delay before translating (maximum if adaptive)
+        'typing_delay_min_ms': 300,
+        'adaptive_typing_delay': True,  # delay follows the measured engine latency
+        'profiling_enabled': False,  # write profiles to ~/.lingosnap/profiles
+        'profile_max_files': 100,
+        'daemon_enabled': False,  # the GUI serves lingo calls with its loaded engines
+        'daemon_socket': '',  # '' = $XDG_RUNTIME_DIR/lingosnap.sock
+        'daemon_timeout': 60.0,  # seconds lingo waits for each daemon response
+        'chunking_enabled': True,
+        'chunk_max_chars': 1000,
+        'chunk_max_workers': 4,
+        'chunk_max_retries': 2,  # Argos only; Google requests are retried by the governor
+        'routing_hedging': True,  # 'auto' engine: race the other backend when slow
+        'routing_cooldown': 30.0,  # seconds a failed backend is skipped
+        'routing_min_hedge_delay': 0.3,
+        'masking_enabled': True,  # keep paths, URLs, IDs and code out of the engine
+        'masking_glossary': {},  # term -> None (keep), translation or {lang: translation}
+        'masking_min_number_length': 4,
+        'usage_metering_enabled': True,  # per-engine, per-day counters in usage.db
+        'usage_flush_interval': 5.0,  # seconds between writes to usage.db
+        'usage_flush_threshold': 200,  # pending requests forcing an early write
     }
     
     def __init__(self):
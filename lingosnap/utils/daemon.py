@@ -0,0 +1,533 @@
+"""
+Resident translation daemon for the lingo CLI (Unix domain socket)
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from lingosnap.utils.languages import get_registry
+from lingosnap.utils.profiling import operation
+from lingosnap.utils.streaming import stream_batch
+
+
+# Largest request accepted (one JSON line)
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+def get_socket_path(config=None) -> Path:
+    """
+    Get the path of the daemon socket
+    
+    Args:
+        config: Config instance (daemon_socket overrides the default)
+        
+    Returns:
+        $XDG_RUNTIME_DIR/lingosnap.sock, or ~/.lingosnap/daemon.sock if
+        there is no runtime directory
+    """
+    path = config.get('daemon_socket', '') if config is not None else ''
+    if path:
+        return Path(path).expanduser()
+    
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR', '')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return Path(runtime_dir) / 'lingosnap.sock'
+    return Path.home() / '.lingosnap' / 'daemon.sock'
+
+
+def ensure_available(engine, engine_type: str):
+    """
+    Check that an engine can translate
+    
+    Args:
+        engine: Translation engine
+        engine_type: Engine name used in the message
+        
+    Raises:
+        Exception: If the engine is not available
+    """
+    if not engine.is_available():
+        message = f"{engine_type.capitalize()} engine is not available."
+        if engine_type in ('argos', 'auto'):
+            message += "\nPlease install Argos language packages first."
+        raise Exception(message)
+
+
+def resolve_target_language(engine, engine_type: str, target_lang: str) -> str:
+    """
+    Normalize a target language code for an engine ('zh' vs 'zh-cn')
+    
+    Args:
+        engine: Translation engine
+        engine_type: Engine name used in the message
+        target_lang: Language code given by the user
+        
+    Returns:
+        Code supported by the engine
+        
+    Raises:
+        Exception: If the engine does not support the language
+    """
+    registry = get_registry()
+    normalized = registry.normalize(target_lang, engine)
+    if normalized is None or normalized == 'auto':
+        raise Exception(
+            f"Language '{target_lang}' is not supported by {engine_type} engine.\n"
+            f"Supported languages: {', '.join(sorted(registry.get(engine).codes()))}"
+        )
+    return normalized
+
+
+def detect_source_language(engine, text: str) -> str:
+    """
+    Detect the source language (offline, no network round-trip)
+    
+    Args:
+        engine: Translation engine
+        text: Text to translate
+        
+    Returns:
+        Language code, or 'auto' if it could not be detected
+    """
+    try:
+        return engine.detect_language(text) or 'auto'
+    except Exception:
+        return 'auto'
+
+
+def create_daemon_engines(config, meter=None) -> Dict[str, object]:
+    """
+    Create the engines of a headless daemon
+    
+    Like the GUI, the Google and Argos engines are created on first use and
+    shared by the 'auto' router; all three share one cache.
+    
+    Args:
+        config: Config instance
+        meter: Usage meter (optional)
+        
+    Returns:
+        Decorated engines by name ('google', 'argos', 'auto')
+    """
+    from lingosnap.engines.factory import create_lazy_engine, create_router, wrap_engine
+    from lingosnap.utils.cache import TranslationCache
+    from lingosnap.utils.masking import Masker
+    
+    cache = TranslationCache.from_config(config)
+    masker = Masker.from_config(config)
+    backends = {
+        'google': create_lazy_engine('google', config, meter),
+        'argos': create_lazy_engine('argos', config, meter),
+    }
+    engines = dict(backends)
+    engines['auto'] = create_router(backends, config)
+    return {name: wrap_engine(engine, config, cache, masker=masker)
+            for name, engine in engines.items()}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request per connection and streams the responses"""
+    
+    def handle(self):
+        """Serve one connection (server thread)"""
+        line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+        if not line:
+            return
+        try:
+            if len(line) > MAX_REQUEST_BYTES:
+                raise Exception("Request too large")
+            self.server.daemon.handle(json.loads(line), self.send)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client went away (e.g. Ctrl+C)
+        except Exception as e:
+            try:
+                self.send({'error': str(e)})
+            except OSError:
+                pass
+    
+    def send(self, message: Dict):
+        """Write one JSON response line"""
+        self.wfile.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingUnixStreamServer if hasattr(socket, 'AF_UNIX')
+              else socketserver.ThreadingTCPServer):
+    """
+    Socket server running every connection in its own thread
+    
+    Only Unix domain sockets are used; the TCP base merely keeps the module
+    importable where they do not exist (bind() refuses to run there).
+    """
+    
+    daemon_threads = True
+    block_on_close = False
+
+
+class TranslationDaemon:
+    """
+    Serves translations from engines that stay loaded between requests
+    
+    The GUI hosts a daemon with its own engines if daemon_enabled is set;
+    `lingo --daemon` runs one without the GUI. Clients connect to a Unix
+    domain socket (readable by the user only) and send one JSON line:
+    
+        {"op": "ping"}
+        {"op": "translate", "lines": [...], "target": "fr", "engine": "google"}
+        
+    Every response is a JSON line. A translation starts with
+    {"engine", "source", "target"}, continues with {"index", "text"} or
+    {"index", "error"} per line in completion order and ends with
+    {"done": true}. A request that cannot be served gets {"error"} instead.
+    """
+    
+    def __init__(self, engines: Dict[str, object], config=None,
+                 socket_path: Optional[Path] = None):
+        """
+        Initialize daemon
+        
+        Args:
+            engines: Decorated engines by name (the dict may change later)
+            config: Config instance
+            socket_path: Socket to listen on (default: get_socket_path())
+        """
+        self.engines = engines
+        self.config = config
+        self.socket_path = Path(socket_path) if socket_path is not None else get_socket_path(config)
+        self.started = time.monotonic()
+        self.requests = 0
+        
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._inode: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def _get(self, key: str, default=None):
+        """Read a setting (defaults if there is no config)"""
+        return self.config.get(key, default) if self.config is not None else default
+    
+    def bind(self) -> bool:
+        """
+        Create the socket
+        
+        A socket left behind by a daemon that died is replaced. The socket
+        is created with mode 0600 (in a directory created with mode 0700),
+        so no other user can connect even briefly.
+        
+        Returns:
+            False if another daemon is listening on the socket
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            raise Exception("Unix domain sockets are not supported on this platform")
+        
+        path = self.socket_path
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if os.path.lexists(path):
+            if DaemonClient(path).is_running():
+                return False
+            path.unlink()
+        
+        # bind() creates the socket file; chmod() afterwards would leave it
+        # open to other users until then
+        umask = os.umask(0o177)
+        try:
+            self._server = _Server(str(path), _RequestHandler)
+        finally:
+            os.umask(umask)
+        self._server.daemon = self
+        self._inode = path.stat().st_ino
+        self.started = time.monotonic()
+        return True
+    
+    def start(self) -> bool:
+        """
+        Serve requests in a background thread
+        
+        Returns:
+            False if another daemon is already running
+        """
+        if self._server is not None:
+            return True
+        if not self.bind():
+            return False
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='lingosnap-daemon', daemon=True)
+        self._thread.start()
+        return True
+    
+    def serve_forever(self):
+        """
+        Serve requests in the calling thread until interrupted
+        
+        The socket is created unless bind() was called already.
+        
+        Raises:
+            Exception: If another daemon is already running
+        """
+        if self._server is None and not self.bind():
+            raise Exception(f"A LingoSnap daemon is already running on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+    
+    def is_running(self) -> bool:
+        """Check whether the daemon is listening"""
+        return self._server is not None
+    
+    def shutdown(self):
+        """Stop a daemon started with start() and remove its socket"""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=3)
+            self._thread = None
+        self.close()
+    
+    def close(self):
+        """Close the socket (requests in progress may still finish)"""
+        if self._server is None:
+            return
+        self._server.server_close()
+        self._server = None
+        try:
+            # Another daemon may have replaced a socket we could not reach
+            if self.socket_path.stat().st_ino == self._inode:
+                self.socket_path.unlink()
+        except OSError:
+            pass
+    
+    def warm_up(self, engine_type: str):
+        """
+        Load an engine and its language list ahead of the first request
+        
+        Args:
+            engine_type: Engine name
+        """
+        get_registry().get(self._get_engine(engine_type))
+    
+    def _get_engine(self, engine_type: str):
+        """Look up an engine by name"""
+        engine = self.engines.get(engine_type)
+        if engine is None:
+            raise Exception(f"Unknown engine: {engine_type}")
+        return engine
+    
+    def handle(self, request: Dict, send):
+        """
+        Serve one request
+        
+        Args:
+            request: Decoded request
+            send: Function writing one response
+        """
+        with self._lock:
+            self.requests += 1
+        
+        op = request.get('op')
+        if op == 'ping':
+            send({
+                'ok': True,
+                'pid': os.getpid(),
+                'uptime': round(time.monotonic() - self.started, 1),
+                'requests': self.requests,
+                'engines': sorted(name for name, engine in self.engines.items()
+                                  if engine.is_loaded()),
+            })
+        elif op == 'translate':
+            self._translate(request, send)
+        else:
+            raise Exception(f"Unknown request: {op}")
+    
+    def _translate(self, request: Dict, send):
+        """Stream the translation of a list of lines"""
+        lines = request.get('lines')
+        if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+            raise Exception("'lines' must be a list of strings")
+        
+        engine_type = request.get('engine') or self._get('engine', 'google')
+        engine = self._get_engine(engine_type)
+        ensure_available(engine, engine_type)
+        target_lang = resolve_target_language(
+            engine, engine_type,
+            request.get('target') or self._get('terminal_default_target', 'zh')
+        )
+        source_lang = request.get('source') or (
+            detect_source_language(engine, '\n'.join(lines)) if lines else 'auto'
+        )
+        send({'engine': engine_type, 'source': source_lang, 'target': target_lang})
+        
+        with operation('daemon.translate', lines=len(lines)):
+            stream = stream_batch(engine, lines, source_lang, target_lang,
+                                  max_workers=self._get('chunk_max_workers', 4))
+            try:
+                for index, result in stream:
+                    if isinstance(result, Exception):
+                        send({'index': index, 'error': str(result)})
+                    else:
+                        send({'index': index, 'text': result})
+            finally:
+                stream.close()  # Cancels batches that have not started
+        send({'done': True})
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket"""
+
+
+class DaemonClient:
+    """Talks to a TranslationDaemon (used by lingo)"""
+    
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = 60.0,
+                 connect_timeout: float = 0.5):
+        """
+        Initialize client
+        
+        Args:
+            socket_path: Daemon socket (default: get_socket_path())
+            timeout: Seconds to wait for each response
+            connect_timeout: Seconds to wait for the connection
+        """
+        self.socket_path = Path(socket_path) if socket_path is not None else get_socket_path()
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+    
+    @classmethod
+    def from_config(cls, config) -> 'DaemonClient':
+        """
+        Create a client from the daemon_* settings
+        
+        Args:
+            config: Config instance
+            
+        Returns:
+            DaemonClient instance
+        """
+        return cls(get_socket_path(config), timeout=config.get('daemon_timeout', 60.0))
+    
+    def _connect(self, request: Dict) -> socket.socket:
+        """Connect and send a request"""
+        if not hasattr(socket, 'AF_UNIX'):
+            raise DaemonUnavailable("Unix domain sockets are not supported on this platform")
+        
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.connect_timeout)
+            sock.connect(str(self.socket_path))
+        except OSError as e:
+            sock.close()
+            raise DaemonUnavailable(str(e))
+        
+        try:
+            sock.settimeout(self.timeout)
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    
+    @staticmethod
+    def _responses(sock: socket.socket) -> Iterator[Dict]:
+        """Read response lines until the daemon closes the connection"""
+        try:
+            with sock.makefile('rb') as f:
+                for line in f:
+                    yield json.loads(line)
+        finally:
+            sock.close()
+    
+    def ping(self) -> Optional[Dict]:
+        """
+        Ask the daemon for its status
+        
+        Returns:
+            Status (pid, uptime, requests, loaded engines), or None if no
+            daemon is running
+        """
+        try:
+            responses = self._responses(self._connect({'op': 'ping'}))
+            status = next(responses, None)
+            responses.close()
+        except (DaemonUnavailable, OSError, ValueError):
+            return None
+        return status if status and status.get('ok') else None
+    
+    def is_running(self) -> bool:
+        """Check whether a daemon answers on the socket"""
+        return self.ping() is not None
+    
+    def translate(self, lines: List[str], target_lang: str, source_lang: Optional[str] = None,
+                  engine_type: Optional[str] = None) -> Iterator[Tuple[int, Union[str, Exception]]]:
+        """
+        Translate lines in the daemon
+        
+        The request is sent right away; results are read while iterating.
+        
+        Args:
+            lines: Lines to translate
+            target_lang: Target language code (normalized by the daemon)
+            source_lang: Source language code (detected if omitted)
+            engine_type: Engine to use (the daemon's setting if omitted)
+            
+        Returns:
+            Iterator of (index, translation or exception) in completion
+            order, like stream_batch(); it raises an Exception if the
+            daemon rejects the request
+            
+        Raises:
+            DaemonUnavailable: If no daemon is running
+        """
+        sock = self._connect({'op': 'translate', 'lines': lines, 'target': target_lang,
+                              'source': source_lang, 'engine': engine_type})
+        return self._results(self._responses(sock))
+    
+    def translate_batch(self, lines: List[str], target_lang: str,
+                        source_lang: Optional[str] = None,
+                        engine_type: Optional[str] = None) -> List[Union[str, Exception]]:
+        """
+        Translate lines in the daemon and wait for all of them
+        
+        An empty list only checks that the daemon accepts the engine and
+        language.
+        
+        Args:
+            lines: Lines to translate
+            target_lang: Target language code
+            source_lang: Source language code (detected if omitted)
+            engine_type: Engine to use (the daemon's setting if omitted)
+            
+        Returns:
+            One translation or exception per line, in input order
+            
+        Raises:
+            DaemonUnavailable: If no daemon is running
+            Exception: If the daemon rejects the request
+        """
+        results: List[Union[str, Exception]] = [
+            Exception("Translation failed: no result") for _ in lines
+        ]
+        for index, result in self.translate(lines, target_lang, source_lang, engine_type):
+            results[index] = result
+        return results
+    
+    @staticmethod
+    def _results(responses: Iterator[Dict]) -> Iterator[Tuple[int, Union[str, Exception]]]:
+        """Turn translate responses into stream_batch() results"""
+        try:
+            for message in responses:
+                if 'index' in message:
+                    if 'text' in message:
+                        yield message['index'], message['text']
+                    else:
+                        yield message['index'], Exception(message.get('error', 'Translation failed'))
+                elif 'error' in message:
+                    raise Exception(message['error'])
+                elif message.get('done'):
+                    return
+            raise Exception("Translation failed: the daemon closed the connection")
+        finally:
+            responses.close()
@@ -0,0 +1,97 @@
+"""
+Typing delay that adapts to measured engine latency
+"""
+
+import threading
+from typing import Optional
+
+
+class AdaptiveDebounce:
+    """
+    Delay between the last keystroke and the translation request
+    
+    A fixed delay is too long for fast engines and too short for slow
+    ones. The delay is a multiple of the smoothed engine latency (an
+    exponential moving average of record()ed round trips), clamped to
+    [min_ms, max_ms]; until the first measurement initial_ms is used.
+    Round trips shorter than min_sample were answered by the cache or the
+    translation memory without reaching the engine and are ignored, so they
+    do not drag the delay down to min_ms.
+    """
+    
+    def __init__(self, initial_ms: int = 2000, min_ms: int = 300, max_ms: int = 2000,
+                 factor: float = 2.0, smoothing: float = 0.3, min_sample: float = 0.05):
+        """
+        Initialize debounce
+        
+        Args:
+            initial_ms: Delay before any latency was measured
+            min_ms: Shortest delay
+            max_ms: Longest delay
+            factor: Delay as a multiple of the engine latency
+            smoothing: Weight of a new measurement in the moving average
+            min_sample: Round trips faster than this (seconds) are ignored
+        """
+        self.initial_ms = initial_ms
+        self.min_ms = min_ms
+        self.max_ms = max(min_ms, max_ms)
+        self.factor = factor
+        self.smoothing = smoothing
+        self.min_sample = min_sample
+        self._latency: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, config) -> 'AdaptiveDebounce':
+        """
+        Create a debounce from the typing_delay_* settings
+        
+        With adaptive_typing_delay disabled the delay stays at
+        typing_delay_ms.
+        
+        Args:
+            config: Config instance
+            
+        Returns:
+            AdaptiveDebounce instance
+        """
+        delay = config.get('typing_delay_ms', 2000)
+        if not config.get('adaptive_typing_delay', True):
+            return cls(initial_ms=delay, min_ms=delay, max_ms=delay)
+        return cls(initial_ms=delay,
+                   min_ms=config.get('typing_delay_min_ms', 300),
+                   max_ms=delay)
+    
+    @property
+    def latency(self) -> Optional[float]:
+        """Smoothed engine latency in seconds (None before the first measurement)"""
+        return self._latency
+    
+    def record(self, seconds: float):
+        """
+        Record the duration of one engine round trip (thread-safe)
+        
+        Args:
+            seconds: Measured latency
+        """
+        if seconds < self.min_sample:
+            return  # Cache or memory hit, not an engine round trip
+        with self._lock:
+            if self._latency is None:
+                self._latency = seconds
+            else:
+                self._latency += self.smoothing * (seconds - self._latency)
+    
+    def interval_ms(self) -> int:
+        """
+        Get the current typing delay
+        
+        Returns:
+            Delay in milliseconds
+        """
+        with self._lock:
+            if self._latency is None:
+                delay = self.initial_ms
+            else:
+                delay = self.factor * self._latency * 1000
+        return int(min(self.max_ms, max(self.min_ms, delay)))
@@ -0,0 +1,341 @@
+"""
+File formats translated by lingo translate-files (text, SRT/VTT, PO, JSON)
+"""
+
+import copy
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+class TranslatableFile:
+    """
+    Translatable segments of a parsed file
+    
+    Only the segments go to the engine; render() puts translations back
+    into the file, leaving its structure (cue timings, msgids, keys, ...)
+    as it was.
+    """
+    
+    def __init__(self, segments: List[str],
+                 render: Callable[[List[Optional[str]]], str]):
+        """
+        Initialize parsed file
+        
+        Args:
+            segments: Texts to translate, in file order
+            render: Function building the file from one translation per
+                segment (None for segments left untranslated)
+        """
+        self.segments = segments
+        self._render = render
+    
+    def render(self, translations: List[Optional[str]]) -> str:
+        """
+        Build the translated file
+        
+        Args:
+            translations: One translation per segment (None keeps the
+                original, or leaves a PO entry untranslated)
+                
+        Returns:
+            File content
+        """
+        return self._render(translations)
+
+
+class _Template:
+    """Literal text interleaved with segments"""
+    
+    def __init__(self):
+        self.pieces: List[Union[str, int]] = []
+        self.segments: List[str] = []
+    
+    def text(self, text: str):
+        if text:
+            self.pieces.append(text)
+    
+    def segment(self, text: str):
+        """Add a segment, keeping surrounding whitespace out of it"""
+        stripped = text.strip()
+        if not stripped:
+            self.text(text)
+            return
+        start = text.index(stripped)
+        self.text(text[:start])
+        self.pieces.append(len(self.segments))
+        self.segments.append(stripped)
+        self.text(text[start + len(stripped):])
+    
+    def build(self) -> TranslatableFile:
+        def render(translations: List[Optional[str]]) -> str:
+            return ''.join(
+                piece if isinstance(piece, str)
+                else (translations[piece] if translations[piece] is not None
+                      else self.segments[piece])
+                for piece in self.pieces
+            )
+        return TranslatableFile(self.segments, render)
+
+
+# Blank lines separating paragraphs, subtitle cues and PO entries
+_BLOCK_BREAK = re.compile(r'(\n\s*\n)')
+
+
+def parse_text(content: str) -> TranslatableFile:
+    """
+    Parse plain text; every paragraph is one segment
+    
+    Args:
+        content: File content
+        
+    Returns:
+        TranslatableFile
+    """
+    template = _Template()
+    for i, part in enumerate(_BLOCK_BREAK.split(content)):
+        if i % 2:
+            template.text(part)
+        else:
+            template.segment(part)
+    return template.build()
+
+
+def parse_subtitles(content: str) -> TranslatableFile:
+    """
+    Parse SRT or WebVTT subtitles; the text of every cue is one segment
+    
+    Cue numbers, identifiers, timings and settings are kept, as are
+    WEBVTT headers and NOTE, STYLE and REGION blocks.
+    
+    Args:
+        content: File content
+        
+    Returns:
+        TranslatableFile
+    """
+    template = _Template()
+    for i, block in enumerate(_BLOCK_BREAK.split(content)):
+        if i % 2:
+            template.text(block)
+            continue
+        
+        lines = block.split('\n')
+        timing = next((n for n, line in enumerate(lines[:3]) if '-->' in line), None)
+        if timing is None:
+            template.text(block)
+            continue
+        template.text('\n'.join(lines[:timing + 1]) + '\n')
+        template.segment('\n'.join(lines[timing + 1:]))
+    return template.build()
+
+
+_PO_FIELD = re.compile(r'^(msgctxt|msgid_plural|msgid|msgstr(?:\[\d+\])?)\s+(".*")\s*$')
+_PO_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+
+def _po_unquote(quoted: str) -> str:
+    """Decode a quoted PO string"""
+    return re.sub(r'\\(.)', lambda m: _PO_ESCAPES.get(m.group(1), m.group(1)), quoted[1:-1])
+
+
+def _po_quote(keyword: str, text: str) -> List[str]:
+    """Encode a PO field, one quoted line per line of text"""
+    def escape(value: str) -> str:
+        return (value.replace('\\', '\\\\').replace('"', '\\"')
+                .replace('\t', '\\t').replace('\n', '\\n'))
+    
+    lines = re.findall(r'[^\n]*\n|[^\n]+$', text)
+    if len(lines) <= 1:
+        return [f'{keyword} "{escape(text)}"']
+    return [f'{keyword} ""'] + [f'"{escape(line)}"' for line in lines]
+
+
+def _match_line_breaks(translation: str, original: str) -> str:
+    """Give a translation the leading and trailing line breaks of its msgid"""
+    core = translation.strip('\n')
+    lead = original[:len(original) - len(original.lstrip('\n'))]
+    trail = original[len(original.rstrip('\n')):]
+    return lead + core + trail
+
+
+def parse_po(content: str) -> TranslatableFile:
+    """
+    Parse a gettext PO or POT catalog
+    
+    The msgid (and msgid_plural) of every untranslated entry is a segment.
+    Entries that already have a translation, the header and obsolete
+    entries are left alone. Machine-translated entries are marked fuzzy so
+    a translator reviews them.
+    
+    Args:
+        content: File content
+        
+    Returns:
+        TranslatableFile
+    """
+    blocks = _BLOCK_BREAK.split(content)
+    segments: List[str] = []
+    # Block index -> (entry lines, fields, first segment index)
+    entries: Dict[int, Tuple[List[str], Dict[str, Tuple[int, int, str]], int]] = {}
+    
+    for i in range(0, len(blocks), 2):
+        lines = blocks[i].split('\n')
+        fields: Dict[str, Tuple[int, int, str]] = {}  # keyword -> (first line, end, value)
+        current = None
+        for n, line in enumerate(lines):
+            match = _PO_FIELD.match(line)
+            if match:
+                current = match.group(1)
+                fields[current] = (n, n + 1, _po_unquote(match.group(2)))
+            elif current is not None and line.startswith('"'):
+                first, _, value = fields[current]
+                fields[current] = (first, n + 1, value + _po_unquote(line.strip()))
+            else:
+                current = None
+        
+        msgid = fields.get('msgid')
+        msgstrs = [value for key, value in fields.items() if key.startswith('msgstr')]
+        if not msgid or not msgid[2].strip() or not msgstrs or any(v[2] for v in msgstrs):
+            continue
+        
+        entries[i] = (lines, fields, len(segments))
+        segments.append(msgid[2])
+        if 'msgid_plural' in fields:
+            segments.append(fields['msgid_plural'][2])
+    
+    def render(translations: List[Optional[str]]) -> str:
+        output = list(blocks)
+        for i, (lines, fields, first) in entries.items():
+            singular = translations[first]
+            plural = translations[first + 1] if 'msgid_plural' in fields else singular
+            if singular is None or plural is None:
+                continue
+            singular = _match_line_breaks(singular, fields['msgid'][2])
+            if 'msgid_plural' in fields:
+                plural = _match_line_breaks(plural, fields['msgid_plural'][2])
+            
+            # Replace msgstr fields from the last one so line numbers stay valid
+            new_lines = list(lines)
+            for key, (start, end, _) in sorted(
+                    ((key, value) for key, value in fields.items() if key.startswith('msgstr')),
+                    key=lambda item: item[1][0], reverse=True):
+                text = singular if key in ('msgstr', 'msgstr[0]') else plural
+                new_lines[start:end] = _po_quote(key, text)
+            output[i] = '\n'.join(_add_fuzzy_flag(new_lines))
+        return ''.join(output)
+    
+    return TranslatableFile(segments, render)
+
+
+def _add_fuzzy_flag(lines: List[str]) -> List[str]:
+    """Mark a PO entry as fuzzy"""
+    for n, line in enumerate(lines):
+        if line.startswith('#,'):
+            if 'fuzzy' not in line:
+                lines[n] = line.rstrip() + ', fuzzy'
+            return lines
+    
+    # Flags go after the other comments, before previous msgids (#|)
+    position = next((n for n, line in enumerate(lines)
+                     if not line.startswith('#') or line.startswith('#|')), len(lines))
+    return lines[:position] + ['#, fuzzy'] + lines[position:]
+
+
+def parse_json(content: str) -> TranslatableFile:
+    """
+    Parse a JSON catalog; every non-empty string value is a segment
+    
+    Keys, numbers and the nesting are kept. The output uses the
+    indentation of the input.
+    
+    Args:
+        content: File content
+        
+    Returns:
+        TranslatableFile
+    """
+    data = json.loads(content)
+    paths: List[Tuple] = []
+    segments: List[str] = []
+    
+    def walk(node, path: Tuple):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                walk(value, path + (key,))
+        elif isinstance(node, list):
+            for index, value in enumerate(node):
+                walk(value, path + (index,))
+        elif isinstance(node, str) and node.strip():
+            paths.append(path)
+            segments.append(node)
+    
+    walk(data, ())
+    
+    indent_match = re.search(r'^([ \t]+)\S', content, re.MULTILINE)
+    indent = indent_match.group(1) if indent_match else None
+    
+    def render(translations: List[Optional[str]]) -> str:
+        result = copy.deepcopy(data)
+        for path, translation in zip(paths, translations):
+            if translation is None:
+                continue
+            if not path:
+                result = translation
+                continue
+            node = result
+            for key in path[:-1]:
+                node = node[key]
+            node[path[-1]] = translation
+        text = json.dumps(result, ensure_ascii=False, indent=indent)
+        return text + '\n' if content.endswith('\n') else text
+    
+    return TranslatableFile(segments, render)
+
+
+# Format name -> parser
+FORMATS: Dict[str, Callable[[str], TranslatableFile]] = {
+    'text': parse_text,
+    'srt': parse_subtitles,
+    'vtt': parse_subtitles,
+    'po': parse_po,
+    'json': parse_json,
+}
+
+_EXTENSIONS = {
+    '.srt': 'srt',
+    '.vtt': 'vtt',
+    '.po': 'po',
+    '.pot': 'po',
+    '.json': 'json',
+}
+
+
+def detect_format(path: Path) -> str:
+    """
+    Get the format of a file from its extension
+    
+    Args:
+        path: File path
+        
+    Returns:
+        Format name (see FORMATS); unknown extensions are plain text
+    """
+    return _EXTENSIONS.get(Path(path).suffix.lower(), 'text')
+
+
+def parse_file(content: str, file_format: str) -> TranslatableFile:
+    """
+    Parse file content
+    
+    Args:
+        content: File content (line breaks normalized to '\\n')
+        file_format: Format name (see FORMATS)
+        
+    Returns:
+        TranslatableFile
+    """
+    if file_format not in FORMATS:
+        raise Exception(f"Unsupported file format: {file_format}")
+    return FORMATS[file_format](content)
@@ -0,0 +1,310 @@
+"""
+Bulk file translation with resumable checkpoints (lingo translate-files)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from lingosnap.utils.file_formats import detect_format, parse_file
+from lingosnap.utils.profiling import span
+from lingosnap.utils.streaming import stream_lines
+
+
+class CheckpointStore:
+    """
+    Translated segments of unfinished file jobs in ~/.lingosnap/checkpoints.db
+    
+    A job is one input file translated to one output with one engine and
+    target language. Its segments are saved while batches complete, so an
+    interrupted job only translates the segments that were still missing.
+    A job whose input file changed starts over.
+    """
+    
+    def __init__(self, db_dir: Optional[Path] = None):
+        """
+        Initialize checkpoint store
+        
+        Args:
+            db_dir: Directory of the database (default: ~/.lingosnap)
+        """
+        self.db_dir = Path(db_dir) if db_dir is not None else Path.home() / '.lingosnap'
+        self.db_file = self.db_dir / 'checkpoints.db'
+        self._lock = threading.Lock()
+        self._init_database()
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_file), timeout=5)
+    
+    def _init_database(self):
+        """Create database and tables if they don't exist"""
+        self.db_dir.mkdir(parents=True, exist_ok=True)
+        
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                segments INTEGER NOT NULL,
+                updated REAL NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS segments (
+                job TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                translation TEXT NOT NULL,
+                PRIMARY KEY (job, idx)
+            )
+        ''')
+        conn.commit()
+        conn.close()
+    
+    def load(self, job: str, digest: str, segments: int) -> Dict[int, str]:
+        """
+        Start or resume a job
+        
+        Args:
+            job: Job key (see job_key())
+            digest: Digest of the input file
+            segments: Number of segments of the input file
+            
+        Returns:
+            Translations saved by earlier runs, by segment index (empty if
+            the job is new or its input changed)
+        """
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('SELECT digest, segments FROM jobs WHERE job = ?', (job,))
+            row = cursor.fetchone()
+            if row != (digest, segments):
+                cursor.execute('DELETE FROM segments WHERE job = ?', (job,))
+            cursor.execute('''
+                INSERT OR REPLACE INTO jobs (job, digest, segments, updated)
+                VALUES (?, ?, ?, ?)
+            ''', (job, digest, segments, time.time()))
+            conn.commit()
+            
+            cursor.execute('SELECT idx, translation FROM segments WHERE job = ?', (job,))
+            translations = dict(cursor.fetchall())
+            conn.close()
+            return translations
+    
+    def save(self, job: str, translations: List[Tuple[int, str]]):
+        """
+        Save translated segments in one transaction
+        
+        Args:
+            job: Job key
+            translations: (segment index, translation) pairs
+        """
+        if not translations:
+            return
+        with self._lock, span('checkpoint.write', segments=len(translations)):
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO segments (job, idx, translation) VALUES (?, ?, ?)
+            ''', [(job, index, translation) for index, translation in translations])
+            cursor.execute('UPDATE jobs SET updated = ? WHERE job = ?', (time.time(), job))
+            conn.commit()
+            conn.close()
+    
+    def delete(self, job: str):
+        """
+        Forget a job (after its output was written)
+        
+        Args:
+            job: Job key
+        """
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM segments WHERE job = ?', (job,))
+            cursor.execute('DELETE FROM jobs WHERE job = ?', (job,))
+            conn.commit()
+            conn.close()
+
+
+def job_key(path: Path, output: Path, engine_type: str, target_lang: str) -> str:
+    """
+    Identify a file job
+    
+    Args:
+        path: Input file
+        output: Output file
+        engine_type: Engine name
+        target_lang: Target language code
+        
+    Returns:
+        Key of the job's checkpoint
+    """
+    parts = [str(Path(path).resolve()), str(Path(output).resolve()), engine_type, target_lang]
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+def default_output_path(path: Path, target_lang: str, output_dir: Optional[Path] = None) -> Path:
+    """
+    Get the output file of an input file
+    
+    Args:
+        path: Input file (e.g. movie.srt)
+        target_lang: Target language code
+        output_dir: Directory of the output (default: next to the input)
+        
+    Returns:
+        Path such as movie.de.srt (templates become catalogs:
+        messages.pot -> messages.de.po)
+    """
+    path = Path(path)
+    suffix = '.po' if path.suffix.lower() == '.pot' else path.suffix
+    name = f'{path.stem}.{target_lang}{suffix}'
+    return (Path(output_dir) if output_dir is not None else path.parent) / name
+
+
+class FileJobResult:
+    """Outcome of one translated file"""
+    
+    def __init__(self, path: Path, output: Path, segments: int):
+        self.path = path
+        self.output = output
+        self.segments = segments
+        self.resumed = 0
+        self.translated = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.seconds = 0.0
+    
+    @property
+    def rate(self) -> float:
+        """Segments translated per second in this run"""
+        return self.translated / self.seconds if self.seconds > 0 else 0.0
+    
+    @property
+    def complete(self) -> bool:
+        """Whether every segment is translated and the output was written"""
+        return self.failed == 0
+
+
+class FileTranslator:
+    """
+    Translates files segment by segment through a pool of batches
+    
+    Segments that are not in the checkpoint go through stream_lines(), so at
+    most 2 * max_workers batches are in flight. Translations are
+    checkpointed at least every checkpoint_interval seconds. The output is
+    only written once every segment is translated; a file with failed
+    segments keeps its checkpoint, so the next run retries just those.
+    """
+    
+    def __init__(self, translate_batch: Callable[[List[str]], List], engine_type: str,
+                 target_lang: str, store: Optional[CheckpointStore] = None,
+                 max_workers: int = 4, max_batch_chars: int = 1000,
+                 checkpoint_interval: float = 1.0):
+        """
+        Initialize file translator
+        
+        Args:
+            translate_batch: Function translating a list of texts (see
+                stream_lines())
+            engine_type: Engine name (part of the checkpoint key)
+            target_lang: Target language code (part of the checkpoint key)
+            store: Checkpoint store (default: ~/.lingosnap/checkpoints.db)
+            max_workers: Batches translated at the same time
+            max_batch_chars: Character limit of a batch
+            checkpoint_interval: Seconds between checkpoint writes
+        """
+        self.translate_batch = translate_batch
+        self.engine_type = engine_type
+        self.target_lang = target_lang
+        self.store = store if store is not None else CheckpointStore()
+        self.max_workers = max_workers
+        self.max_batch_chars = max_batch_chars
+        self.checkpoint_interval = checkpoint_interval
+    
+    def translate_file(self, path: Path, output: Path, file_format: Optional[str] = None,
+                       restart: bool = False,
+                       on_progress: Optional[Callable[[FileJobResult, int], None]] = None
+                       ) -> FileJobResult:
+        """
+        Translate one file
+        
+        Args:
+            path: Input file
+            output: Output file (written atomically when complete)
+            file_format: Format name (default: from the extension)
+            restart: Ignore the checkpoint of an earlier run
+            on_progress: Called with the result so far and the number of
+                segments done (including resumed ones) after every segment
+                
+        Returns:
+            FileJobResult
+        """
+        path = Path(path)
+        output = Path(output)
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            raw = f.read()
+        newline = '\r\n' if '\r\n' in raw else '\n'
+        parsed = parse_file(raw.replace('\r\n', '\n'), file_format or detect_format(path))
+        segments = parsed.segments
+        
+        result = FileJobResult(path, output, len(segments))
+        job = job_key(path, output, self.engine_type, self.target_lang)
+        if restart:
+            self.store.delete(job)
+        digest = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+        translations: List[Optional[str]] = [None] * len(segments)
+        for index, translation in self.store.load(job, digest, len(segments)).items():
+            if 0 <= index < len(segments):
+                translations[index] = translation
+                result.resumed += 1
+        
+        todo = [i for i, translation in enumerate(translations) if translation is None]
+        started = time.monotonic()
+        unsaved: List[Tuple[int, str]] = []
+        saved_at = started
+        done = result.resumed
+        stream = stream_lines(self.translate_batch, (segments[i] for i in todo),
+                              max_workers=self.max_workers,
+                              max_batch_chars=self.max_batch_chars)
+        try:
+            for index, (_, translation) in zip(todo, stream):
+                done += 1
+                if isinstance(translation, Exception):
+                    result.failed += 1
+                    if len(result.errors) < 5:
+                        result.errors.append(str(translation))
+                else:
+                    translations[index] = translation
+                    result.translated += 1
+                    unsaved.append((index, translation))
+                
+                now = time.monotonic()
+                result.seconds = now - started
+                if unsaved and now - saved_at >= self.checkpoint_interval:
+                    self.store.save(job, unsaved)
+                    unsaved = []
+                    saved_at = now
+                if on_progress is not None:
+                    on_progress(result, done)
+        finally:
+            stream.close()
+            self.store.save(job, unsaved)
+            result.seconds = time.monotonic() - started
+        
+        if result.failed:
+            return result
+        
+        output.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = output.with_name(output.name + '.tmp')
+        with open(temp_file, 'w', encoding='utf-8', newline=newline) as f:
+            f.write(parsed.render(translations))
+        os.replace(temp_file, output)
+        self.store.delete(job)
+        return result
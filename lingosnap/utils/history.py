@@ -5,18 +5,46 @@ Translation history database management
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
+from lingosnap.utils.profiling import span
 
 
 class HistoryDatabase:
     """SQLite database for translation history"""
     
-    def __init__(self):
-        """Initialize history database"""
-        self.db_dir = Path.home() / '.lingosnap'
+    def __init__(self, db_dir: Optional[Path] = None):
+        """
+        Initialize history database
+        
+        Args:
+            db_dir: Directory of history.db (default: ~/.lingosnap)
+        """
+        self.db_dir = Path(db_dir) if db_dir is not None else Path.home() / '.lingosnap'
         self.db_file = self.db_dir / 'history.db'
+        
+        # Callbacks notified of changes: listener(event, payload) with
+        # ('add', entry), ('delete', entry_id) or ('clear', None)
+        self._listeners: List[Callable[[str, object], None]] = []
+        
         self._init_database()
     
+    def add_listener(self, listener: Callable[[str, object], None]):
+        """
+        Register a callback notified after every change
+        
+        Args:
+            listener: Function called as listener(event, payload)
+        """
+        self._listeners.append(listener)
+    
+    def _notify(self, event: str, payload):
+        """Call the listeners; a failing listener must not break history"""
+        for listener in self._listeners:
+            try:
+                listener(event, payload)
+            except Exception:
+                pass
+    
     def _init_database(self):
         """Create database and tables if they don't exist"""
         try:
@@ -34,10 +62,16 @@ class HistoryDatabase:
                     source_lang TEXT NOT NULL,
                     target_lang TEXT NOT NULL,
                     source_text TEXT NOT NULL,
-                    translated_text TEXT NOT NULL
+                    translated_text TEXT NOT NULL,
+                    engine TEXT NOT NULL DEFAULT ''
                 )
             ''')
             
+            # Databases created before the engine column was added
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(history)')}
+            if 'engine' not in columns:
+                cursor.execute("ALTER TABLE history ADD COLUMN engine TEXT NOT NULL DEFAULT ''")
+            
             # Create index on timestamp for faster queries
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_timestamp 
@@ -50,7 +84,7 @@ class HistoryDatabase:
             raise Exception(f"Failed to initialize database: {str(e)}")
     
     def add_entry(self, source_lang: str, target_lang: str, 
-                  source_text: str, translated_text: str):
+                  source_text: str, translated_text: str, engine: str = '') -> int:
         """
         Add a translation entry to history
         
@@ -59,23 +93,40 @@ class HistoryDatabase:
             target_lang: Target language code
             source_text: Original text
             translated_text: Translated text
+            engine: Name of the engine that produced the translation
+            
+        Returns:
+            ID of the new entry
         """
         try:
-            conn = sqlite3.connect(str(self.db_file))
-            cursor = conn.cursor()
-            
-            timestamp = datetime.now().isoformat()
-            
-            cursor.execute('''
-                INSERT INTO history 
-                (timestamp, source_lang, target_lang, source_text, translated_text)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (timestamp, source_lang, target_lang, source_text, translated_text))
-            
-            conn.commit()
-            conn.close()
+            with span('history.write'):
+                conn = sqlite3.connect(str(self.db_file))
+                cursor = conn.cursor()
+                
+                timestamp = datetime.now().isoformat()
+                
+                cursor.execute('''
+                    INSERT INTO history 
+                    (timestamp, source_lang, target_lang, source_text, translated_text, engine)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (timestamp, source_lang, target_lang, source_text, translated_text, engine))
+                entry_id = cursor.lastrowid
+                
+                conn.commit()
+                conn.close()
         except Exception as e:
             raise Exception(f"Failed to add history entry: {str(e)}")
+        
+        self._notify('add', {
+            'id': entry_id,
+            'timestamp': timestamp,
+            'source_lang': source_lang,
+            'target_lang': target_lang,
+            'source_text': source_text,
+            'translated_text': translated_text,
+            'engine': engine
+        })
+        return entry_id
     
     def get_history(self, limit: int = 100) -> List[Dict]:
         """
@@ -93,7 +144,7 @@ class HistoryDatabase:
             
             cursor.execute('''
                 SELECT id, timestamp, source_lang, target_lang, 
-                       source_text, translated_text
+                       source_text, translated_text, engine
                 FROM history
                 ORDER BY timestamp DESC
                 LIMIT ?
@@ -109,7 +160,8 @@ class HistoryDatabase:
                     'source_lang': row[2],
                     'target_lang': row[3],
                     'source_text': row[4],
-                    'translated_text': row[5]
+                    'translated_text': row[5],
+                    'engine': row[6]
                 }
                 for row in rows
             ]
@@ -126,6 +178,8 @@ class HistoryDatabase:
             conn.close()
         except Exception as e:
             raise Exception(f"Failed to clear history: {str(e)}")
+        
+        self._notify('clear', None)
     
     def delete_entry(self, entry_id: int):
         """
@@ -142,3 +196,5 @@ class HistoryDatabase:
             conn.close()
         except Exception as e:
             raise Exception(f"Failed to delete entry: {str(e)}")
+        
+        self._notify('delete', entry_id)
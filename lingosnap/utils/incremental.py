@@ -0,0 +1,207 @@
+"""
+Incremental re-translation of edited texts
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from lingosnap.utils.segmentation import ends_sentence, split_segments, join_segments
+from lingosnap.utils.streaming import stream_batch
+
+
+class SegmentMap:
+    """
+    Per-sentence translations of the last translated text
+    
+    translate() splits the new text into sentences, reuses the translation
+    of every sentence that was already in the previous text and sends only
+    the added or changed sentences to the engine (as one batch), so the
+    cost of re-translating an edited text grows with the edit, not with the
+    text.
+    
+    translate() may run in worker threads; the engine is called without
+    holding the lock, so a superseded call can finish while a newer one is
+    running.
+    """
+    
+    # Minimum seconds between two progress callbacks
+    PROGRESS_INTERVAL = 0.05
+    
+    def __init__(self, mode: str = 'sentence',
+                 on_latency: Optional[Callable[[float], None]] = None):
+        """
+        Initialize segment map
+        
+        Args:
+            mode: Segment boundaries, 'sentence' or 'paragraph'
+            on_latency: Called with the duration of every engine call (in
+                seconds, from the calling thread)
+        """
+        self.mode = mode
+        self.on_latency = on_latency
+        self._key: Optional[Tuple[str, str, str]] = None
+        self._translations: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        
+        # Counters of the last translate() call
+        self.reused = 0
+        self.translated = 0
+        self.chars_sent = 0
+    
+    def reset(self):
+        """Forget all segment translations"""
+        with self._lock:
+            self._key = None
+            self._translations = {}
+    
+    def translate(self, engine, text: str, source_lang: str, target_lang: str,
+                  on_progress: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Translate text, re-translating only segments not seen last time
+        
+        Args:
+            engine: Translation engine
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            on_progress: Called with the partial translation (untranslated
+                segments still in the source language) as segments
+                complete; segments are then streamed in growing batches
+                instead of one batch
+                
+        Returns:
+            Translated text with the original whitespace and line breaks
+        """
+        key = (engine.name, source_lang, target_lang)
+        segments = split_segments(text, self.mode)
+        
+        with self._lock:
+            if key != self._key:
+                self._key = key
+                self._translations = {}
+            known = {segment: self._translations[segment]
+                     for segment, _ in segments if segment in self._translations}
+        
+        missing = list(dict.fromkeys(
+            segment for segment, _ in segments
+            if segment and segment not in known
+        ))
+        
+        error: Optional[Exception] = None
+        started = time.monotonic()
+        if missing and on_progress is not None:
+            last_progress = 0.0
+            remaining = len(missing)
+            for i, result in stream_batch(engine, missing, source_lang, target_lang):
+                remaining -= 1
+                if isinstance(result, Exception):
+                    error = error or result
+                    continue
+                known[missing[i]] = result
+                now = time.monotonic()
+                if remaining and now - last_progress >= self.PROGRESS_INTERVAL:
+                    last_progress = now
+                    on_progress(join_segments(
+                        [known.get(segment, segment) for segment, _ in segments], segments
+                    ))
+        elif missing:
+            results: List[Union[str, Exception]] = engine.translate_batch(
+                missing, source_lang, target_lang
+            )
+            for segment, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    error = error or result
+                else:
+                    known[segment] = result
+        if missing and self.on_latency is not None:
+            self.on_latency(time.monotonic() - started)
+        
+        with self._lock:
+            self.translated = len(missing)
+            self.chars_sent = sum(len(segment) for segment in missing)
+            self.reused = sum(1 for segment, _ in segments if segment) - self.translated
+            
+            # Keep only the segments of the current text
+            if key == self._key:
+                self._translations = known
+        
+        if error is not None:
+            raise error
+        
+        return join_segments(
+            [known[segment] if segment else '' for segment, _ in segments], segments
+        )
+    
+    def prefetch(self, engine, text: str, source_lang: str, target_lang: str) -> int:
+        """
+        Translate the complete sentences of a text that is still being typed
+        
+        The last sentence is skipped unless it is complete (see
+        ends_sentence). Translations are stored for a later translate() of
+        the same text; translations of sentences that are no longer in the
+        text are dropped. Failed sentences are left for translate().
+        
+        Args:
+            engine: Translation engine
+            text: Text as typed so far
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Number of sentences sent to the engine
+        """
+        key = (engine.name, source_lang, target_lang)
+        segments = [segment for segment, _ in split_segments(text, self.mode) if segment]
+        if segments and not ends_sentence(text):
+            segments.pop()
+        
+        with self._lock:
+            if key != self._key:
+                self._key = key
+                self._translations = {}
+            missing = list(dict.fromkeys(
+                segment for segment in segments if segment not in self._translations
+            ))
+        if not missing:
+            return 0
+        
+        started = time.monotonic()
+        results = engine.translate_batch(missing, source_lang, target_lang)
+        if self.on_latency is not None:
+            self.on_latency(time.monotonic() - started)
+        
+        with self._lock:
+            if key == self._key:
+                current = set(segments)
+                self._translations = {
+                    segment: translation for segment, translation in self._translations.items()
+                    if segment in current
+                }
+                for segment, result in zip(missing, results):
+                    if not isinstance(result, Exception):
+                        self._translations[segment] = result
+        return len(missing)
+
+
+def splice_range(old: str, new: str) -> Tuple[int, int, str]:
+    """
+    Smallest replacement turning one text into another
+    
+    Args:
+        old: Current text
+        new: Wanted text
+        
+    Returns:
+        Tuple (start, end, replacement): replacing old[start:end] by
+        replacement gives new
+    """
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    
+    suffix = 0
+    while suffix < limit - start and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    
+    return start, len(old) - suffix, new[start:len(new) - suffix]
@@ -0,0 +1,686 @@
+"""
+Offline language detection from Unicode scripts and character trigrams
+"""
+
+import bisect
+import math
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+
+# (first codepoint, last codepoint, script)
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, 'Latin'),
+    (0x0061, 0x007A, 'Latin'),
+    (0x00C0, 0x024F, 'Latin'),
+    (0x0370, 0x03FF, 'Greek'),
+    (0x0400, 0x052F, 'Cyrillic'),
+    (0x0530, 0x058F, 'Armenian'),
+    (0x0590, 0x05FF, 'Hebrew'),
+    (0x0600, 0x06FF, 'Arabic'),
+    (0x0750, 0x077F, 'Arabic'),
+    (0x0900, 0x097F, 'Devanagari'),
+    (0x0980, 0x09FF, 'Bengali'),
+    (0x0A00, 0x0A7F, 'Gurmukhi'),
+    (0x0A80, 0x0AFF, 'Gujarati'),
+    (0x0B80, 0x0BFF, 'Tamil'),
+    (0x0C00, 0x0C7F, 'Telugu'),
+    (0x0C80, 0x0CFF, 'Kannada'),
+    (0x0D00, 0x0D7F, 'Malayalam'),
+    (0x0D80, 0x0DFF, 'Sinhala'),
+    (0x0E00, 0x0E7F, 'Thai'),
+    (0x0E80, 0x0EFF, 'Lao'),
+    (0x1000, 0x109F, 'Myanmar'),
+    (0x10A0, 0x10FF, 'Georgian'),
+    (0x1100, 0x11FF, 'Hangul'),
+    (0x1200, 0x137F, 'Ethiopic'),
+    (0x1780, 0x17FF, 'Khmer'),
+    (0x1E00, 0x1EFF, 'Latin'),
+    (0x3040, 0x309F, 'Hiragana'),
+    (0x30A0, 0x30FF, 'Katakana'),
+    (0x3130, 0x318F, 'Hangul'),
+    (0x3400, 0x4DBF, 'Han'),
+    (0x4E00, 0x9FFF, 'Han'),
+    (0xAC00, 0xD7AF, 'Hangul'),
+    (0xF900, 0xFAFF, 'Han'),
+    (0xFF66, 0xFF9F, 'Katakana'),
+]
+
+# Scripts written by (practically) a single supported language
+SCRIPT_LANGUAGES = {
+    'Greek': 'el',
+    'Armenian': 'hy',
+    'Hebrew': 'he',
+    'Devanagari': 'hi',
+    'Bengali': 'bn',
+    'Gurmukhi': 'pa',
+    'Gujarati': 'gu',
+    'Tamil': 'ta',
+    'Telugu': 'te',
+    'Kannada': 'kn',
+    'Malayalam': 'ml',
+    'Sinhala': 'si',
+    'Thai': 'th',
+    'Lao': 'lo',
+    'Myanmar': 'my',
+    'Georgian': 'ka',
+    'Hangul': 'ko',
+    'Ethiopic': 'am',
+    'Khmer': 'km',
+}
+
+# Seed text per language for scripts shared by several languages; the
+# trigram profiles are built from these on first use
+SEED_TEXTS = {
+    'Latin': {
+        'en': "The quick brown fox jumps over the lazy dog. This is a simple "
+              "sentence that we can use to show how the language works. What "
+              "do you want to do today? I think they would like to have it, "
+              "but there is nothing here for them. Please check your settings "
+              "and try again with the new file.",
+        'fr': "Le renard brun saute par-dessus le chien paresseux. C'est une "
+              "phrase simple que nous pouvons utiliser pour montrer comment la "
+              "langue fonctionne. Qu'est-ce que vous voulez faire aujourd'hui ? "
+              "Je pense qu'ils aimeraient l'avoir, mais il n'y a rien ici pour "
+              "eux. Veuillez vérifier vos paramètres et réessayer avec le "
+              "nouveau fichier.",
+        'de': "Der schnelle braune Fuchs springt über den faulen Hund. Das ist "
+              "ein einfacher Satz, mit dem wir zeigen können, wie die Sprache "
+              "funktioniert. Was möchtest du heute machen? Ich glaube, sie "
+              "würden es gerne haben, aber hier ist nichts für sie. Bitte "
+              "überprüfen Sie Ihre Einstellungen und versuchen Sie es mit der "
+              "neuen Datei noch einmal.",
+        'es': "El rápido zorro marrón salta sobre el perro perezoso. Esta es "
+              "una frase sencilla que podemos usar para mostrar cómo funciona "
+              "el idioma. ¿Qué quieres hacer hoy? Creo que les gustaría "
+              "tenerlo, pero aquí no hay nada para ellos. Por favor, revise su "
+              "configuración y vuelva a intentarlo con el nuevo archivo.",
+        'it': "La rapida volpe marrone salta sopra il cane pigro. Questa è una "
+              "frase semplice che possiamo usare per mostrare come funziona la "
+              "lingua. Che cosa vuoi fare oggi? Penso che vorrebbero averlo, "
+              "ma qui non c'è niente per loro. Per favore controlla le tue "
+              "impostazioni e riprova con il nuovo file.",
+        'pt': "A rápida raposa marrom pula sobre o cão preguiçoso. Esta é uma "
+              "frase simples que podemos usar para mostrar como a língua "
+              "funciona. O que você quer fazer hoje? Acho que eles gostariam "
+              "de ter isso, mas não há nada aqui para eles. Por favor, "
+              "verifique as suas configurações e tente novamente com o novo "
+              "arquivo.",
+        'nl': "De snelle bruine vos springt over de luie hond. Dit is een "
+              "eenvoudige zin die we kunnen gebruiken om te laten zien hoe de "
+              "taal werkt. Wat wil je vandaag doen? Ik denk dat ze het graag "
+              "zouden hebben, maar er is hier niets voor hen. Controleer uw "
+              "instellingen en probeer het opnieuw met het nieuwe bestand.",
+        'sv': "Den snabba bruna räven hoppar över den lata hunden. Det här är "
+              "en enkel mening som vi kan använda för att visa hur språket "
+              "fungerar. Vad vill du göra i dag? Jag tror att de skulle vilja "
+              "ha det, men det finns ingenting här för dem. Kontrollera dina "
+              "inställningar och försök igen med den nya filen.",
+        'da': "Den hurtige brune ræv hopper over den dovne hund. Dette er en "
+              "enkel sætning, som vi kan bruge til at vise, hvordan sproget "
+              "fungerer. Hvad vil du lave i dag? Jeg tror, at de gerne vil "
+              "have det, men der er ikke noget her til dem. Kontroller dine "
+              "indstillinger, og prøv igen med den nye fil. Adgang nægtet. Du "
+              "har ikke tilladelse til at ændre denne fil. Kommandoen blev ikke "
+              "fundet. Vil du fortsætte? Mappen findes ikke, og den kunne ikke "
+              "oprettes. Noget gik galt under gemningen, men dine ændringer er "
+              "bevaret. Hvis problemet fortsætter, kan du kontakte support.",
+        'fi': "Nopea ruskea kettu hyppää laiskan koiran yli. Tämä on "
+              "yksinkertainen lause, jonka avulla voimme näyttää, miten kieli "
+              "toimii. Mitä haluat tehdä tänään? Luulen, että he haluaisivat "
+              "sen, mutta täällä ei ole mitään heille. Tarkista asetuksesi ja "
+              "yritä uudelleen uudella tiedostolla.",
+        'pl': "Szybki brązowy lis przeskakuje nad leniwym psem. To jest proste "
+              "zdanie, którego możemy użyć, aby pokazać, jak działa język. Co "
+              "chcesz dzisiaj robić? Myślę, że chcieliby to mieć, ale nie ma "
+              "tu nic dla nich. Sprawdź swoje ustawienia i spróbuj ponownie z "
+              "nowym plikiem.",
+        'cs': "Rychlá hnědá liška skáče přes líného psa. Toto je jednoduchá "
+              "věta, kterou můžeme použít, abychom ukázali, jak jazyk funguje. "
+              "Co chceš dnes dělat? Myslím, že by to chtěli mít, ale není tu "
+              "pro ně nic. Zkontrolujte prosím své nastavení a zkuste to znovu "
+              "s novým souborem.",
+        'hu': "A gyors barna róka átugrik a lusta kutya felett. Ez egy "
+              "egyszerű mondat, amellyel megmutathatjuk, hogyan működik a "
+              "nyelv. Mit szeretnél ma csinálni? Azt hiszem, szeretnék "
+              "megkapni, de itt nincs semmi számukra. Kérjük, ellenőrizze a "
+              "beállításait, és próbálja újra az új fájllal.",
+        'ro': "Vulpea maro rapidă sare peste câinele leneș. Aceasta este o "
+              "propoziție simplă pe care o putem folosi pentru a arăta cum "
+              "funcționează limba. Ce vrei să faci astăzi? Cred că ar vrea să "
+              "îl aibă, dar aici nu este nimic pentru ei. Vă rugăm să "
+              "verificați setările și să încercați din nou cu fișierul nou.",
+        'tr': "Hızlı kahverengi tilki tembel köpeğin üzerinden atlar. Bu, "
+              "dilin nasıl çalıştığını göstermek için kullanabileceğimiz basit "
+              "bir cümledir. Bugün ne yapmak istiyorsun? Sanırım bunu almak "
+              "isterler, ama burada onlar için hiçbir şey yok. Lütfen "
+              "ayarlarınızı kontrol edin ve yeni dosyayla tekrar deneyin.",
+        'id': "Rubah cokelat yang cepat melompati anjing yang malas. Ini adalah "
+              "kalimat sederhana yang bisa kita gunakan untuk menunjukkan "
+              "bagaimana bahasa ini bekerja. Apa yang ingin kamu lakukan hari "
+              "ini? Saya pikir mereka ingin memilikinya, tetapi tidak ada apa "
+              "pun di sini untuk mereka. Silakan periksa pengaturan Anda dan "
+              "coba lagi dengan berkas yang baru.",
+        'vi': "Con cáo nâu nhanh nhẹn nhảy qua con chó lười. Đây là một câu "
+              "đơn giản mà chúng ta có thể dùng để cho thấy ngôn ngữ hoạt động "
+              "như thế nào. Hôm nay bạn muốn làm gì? Tôi nghĩ họ muốn có nó, "
+              "nhưng ở đây không có gì cho họ. Vui lòng kiểm tra cài đặt của "
+              "bạn và thử lại với tệp mới.",
+        'ca': "La ràpida guineu marró salta per sobre del gos mandrós. Aquesta "
+              "és una frase senzilla que podem fer servir per mostrar com "
+              "funciona la llengua. Què vols fer avui? Crec que els agradaria "
+              "tenir-ho, però aquí no hi ha res per a ells. Si us plau, "
+              "comproveu la configuració i torneu-ho a provar amb el fitxer "
+              "nou.",
+        'no': "Den raske brune reven hopper over den late hunden. Dette er en "
+              "enkel setning som vi kan bruke til å vise hvordan språket "
+              "fungerer. Hva vil du gjøre i dag? Jeg tror at de gjerne vil ha "
+              "det, men det finnes ingenting her for dem. Kontroller "
+              "innstillingene dine og prøv igjen med den nye filen. Tilgang "
+              "nektet. Du har ikke tillatelse til å endre denne filen. "
+              "Kommandoen ble ikke funnet. Vil du fortsette? Mappen finnes "
+              "ikke, og den kunne ikke opprettes. Noe gikk galt under "
+              "lagringen, men endringene dine er tatt vare på. Hvis problemet "
+              "vedvarer, kan du kontakte brukerstøtten.",
+        'sk': "Rýchla hnedá líška skáče cez lenivého psa. Toto je jednoduchá "
+              "veta, ktorú môžeme použiť na to, aby sme ukázali, ako funguje "
+              "jazyk. Čo chceš dnes robiť? Myslím si, že by to chceli mať, ale "
+              "nie je tu pre nich nič. Skontrolujte, prosím, svoje nastavenia "
+              "a skúste to znova s novým súborom.",
+        'hr': "Brza smeđa lisica skače preko lijenog psa. Ovo je jednostavna "
+              "rečenica koju možemo koristiti da pokažemo kako jezik "
+              "funkcionira. Što želiš raditi danas? Mislim da bi to htjeli "
+              "imati, ali ovdje nema ništa za njih. Molimo provjerite svoje "
+              "postavke i pokušajte ponovno s novom datotekom.",
+        'sl': "Hitra rjava lisica skoči čez lenega psa. To je preprost stavek, "
+              "s katerim lahko pokažemo, kako deluje jezik. Kaj želiš početi "
+              "danes? Mislim, da bi to radi imeli, vendar tukaj zanje ni "
+              "ničesar. Preverite svoje nastavitve in poskusite znova z novo "
+              "datoteko.",
+        'lv': "Ātrā brūnā lapsa pārlec pāri slinkajam sunim. Šis ir vienkāršs "
+              "teikums, ko varam izmantot, lai parādītu, kā darbojas valoda. "
+              "Ko tu šodien vēlies darīt? Es domāju, ka viņi to gribētu, bet "
+              "šeit viņiem nekā nav. Lūdzu, pārbaudiet savus iestatījumus un "
+              "mēģiniet vēlreiz ar jauno failu.",
+        'lt': "Greita ruda lapė peršoka per tingų šunį. Tai paprastas "
+              "sakinys, kurį galime naudoti norėdami parodyti, kaip veikia "
+              "kalba. Ką nori šiandien veikti? Manau, kad jie norėtų tai "
+              "turėti, bet čia jiems nieko nėra. Patikrinkite savo nustatymus "
+              "ir bandykite dar kartą su nauju failu.",
+        'et': "Kiire pruun rebane hüppab üle laisa koera. See on lihtne lause, "
+              "mille abil saame näidata, kuidas keel töötab. Mida sa täna "
+              "teha tahad? Ma arvan, et nad tahaksid seda saada, aga siin pole "
+              "nende jaoks midagi. Palun kontrollige oma seadeid ja proovige "
+              "uue failiga uuesti.",
+        'sw': "Mbweha mwepesi wa kahawia anaruka juu ya mbwa mvivu. Hii ni "
+              "sentensi rahisi ambayo tunaweza kuitumia kuonyesha jinsi lugha "
+              "inavyofanya kazi. Unataka kufanya nini leo? Nadhani wangependa "
+              "kuwa nayo, lakini hakuna kitu hapa kwa ajili yao. Tafadhali "
+              "angalia mipangilio yako na ujaribu tena na faili jipya.",
+        'tl': "Ang mabilis na kayumangging soro ay tumatalon sa tamad na aso. "
+              "Ito ay isang simpleng pangungusap na magagamit natin upang "
+              "ipakita kung paano gumagana ang wika. Ano ang gusto mong gawin "
+              "ngayon? Sa tingin ko gusto nilang magkaroon nito, ngunit walang "
+              "anuman dito para sa kanila. Pakisuri ang iyong mga setting at "
+              "subukang muli gamit ang bagong file.",
+        'af': "Die vinnige bruin jakkals spring oor die lui hond. Dit is 'n "
+              "eenvoudige sin wat ons kan gebruik om te wys hoe die taal werk. "
+              "Wat wil jy vandag doen? Ek dink hulle sal dit graag wil hê, maar "
+              "hier is niks vir hulle nie. Gaan asseblief jou instellings na en "
+              "probeer weer met die nuwe lêer.",
+        'gl': "O raposo marrón rápido salta sobre o can preguiceiro. Esta é "
+              "unha frase sinxela que podemos usar para amosar como funciona a "
+              "lingua. Que queres facer hoxe? Coido que lles gustaría telo, "
+              "pero aquí non hai nada para eles. Por favor, revisa a túa "
+              "configuración e téntao de novo co novo ficheiro.",
+        'ms': "Musang perang yang pantas melompat ke atas anjing yang malas. "
+              "Ini ialah ayat mudah yang boleh kita gunakan untuk menunjukkan "
+              "bagaimana bahasa ini berfungsi. Apakah yang anda mahu lakukan "
+              "hari ini? Saya fikir mereka mahu memilikinya, tetapi tiada "
+              "apa-apa di sini untuk mereka. Sila semak tetapan anda dan cuba "
+              "lagi dengan fail baharu.",
+    },
+    'Cyrillic': {
+        'ru': "Быстрая коричневая лиса прыгает через ленивую собаку. Это "
+              "простое предложение, которое мы можем использовать, чтобы "
+              "показать, как работает язык. Что ты хочешь сделать сегодня? "
+              "Я думаю, что они хотели бы это получить, но здесь для них "
+              "ничего нет. Пожалуйста, проверьте свои настройки и попробуйте "
+              "ещё раз с новым файлом.",
+        'uk': "Швидка коричнева лисиця стрибає через ледачого пса. Це просте "
+              "речення, яке ми можемо використати, щоб показати, як працює "
+              "мова. Що ти хочеш зробити сьогодні? Я думаю, що вони хотіли б "
+              "це мати, але тут для них нічого немає. Будь ласка, перевірте "
+              "свої налаштування і спробуйте ще раз з новим файлом.",
+        'bg': "Бързата кафява лисица прескача мързеливото куче. Това е "
+              "просто изречение, което можем да използваме, за да покажем как "
+              "работи езикът. Какво искаш да правиш днес? Мисля, че те биха "
+              "искали да го имат, но тук няма нищо за тях. Моля, проверете "
+              "настройките си и опитайте отново с новия файл.",
+    },
+    'Arabic': {
+        'ar': "الثعلب البني السريع يقفز فوق الكلب الكسول. هذه جملة بسيطة "
+              "يمكننا استخدامها لنوضح كيف تعمل اللغة. ماذا تريد أن تفعل "
+              "اليوم؟ أعتقد أنهم يودون الحصول عليه، لكن لا يوجد شيء هنا "
+              "لهم. يرجى التحقق من الإعدادات والمحاولة مرة أخرى مع الملف "
+              "الجديد.",
+        'fa': "روباه قهوه ای سریع از روی سگ تنبل می پرد. این یک جمله ساده "
+              "است که می توانیم از آن برای نشان دادن چگونگی کار زبان استفاده "
+              "کنیم. امروز می خواهی چه کار کنی؟ فکر می کنم آنها دوست دارند "
+              "آن را داشته باشند، اما اینجا چیزی برای آنها نیست. لطفا "
+              "تنظیمات خود را بررسی کنید و دوباره با فایل جدید امتحان کنید.",
+        'ur': "تیز بھوری لومڑی سست کتے کے اوپر سے چھلانگ لگاتی ہے۔ یہ ایک "
+              "سادہ جملہ ہے جسے ہم یہ دکھانے کے لیے استعمال کر سکتے ہیں کہ "
+              "زبان کیسے کام کرتی ہے۔ آج آپ کیا کرنا چاہتے ہیں؟ میرا خیال ہے "
+              "کہ وہ اسے لینا چاہیں گے، لیکن یہاں ان کے لیے کچھ نہیں ہے۔ "
+              "براہ کرم اپنی ترتیبات چیک کریں اور نئی فائل کے ساتھ دوبارہ "
+              "کوشش کریں۔",
+    },
+}
+
+# Frequent words, added to the seed texts so short inputs score well
+COMMON_WORDS = {
+    'en': "the of and to in is you that it was for on are with as they at be "
+          "this have from or one had by but not what all were when we there "
+          "can your which their if do will how up out them then she so these "
+          "would other has more her him see time could no make than been who "
+          "now people my over only way find use may long very after just where "
+          "know get back much go good new our me too any day right look think "
+          "also come work well here take why help error warning failed file "
+          "hello okay yes thanks please open close",
+    'fr': "le la les de des du un une et est en que qui dans pour pas sur au "
+          "avec ce il elle nous vous ils sont mais ou plus par je ne se son "
+          "sa ses leur cette tout fait être avoir bonjour merci oui non erreur "
+          "fichier impossible",
+    'de': "der die das und ist nicht zu den mit von sich des auf für im dem "
+          "ein eine einen es ich sie er wir ihr auch an als wie noch nach aus "
+          "bei nur oder aber wenn kann wird werden hallo danke ja nein fehler "
+          "datei konnte",
+    'es': "el la los las de del y en que un una es por con no se para su al "
+          "lo como más pero sus le ya o este sí porque esta entre cuando muy "
+          "sin sobre también hola gracias error archivo puede",
+    'it': "il lo la i gli le di del della e è che un una per non in con si da "
+          "al come ma più anche sono questo questa ci sul nel ciao grazie sì "
+          "errore file impossibile",
+    'pt': "o a os as de do da dos das e é que um uma em no na para com não se "
+          "por mais como mas ao ele ela são seu sua isso também você olá "
+          "obrigado sim erro arquivo",
+    'nl': "de het een en van is dat op te in zijn niet met voor er die aan "
+          "ook als maar om dan bij nog uit wel naar kan worden hallo dank ja "
+          "nee fout bestand",
+    'sv': "och i att det som en på är av för med till den har inte om ett var "
+          "jag han hon vi de men så kan från hej tack ja nej fel filen",
+    'da': "og i at det som en på er af for med til den har ikke om et var jeg "
+          "han hun vi de men så kan fra hvad hvordan hvor noget også kun "
+          "eller efter nu skal blive hej tak ja nej fejl filen mappen findes",
+    'fi': "ja on ei se että oli hän ovat kun mutta tai myös jo niin kuin nyt "
+          "vain minä sinä me he tämä mikä hei kiitos kyllä virhe tiedosto",
+    'pl': "i w nie na się z do to że jest jak ale co po tak za od o jego jej "
+          "są dla być który czy już tylko cześć dziękuję tak błąd plik",
+    'cs': "a v se na je že to s z do jsem jako ale o by pro jeho její jsou "
+          "už jen když nebo ahoj děkuji ano ne chyba soubor",
+    'hu': "a az és hogy nem is egy van meg de ez csak már volt mint el ki be "
+          "fel még sem szia köszönöm igen hiba fájl",
+    'ro': "și în de la nu cu un o este pe că din se care ce mai sunt pentru "
+          "dar fost acest această bună mulțumesc da eroare fișier",
+    'tr': "ve bir bu da de için ile ne çok daha ama gibi var olan ben sen o "
+          "biz siz onlar değil merhaba teşekkürler evet hayır hata dosya",
+    'id': "yang dan di ke dari ini itu dengan untuk tidak ada akan pada juga "
+          "saya kami mereka adalah bisa sudah halo terima kasih ya kesalahan "
+          "berkas",
+    'vi': "và của là có trong không được cho một những với người này đã các "
+          "khi để tôi bạn chúng xin chào cảm ơn lỗi tệp thư mục máy chủ kết "
+          "nối thử lại sau vui lòng không thể tìm thấy xảy ra",
+    'ca': "el la els les de i a que en un una és per amb no es del al com més "
+          "però hi ha aquest aquesta també hola gràcies sí error fitxer",
+    'no': "og i det som en på er av for med til den har ikke om et var jeg "
+          "han hun vi de men så kan fra hva hvordan hvor noe også bare eller "
+          "etter nå skal blir hei takk ja nei feil filen mappen",
+    'sk': "a v sa na je že to s z do som ako ale o by pre jeho jej sú už len "
+          "keď alebo nie ahoj ďakujem áno chyba súbor priečinok",
+    'hr': "i u je se na da za su od ne sa to koji kao ali što ili iz bi ja "
+          "ti on ona mi vi oni bio biti može nije bok hvala greška pogreška "
+          "datoteka mapa",
+    'sl': "in je v se na da za so ne z s to ki kot ali kaj iz bi jaz ti on "
+          "ona mi vi oni bil biti lahko ni živjo hvala ja napaka datoteka "
+          "mapa",
+    'lv': "un ir ar uz par no kā ka lai bet vai tas tā es tu viņš viņa mēs "
+          "jūs viņi nav bija var arī tikai sveiki paldies jā nē kļūda fails "
+          "neizdevās",
+    'lt': "ir yra kad su į iš ne o bet kaip tai aš tu jis ji mes jūs jie "
+          "buvo gali taip pat tik labas ačiū klaida failas nepavyko",
+    'et': "ja on ei see et oli ta nad kui aga või ka juba nii nagu nüüd "
+          "ainult mina sina meie teie tere aitäh jah viga fail ebaõnnestus",
+    'sw': "na ya wa kwa ni za katika la kuwa hii hiyo yake lakini kama au "
+          "sana mimi wewe yeye sisi ninyi wao hakuna hapana ndiyo habari "
+          "asante hitilafu faili imeshindwa haiwezi",
+    'tl': "ang ng sa na at mga ay si ni ko mo ka siya kami tayo sila hindi "
+          "oo po ito iyan iyon para kung may wala lang rin din kamusta "
+          "salamat mali nabigo",
+    'af': "die en van is in dat het nie met op vir te was sy hy ek jy ons "
+          "hulle maar of kan sal wat hoe hallo dankie ja nee fout lêer",
+    'gl': "o a os as de do da dos das e é que un unha en no na para con non "
+          "se por máis como pero ao el ela son seu súa iso tamén ti ola "
+          "grazas si erro ficheiro cartafol",
+    'ms': "yang dan di ke dari ini itu dengan untuk tidak ada akan pada juga "
+          "saya kami mereka ialah boleh sudah helo terima kasih ya ralat fail "
+          "tiada",
+    'ru': "и в не на я что он с как а то все она так его но да ты к у же вы "
+          "за бы по только ее мне было вот от меня еще нет о из ему теперь "
+          "когда даже ну вдруг ли если уже или ни быть был него до вас нибудь "
+          "этот этом нужно можно сейчас который которые очень время день "
+          "работа слово место вопрос дом страна мир случай часть город "
+          "привет спасибо ошибка файл найден не удалось открыть доступ "
+          "отказано запрещён каталог сервер подключение памяти такого",
+    'uk': "і в не на я що він з як а то все вона так його але так ти до у же "
+          "ви за б по тільки її мені було от від мене ще немає про із йому "
+          "тепер коли навіть якщо вже або бути був привіт дякую помилка файл "
+          "знайдено не вдалося відкрити доступ відмовлено заборонено каталог "
+          "сервер підключення пам'яті такого",
+    'bg': "и в не на аз че той с като а то всички тя така него но да ти към "
+          "у вие за би по само нея ми беше от мен още няма за от му сега "
+          "когато дори ако вече или съм бъде здравей благодаря грешка файлът "
+          "неуспешно отваряне достъпът отказан директория сървър връзка "
+          "паметта такъв",
+    'ar': "في من على إلى أن هذا التي الذي عن مع كان هو هي لا ما هل كل بعد "
+          "قد ذلك مرحبا شكرا نعم خطأ ملف",
+    'fa': "و در به از که این را با است برای آن یک خود تا می شود بود هم یا "
+          "نه اما سلام ممنون بله خطا فایل",
+    'ur': "اور میں کے کی ہے کو سے یہ نہیں کہ ایک پر ہیں تھا وہ بھی کر تو "
+          "ہو گا جو سلام شکریہ ہاں غلطی فائل",
+}
+
+# Letters beyond ASCII of every profiled language (whole alphabet for
+# non-Latin scripts). A letter outside the best language's set means the
+# text is in another language, usually one without a profile.
+ALPHABETS = {
+    'en': '',
+    'fr': 'àâæçéèêëîïôœùûüÿ',
+    'de': 'äöüß',
+    'es': 'áéíñóúü',
+    'it': 'àèéìíîòóùú',
+    'pt': 'áâãàçéêíóôõú',
+    'nl': 'áéíóúàèëïöü',
+    'sv': 'åäöé',
+    'da': 'æøåé',
+    'no': 'æøåéèêóòô',
+    'fi': 'äöåšž',
+    'pl': 'ąćęłńóśźż',
+    'cs': 'áčďéěíňóřšťúůýž',
+    'sk': 'áäčďéíĺľňóôŕšťúýž',
+    'hu': 'áéíóöőúüű',
+    'ro': 'ăâîșțşţ',
+    'tr': 'çğıöşüâîû',
+    'id': 'é',
+    'vi': 'àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđ',
+    'ca': 'àçèéíïòóúü',
+    'hr': 'čćđšž',
+    'sl': 'čšž',
+    'lv': 'āčēģīķļņšūž',
+    'lt': 'ąčęėįšųūž',
+    'et': 'äöõüšž',
+    'sw': '',
+    'tl': 'ñ',
+    'af': 'áéèêëíîïóôöúûü',
+    'gl': 'áéíóúñü',
+    'ms': '',
+    'ru': 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя',
+    'uk': 'абвгґдеєжзиіїйклмнопрстуфхцчшщьюя',
+    'bg': 'абвгдежзийклмнопрстуфхцчшщъьюя',
+    'ar': 'ءآأؤإئابةتثجحخدذرزسشصضطظعغفقكلمنهوىي',
+    'fa': 'ءآأؤئابپتثجچحخدذرزژسشصضطظعغفقکگكلمنوهیية',
+    'ur': 'ءآأؤئابپتٹثجچحخدڈذرڑزژسشصضطظعغفقکگلمنںوہھیےۃۓ',
+}
+
+# Characters that only exist in one of the two Chinese scripts
+SIMPLIFIED_ONLY = set('这们国会来时说为个对与学开关体点还后发经过让从见现无样当应问题机认电话书长车东门间头边听写读买卖气实义欢钱爱')
+TRADITIONAL_ONLY = set('這們國會來時說為個對與學開關體點還後發經過讓從見現無樣當應問題機認電話書長車東門間頭邊聽寫讀買賣氣實義歡錢愛')
+
+
+class LanguageDetector:
+    """
+    Offline language detector
+    
+    The dominant Unicode script decides the language for scripts used by
+    a single language (Hangul, Thai, Greek, ...) and tells Chinese from
+    Japanese. Scripts shared by several languages (Latin, Cyrillic, Arabic)
+    are resolved with naive Bayes over character trigrams. All language
+    profiles are stored in one table mapping trigram -> row of per-language
+    log probabilities, so an input is scored against every candidate
+    language with one dictionary lookup per trigram.
+    
+    Naive Bayes always ranks some profiled language first, even for short
+    lines and for languages without a profile, so detect() only answers
+    when the guess is safe and returns None otherwise. Callers then leave
+    the source language to the translation service ('auto').
+    """
+    
+    # Only the start of long inputs is analyzed
+    MAX_CHARS = 1000
+    
+    # Fewer letters than this in a shared script are not enough to tell
+    # its languages apart ("ok", "Permission denied", ...)
+    MIN_LETTERS = 16
+    
+    # Minimum confidence of the best language
+    MIN_CONFIDENCE = 0.9
+    
+    def __init__(self, seed_texts: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Initialize detector (profiles are built on first use)
+        
+        Args:
+            seed_texts: Mapping script -> {language_code: sample text}
+        """
+        self.seed_texts = seed_texts if seed_texts is not None else SEED_TEXTS
+        self._range_starts = [start for start, _, _ in SCRIPT_RANGES]
+        self._profiles = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _words(text: str) -> List[str]:
+        """Split lowercase text into words of letters only"""
+        words = []
+        for word in text.lower().split():
+            word = ''.join(char for char in word if char.isalpha())
+            if word:
+                words.append(word)
+        return words
+    
+    @classmethod
+    def _trigrams(cls, text: str) -> Counter:
+        """Count the trigrams of every word, padded with spaces"""
+        counts = Counter()
+        for word in cls._words(text):
+            padded = f' {word} '
+            counts.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return counts
+    
+    def _get_profiles(self) -> Dict[str, tuple]:
+        """
+        Build (once) the trigram tables of every shared script
+        
+        Returns:
+            Mapping script -> (languages, trigram -> log probability row,
+            log probability row of unseen trigrams, language -> known
+            words, language -> known letters)
+        """
+        with self._lock:
+            if self._profiles is None:
+                profiles = {}
+                for script, samples in self.seed_texts.items():
+                    languages = sorted(samples)
+                    texts = [samples[code] + ' ' + COMMON_WORDS.get(code, '')
+                             for code in languages]
+                    counts = [self._trigrams(text) for text in texts]
+                    vocabulary = set().union(*counts)
+                    totals = [sum(count.values()) + len(vocabulary) for count in counts]
+                    
+                    # Add-one smoothing
+                    unseen = [math.log(1 / total) for total in totals]
+                    table = {
+                        trigram: [math.log((count[trigram] + 1) / total)
+                                  for count, total in zip(counts, totals)]
+                        for trigram in vocabulary
+                    }
+                    words = {code: set(self._words(text))
+                             for code, text in zip(languages, texts)}
+                    letters = {code: set(''.join(words[code])) | set(ALPHABETS.get(code, ''))
+                               for code in languages}
+                    profiles[script] = (languages, table, unseen, words, letters)
+                self._profiles = profiles
+            return self._profiles
+    
+    def _script_of(self, char: str) -> Optional[str]:
+        """Look up the script of a character"""
+        codepoint = ord(char)
+        index = bisect.bisect_right(self._range_starts, codepoint) - 1
+        if index >= 0:
+            start, end, script = SCRIPT_RANGES[index]
+            if codepoint <= end:
+                return script
+        return None
+    
+    def _rank(self, text: str) -> Tuple[List[Tuple[str, float]], Optional[str], int]:
+        """
+        Rank every candidate language of a text
+        
+        Returns:
+            (ranked (language_code, confidence) pairs, shared script the
+            ranking comes from or None if the script decided, number of
+            letters)
+        """
+        text = text[:self.MAX_CHARS]
+        scripts = Counter(self._script_of(char) for char in text if char.isalpha())
+        scripts.pop(None, None)
+        letters = sum(scripts.values())
+        if not letters:
+            return [], None, 0
+        
+        # Kana mixed with Han is Japanese
+        cjk = scripts.pop('Hiragana', 0) + scripts.pop('Katakana', 0)
+        if cjk:
+            scripts['Japanese'] = cjk + scripts.pop('Han', 0)
+        
+        script, count = scripts.most_common(1)[0]
+        share = count / letters
+        
+        if script == 'Japanese':
+            return [('ja', share)], None, letters
+        if script == 'Han':
+            simplified = sum(1 for char in text if char in SIMPLIFIED_ONLY)
+            traditional = sum(1 for char in text if char in TRADITIONAL_ONLY)
+            return [('zh-tw' if traditional > simplified else 'zh', share)], None, letters
+        if script in SCRIPT_LANGUAGES:
+            return [(SCRIPT_LANGUAGES[script], share)], None, letters
+        
+        profiles = self._get_profiles()
+        if script not in profiles:
+            return [], None, letters
+        
+        languages, table, unseen, _, _ = profiles[script]
+        scores = [0.0] * len(languages)
+        for trigram, occurrences in self._trigrams(text).items():
+            row = table.get(trigram, unseen)
+            scores = [score + occurrences * value for score, value in zip(scores, row)]
+        
+        # Posterior over the candidate languages (softmax of log likelihoods)
+        best = max(scores)
+        weights = [math.exp(score - best) for score in scores]
+        total = sum(weights)
+        ranked = sorted(
+            ((code, share * weight / total) for code, weight in zip(languages, weights)),
+            key=lambda item: item[1],
+            reverse=True
+        )
+        return ranked, script, letters
+    
+    def detect_scores(self, text: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """
+        Rank the most likely languages of a text
+        
+        The ranking is not filtered: the best candidate may be a poor
+        guess (see detect()).
+        
+        Args:
+            text: Text to analyze
+            limit: Maximum number of candidates returned
+            
+        Returns:
+            List of (language_code, confidence) pairs, best first; empty if
+            the text contains no letters. Confidences are between 0 and 1.
+        """
+        return self._rank(text)[0][:limit]
+    
+    def _is_profiled(self, text: str, script: str, code: str) -> bool:
+        """
+        Check that a text looks like the profiled language it scored best
+        
+        Languages without a profile (Icelandic, Basque, Serbian, ...) still
+        score best for some profiled language. Their words are not among
+        the words seen for it, and they often use letters outside its
+        alphabet.
+        """
+        _, _, _, known_words, known_letters = self._get_profiles()[script]
+        words = self._words(text[:self.MAX_CHARS])
+        if not any(word in known_words[code] for word in words):
+            return False
+        # ASCII letters are left out: loanwords and names use all of them
+        return all(char in known_letters[code] or char.isascii()
+                   for word in words for char in word)
+    
+    def detect(self, text: str) -> Optional[str]:
+        """
+        Detect the language of a text
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Language code (ISO 639-1, 'zh-tw' for Traditional Chinese) or
+            None if the language cannot be told with enough confidence
+            (no letters, too few letters, a close call between profiled
+            languages, or a language without a profile)
+        """
+        ranked, script, letters = self._rank(text)
+        if not ranked:
+            return None
+        code, confidence = ranked[0]
+        if confidence < self.MIN_CONFIDENCE:
+            return None
+        if script is not None:
+            if letters < self.MIN_LETTERS or not self._is_profiled(text, script, code):
+                return None
+        return code
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_detector() -> LanguageDetector:
+    """
+    Get the shared detector instance
+    
+    Returns:
+        LanguageDetector
+    """
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = LanguageDetector()
+        return _detector
+
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    Detect the language of a text with the shared detector
+    
+    Args:
+        text: Text to analyze
+        
+    Returns:
+        Language code or None if it cannot be told with enough confidence
+    """
+    return get_detector().detect(text)
@@ -0,0 +1,200 @@
+"""
+Shared language registry
+"""
+
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Codes that name the same language differently per engine. Google codes
+# are the canonical form (used by the 'auto' router and the settings).
+ENGINE_ALIASES = {
+    'google': {'zh': 'zh-cn', 'jv': 'jw'},
+    'argos': {'zh-cn': 'zh', 'zh-tw': 'zh', 'iw': 'he', 'jw': 'jv'},
+}
+
+# Engine code -> canonical (Google) code
+CANONICAL_ALIASES = {'zh': 'zh-cn', 'he': 'iw', 'jv': 'jw'}
+
+
+def to_engine_code(code: str, engine_name: str) -> str:
+    """
+    Convert a language code to the form an engine uses
+    
+    Args:
+        code: Language code in any engine's form
+        engine_name: Target engine name ('google', 'argos', ...)
+        
+    Returns:
+        Code understood by the engine (unchanged if no alias applies)
+    """
+    if not code:
+        return code
+    code = code.lower()
+    return ENGINE_ALIASES.get(engine_name, {}).get(code, code)
+
+
+def to_canonical_code(code: str) -> str:
+    """
+    Convert an engine's language code to the canonical (Google) form
+    
+    Args:
+        code: Language code
+        
+    Returns:
+        Canonical code
+    """
+    if not code:
+        return code
+    code = code.lower()
+    return CANONICAL_ALIASES.get(code, code)
+
+
+class LanguageSet:
+    """Languages of one engine, sorted by name, with O(1) code lookup"""
+    
+    def __init__(self, languages: List[Tuple[str, str]]):
+        """
+        Initialize language set
+        
+        Args:
+            languages: List of tuples (language_code, language_name)
+        """
+        unique = {}
+        for code, name in languages:
+            unique.setdefault(code, name)
+        self.languages = sorted(unique.items(), key=lambda x: x[1])
+        self._index = {code: i for i, (code, _) in enumerate(self.languages)}
+    
+    def __len__(self) -> int:
+        return len(self.languages)
+    
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return iter(self.languages)
+    
+    def __contains__(self, code: str) -> bool:
+        return code in self._index
+    
+    def __getitem__(self, index: int) -> Tuple[str, str]:
+        return self.languages[index]
+    
+    def index_of(self, code: str) -> int:
+        """
+        Position of a language in the sorted list
+        
+        Args:
+            code: Language code
+            
+        Returns:
+            Index, or -1 if the language is not in the set
+        """
+        return self._index.get(code, -1)
+    
+    def name_of(self, code: str) -> Optional[str]:
+        """
+        Display name of a language
+        
+        Args:
+            code: Language code
+            
+        Returns:
+            Language name or None
+        """
+        index = self._index.get(code)
+        return None if index is None else self.languages[index][1]
+    
+    def codes(self) -> List[str]:
+        """
+        Get the language codes in display order
+        
+        Returns:
+            List of codes
+        """
+        return [code for code, _ in self.languages]
+
+
+class LanguageRegistry:
+    """
+    Cache of every engine's supported languages
+    
+    Engines are keyed by name, so decorated engines share the entry of the
+    engine they wrap. Call invalidate() after the installed languages
+    changed (e.g. an Argos package was installed).
+    """
+    
+    def __init__(self):
+        """Initialize empty registry"""
+        self._sets: Dict[str, LanguageSet] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, engine) -> LanguageSet:
+        """
+        Get the languages of an engine, loading them on first use
+        
+        Args:
+            engine: Translation engine
+            
+        Returns:
+            LanguageSet of the engine
+        """
+        with self._lock:
+            languages = self._sets.get(engine.name)
+            if languages is None:
+                languages = LanguageSet(engine.get_supported_languages())
+                self._sets[engine.name] = languages
+            return languages
+    
+    def invalidate(self, engine_name: Optional[str] = None):
+        """
+        Drop cached languages
+        
+        Args:
+            engine_name: Engine to drop (None drops every engine, which also
+                covers engines such as the router that combine others)
+        """
+        with self._lock:
+            if engine_name is None:
+                self._sets.clear()
+            else:
+                self._sets.pop(engine_name, None)
+    
+    def normalize(self, code: str, engine) -> Optional[str]:
+        """
+        Convert a language code for an engine and check it is supported
+        
+        Args:
+            code: Language code in any engine's form ('auto' is kept)
+            engine: Translation engine
+            
+        Returns:
+            Engine code, or None if the engine does not support the language
+        """
+        if code == 'auto':
+            return code
+        converted = to_engine_code(code, engine.name)
+        languages = self.get(engine)
+        if converted in languages:
+            return converted
+        # e.g. a stored 'he' for an engine that only knows 'iw'
+        canonical = to_canonical_code(code)
+        if canonical in languages:
+            return canonical
+        return None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> LanguageRegistry:
+    """
+    Get the shared registry instance
+    
+    Returns:
+        LanguageRegistry
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LanguageRegistry()
+        return _registry
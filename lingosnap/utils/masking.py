@@ -0,0 +1,340 @@
+"""
+Do-not-translate masking of paths, URLs, identifiers and glossary terms
+"""
+
+import re
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+# Spans that must come back from the engine unchanged. Each pattern is a
+# named group of one compiled alternation; the longest match at a position
+# wins.
+DEFAULT_PATTERNS = [
+    ('url', r'\b(?:https?|ftp|file)://[^\s<>"\']*[^\s<>"\'.,;:!?)\]]'),
+    ('email', r'\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b'),
+    ('unix_path', r'(?<![\w/])(?:~|\.{1,2})?/(?:[\w.@+-]+/)*[\w.@+-]+/?'),
+    ('windows_path', r'\b[A-Za-z]:\\(?:[^\\\s]+\\)*[^\\\s]*'),
+    ('uuid', r'\b[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}\b'),
+    ('hex', r'\b0x[0-9a-fA-F]+\b|\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{7,}\b'),
+    ('ip', r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'),
+    ('backticks', r'`[^`\n]+`'),
+    # printf and format-string placeholders and markup tags (PO and JSON
+    # catalogs, subtitles)
+    ('format', r'%(?:\([\w.]+\))?[-+#0]*\d*(?:\.\d+)?[sdifFgGeExXcru]'
+               r'|\{\{\s*[\w.]+\s*\}\}|\{[A-Za-z_][\w.]*(?:[:!][^{}\s]*)?\}'),
+    ('markup', r'</?[A-Za-z][\w-]*(?:\s[^<>]*)?/?>'),
+    ('dotted', r'\b[A-Za-z_]\w+(?:\.[A-Za-z_]\w+)+(?:\(\))?'),
+    ('snake_case', r'\b[A-Za-z]\w*_\w+\b'),
+    ('camel_case', r'\b[a-z]+[A-Z]\w*\b'),
+    ('flag', r'(?<![\w-])--?[A-Za-z][\w-]*'),
+    ('number', r'\b\d+(?:[.,:]\d+)*\b'),
+    # Existing placeholder-like text must not be confused with ours
+    ('placeholder', r'\{\d+\}'),
+]
+
+# Numbers shorter than this are left in the text (no savings, rarely mangled)
+MIN_NUMBER_LENGTH = 4
+
+_PLACEHOLDER = re.compile(r'[{｛]\s*(\d+)\s*[}｝]')
+
+
+def _fold(text: str) -> str:
+    """
+    Lowercase text one character at a time
+    
+    str.lower() can change the length ('İ' becomes two code points), which
+    would shift every offset after it.
+    
+    Args:
+        text: Text to lowercase
+        
+    Returns:
+        Lowercased text of the same length
+    """
+    return ''.join(char.lower()[:1] for char in text)
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton finding many literal terms in one pass
+    
+    Matching is case-insensitive and only reports whole words (a term
+    next to a letter or digit is ignored).
+    """
+    
+    def __init__(self, terms: List[str]):
+        """
+        Build the automaton
+        
+        Args:
+            terms: Literal terms to find
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self.terms = [term for term in dict.fromkeys(terms) if term]
+        
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in _fold(term):
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+        
+        # Breadth-first construction of the failure links
+        queue = list(self._goto[0].values())
+        while queue:
+            state = queue.pop(0)
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = (self._output[next_state] +
+                                            self._output[self._fail[next_state]])
+    
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Find every whole-word occurrence of the terms
+        
+        Args:
+            text: Text to search
+            
+        Yields:
+            (start, end, term) for every match (overlapping matches included)
+        """
+        state = 0
+        for position, char in enumerate(_fold(text)):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                term = self.terms[index]
+                start = position - len(term) + 1
+                end = position + 1
+                if (start > 0 and text[start - 1].isalnum() and term[0].isalnum()) or \
+                        (end < len(text) and text[end].isalnum() and term[-1].isalnum()):
+                    continue
+                yield start, end, term
+
+
+class Masker:
+    """
+    Replaces do-not-translate spans with numbered placeholders
+    
+    Spans are found with an Aho-Corasick automaton over the glossary terms
+    and one compiled regular expression for the built-in patterns. They are
+    replaced by '{0}', '{1}', ... before translation and restored (or
+    replaced by the glossary translation) afterwards.
+    """
+    
+    def __init__(self, glossary: Optional[Dict[str, Union[None, str, Dict[str, str]]]] = None,
+                 patterns: Optional[List[Tuple[str, str]]] = None,
+                 min_number_length: int = MIN_NUMBER_LENGTH):
+        """
+        Initialize masker
+        
+        Args:
+            glossary: Terms never sent to the engine. The value is None (keep
+                the term), a fixed translation, or a dict mapping target
+                language codes to translations.
+            patterns: (name, regex) pairs (default: DEFAULT_PATTERNS)
+            min_number_length: Shortest number that is masked
+        """
+        self.glossary = {term.lower(): value for term, value in (glossary or {}).items()}
+        self.min_number_length = min_number_length
+        self._terms = AhoCorasick(list((glossary or {}).keys())) if glossary else None
+        
+        patterns = DEFAULT_PATTERNS if patterns is None else patterns
+        self._pattern = re.compile('|'.join(
+            f'(?P<{name}>{regex})' for name, regex in patterns
+        )) if patterns else None
+        
+        self._lock = threading.Lock()
+        self.texts = 0
+        self.spans = 0
+        self.chars_saved = 0
+        self.skipped = 0
+        self.fallbacks = 0
+    
+    @classmethod
+    def from_config(cls, config) -> 'Masker':
+        """
+        Create a masker from the application configuration
+        
+        Args:
+            config: Config instance
+            
+        Returns:
+            Masker instance
+        """
+        return cls(
+            glossary=config.get('masking_glossary', {}),
+            min_number_length=config.get('masking_min_number_length', MIN_NUMBER_LENGTH)
+        )
+    
+    def find_spans(self, text: str) -> List[Tuple[int, int, Optional[str]]]:
+        """
+        Find the non-overlapping spans to mask
+        
+        Args:
+            text: Text to scan
+            
+        Returns:
+            Sorted list of (start, end, glossary_term or None)
+        """
+        candidates = []
+        if self._terms is not None:
+            for start, end, term in self._terms.finditer(text):
+                candidates.append((start, end, term.lower()))
+        
+        if self._pattern is not None:
+            position = 0
+            while position < len(text):
+                match = self._pattern.search(text, position)
+                if match is None:
+                    break
+                start, end = match.span()
+                if end == start:
+                    position = start + 1
+                    continue
+                if match.lastgroup != 'number' or end - start >= self.min_number_length:
+                    candidates.append((start, end, None))
+                # Allow shorter alternatives nested in a skipped number
+                position = end if match.lastgroup != 'number' else start + 1
+        
+        # Leftmost-longest, without overlaps
+        candidates.sort(key=lambda span: (span[0], -(span[1] - span[0])))
+        spans = []
+        last_end = 0
+        for start, end, term in candidates:
+            if start >= last_end:
+                spans.append((start, end, term))
+                last_end = end
+        return spans
+    
+    def mask(self, text: str, target_lang: str) -> Tuple[str, List[str]]:
+        """
+        Replace do-not-translate spans with placeholders
+        
+        Args:
+            text: Text to mask
+            target_lang: Target language (selects glossary translations)
+            
+        Returns:
+            Tuple (masked_text, replacements) where replacements[i] is the
+            text placeholder {i} stands for in the translation
+        """
+        spans = self.find_spans(text)
+        if not spans:
+            return text, []
+        
+        pieces = []
+        replacements = []
+        position = 0
+        for start, end, term in spans:
+            pieces.append(text[position:start])
+            pieces.append('{%d}' % len(replacements))
+            replacements.append(self._replacement(text[start:end], term, target_lang))
+            position = end
+        pieces.append(text[position:])
+        return ''.join(pieces), replacements
+    
+    def _replacement(self, original: str, term: Optional[str], target_lang: str) -> str:
+        """Text to put back for a span"""
+        if term is None:
+            return original
+        value = self.glossary.get(term)
+        if isinstance(value, dict):
+            value = value.get(target_lang) or value.get(target_lang.split('-')[0])
+        return value if value else original
+    
+    @staticmethod
+    def restore(translated: str, replacements: List[str]) -> Optional[str]:
+        """
+        Put the masked spans back into a translation
+        
+        Args:
+            translated: Translation of the masked text
+            replacements: Replacements returned by mask()
+            
+        Returns:
+            Restored text, or None if placeholders were lost, duplicated or
+            invented by the engine
+        """
+        if not replacements:
+            return translated
+        
+        seen = []
+        for match in _PLACEHOLDER.finditer(translated):
+            seen.append(int(match.group(1)))
+        if sorted(seen) != list(range(len(replacements))):
+            return None
+        return _PLACEHOLDER.sub(lambda m: replacements[int(m.group(1))], translated)
+    
+    @staticmethod
+    def is_only_placeholders(masked: str) -> bool:
+        """
+        Check whether nothing translatable is left
+        
+        Args:
+            masked: Masked text
+            
+        Returns:
+            True if the text has no letters outside placeholders
+        """
+        return not any(char.isalpha() for char in _PLACEHOLDER.sub('', masked))
+    
+    def record(self, original: str, masked: str, replacements: List[str],
+               skipped: bool = False):
+        """
+        Count a masked text
+        
+        Args:
+            original: Text before masking
+            masked: Text sent to the engine
+            replacements: Replacements returned by mask()
+            skipped: Whether the engine was not called at all
+        """
+        with self._lock:
+            self.texts += 1
+            self.spans += len(replacements)
+            self.chars_saved += len(original) - (0 if skipped else len(masked))
+            if skipped:
+                self.skipped += 1
+    
+    def record_fallback(self):
+        """Count a translation that had to be repeated without masking"""
+        with self._lock:
+            self.fallbacks += 1
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get masking statistics
+        
+        Returns:
+            Dictionary with texts, spans, chars_saved, skipped and fallbacks
+        """
+        with self._lock:
+            return {
+                'texts': self.texts,
+                'spans': self.spans,
+                'chars_saved': self.chars_saved,
+                'skipped': self.skipped,
+                'fallbacks': self.fallbacks,
+            }
+    
+    def reset_stats(self):
+        """Reset masking statistics"""
+        with self._lock:
+            self.texts = self.spans = self.chars_saved = 0
+            self.skipped = self.fallbacks = 0
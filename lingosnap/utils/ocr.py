@@ -2,9 +2,12 @@
 OCR functionality using Tesseract
 """
 
-import pytesseract
-from PIL import Image
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
+from lingosnap.utils.profiling import span
+
+# pytesseract and PIL are imported on first use, keeping them out of startup
+if TYPE_CHECKING:
+    from PIL import Image
 
 
 class OCREngine:
@@ -21,10 +24,11 @@ class OCREngine:
         Args:
             path: Path to tesseract executable
         """
+        import pytesseract
         self.tesseract_cmd = path
         pytesseract.pytesseract.tesseract_cmd = path
     
-    def extract_text(self, image: Image.Image, lang: str = 'eng') -> str:
+    def extract_text(self, image: 'Image.Image', lang: str = 'eng') -> str:
         """
         Extract text from image using OCR
         
@@ -35,6 +39,7 @@ class OCREngine:
         Returns:
             Extracted text
         """
+        import pytesseract
         try:
             # Perform OCR with optimized config for faster processing
             # PSM 3 = Fully automatic page segmentation (default)
@@ -43,12 +48,14 @@ class OCREngine:
             
             # Add timeout to prevent hanging
             # Tesseract can sometimes hang on certain images
-            text = pytesseract.image_to_string(
-                image, 
-                lang=lang,
-                config=config,
-                timeout=30  # 30 second timeout
-            )
+            # Includes writing the image as PNG and starting tesseract
+            with span('ocr.tesseract', pixels=image.width * image.height):
+                text = pytesseract.image_to_string(
+                    image, 
+                    lang=lang,
+                    config=config,
+                    timeout=30  # 30 second timeout
+                )
             return text.strip()
         except pytesseract.TesseractError as e:
             # Tesseract-specific error
@@ -69,6 +76,7 @@ class OCREngine:
             Extracted text
         """
         try:
+            from PIL import Image
             image = Image.open(image_path)
             return self.extract_text(image, lang)
         except Exception as e:
@@ -82,6 +90,7 @@ class OCREngine:
             True if Tesseract is installed and accessible
         """
         try:
+            import pytesseract
             pytesseract.get_tesseract_version()
             return True
         except Exception:
@@ -95,6 +104,7 @@ class OCREngine:
             List of language codes
         """
         try:
+            import pytesseract
             langs = pytesseract.get_languages()
             return langs
         except Exception:
@@ -0,0 +1,314 @@
+"""
+Profiling of translations and OCR (cProfile plus per-stage wall-clock spans)
+"""
+
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+_DISABLED = nullcontext()
+
+# Thread IDs of lanes (see Profiler.span) start here, far above real ones
+_LANE_TID_BASE = 1 << 40
+
+
+class Profiler:
+    """
+    Records where the time of an operation goes
+    
+    span() records the wall-clock time of one stage (an HTTP request, a
+    SQLite write, a Tesseract run, ...) in any thread. operation() marks a
+    user-visible unit of work (a translation, an OCR capture, a lingo run):
+    it is a span as well, and its own thread runs under cProfile, written to
+    ~/.lingosnap/profiles/<session>-<n>-<operation>.prof (open with snakeviz
+    or pstats). All spans of the session are written to
+    <session>-trace.json in the Chrome trace event format (open with
+    speedscope, Perfetto or chrome://tracing) whenever an operation ends.
+    
+    While disabled, span() and operation() return a shared no-op context
+    manager, so instrumented code costs next to nothing.
+    """
+    
+    # Spans kept per session (older ones are dropped first)
+    MAX_SPANS = 100000
+    
+    def __init__(self, profile_dir: Optional[Path] = None, enabled: bool = False,
+                 max_files: int = 100):
+        """
+        Initialize profiler
+        
+        Args:
+            profile_dir: Output directory (default: ~/.lingosnap/profiles)
+            enabled: Whether to record from the start
+            max_files: Number of .prof files kept (oldest are deleted)
+        """
+        self.profile_dir = (Path(profile_dir) if profile_dir is not None
+                            else Path.home() / '.lingosnap' / 'profiles')
+        self.max_files = max_files
+        self.enabled = enabled
+        
+        self.session = time.strftime('%Y%m%d-%H%M%S') + f'-{os.getpid()}'
+        self._started = time.perf_counter()
+        self._spans: List[Dict] = []
+        self._threads: Dict[int, str] = {}
+        self._lanes: Dict[str, List[bool]] = {}
+        self._operations = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    @classmethod
+    def from_config(cls, config) -> 'Profiler':
+        """
+        Create a profiler from the profiling_* settings
+        
+        Args:
+            config: Config instance
+            
+        Returns:
+            Profiler instance
+        """
+        return cls(enabled=config.get('profiling_enabled', False),
+                   max_files=config.get('profile_max_files', 100))
+    
+    def set_enabled(self, enabled: bool):
+        """
+        Start or stop recording
+        
+        Args:
+            enabled: Whether spans and operations are recorded
+        """
+        self.enabled = enabled
+    
+    @property
+    def trace_file(self) -> Path:
+        """Chrome trace of this session"""
+        return self.profile_dir / f'{self.session}-trace.json'
+    
+    def span(self, name: str, lane: Optional[str] = None, **args):
+        """
+        Time one stage
+        
+        Args:
+            name: Stage name ('google.http', 'history.write', ...)
+            lane: Show the span on a named lane instead of the calling
+                thread; use for stages that overlap on one thread, such as
+                requests on an event loop
+            **args: Values shown with the span (e.g. chars=120)
+            
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._span(name, lane, args)
+    
+    @contextmanager
+    def _span(self, name: str, lane: Optional[str], args: Dict) -> Iterator[None]:
+        """Record a span when the with block ends"""
+        if lane is not None:
+            tid = self._acquire_lane(lane)
+        else:
+            thread = threading.current_thread()
+            tid = thread.native_id or thread.ident
+            with self._lock:
+                self._threads.setdefault(tid, thread.name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            if lane is not None:
+                self._release_lane(lane, tid)
+            event = {
+                'name': name,
+                'ph': 'X',
+                'ts': round((started - self._started) * 1e6, 1),
+                'dur': round((ended - started) * 1e6, 1),
+                'pid': os.getpid(),
+                'tid': tid,
+            }
+            if args:
+                event['args'] = args
+            with self._lock:
+                self._spans.append(event)
+                if len(self._spans) > self.MAX_SPANS:
+                    del self._spans[:len(self._spans) - self.MAX_SPANS]
+    
+    def _acquire_lane(self, lane: str) -> int:
+        """Get a free slot of a lane (one per concurrent span)"""
+        with self._lock:
+            slots = self._lanes.setdefault(lane, [])
+            for slot, busy in enumerate(slots):
+                if not busy:
+                    break
+            else:
+                slot = len(slots)
+                slots.append(False)
+            slots[slot] = True
+            
+            tid = _LANE_TID_BASE + list(self._lanes).index(lane) * 1000 + slot
+            self._threads[tid] = f'{lane} {slot + 1}'
+            return tid
+    
+    def _release_lane(self, lane: str, tid: int):
+        """Free the slot taken by _acquire_lane"""
+        slot = (tid - _LANE_TID_BASE) % 1000
+        with self._lock:
+            self._lanes[lane][slot] = False
+    
+    def operation(self, name: str, **args):
+        """
+        Profile one user-visible operation
+        
+        The calling thread runs under cProfile unless an operation is
+        already being profiled in it; work handed to other threads shows
+        up as spans only.
+        
+        Args:
+            name: Operation name ('translate', 'ocr', ...)
+            **args: Values shown with the span
+            
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._operation(name, args)
+    
+    @contextmanager
+    def _operation(self, name: str, args: Dict) -> Iterator[None]:
+        """Run the with block under cProfile and write the results"""
+        profile = None
+        if not getattr(self._local, 'profiling', False):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                profile = None  # Another profiler is active (Python 3.12+)
+        
+        try:
+            with self._span(name, None, args):
+                if profile is None:
+                    yield
+                else:
+                    self._local.profiling = True
+                    try:
+                        yield
+                    finally:
+                        profile.disable()
+                        self._local.profiling = False
+        finally:
+            if profile is not None:
+                self._write_profile(name, profile)
+            self.write_trace()
+    
+    def _write_profile(self, name: str, profile: cProfile.Profile):
+        """Dump a cProfile result and delete the oldest files"""
+        with self._lock:
+            self._operations += 1
+            number = self._operations
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+        try:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(str(self.profile_dir / f'{self.session}-{number:04d}-{safe_name}.prof'))
+            
+            files = sorted(self.profile_dir.glob('*.prof'), key=lambda path: path.stat().st_mtime)
+            for path in files[:max(0, len(files) - self.max_files)]:
+                path.unlink()
+        except OSError:
+            pass  # Profiling must never break the operation
+    
+    def get_spans(self) -> List[Dict]:
+        """
+        Get the recorded spans
+        
+        Returns:
+            Chrome trace 'X' events (ts and dur in microseconds)
+        """
+        with self._lock:
+            return list(self._spans)
+    
+    def write_trace(self) -> Optional[Path]:
+        """
+        Write all spans of the session as a Chrome trace
+        
+        Returns:
+            Path of the trace file, or None if nothing was recorded or it
+            could not be written
+        """
+        with self._lock:
+            if not self._spans:
+                return None
+            events = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                       'args': {'name': thread_name}}
+                      for tid, thread_name in self._threads.items()]
+            events.extend(self._spans)
+        
+        try:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = self.trace_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+            os.replace(temp_file, self.trace_file)
+        except OSError:
+            return None
+        return self.trace_file
+
+
+_profiler: Optional[Profiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler(config=None) -> Profiler:
+    """
+    Get the process-wide profiler
+    
+    Args:
+        config: Config instance used when the profiler is created
+        
+    Returns:
+        Shared Profiler instance
+    """
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = Profiler.from_config(config) if config is not None else Profiler()
+        return _profiler
+
+
+def span(name: str, lane: Optional[str] = None, **args):
+    """
+    Time one stage with the process-wide profiler (see Profiler.span)
+    
+    Args:
+        name: Stage name
+        lane: Named lane for stages that overlap on one thread
+        **args: Values shown with the span
+        
+    Returns:
+        Context manager
+    """
+    return get_profiler().span(name, lane, **args)
+
+
+def operation(name: str, **args):
+    """
+    Profile an operation with the process-wide profiler (see Profiler.operation)
+    
+    Args:
+        name: Operation name
+        **args: Values shown with the span
+        
+    Returns:
+        Context manager
+    """
+    return get_profiler().operation(name, **args)
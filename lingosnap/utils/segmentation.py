@@ -0,0 +1,189 @@
+"""
+Text segmentation helpers
+"""
+
+import re
+from typing import List, Tuple
+
+
+# Characters that end a sentence
+SENTENCE_TERMINATORS = '.!?…'
+CJK_SENTENCE_TERMINATORS = '。！？'
+
+# Closing quotes/brackets that stay attached to the end of a sentence
+SENTENCE_CLOSERS = '"\'”’)]）」』'
+
+_PARAGRAPH_BREAK = re.compile(r'([ \t]*\n\s*)')
+
+
+def _split_sentences(paragraph: str) -> List[Tuple[str, str]]:
+    """
+    Split a paragraph (no newlines, no surrounding whitespace) into sentences
+    
+    Args:
+        paragraph: Paragraph to split
+        
+    Returns:
+        List of (sentence, following_whitespace) pairs
+    """
+    sentences = []
+    start = 0
+    i = 0
+    n = len(paragraph)
+    terminators = SENTENCE_TERMINATORS + CJK_SENTENCE_TERMINATORS
+    
+    while i < n:
+        char = paragraph[i]
+        if char not in terminators:
+            i += 1
+            continue
+        
+        # Swallow runs like '?!' and closing quotes
+        end = i + 1
+        while end < n and paragraph[end] in terminators:
+            end += 1
+        while end < n and paragraph[end] in SENTENCE_CLOSERS:
+            end += 1
+        
+        next_start = end
+        while next_start < n and paragraph[next_start].isspace():
+            next_start += 1
+        
+        # Latin terminators need whitespace after them ('3.14', 'e.g' stay
+        # intact); CJK full stops end a sentence on their own
+        if end < n and (next_start > end or paragraph[end - 1] in CJK_SENTENCE_TERMINATORS
+                        or paragraph[i] in CJK_SENTENCE_TERMINATORS):
+            sentences.append((paragraph[start:end], paragraph[end:next_start]))
+            start = next_start
+        i = next_start if next_start > end else end
+    
+    if start < n:
+        sentences.append((paragraph[start:], ''))
+    
+    return sentences
+
+
+def split_segments(text: str, mode: str = 'sentence') -> List[Tuple[str, str]]:
+    """
+    Split text into translatable segments, keeping the whitespace between them
+    
+    Joining every segment with its separator gives back the original text
+    exactly, so translated segments can be stitched together with the
+    original line structure.
+    
+    Args:
+        text: Text to split
+        mode: 'sentence' or 'paragraph'
+        
+    Returns:
+        List of (segment, separator) pairs; segments never have leading or
+        trailing whitespace (the first segment may be empty when the text
+        starts with whitespace)
+    """
+    segments = []
+    
+    body = text.lstrip()
+    if len(body) < len(text):
+        segments.append(('', text[:len(text) - len(body)]))
+    
+    parts = _PARAGRAPH_BREAK.split(body)
+    for i in range(0, len(parts), 2):
+        paragraph = parts[i]
+        separator = parts[i + 1] if i + 1 < len(parts) else ''
+        
+        stripped = paragraph.rstrip()
+        separator = paragraph[len(stripped):] + separator
+        if not stripped:
+            if separator:
+                segments.append(('', separator))
+            continue
+        
+        if mode == 'paragraph':
+            segments.append((stripped, separator))
+            continue
+        
+        sentences = _split_sentences(stripped)
+        last_sentence, last_separator = sentences[-1]
+        sentences[-1] = (last_sentence, last_separator + separator)
+        segments.extend(sentences)
+    
+    return segments
+
+
+def ends_sentence(text: str) -> bool:
+    """
+    Check whether the last sentence of a text is complete
+    
+    A text is complete when it ends with a sentence terminator (optionally
+    followed by closing quotes and spaces) or with a line break.
+    
+    Args:
+        text: Text as typed
+        
+    Returns:
+        True if the text ends with a complete sentence
+    """
+    stripped = text.rstrip(' \t')
+    if not stripped.strip():
+        return False
+    if stripped[-1] in '\r\n':
+        return True
+    stripped = stripped.rstrip(SENTENCE_CLOSERS)
+    return bool(stripped) and stripped[-1] in SENTENCE_TERMINATORS + CJK_SENTENCE_TERMINATORS
+
+
+def join_segments(translations: List[str], segments: List[Tuple[str, str]]) -> str:
+    """
+    Stitch translated segments back together
+    
+    Args:
+        translations: One translation per segment (in order)
+        segments: Segments returned by split_segments
+        
+    Returns:
+        Joined text with the original separators
+    """
+    return ''.join(translated + separator
+                   for translated, (_, separator) in zip(translations, segments))
+
+
+def group_segments(segments: List[Tuple[str, str]], max_chars: int) -> List[Tuple[str, str]]:
+    """
+    Merge consecutive segments into chunks of at most max_chars characters
+    
+    Separators between segments of the same chunk become part of the chunk
+    text; the separator after the last segment is kept apart, so the result
+    can be stitched with join_segments like the segments themselves. A
+    single segment longer than max_chars becomes a chunk of its own.
+    
+    Args:
+        segments: Segments returned by split_segments
+        max_chars: Maximum chunk length
+        
+    Returns:
+        List of (chunk, separator) pairs
+    """
+    chunks = []
+    current = ''
+    pending_separator = ''
+    
+    for segment, separator in segments:
+        if not segment:
+            # Leading whitespace: nothing to translate
+            if current:
+                chunks.append((current, pending_separator))
+                current = ''
+            chunks.append(('', separator))
+            continue
+        
+        if current and len(current) + len(pending_separator) + len(segment) > max_chars:
+            chunks.append((current, pending_separator))
+            current = ''
+        
+        current = current + pending_separator + segment if current else segment
+        pending_separator = separator
+    
+    if current:
+        chunks.append((current, pending_separator))
+    
+    return chunks
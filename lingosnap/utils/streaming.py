@@ -0,0 +1,292 @@
+"""
+Streaming translation of many texts (results as they complete)
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# Events handled by stream_lines()
+_LINE, _END, _ERROR, _DONE = range(4)
+
+
+def plan_batches(texts: List[str], first_batch: int = 1, max_batch_chars: int = 1000,
+                 parallel: int = 4) -> List[List[int]]:
+    """
+    Split texts into a small first batch and evenly sized later batches
+    
+    The first batch is small so the first result arrives quickly. The other
+    texts are spread over parallel - 1 batches of similar length (more if a
+    batch would exceed max_batch_chars), so they complete in about one
+    round trip alongside the first one. Empty texts are left out.
+    
+    Args:
+        texts: Texts to translate
+        first_batch: Number of texts in the first batch
+        max_batch_chars: Character limit of a batch (a longer text gets a
+            batch of its own)
+        parallel: Number of batches translated at the same time
+        
+    Returns:
+        Lists of text indices, in text order
+    """
+    indices = [i for i, text in enumerate(texts) if text]
+    if not indices:
+        return []
+    
+    first = indices[:max(1, first_batch)]
+    rest = indices[len(first):]
+    batches = [first]
+    if not rest:
+        return batches
+    
+    rest_chars = sum(len(texts[i]) for i in rest)
+    target = min(max_batch_chars, -(-rest_chars // max(1, parallel - 1)))
+    current: List[int] = []
+    chars = 0
+    for i in rest:
+        if current and chars + len(texts[i]) > max_batch_chars:
+            batches.append(current)
+            current = []
+            chars = 0
+        current.append(i)
+        chars += len(texts[i])
+        if chars >= target:
+            batches.append(current)
+            current = []
+            chars = 0
+    if current:
+        batches.append(current)
+    return batches
+
+
+def stream_batch(engine, texts: List[str], source_lang: str, target_lang: str,
+                 max_workers: int = 4, first_batch: int = 1,
+                 max_batch_chars: int = 1000) -> Iterator[Tuple[int, Union[str, Exception]]]:
+    """
+    Translate texts, yielding every result as soon as its batch completes
+    
+    Batches (see plan_batches) are sent concurrently with translate_batch,
+    so they go through the whole engine stack (cache, masking, ...).
+    Closing the generator early cancels batches that have not started.
+    
+    Args:
+        engine: Translation engine
+        texts: Texts to translate
+        source_lang: Source language code
+        target_lang: Target language code
+        max_workers: Batches translated at the same time
+        first_batch: Number of texts in the first batch
+        max_batch_chars: Character limit of a batch
+        
+    Yields:
+        (index, translation or exception) in completion order; every index
+        is yielded exactly once (empty texts first, as '')
+    """
+    for i, text in enumerate(texts):
+        if not text:
+            yield i, ''
+    
+    batches = plan_batches(texts, first_batch, max_batch_chars, max_workers)
+    if not batches:
+        return
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches))))
+    try:
+        futures = {
+            executor.submit(engine.translate_batch, [texts[i] for i in batch],
+                            source_lang, target_lang): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                results = [e] * len(batch)
+            for i, result in zip(batch, results):
+                yield i, result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stream_lines(translate_batch: Callable[[List[str]], List[Union[str, Exception]]],
+                 lines: Iterable[str], max_workers: int = 4, first_batch: int = 1,
+                 max_batch_lines: int = 100, max_batch_chars: int = 1000,
+                 flush_interval: float = 0.05,
+                 max_buffered: int = 1000) -> Iterator[Tuple[str, Union[str, Exception]]]:
+    """
+    Translate a stream of lines of any length, yielding results in input order
+    
+    Lines are read in a background thread and grouped into batches of at
+    most max_batch_lines lines and max_batch_chars characters (the first
+    one has first_batch lines, so the first result arrives quickly). A
+    batch that is not full is sent once its first line has waited
+    flush_interval seconds, so slow producers (tail -f) see output
+    promptly. Results are yielded as soon as every earlier line is done.
+    
+    Memory stays constant: at most max_buffered lines are read ahead, and
+    at most 2 * max_workers batches are in flight or waiting to be yielded.
+    Closing the generator early cancels batches that have not started.
+    
+    Args:
+        translate_batch: Function translating a list of texts, returning one
+            translation or exception per text (a raised exception counts for
+            every text of the batch)
+        lines: Lines to translate, without line breaks
+        max_workers: Batches translated at the same time
+        first_batch: Number of lines in the first batch
+        max_batch_lines: Line limit of a batch
+        max_batch_chars: Character limit of a batch (a longer line gets a
+            batch of its own)
+        flush_interval: Seconds a partial batch waits for more lines
+        max_buffered: Lines read ahead of the batches in flight
+        
+    Yields:
+        (line, translation or exception) in input order; blank lines are
+        passed through unchanged without being sent
+    """
+    events: queue.Queue = queue.Queue()
+    slots = threading.Semaphore(max_buffered)
+    closed = threading.Event()
+    
+    def read():
+        try:
+            for line in lines:
+                slots.acquire()
+                if closed.is_set():
+                    return
+                events.put((_LINE, line))
+        except Exception as e:
+            events.put((_ERROR, e))
+        else:
+            events.put((_END, None))
+    
+    threading.Thread(target=read, name='lingosnap-reader', daemon=True).start()
+    
+    max_in_flight = 2 * max(1, max_workers)
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    pending: Deque[Tuple[List[str], Future]] = deque()
+    batch: List[str] = []
+    batch_started = 0.0
+    batch_limit = max(1, first_batch)
+    ended = False
+    
+    try:
+        while True:
+            # Release finished batches at the head, in input order
+            while pending and pending[0][1].done():
+                texts, future = pending.popleft()
+                for line, result in zip(texts, future.result()):
+                    yield line, result
+            
+            # Send batches that are full, waited long enough or end the input
+            while batch and len(pending) < max_in_flight:
+                count, full = _fit_batch(batch, batch_limit, max_batch_chars)
+                if not (full or ended or time.monotonic() - batch_started >= flush_interval):
+                    break
+                texts = batch[:count]
+                del batch[:count]
+                future = executor.submit(_translate_lines, translate_batch, texts)
+                future.add_done_callback(lambda _: events.put((_DONE, None)))
+                pending.append((texts, future))
+                slots.release(count)
+                batch_started = time.monotonic()
+                batch_limit = max(1, max_batch_lines)
+            
+            if ended and not batch and not pending:
+                return
+            
+            # Wait for a line, the end of the input or a finished batch
+            timeout = None
+            if batch and len(pending) < max_in_flight:
+                timeout = max(0.0, batch_started + flush_interval - time.monotonic())
+            try:
+                kind, value = events.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            
+            if kind == _LINE:
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append(value)
+            elif kind == _END:
+                ended = True
+            elif kind == _ERROR:
+                raise value
+    finally:
+        closed.set()
+        slots.release(max_buffered)  # Unblocks the reader
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _fit_batch(batch: List[str], max_lines: int, max_chars: int) -> Tuple[int, bool]:
+    """Count the leading lines that fit into one batch and whether it is full"""
+    count = 0
+    chars = 0
+    for line in batch:
+        if count >= max_lines or (count and chars + len(line) > max_chars):
+            return count, True
+        count += 1
+        chars += len(line)
+    return count, count >= max_lines or chars >= max_chars
+
+
+def _translate_lines(translate_batch, texts: List[str]) -> List[Union[str, Exception]]:
+    """Translate the non-blank lines of a batch (never raises)"""
+    results: List[Union[str, Exception]] = list(texts)
+    indices = [i for i, text in enumerate(texts) if text.strip()]
+    if not indices:
+        return results
+    
+    try:
+        translated = translate_batch([texts[i] for i in indices])
+    except Exception as e:
+        translated = [e] * len(indices)
+    for i, result in zip(indices, translated):
+        results[i] = result
+    return results
+
+
+def in_order(stream: Iterator[Tuple[int, object]]) -> Iterator[Tuple[int, object]]:
+    """
+    Reorder a completion-order stream into index order
+    
+    Results are held back only until every earlier index has arrived.
+    
+    Args:
+        stream: Iterator of (index, result) covering 0..n-1
+        
+    Yields:
+        (index, result) in index order
+    """
+    pending: Dict[int, object] = {}
+    next_index = 0
+    for index, result in stream:
+        pending[index] = result
+        while next_index in pending:
+            yield next_index, pending.pop(next_index)
+            next_index += 1
+
+
+class StreamTimer:
+    """Time to first output and total latency of one streamed translation"""
+    
+    def __init__(self):
+        self.started = time.monotonic()
+        self.first_output: Optional[float] = None
+        self.total: Optional[float] = None
+    
+    def output(self):
+        """Record that a result was shown"""
+        if self.first_output is None:
+            self.first_output = time.monotonic() - self.started
+    
+    def finish(self):
+        """Record the end of the translation"""
+        self.output()
+        self.total = time.monotonic() - self.started
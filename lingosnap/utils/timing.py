@@ -0,0 +1,102 @@
+"""
+Startup phase timing (lingosnap --timing)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class PhaseTimer:
+    """
+    Records how long named phases take, relative to a common start
+    
+    Phases may be recorded from any thread; phases outside the main thread
+    are marked as background work in the report.
+    """
+    
+    def __init__(self, started: Optional[float] = None):
+        """
+        Initialize timer
+        
+        Args:
+            started: time.perf_counter() value the offsets are relative to
+                (default: now)
+        """
+        self.started = time.perf_counter() if started is None else started
+        self._phases: List[Dict] = []
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time the body of a with block
+        
+        The phase is recorded even if the body raises.
+        
+        Args:
+            name: Phase name
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, time.perf_counter())
+    
+    def record(self, name: str, started: float, ended: Optional[float] = None):
+        """
+        Record a phase measured by the caller
+        
+        Args:
+            name: Phase name
+            started: time.perf_counter() at the start of the phase
+            ended: time.perf_counter() at the end (default: now)
+        """
+        ended = time.perf_counter() if ended is None else ended
+        with self._lock:
+            self._phases.append({
+                'name': name,
+                'start': started - self.started,
+                'duration': ended - started,
+                'background': threading.current_thread() is not threading.main_thread(),
+            })
+    
+    def mark(self, name: str):
+        """
+        Record a point in time (a phase of zero length)
+        
+        Args:
+            name: Event name
+        """
+        now = time.perf_counter()
+        self.record(name, now, now)
+    
+    def get_phases(self) -> List[Dict]:
+        """
+        Get the recorded phases in start order
+        
+        Returns:
+            List of dicts with name, start and duration (seconds) and
+            background (recorded outside the main thread)
+        """
+        with self._lock:
+            return sorted(self._phases, key=lambda phase: phase['start'])
+    
+    def report(self) -> str:
+        """
+        Format the phases as a table
+        
+        Returns:
+            Multi-line report, times in milliseconds
+        """
+        phases = self.get_phases()
+        width = max([len(phase['name']) for phase in phases] + [5])
+        lines = [f"{'phase':<{width}}  {'start ms':>9}  {'took ms':>9}"]
+        for phase in phases:
+            line = (f"{phase['name']:<{width}}  {phase['start'] * 1000:9.1f}  "
+                    f"{phase['duration'] * 1000:9.1f}")
+            if phase['background']:
+                line += '  (background)'
+            lines.append(line)
+        return '\n'.join(lines)
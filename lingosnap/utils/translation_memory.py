@@ -0,0 +1,366 @@
+"""
+Fuzzy translation memory over the translation history
+"""
+
+import itertools
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+from lingosnap.utils.languages import to_canonical_code
+
+
+# Numbers (including 1,234.5 and 12:30:01) are compared as placeholders, so
+# log lines differing only by numbers match each other
+_NUMBER = re.compile(r'\d+(?:[.,:]\d+)*')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class _Entry:
+    """Indexed history entry"""
+    
+    __slots__ = ('engine', 'source_lang', 'target_lang', 'source_text',
+                 'translated_text', 'signature', 'grams', 'numbers')
+    
+    def __init__(self, engine: str, source_lang: str, target_lang: str,
+                 source_text: str, translated_text: str, signature: str,
+                 grams: FrozenSet[str], numbers: List[str]):
+        self.engine = engine
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.source_text = source_text
+        self.translated_text = translated_text
+        self.signature = signature
+        self.grams = grams
+        self.numbers = numbers
+
+
+def make_signature(text: str) -> str:
+    """
+    Normalize text for fuzzy comparison
+    
+    Args:
+        text: Text to normalize
+        
+    Returns:
+        Lowercased text with collapsed whitespace and numbers replaced by '0'
+    """
+    return _NUMBER.sub('0', _WHITESPACE.sub(' ', text.strip()).lower())
+
+
+def make_trigrams(signature: str) -> FrozenSet[str]:
+    """
+    Character trigrams of a signature, including the text boundaries
+    
+    Args:
+        signature: Text returned by make_signature
+        
+    Returns:
+        Set of trigrams (empty for empty text)
+    """
+    if not signature:
+        return frozenset()
+    padded = f'\x02{signature}\x03'
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def adapt_numbers(translated: str, old_numbers: List[str],
+                  new_numbers: List[str]) -> Optional[str]:
+    """
+    Carry the numbers of a new source text over into an old translation
+    
+    Args:
+        translated: Translation of the old source text
+        old_numbers: Numbers of the old source text, in order
+        new_numbers: Numbers of the new source text, in order
+        
+    Returns:
+        Adapted translation, or None if the numbers cannot be mapped safely
+        (different count, ambiguous mapping or numbers not in the
+        translation)
+    """
+    if old_numbers == new_numbers:
+        return translated
+    if len(old_numbers) != len(new_numbers):
+        return None
+    
+    mapping = {}
+    for old, new in zip(old_numbers, new_numbers):
+        if mapping.setdefault(old, new) != new:
+            return None
+    
+    # Every number of the translation must come from the source
+    if sorted(_NUMBER.findall(translated)) != sorted(old_numbers):
+        return None
+    return _NUMBER.sub(lambda m: mapping[m.group(0)], translated)
+
+
+class TranslationMemory:
+    """
+    Index of past translations answering near-duplicate lookups
+    
+    Entries are indexed by character trigrams of their normalized text in
+    one inverted index per engine and target language, so a translation is
+    only reused for the engine that produced it. A lookup only scans the
+    postings of the query's rarest trigrams (prefix filtering: a text with
+    Jaccard similarity >= threshold must share one of them), then verifies
+    the candidates exactly. The index follows the history database through
+    its change listeners and also learns the translations passing through
+    MemoryTranslationEngine (see learn()).
+    """
+    
+    # Texts shorter than this (normalized) only match exactly: one
+    # character changes too much of a short text
+    MIN_FUZZY_CHARS = 12
+    
+    # Longer texts are not indexed (chunks of long texts are)
+    MAX_TEXT_CHARS = 2000
+    
+    def __init__(self, history_db=None, threshold: float = 0.9,
+                 max_entries: int = 20000):
+        """
+        Initialize translation memory
+        
+        Args:
+            history_db: HistoryDatabase to load and follow (optional)
+            threshold: Minimum trigram Jaccard similarity of a match
+            max_entries: Most recent entries kept in the index
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        
+        self._entries: 'OrderedDict[int, _Entry]' = OrderedDict()
+        self._postings: Dict[Tuple[str, str], Dict[str, Set[int]]] = {}
+        self._lock = threading.Lock()
+        
+        # Learned translations get negative IDs, history entries positive ones
+        self._learned_ids = itertools.count(-1, -1)
+        
+        self.lookups = 0
+        self.hits = 0
+        
+        self._history_db = history_db
+        self._loaded = threading.Event()
+        if history_db is None:
+            self._loaded.set()
+        else:
+            history_db.add_listener(self._on_history_changed)
+    
+    def load(self):
+        """Index the most recent history entries (blocking)"""
+        try:
+            entries = self._history_db.get_history(self.max_entries)
+        except Exception:
+            entries = []
+        
+        with self._lock:
+            # Oldest first, so eviction order matches insertion order
+            for entry in reversed(entries):
+                self._add(entry)
+        self._loaded.set()
+    
+    def load_async(self) -> threading.Thread:
+        """
+        Index the history in a background thread
+        
+        Lookups return no match until loading has finished.
+        
+        Returns:
+            The loader thread
+        """
+        thread = threading.Thread(target=self.load, name='lingosnap-memory', daemon=True)
+        thread.start()
+        return thread
+    
+    def _on_history_changed(self, event: str, payload):
+        """Follow changes of the history database"""
+        with self._lock:
+            if event == 'add':
+                self._add(payload)
+            elif event == 'delete':
+                self._remove(payload)
+            elif event == 'clear':
+                self._entries.clear()
+                self._postings.clear()
+    
+    def add(self, entry_id: int, source_lang: str, target_lang: str,
+            source_text: str, translated_text: str, engine: str = ''):
+        """
+        Index a translation
+        
+        Args:
+            entry_id: Unique ID (history entry ID)
+            source_lang: Source language code
+            target_lang: Target language code
+            source_text: Original text
+            translated_text: Translated text
+            engine: Name of the engine that produced the translation
+        """
+        with self._lock:
+            self._add({
+                'id': entry_id,
+                'engine': engine,
+                'source_lang': source_lang,
+                'target_lang': target_lang,
+                'source_text': source_text,
+                'translated_text': translated_text
+            })
+    
+    def learn(self, engine: str, source_lang: str, target_lang: str,
+              source_text: str, translated_text: str):
+        """
+        Index a fresh translation of a text exactly as it was looked up
+        
+        History keeps whole texts, while incremental translation looks up
+        single sentences; learning what the engine returned keeps both forms
+        in the index.
+        
+        Args:
+            engine: Name of the engine that produced the translation
+            source_lang: Source language code
+            target_lang: Target language code
+            source_text: Original text
+            translated_text: Translated text
+        """
+        with self._lock:
+            self._add({
+                'id': next(self._learned_ids),
+                'engine': engine,
+                'source_lang': source_lang,
+                'target_lang': target_lang,
+                'source_text': source_text,
+                'translated_text': translated_text
+            })
+    
+    def _add(self, entry: dict):
+        """Index one history entry (lock held)"""
+        source_text = entry['source_text']
+        if not source_text or len(source_text) > self.MAX_TEXT_CHARS:
+            return
+        
+        entry_id = entry['id']
+        self._remove(entry_id)
+        
+        signature = make_signature(source_text)
+        grams = make_trigrams(signature)
+        engine = entry.get('engine') or ''
+        target_lang = to_canonical_code(entry['target_lang'])
+        self._entries[entry_id] = _Entry(
+            engine, to_canonical_code(entry['source_lang']), target_lang, source_text,
+            entry['translated_text'], signature, grams, _NUMBER.findall(source_text)
+        )
+        
+        postings = self._postings.setdefault((engine, target_lang), {})
+        for gram in grams:
+            postings.setdefault(gram, set()).add(entry_id)
+        
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+    
+    def _remove(self, entry_id: int):
+        """Drop one entry from the index (lock held)"""
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        postings = self._postings.get((entry.engine, entry.target_lang), {})
+        for gram in entry.grams:
+            ids = postings.get(gram)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del postings[gram]
+    
+    def lookup(self, text: str, source_lang: str, target_lang: str,
+               engine: str = '') -> Optional[Dict]:
+        """
+        Find the closest past translation of a text
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code ('auto' matches any)
+            target_lang: Target language code
+            engine: Name of the engine whose translations may be reused
+            
+        Returns:
+            Best match at or above the threshold as a dictionary
+            (translated_text, source_text, similarity, entry_id), or None
+        """
+        if not self._loaded.is_set() or not text or len(text) > self.MAX_TEXT_CHARS:
+            return None
+        
+        signature = make_signature(text)
+        grams = make_trigrams(signature)
+        if not grams:
+            return None
+        source_lang = to_canonical_code(source_lang)
+        numbers = _NUMBER.findall(text)
+        
+        with self._lock:
+            self.lookups += 1
+            postings = self._postings.get((engine, to_canonical_code(target_lang)))
+            if not postings:
+                return None
+            
+            threshold = self.threshold if len(signature) >= self.MIN_FUZZY_CHARS else 1.0
+            
+            # Prefix filter: only the rarest trigrams can produce candidates
+            lists = sorted((postings.get(gram, ()) for gram in grams), key=len)
+            prefix = len(grams) - math.ceil(threshold * len(grams)) + 1
+            candidates = set()
+            for ids in lists[:prefix]:
+                candidates.update(ids)
+            
+            best = None
+            best_score = 0.0
+            min_size = threshold * len(grams)
+            max_size = len(grams) / threshold
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                if not min_size <= len(entry.grams) <= max_size:
+                    continue
+                if source_lang != 'auto' and entry.source_lang not in (source_lang, 'auto'):
+                    continue
+                
+                if entry.signature == signature:
+                    score = 1.0
+                else:
+                    shared = len(grams & entry.grams)
+                    score = shared / (len(grams) + len(entry.grams) - shared)
+                
+                # Ties go to the most recent entry
+                if score >= threshold and (score > best_score or
+                                           (score == best_score and entry_id > best[0])):
+                    best = (entry_id, entry)
+                    best_score = score
+            
+            if best is None:
+                return None
+            entry_id, entry = best
+            
+            translated = adapt_numbers(entry.translated_text, entry.numbers, numbers)
+            if translated is None:
+                return None
+            
+            self.hits += 1
+            return {
+                'translated_text': translated,
+                'source_text': entry.source_text,
+                'similarity': best_score,
+                'entry_id': entry_id
+            }
+    
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Get index statistics
+        
+        Returns:
+            Dictionary with entries, lookups, hits and loaded
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'loaded': self._loaded.is_set(),
+            }
@@ -0,0 +1,329 @@
+"""
+Per-engine, per-day usage metering (characters, requests, latency)
+"""
+
+import atexit
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from lingosnap.utils.profiling import span
+
+
+class UsageMeter:
+    """
+    Usage counters kept in memory and flushed to ~/.lingosnap/usage.db
+    
+    record() only updates an in-memory delta per (day, engine), so it is
+    cheap enough to call on every upstream request. A background thread
+    adds the deltas to SQLite every flush_interval seconds (earlier once
+    flush_threshold requests are pending) in one transaction. Because
+    flushes add deltas instead of overwriting totals, the GUI and the lingo
+    CLI can meter into the same database.
+    """
+    
+    def __init__(self, db_dir: Optional[Path] = None, flush_interval: float = 5.0,
+                 flush_threshold: int = 200):
+        """
+        Initialize usage meter
+        
+        Args:
+            db_dir: Directory of the usage database (default: ~/.lingosnap)
+            flush_interval: Seconds between two flushes
+            flush_threshold: Pending requests that trigger an early flush
+        """
+        self.db_dir = Path(db_dir) if db_dir is not None else Path.home() / '.lingosnap'
+        self.db_file = self.db_dir / 'usage.db'
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        
+        # (day, engine) -> [characters, requests, errors, latency_total, latency_max]
+        self._pending: Dict[Tuple[str, str], List[float]] = {}
+        self._pending_requests = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        
+        self.persistent = True
+        self._init_database()
+    
+    @classmethod
+    def from_config(cls, config) -> 'UsageMeter':
+        """
+        Create a usage meter using the intervals stored in the configuration
+        
+        Args:
+            config: Config instance
+            
+        Returns:
+            UsageMeter instance
+        """
+        return cls(
+            flush_interval=config.get('usage_flush_interval', 5.0),
+            flush_threshold=config.get('usage_flush_threshold', 200),
+        )
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_file), timeout=5)
+    
+    def _init_database(self):
+        """Create database and tables if they don't exist"""
+        try:
+            self.db_dir.mkdir(parents=True, exist_ok=True)
+            
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS usage (
+                    day TEXT NOT NULL,
+                    engine TEXT NOT NULL,
+                    characters INTEGER NOT NULL DEFAULT 0,
+                    requests INTEGER NOT NULL DEFAULT 0,
+                    errors INTEGER NOT NULL DEFAULT 0,
+                    latency_total REAL NOT NULL DEFAULT 0,
+                    latency_max REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, engine)
+                )
+            ''')
+            conn.commit()
+            conn.close()
+        except Exception:
+            # Keep counting in memory only
+            self.persistent = False
+    
+    def record(self, engine: str, characters: int, latency: float,
+               requests: int = 1, error: bool = False):
+        """
+        Count upstream requests (hot path: memory only)
+        
+        Args:
+            engine: Engine name
+            characters: Characters sent to the engine
+            latency: Seconds the call took
+            requests: Number of texts translated by the call
+            error: Whether the call failed
+        """
+        key = (date.today().isoformat(), engine)
+        with self._lock:
+            counters = self._pending.get(key)
+            if counters is None:
+                counters = self._pending[key] = [0, 0, 0, 0.0, 0.0]
+            counters[0] += characters
+            counters[1] += requests
+            if error:
+                counters[2] += requests
+            counters[3] += latency
+            if latency > counters[4]:
+                counters[4] = latency
+            self._pending_requests += requests
+            flush_now = self._pending_requests >= self.flush_threshold
+        
+        self._ensure_flusher()
+        if flush_now:
+            self._wake.set()
+    
+    def _ensure_flusher(self):
+        """Start the background flush thread on first use"""
+        if self._thread is not None or self._closed or not self.persistent:
+            return
+        with self._flush_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='lingosnap-usage',
+                                            daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+    
+    def _run(self):
+        """Flush periodically until closed"""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+    
+    def flush(self):
+        """Add the pending counters to the database in one transaction"""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {}
+                self._pending_requests = 0
+            if not pending or not self.persistent:
+                self._merge_back(pending)
+                return
+            
+            try:
+                with span('usage.flush', rows=len(pending)):
+                    conn = self._connect()
+                    cursor = conn.cursor()
+                    cursor.executemany('''
+                        INSERT INTO usage
+                        (day, engine, characters, requests, errors, latency_total, latency_max)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(day, engine) DO UPDATE SET
+                            characters = characters + excluded.characters,
+                            requests = requests + excluded.requests,
+                            errors = errors + excluded.errors,
+                            latency_total = latency_total + excluded.latency_total,
+                            latency_max = MAX(latency_max, excluded.latency_max)
+                    ''', [key + tuple(counters) for key, counters in pending.items()])
+                    conn.commit()
+                    conn.close()
+            except Exception:
+                # Retry with the next flush
+                self._merge_back(pending)
+    
+    def _merge_back(self, pending: Dict[Tuple[str, str], List[float]]):
+        """Return counters that could not be written to the pending deltas"""
+        if not pending:
+            return
+        with self._lock:
+            for key, counters in pending.items():
+                current = self._pending.setdefault(key, [0, 0, 0, 0.0, 0.0])
+                for i in range(4):
+                    current[i] += counters[i]
+                current[4] = max(current[4], counters[4])
+    
+    def close(self):
+        """Stop the flush thread and write the remaining counters"""
+        self._closed = True
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+    
+    def get_usage(self, engine: Optional[str] = None, days: int = 30) -> List[Dict]:
+        """
+        Get daily usage, including counters not flushed yet
+        
+        Args:
+            engine: Only this engine (default: all engines)
+            days: Number of days to return, counting today
+            
+        Returns:
+            List of dictionaries (day, engine, characters, requests, errors,
+            avg_latency, max_latency), newest day first
+        """
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        rows: Dict[Tuple[str, str], List[float]] = {}
+        
+        # Counters being flushed are neither pending nor stored yet
+        with self._flush_lock:
+            self._read_usage(rows, engine, since)
+        
+        return [{
+            'day': day,
+            'engine': name,
+            'characters': int(counters[0]),
+            'requests': int(counters[1]),
+            'errors': int(counters[2]),
+            'avg_latency': counters[3] / counters[1] if counters[1] else 0.0,
+            'max_latency': counters[4],
+        } for (day, name), counters in sorted(rows.items(), reverse=True)]
+    
+    def _read_usage(self, rows: Dict[Tuple[str, str], List[float]],
+                    engine: Optional[str], since: str):
+        """Add stored and pending counters to rows (flush lock held)"""
+        if self.persistent:
+            try:
+                conn = self._connect()
+                cursor = conn.cursor()
+                query = '''
+                    SELECT day, engine, characters, requests, errors,
+                           latency_total, latency_max
+                    FROM usage WHERE day >= ?
+                '''
+                params: tuple = (since,)
+                if engine is not None:
+                    query += ' AND engine = ?'
+                    params += (engine,)
+                cursor.execute(query, params)
+                for row in cursor.fetchall():
+                    rows[(row[0], row[1])] = list(row[2:])
+                conn.close()
+            except Exception:
+                pass
+        
+        with self._lock:
+            for key, counters in self._pending.items():
+                if key[0] < since or (engine is not None and key[1] != engine):
+                    continue
+                current = rows.setdefault(key, [0, 0, 0, 0.0, 0.0])
+                for i in range(4):
+                    current[i] += counters[i]
+                current[4] = max(current[4], counters[4])
+    
+    def get_totals(self, engine: str, days: int = 36500) -> Dict[str, float]:
+        """
+        Get usage of one engine summed over a period
+        
+        Args:
+            engine: Engine name
+            days: Number of days to sum, counting today (default: all)
+            
+        Returns:
+            Dictionary with characters, requests, errors and avg_latency
+        """
+        usage = self.get_usage(engine, days)
+        requests = sum(row['requests'] for row in usage)
+        latency = sum(row['avg_latency'] * row['requests'] for row in usage)
+        return {
+            'characters': sum(row['characters'] for row in usage),
+            'requests': requests,
+            'errors': sum(row['errors'] for row in usage),
+            'avg_latency': latency / requests if requests else 0.0,
+        }
+    
+    def reset(self, engine: Optional[str] = None):
+        """
+        Delete recorded usage
+        
+        Args:
+            engine: Only this engine (default: all engines)
+        """
+        with self._lock:
+            if engine is None:
+                self._pending.clear()
+            else:
+                for key in [key for key in self._pending if key[1] == engine]:
+                    del self._pending[key]
+        if not self.persistent:
+            return
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            if engine is None:
+                cursor.execute('DELETE FROM usage')
+            else:
+                cursor.execute('DELETE FROM usage WHERE engine = ?', (engine,))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            raise Exception(f"Failed to reset usage: {str(e)}")
+
+
+_meter: Optional[UsageMeter] = None
+_meter_lock = threading.Lock()
+
+
+def get_usage_meter(config=None) -> UsageMeter:
+    """
+    Get the process-wide usage meter
+    
+    Args:
+        config: Config instance used when the meter is created
+        
+    Returns:
+        Shared UsageMeter instance
+    """
+    global _meter
+    with _meter_lock:
+        if _meter is None:
+            _meter = UsageMeter.from_config(config) if config is not None else UsageMeter()
+        return _meter
@@ -21,7 +21,7 @@ setup(
     author='LingoSnap Team',
     author_email='',
     url='https://github.com/The-Eleven11/LingoSnap',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     include_package_data=True,
     install_requires=[
         'PyQt6>=6.4.0',
@@ -0,0 +1,64 @@
+"""
+Fake engines and config shared by the tests
+"""
+
+from lingosnap.engines.base import TranslationEngine
+
+
+class CountingEngine(TranslationEngine):
+    """Fake engine that counts upstream calls"""
+    
+    name = 'fake'
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def translate(self, text, source_lang, target_lang):
+        self.calls += 1
+        return f'{target_lang}:{text}'
+    
+    def get_supported_languages(self):
+        return [('en', 'English'), ('de', 'German'), ('zh', 'Chinese')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return True
+
+
+class BatchRecordingEngine(TranslationEngine):
+    """Fake engine recording every batch it receives"""
+    
+    name = 'fake'
+    
+    def __init__(self):
+        self.batches = []
+    
+    def translate(self, text, source_lang, target_lang):
+        if 'FAIL' in text:
+            raise Exception('Translation failed: boom')
+        return f'<{text}>'
+    
+    def translate_batch(self, texts, source_lang, target_lang):
+        self.batches.append(list(texts))
+        return super().translate_batch(texts, source_lang, target_lang)
+    
+    def get_supported_languages(self):
+        return [('en', 'English'), ('de', 'German')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return True
+
+
+class FakeConfig:
+    """Config stand-in with fixed settings"""
+    
+    def __init__(self, **settings):
+        self.settings = settings
+    
+    def get(self, key, default=None):
+        return self.settings.get(key, default)
@@ -0,0 +1,47 @@
+"""
+Tests for sentence segmentation and the Argos worker pool sharding
+"""
+
+from lingosnap.engines.argos_pool import ArgosWorkerPool
+from lingosnap.utils.segmentation import split_segments, join_segments
+
+
+def test_segments_round_trip():
+    """Segments and separators rebuild the original text exactly"""
+    texts = [
+        'Hello world. How are you?  Fine!\n\nPi is 3.14 here.\n',
+        '  leading. spaces\t\n',
+        '你好。我很好！谢谢',
+        'He said "hi." Then left',
+        '',
+    ]
+    for text in texts:
+        for mode in ('sentence', 'paragraph'):
+            segments = split_segments(text, mode)
+            assert join_segments([segment for segment, _ in segments], segments) == text
+    
+    assert [s for s, _ in split_segments('One. Two? 3.14 three')] == ['One.', 'Two?', '3.14 three']
+    assert [s for s, _ in split_segments('A. B\n\nC', 'paragraph')] == ['A. B', 'C']
+
+
+def test_shards_cover_input_in_order():
+    """Shards are contiguous, ordered and roughly balanced"""
+    assert ArgosWorkerPool.make_shards([10, 10, 10, 10], 2) == [(0, 2), (2, 4)]
+    assert ArgosWorkerPool.make_shards([100, 1, 1, 1], 2) == [(0, 1), (1, 4)]
+    assert ArgosWorkerPool.make_shards([5, 5], 4) == [(0, 1), (1, 2)]
+    assert ArgosWorkerPool.make_shards([1, 1, 1], 1) == [(0, 3)]
+
+
+def test_translations_reassembled_in_order(monkeypatch):
+    """Sentences of several texts come back stitched in their original layout"""
+    pool = ArgosWorkerPool(workers=3)
+    
+    def fake_translate_sentences(sentences, source_lang, target_lang):
+        return [Exception('boom') if s == 'Bad.' else s.upper() for s in sentences]
+    
+    monkeypatch.setattr(pool, '_translate_sentences', fake_translate_sentences)
+    
+    results = pool.translate_batch(['One. Two!\n\n  Three.', '', 'Ok. Bad.'], 'en', 'zh')
+    assert results[0] == 'ONE. TWO!\n\n  THREE.'
+    assert results[1] == ''
+    assert isinstance(results[2], Exception)
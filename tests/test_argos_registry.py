@@ -0,0 +1,159 @@
+"""
+Tests for the Argos resident translator registry
+"""
+
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+import pytest
+
+argostranslate = pytest.importorskip('argostranslate')
+
+from lingosnap.engines.argos_engine import ArgosTranslateEngine
+
+
+class FakeTranslation:
+    """Stand-in for an installed package translation"""
+    
+    def __init__(self, from_lang, to_lang):
+        self.from_lang = from_lang
+        self.to_lang = to_lang
+        self.pkg = types.SimpleNamespace(type='translate')
+    
+    def translate(self, text):
+        return f'{text}>{self.to_lang.code}'
+
+
+def make_languages(pairs):
+    """Build fake argos Language objects from (from, to) pairs"""
+    languages = {}
+    for from_code, to_code in pairs:
+        for code in (from_code, to_code):
+            languages.setdefault(code, types.SimpleNamespace(code=code, translations_from=[]))
+    for from_code, to_code in pairs:
+        languages[from_code].translations_from.append(
+            FakeTranslation(languages[from_code], languages[to_code])
+        )
+    return list(languages.values())
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    calls = []
+    
+    def fake_installed_languages():
+        calls.append(1)
+        return make_languages([('ja', 'en'), ('en', 'zh'), ('en', 'ja')])
+    
+    monkeypatch.setattr(argostranslate.translate, 'get_installed_languages',
+                        fake_installed_languages)
+    engine = ArgosTranslateEngine()
+    engine.scan_calls = calls
+    return engine
+
+
+def test_pair_resolved_once(engine):
+    """Installed languages are scanned once per pair set"""
+    assert engine.translate('a', 'en', 'zh') == 'a>zh'
+    assert engine.translate('b', 'en', 'zh') == 'b>zh'
+    assert engine.translate('c', 'en', 'ja') == 'c>ja'
+    assert len(engine.scan_calls) == 1
+
+
+def test_pivot_pair(engine):
+    """ja→zh goes through English"""
+    assert engine.translate('x', 'ja', 'zh') == 'x>en>zh'
+    assert engine.translate_batch(['x', 'y'], 'ja', 'zh') == ['x>en>zh', 'y>en>zh']
+
+
+def test_single_text_loads_models(engine, monkeypatch):
+    """The single-text path loads models with the engine's thread limit"""
+    loaded = []
+    
+    def fake_load_model(translation):
+        loaded.append(translation.to_lang.code)
+        translation.translator = object()
+    
+    monkeypatch.setattr(engine, '_load_model', fake_load_model)
+    for language in engine._get_package_graph().values():
+        for translation in language.values():
+            translation.pkg.tokenizer = object()
+            translation.translator = None
+    
+    assert engine.translate('x', 'ja', 'zh') == 'x>en>zh'
+    assert loaded == ['en', 'zh']
+
+
+def test_missing_pair(engine):
+    """Unreachable pairs raise"""
+    with pytest.raises(Exception):
+        engine.translate('x', 'zh', 'fr')
+
+
+def test_invalidate(engine):
+    """invalidate_translations forces a rescan"""
+    engine.translate('a', 'en', 'zh')
+    engine.invalidate_translations()
+    engine.translate('a', 'en', 'zh')
+    assert len(engine.scan_calls) == 2
+
+
+def test_sentence_splitter_shared_safely(engine, monkeypatch):
+    """Threads share one stanza pipeline per package without overlapping"""
+    created = []
+    overlaps = []
+    
+    class FakePipeline:
+        def __init__(self, **kwargs):
+            created.append(kwargs['lang'])
+            self.busy = False
+        
+        def __call__(self, paragraph):
+            if self.busy:
+                overlaps.append(paragraph)
+            self.busy = True
+            time.sleep(0.001)
+            self.busy = False
+            return types.SimpleNamespace(sentences=[types.SimpleNamespace(text=paragraph)])
+    
+    monkeypatch.setitem(sys.modules, 'stanza', types.SimpleNamespace(Pipeline=FakePipeline))
+    pkg = types.SimpleNamespace(package_path=Path('/pkg'), from_code='en')
+    
+    def split():
+        for _ in range(20):
+            assert engine._split_sentences(pkg, 'Hello.') == ['Hello.']
+    
+    threads = [threading.Thread(target=split) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert created == ['en']
+    assert overlaps == []
+
+
+def test_model_loaded_once_under_concurrency(engine, monkeypatch):
+    """Concurrent batches share one CTranslate2 translator per model"""
+    created = []
+    
+    class FakeTranslator:
+        def __init__(self, path, **kwargs):
+            created.append(path)
+            time.sleep(0.01)
+    
+    monkeypatch.setitem(sys.modules, 'ctranslate2', types.SimpleNamespace(Translator=FakeTranslator))
+    translation = types.SimpleNamespace(translator=None,
+                                        pkg=types.SimpleNamespace(package_path=Path('/pkg')))
+    
+    threads = [threading.Thread(target=engine._load_model, args=(translation,))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert created == [str(Path('/pkg') / 'model')]
+    assert isinstance(translation.translator, FakeTranslator)
@@ -0,0 +1,80 @@
+"""
+Tests for batch translation
+"""
+
+import asyncio
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.engines.google_engine import GoogleTranslateEngine
+
+
+class FlakyEngine(TranslationEngine):
+    """Fake engine that fails on one input"""
+    
+    def translate(self, text, source_lang, target_lang):
+        if text == 'bad':
+            raise Exception('Translation failed: bad input')
+        return text.upper()
+    
+    def get_supported_languages(self):
+        return []
+    
+    def detect_language(self, text):
+        return None
+    
+    def is_available(self):
+        return True
+
+
+def test_default_batch_keeps_order_and_errors():
+    """The fallback implementation reports errors per item"""
+    results = FlakyEngine().translate_batch(['a', 'bad', 'c'], 'en', 'fr')
+    assert results[0] == 'A'
+    assert isinstance(results[1], Exception)
+    assert results[2] == 'C'
+
+
+def test_google_batch_packs_segments(monkeypatch):
+    """Segments are packed into as few requests as the limit allows"""
+    engine = GoogleTranslateEngine()
+    requests = []
+    
+    async def fake_translate(text, source_lang, target_lang):
+        requests.append(text)
+        return text.upper()
+    
+    monkeypatch.setattr(engine.async_engine, 'translate', fake_translate)
+    monkeypatch.setattr(engine.async_engine, 'MAX_PAYLOAD_CHARS', 12)
+    
+    results = engine.translate_batch(['one', 'two', '', 'three', 'four'], 'en', 'fr')
+    assert results == ['ONE', 'TWO', '', 'THREE', 'FOUR']
+    assert requests == ['one\ntwo', 'three\nfour']
+
+
+def test_google_batch_falls_back_when_lines_merge(monkeypatch):
+    """A packed response with the wrong line count is retried per segment"""
+    engine = GoogleTranslateEngine()
+    
+    async def fake_translate(text, source_lang, target_lang):
+        return text.replace('\n', ' ').upper()
+    
+    monkeypatch.setattr(engine.async_engine, 'translate', fake_translate)
+    assert engine.translate_batch(['a', 'b'], 'en', 'fr') == ['A', 'B']
+
+
+def test_google_requests_run_concurrently(monkeypatch):
+    """Packed requests are in flight at the same time"""
+    engine = GoogleTranslateEngine()
+    in_flight = []
+    peak = []
+    
+    async def fake_translate(text, source_lang, target_lang):
+        in_flight.append(text)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(text)
+        return text
+    
+    monkeypatch.setattr(engine.async_engine, 'translate', fake_translate)
+    texts = ['a\nb', 'c\nd', 'e\nf']
+    assert engine.translate_batch(texts, 'en', 'fr') == texts
+    assert max(peak) == 3
@@ -0,0 +1,58 @@
+"""
+Tests for the benchmark stand-ins and statistics
+"""
+
+from benchmarks.fake_argos import FakeArgosEngine
+from benchmarks.run import compare, make_corpus, percentile, summarize
+from benchmarks.stub_google import StubGoogleServer, fake_translate
+from lingosnap.engines.google_engine import GoogleTranslateEngine
+from lingosnap.engines.resilience import RequestGovernor
+
+
+def test_google_engine_against_stub():
+    """The Google engine talks to the stand-in like to the real endpoint"""
+    with StubGoogleServer(latency=0, jitter=0) as server:
+        engine = GoogleTranslateEngine(service_url=server.url)
+        try:
+            assert engine.translate('Hello', 'en', 'de') == '[de] hELLO'
+            assert engine.translate_batch(['a', '', 'b'], 'en', 'fr') == ['[fr] A', '', '[fr] B']
+        finally:
+            engine.close()
+        assert server.requests == 2
+
+
+def test_stub_errors_are_retried():
+    """503 answers of the stand-in go through the engine's retry policy"""
+    with StubGoogleServer(latency=0, jitter=0, error_rate=1.0) as server:
+        governor = RequestGovernor(max_retries=2, retry_base_delay=0.01,
+                                   failure_threshold=0)
+        engine = GoogleTranslateEngine(service_url=server.url, governor=governor)
+        try:
+            engine.translate('Hello', 'en', 'de')
+            assert False, 'expected an exception'
+        except Exception as e:
+            assert '503' in str(e)
+        finally:
+            engine.close()
+        assert server.requests == 3
+
+
+def test_fake_argos_is_deterministic():
+    """The fake backend returns the same output as the stub"""
+    engine = FakeArgosEngine(latency=0, per_char=0)
+    assert engine.translate('Hi\nthere', 'en', 'de') == fake_translate('Hi\nthere', 'de')
+    assert engine.translate_batch(['a', 'b'], 'en', 'de') == ['[de] A', '[de] B']
+
+
+def test_statistics():
+    """Percentiles interpolate and comparisons report relative changes"""
+    assert percentile([], 0.5) is None
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert percentile([1.0, 2.0], 0.99) == 1.99
+    assert make_corpus(5, 2, 4, seed=1) == make_corpus(5, 2, 4, seed=1)
+    
+    old = {'results': {'google': {'single': summarize([0.1, 0.2], 1.0, 10, 100, 0)}}}
+    new = {'results': {'google': {'single': summarize([0.05, 0.1], 0.5, 10, 100, 0)}}}
+    lines = compare(old, new)
+    assert len(lines) == 1
+    assert '-50.0%' in lines[0] and '+100.0%' in lines[0]
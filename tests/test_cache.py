@@ -0,0 +1,71 @@
+"""
+Tests for the translation cache
+"""
+
+import pytest
+from lingosnap.engines.cached_engine import CachedTranslationEngine
+from lingosnap.utils.cache import TranslationCache, normalize_text
+from tests.fakes import CountingEngine
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TranslationCache(memory_entries=2, db_dir=tmp_path)
+
+
+def test_normalize_text():
+    """Spacing between words is collapsed, surrounding whitespace is kept"""
+    assert normalize_text('  hello   world \n foo\t\tbar\t') == '  hello world \n foo bar\t'
+
+
+def test_cached_engine_memory_hit(cache):
+    """Repeated requests are served from memory"""
+    engine = CachedTranslationEngine(CountingEngine(), cache)
+    assert engine.translate('Hello world', 'en', 'zh') == 'zh:Hello world'
+    assert engine.translate('Hello  world', 'en', 'zh') == 'zh:Hello world'
+    assert engine.engine.calls == 1
+    
+    stats = engine.get_cache_stats()
+    assert stats['memory_hits'] == 1
+    assert stats['misses'] == 1
+
+
+def test_surrounding_whitespace_is_kept(cache):
+    """Texts differing only in surrounding whitespace are cached apart"""
+    engine = CachedTranslationEngine(CountingEngine(), cache)
+    assert engine.translate('Hello', 'en', 'zh') == 'zh:Hello'
+    assert engine.translate('Hello ', 'en', 'zh') == 'zh:Hello '
+    assert engine.translate('  Hello', 'en', 'zh') == 'zh:  Hello'
+    assert engine.engine.calls == 3
+
+
+def test_persistent_tier_shared(cache, tmp_path):
+    """A second cache on the same directory sees earlier entries"""
+    cache.put('fake', 'Hello', 'en', 'zh', '你好')
+    
+    other = TranslationCache(db_dir=tmp_path)
+    assert other.get('fake', 'Hello', 'en', 'zh') == '你好'
+    assert other.get_stats()['disk_hits'] == 1
+    assert other.get('argos', 'Hello', 'en', 'zh') is None
+
+
+def test_memory_tier_bounded(cache):
+    """The LRU tier never exceeds its size"""
+    for i in range(5):
+        cache.put('fake', f'text {i}', 'en', 'zh', str(i))
+    assert cache.get_stats()['memory_entries'] == 2
+
+
+def test_prune_by_size_and_age(tmp_path):
+    """Old entries and overflow are evicted from disk"""
+    cache = TranslationCache(max_entries=3, db_dir=tmp_path)
+    for i in range(5):
+        cache.put('fake', f'text {i}', 'en', 'zh', str(i))
+    cache.prune()
+    
+    fresh = TranslationCache(max_entries=3, db_dir=tmp_path)
+    assert fresh.get('fake', 'text 0', 'en', 'zh') is None
+    assert fresh.get('fake', 'text 4', 'en', 'zh') == '4'
+    
+    expired = TranslationCache(max_age_days=0, db_dir=tmp_path)
+    assert expired.get('fake', 'text 4', 'en', 'zh') is None
@@ -0,0 +1,118 @@
+"""
+Tests for the segmentation pipeline stage
+"""
+
+import threading
+import time
+import pytest
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.engines.chunked_engine import ChunkedTranslationEngine
+from lingosnap.engines.factory import wrap_engine
+from lingosnap.engines.resilience import CircuitOpenError
+from lingosnap.utils.segmentation import split_segments, group_segments
+from tests.fakes import FakeConfig
+
+
+class RecordingEngine(TranslationEngine):
+    """Fake engine that upper-cases text and records concurrency"""
+    
+    name = 'fake'
+    
+    def __init__(self, failures=0, error=None):
+        self.requests = []
+        self.failures = failures
+        self.error = error or Exception('temporary failure')
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+    
+    def translate(self, text, source_lang, target_lang):
+        with self.lock:
+            self.requests.append(text)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            fail = self.failures > 0
+            if fail:
+                self.failures -= 1
+        try:
+            time.sleep(0.01)
+            if fail:
+                raise self.error
+            return text.upper()
+        finally:
+            with self.lock:
+                self.active -= 1
+    
+    def get_supported_languages(self):
+        return [('en', 'English')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return True
+
+
+LONG_TEXT = '  ' + '\n\n'.join(
+    ' '.join(f'Sentence {p}.{s} is here.' for s in range(8)) for p in range(6)
+) + '\n'
+
+
+def test_group_segments_respects_limit():
+    """Chunks stay under the limit and keep every character"""
+    segments = split_segments(LONG_TEXT)
+    chunks = group_segments(segments, 100)
+    assert ''.join(chunk + sep for chunk, sep in chunks) == LONG_TEXT
+    assert all(len(chunk) <= 100 for chunk, _ in chunks)
+
+
+def test_long_text_translated_in_order_with_bounded_parallelism():
+    """Chunks run concurrently, never above max_workers, and keep the layout"""
+    engine = RecordingEngine()
+    chunked = ChunkedTranslationEngine(engine, max_chunk_chars=100, max_workers=3)
+    
+    assert chunked.translate(LONG_TEXT, 'en', 'zh') == LONG_TEXT.upper()
+    assert len(engine.requests) > 3
+    assert all(len(request) <= 100 for request in engine.requests)
+    assert 1 < engine.max_active <= 3
+
+
+def test_failed_chunk_is_retried():
+    """A transient failure only repeats the affected chunk"""
+    engine = RecordingEngine(failures=1)
+    chunked = ChunkedTranslationEngine(engine, max_chunk_chars=100, max_workers=1)
+    chunked.RETRY_DELAY = 0
+    
+    assert chunked.translate(LONG_TEXT, 'en', 'zh') == LONG_TEXT.upper()
+    chunk_count = len([c for c, _ in group_segments(split_segments(LONG_TEXT), 100) if c])
+    assert len(engine.requests) == chunk_count + 1
+
+
+def test_open_circuit_is_not_retried():
+    """A chunk rejected by an open circuit fails without further attempts"""
+    engine = RecordingEngine(failures=100, error=CircuitOpenError(30))
+    chunked = ChunkedTranslationEngine(engine, max_chunk_chars=100, max_workers=1)
+    chunked.RETRY_DELAY = 0
+    
+    with pytest.raises(CircuitOpenError):
+        chunked.translate(LONG_TEXT, 'en', 'zh')
+    assert len(engine.requests) == len(set(engine.requests))
+
+
+def test_google_chunks_rely_on_governor_retries():
+    """Chunk retries are only configured for engines without their own"""
+    engine = RecordingEngine()
+    engine.name = 'google'
+    assert wrap_engine(engine, FakeConfig(masking_enabled=False, cache_enabled=False)).max_retries == 0
+    engine.name = 'argos'
+    assert wrap_engine(engine, FakeConfig(masking_enabled=False, cache_enabled=False)).max_retries == 2
+
+
+def test_short_texts_pass_through():
+    """Short texts and batches are sent unchanged"""
+    engine = RecordingEngine()
+    chunked = ChunkedTranslationEngine(engine, max_chunk_chars=100)
+    
+    assert chunked.translate('Hi. There.', 'en', 'zh') == 'HI. THERE.'
+    assert chunked.translate_batch(['a', LONG_TEXT], 'en', 'zh') == ['A', LONG_TEXT.upper()]
+    assert engine.requests[:2] == ['Hi. There.', 'a']
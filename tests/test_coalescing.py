@@ -0,0 +1,97 @@
+"""
+Tests for single-flight request coalescing
+"""
+
+import threading
+import time
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.engines.coalescing_engine import CoalescingTranslationEngine
+
+
+class BlockingEngine(TranslationEngine):
+    """Fake engine whose calls block until released"""
+    
+    name = 'fake'
+    
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+    
+    def translate(self, text, source_lang, target_lang):
+        self.calls.append(text)
+        self.started.set()
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return text.upper()
+    
+    def get_supported_languages(self):
+        return [('en', 'English')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return True
+
+
+def run_concurrently(engine, count, call):
+    """Start count callers once the first one reached the engine"""
+    results = [None] * count
+    
+    def worker(index):
+        try:
+            results[index] = call()
+        except Exception as e:
+            results[index] = e
+    
+    threads = [threading.Thread(target=worker, args=(0,))]
+    threads[0].start()
+    engine.unwrap().started.wait(5)
+    for index in range(1, count):
+        threads.append(threading.Thread(target=worker, args=(index,)))
+        threads[-1].start()
+    
+    # Let the followers register before the leader finishes
+    while engine.get_coalescing_stats()['coalesced'] < count - 1:
+        time.sleep(0.001)
+    engine.unwrap().release.set()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_identical_requests_share_one_call():
+    """Concurrent identical requests hit the engine once"""
+    engine = CoalescingTranslationEngine(BlockingEngine())
+    results = run_concurrently(engine, 4, lambda: engine.translate('hi', 'en', 'zh'))
+    
+    assert results == ['HI'] * 4
+    assert engine.unwrap().calls == ['hi']
+    assert engine.get_coalescing_stats()['in_flight'] == 0
+
+
+def test_waiters_receive_the_error():
+    """Every waiter sees the leader's exception"""
+    error = Exception('upstream down')
+    engine = CoalescingTranslationEngine(BlockingEngine(error))
+    results = run_concurrently(engine, 3, lambda: engine.translate('hi', 'en', 'zh'))
+    
+    assert all(result is error for result in results)
+    assert len(engine.unwrap().calls) == 1
+
+
+def test_batch_joins_flight_and_dedupes():
+    """Batches skip texts already in flight and duplicates within the batch"""
+    engine = CoalescingTranslationEngine(BlockingEngine())
+    results = run_concurrently(
+        engine, 2,
+        lambda: engine.translate('hi', 'en', 'zh') if not engine.unwrap().calls
+        else engine.translate_batch(['hi', 'yo', 'yo'], 'en', 'zh')
+    )
+    
+    assert results[0] == 'HI'
+    assert results[1] == ['HI', 'YO', 'YO']
+    assert sorted(engine.unwrap().calls) == ['hi', 'yo']
@@ -0,0 +1,134 @@
+"""
+Tests for the translation daemon and its client
+"""
+
+import argparse
+import socket
+import pytest
+from lingosnap.cli import terminal
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.utils.daemon import DaemonClient, DaemonUnavailable, TranslationDaemon
+from tests.fakes import FakeConfig
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'),
+                                reason='Unix domain sockets are not available')
+
+
+class UpperEngine(TranslationEngine):
+    """Fake engine upper-casing texts"""
+    
+    name = 'daemon-fake'
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def translate(self, text, source_lang, target_lang):
+        self.calls += 1
+        if 'FAIL' in text:
+            raise Exception('Translation failed: boom')
+        return text.upper()
+    
+    def get_supported_languages(self):
+        return [('en', 'English'), ('de', 'German')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return True
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    engine = UpperEngine()
+    daemon = TranslationDaemon({'fake': engine}, FakeConfig(engine='fake'),
+                               socket_path=tmp_path / 'd.sock')
+    assert daemon.start()
+    daemon.engine = engine
+    yield daemon
+    daemon.shutdown()
+
+
+def test_translate_through_socket(daemon):
+    """Every line comes back once; failures stay per line"""
+    client = DaemonClient(daemon.socket_path)
+    results = dict(client.translate(['hello', '', 'FAIL here', 'world'], 'de'))
+    
+    assert results[0] == 'HELLO'
+    assert results[1] == ''
+    assert isinstance(results[2], Exception) and 'boom' in str(results[2])
+    assert results[3] == 'WORLD'
+    
+    status = client.ping()
+    assert status['requests'] == 2
+    assert status['engines'] == ['fake']
+
+
+def test_engines_stay_loaded(daemon):
+    """Repeated requests reuse the same engine"""
+    client = DaemonClient(daemon.socket_path)
+    for _ in range(3):
+        assert list(client.translate(['one'], 'de')) == [(0, 'ONE')]
+    assert daemon.engine.calls == 3
+
+
+def test_rejected_requests(daemon):
+    """Unsupported languages and engines are reported to the client"""
+    client = DaemonClient(daemon.socket_path)
+    with pytest.raises(Exception, match="'xx' is not supported"):
+        list(client.translate(['hello'], 'xx'))
+    with pytest.raises(Exception, match='Unknown engine'):
+        list(client.translate(['hello'], 'de', engine_type='nope'))
+
+
+def test_socket_lifecycle(tmp_path):
+    """Stale sockets are replaced, live ones are not, shutdown cleans up"""
+    path = tmp_path / 'd.sock'
+    client = DaemonClient(path)
+    with pytest.raises(DaemonUnavailable):
+        client.translate(['hello'], 'de')
+    assert not client.is_running()
+    
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    
+    first = TranslationDaemon({'fake': UpperEngine()}, socket_path=path)
+    assert first.start()
+    assert client.is_running()
+    
+    second = TranslationDaemon({'fake': UpperEngine()}, socket_path=path)
+    assert not second.start()
+    
+    first.shutdown()
+    assert not path.exists()
+    assert not client.is_running()
+
+
+def test_socket_is_private_from_the_start(tmp_path, monkeypatch):
+    """The socket is never accessible to other users, not even before a chmod"""
+    monkeypatch.setattr('os.chmod', lambda *args, **kwargs: None)
+    path = tmp_path / 'run' / 'd.sock'
+    daemon = TranslationDaemon({'fake': UpperEngine()}, socket_path=path)
+    assert daemon.start()
+    try:
+        assert path.stat().st_mode & 0o777 == 0o600
+        assert path.parent.stat().st_mode & 0o777 == 0o700
+        assert DaemonClient(path).is_running()
+    finally:
+        daemon.shutdown()
+
+
+def test_lingo_uses_running_daemon(daemon, monkeypatch, capsys):
+    """lingo prints the daemon's translations without creating an engine"""
+    def no_local_engine(*args):
+        raise AssertionError('engine created in the client')
+    
+    monkeypatch.setattr(terminal, 'create_local_translator', no_local_engine)
+    monkeypatch.setattr(terminal, 'get_previous_terminal_output', lambda n: 'first\nsecond')
+    
+    config = FakeConfig(engine='fake', daemon_socket=str(daemon.socket_path))
+    args = argparse.Namespace(target_line=2, language='de', no_daemon=False)
+    terminal.translate_terminal_output(args, config, None)
+    
+    assert capsys.readouterr().out == 'FIRST\nSECOND\n'
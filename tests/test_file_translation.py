@@ -0,0 +1,108 @@
+"""
+Tests for file formats and resumable file translation
+"""
+
+import json
+from lingosnap.utils.file_formats import (detect_format, parse_json, parse_po,
+                                          parse_subtitles, parse_text)
+from lingosnap.utils.file_translation import (CheckpointStore, FileTranslator,
+                                              default_output_path, job_key)
+
+
+def upper(texts):
+    return [text.upper() for text in texts]
+
+
+def test_text_paragraphs():
+    """Paragraphs are segments; blank lines and indentation stay"""
+    parsed = parse_text('  First line\nsecond line.\n\n\nNext.\n')
+    assert parsed.segments == ['First line\nsecond line.', 'Next.']
+    assert parsed.render(['A', None]) == '  A\n\n\nNext.\n'
+
+
+def test_subtitles_keep_timings():
+    """Only cue text is translated in SRT and WebVTT files"""
+    srt = '1\n00:00:01,000 --> 00:00:02,000\nHello\nthere\n\n2\n00:00:03,000 --> 00:00:04,000\nBye\n'
+    parsed = parse_subtitles(srt)
+    assert parsed.segments == ['Hello\nthere', 'Bye']
+    assert parsed.render(upper(parsed.segments)) == srt.replace('Hello\nthere', 'HELLO\nTHERE').replace('Bye', 'BYE')
+    
+    vtt = 'WEBVTT\n\nNOTE not a cue\n\nintro\n00:01.000 --> 00:02.000 align:start\nHi\n'
+    parsed = parse_subtitles(vtt)
+    assert parsed.segments == ['Hi']
+    assert parsed.render(['Salut']) == vtt.replace('Hi\n', 'Salut\n')
+    assert detect_format('movie.VTT') == 'vtt' and detect_format('notes.md') == 'text'
+
+
+def test_po_untranslated_entries():
+    """Empty msgstrs are filled and marked fuzzy, existing ones are kept"""
+    po = ('msgid ""\nmsgstr ""\n"Language: de\\n"\n\n'
+          '#: a.c:1\nmsgid "Hello"\nmsgstr ""\n\n'
+          '#, c-format\nmsgid "One file\\n"\nmsgid_plural "%d files\\n"\nmsgstr[0] ""\nmsgstr[1] ""\n\n'
+          'msgid "Done"\nmsgstr "Fertig"\n')
+    parsed = parse_po(po)
+    assert parsed.segments == ['Hello', 'One file\n', '%d files\n']
+    
+    rendered = parsed.render(['Hallo', 'Eine Datei', '%d Dateien'])
+    assert '#: a.c:1\n#, fuzzy\nmsgid "Hello"\nmsgstr "Hallo"' in rendered
+    assert '#, c-format, fuzzy' in rendered
+    assert 'msgstr[0] "Eine Datei\\n"\nmsgstr[1] "%d Dateien\\n"' in rendered
+    assert 'msgstr "Fertig"' in rendered and '"Language: de\\n"' in rendered
+    
+    # Untranslated segments leave their entry as it was
+    assert parsed.render([None, None, None]) == po
+
+
+def test_json_values():
+    """String values are translated, keys, numbers and indentation are kept"""
+    content = '{\n    "a": "Hello",\n    "b": {"list": ["One", ""], "n": 3}\n}\n'
+    parsed = parse_json(content)
+    assert parsed.segments == ['Hello', 'One']
+    rendered = parsed.render(['Hallo', None])
+    assert json.loads(rendered) == {'a': 'Hallo', 'b': {'list': ['One', ''], 'n': 3}}
+    assert rendered.startswith('{\n    "a"') and rendered.endswith('}\n')
+
+
+def test_resume_after_failures(tmp_path):
+    """A failed run keeps its checkpoint; the next one translates only the rest"""
+    source = tmp_path / 'movie.srt'
+    cues = [f'{i + 1}\n00:00:01,000 --> 00:00:02,000\nLine {i}\n' for i in range(50)]
+    source.write_text('\n'.join(cues), encoding='utf-8')
+    output = default_output_path(source, 'de')
+    assert output.name == 'movie.de.srt'
+    store = CheckpointStore(tmp_path)
+    
+    def flaky(texts):
+        return [Exception('Translation failed: boom') if text.endswith('7') else text.upper()
+                for text in texts]
+    
+    result = FileTranslator(flaky, 'fake', 'de', store, max_workers=2).translate_file(source, output)
+    assert result.failed == 5 and result.translated == 45
+    assert not output.exists()
+    
+    sent = []
+    
+    def recording(texts):
+        sent.extend(texts)
+        return upper(texts)
+    
+    result = FileTranslator(recording, 'fake', 'de', store).translate_file(source, output)
+    assert result.complete and result.resumed == 45 and result.translated == 5
+    assert sorted(sent) == sorted(f'Line {i}' for i in range(50) if i % 10 == 7)
+    assert output.read_text(encoding='utf-8').count('LINE ') == 50
+    assert store.load(job_key(source, output, 'fake', 'de'), '', 0) == {}
+
+
+def test_changed_input_starts_over(tmp_path):
+    """Checkpoints of a file that changed are dropped; line breaks are kept"""
+    store = CheckpointStore(tmp_path)
+    job = job_key(tmp_path / 'a.txt', tmp_path / 'a.de.txt', 'fake', 'de')
+    store.load(job, 'old', 1)
+    store.save(job, [(0, 'stale')])
+    
+    source = tmp_path / 'a.txt'
+    source.write_bytes(b'One.\r\n\r\nTwo.\r\n')
+    output = tmp_path / 'a.de.txt'
+    result = FileTranslator(upper, 'fake', 'de', store).translate_file(source, output)
+    assert result.resumed == 0 and result.translated == 2
+    assert output.read_bytes() == b'ONE.\r\n\r\nTWO.\r\n'
@@ -0,0 +1,61 @@
+"""
+Tests for incremental re-translation
+"""
+
+import pytest
+from lingosnap.utils.incremental import SegmentMap, splice_range
+from tests.fakes import BatchRecordingEngine
+
+
+def test_only_edited_sentences_are_sent():
+    """Unchanged sentences are reused, edited ones re-translated"""
+    engine = BatchRecordingEngine()
+    segments = SegmentMap()
+    
+    text = 'First sentence. Second sentence.\n\nThird one here.'
+    assert segments.translate(engine, text, 'en', 'de') == \
+        '<First sentence.> <Second sentence.>\n\n<Third one here.>'
+    assert engine.batches == [['First sentence.', 'Second sentence.', 'Third one here.']]
+    
+    edited = 'First sentence. Second sentence, edited.\n\nThird one here.'
+    assert segments.translate(engine, edited, 'en', 'de') == \
+        '<First sentence.> <Second sentence, edited.>\n\n<Third one here.>'
+    assert engine.batches[-1] == ['Second sentence, edited.']
+    assert (segments.translated, segments.reused) == (1, 2)
+    assert segments.chars_sent == len('Second sentence, edited.')
+    
+    # Nothing changed: no engine call at all
+    segments.translate(engine, edited, 'en', 'de')
+    assert len(engine.batches) == 2
+
+
+def test_language_change_starts_over():
+    """Translations are not reused for another language pair"""
+    engine = BatchRecordingEngine()
+    segments = SegmentMap()
+    segments.translate(engine, 'One. Two.', 'en', 'de')
+    segments.translate(engine, 'One. Two.', 'en', 'fr')
+    assert engine.batches[-1] == ['One.', 'Two.']
+
+
+def test_failed_sentence_is_retried_next_time():
+    """Successful sentences are kept when another one fails"""
+    engine = BatchRecordingEngine()
+    segments = SegmentMap()
+    with pytest.raises(Exception):
+        segments.translate(engine, 'Good one. FAIL here.', 'en', 'de')
+    
+    with pytest.raises(Exception):
+        segments.translate(engine, 'Good one. FAIL here.', 'en', 'de')
+    assert engine.batches[-1] == ['FAIL here.']
+
+
+def test_splice_range():
+    """The replacement covers only the changed middle part"""
+    assert splice_range('abcdef', 'abXYef') == (2, 4, 'XY')
+    assert splice_range('abc', 'abc') == (3, 3, '')
+    assert splice_range('aaa', 'aaaa') == (3, 3, 'a')
+    for old, new in [('hello world', 'hello brave world'), ('xyz', ''), ('', 'new'),
+                     ('Satz eins. Satz zwei.', 'Satz eins. Satz 2.')]:
+        start, end, replacement = splice_range(old, new)
+        assert old[:start] + replacement + old[end:] == new
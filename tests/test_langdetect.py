@@ -0,0 +1,100 @@
+"""
+Tests for the offline language detector
+"""
+
+import time
+from lingosnap.engines.google_engine import GoogleTranslateEngine
+from lingosnap.utils.daemon import detect_source_language
+from lingosnap.utils.langdetect import LanguageDetector
+
+
+def test_script_based_languages():
+    """Single-script languages and CJK are told apart by script"""
+    detector = LanguageDetector()
+    assert detector.detect('在当前目录中找不到文件') == 'zh'
+    assert detector.detect('在目前目錄中找不到這個檔案') == 'zh-tw'
+    assert detector.detect('ファイルが見つかりません') == 'ja'
+    assert detector.detect('파일을 찾을 수 없습니다') == 'ko'
+    assert detector.detect('Το αρχείο δεν βρέθηκε') == 'el'
+    assert detector.detect('12345 !?') is None
+
+
+def test_terminal_messages():
+    """Localized error messages are detected with their language"""
+    detector = LanguageDetector()
+    samples = {
+        'en': "rm: cannot remove 'build': No such file or directory",
+        'de': "ls: Zugriff auf 'foo' nicht möglich: Datei oder Verzeichnis nicht gefunden",
+        'es': "ls: no se puede acceder a 'foo': No existe el archivo o el directorio",
+        'fr': "ls: impossible d'accéder à 'foo': Aucun fichier ou dossier de ce type",
+        'it': "ls: impossibile accedere a 'foo': File o directory non esistente",
+        'pt': "ls: não foi possível acessar 'foo': Arquivo ou diretório inexistente",
+        'nl': "ls: kan geen toegang krijgen tot 'foo': Bestand of map bestaat niet",
+        'pl': "ls: nie można uzyskać dostępu do 'foo': Nie ma takiego pliku ani katalogu",
+        'ru': "ls: невозможно получить доступ к 'foo': Нет такого файла или каталога",
+        'uk': "ls: не вдалося отримати доступ до 'foo': Немає такого файла або каталогу",
+    }
+    for code, text in samples.items():
+        assert detector.detect(text) == code, text
+        scores = detector.detect_scores(text)
+        assert scores[0][0] == code
+        assert [s for _, s in scores] == sorted((s for _, s in scores), reverse=True)
+
+
+def test_close_languages():
+    """Neighbours of other profiled languages are not mistaken for them"""
+    detector = LanguageDetector()
+    samples = {
+        'no': 'Kommandoen ble ikke funnet, men kan installeres med følgende pakke',
+        'da': 'Du skal logge ind igen, fordi din session er udløbet.',
+        'sw': 'Tafadhali subiri wakati tunapakua sasisho la hivi karibuni.',
+        'tl': 'Pakihintay habang dina-download namin ang pinakabagong update.',
+        'hr': 'Molimo pričekajte dok preuzimamo najnovije ažuriranje.',
+        'sk': 'Prístup bol zamietnutý. Nemáte povolenie zapisovať do tohto priečinka.',
+        'lv': 'Lūdzu, uzgaidiet, kamēr mēs lejupielādējam jaunāko atjauninājumu.',
+    }
+    for code, text in samples.items():
+        assert detector.detect(text) == code, text
+
+
+def test_declines_short_lines():
+    """Lines too short to tell the language are left undetected"""
+    detector = LanguageDetector()
+    for text in ['ok', 'Killed', 'Permission denied', 'Segmentation fault (core dumped)',
+                 'git push origin main', 'Traceback (most recent call last):']:
+        assert detector.detect(text) is None, text
+
+
+def test_declines_languages_without_profile():
+    """Languages without a trigram profile are not guessed"""
+    detector = LanguageDetector()
+    for text in [
+        'Skráin fannst ekki í tilgreindri möppu, vinsamlegast reyndu aftur síðar',
+        'Ezin izan da fitxategia aurkitu zehaztutako direktorioan',
+        'Fayl göstərilən qovluqda tapılmadı, zəhmət olmasa yenidən cəhd edin',
+        'Faylka lagama helin galka la cayimay, fadlan isku day mar kale',
+        'Датотека није пронађена у наведеном директоријуму',
+        'Файл көрсетілген каталогтан табылмады',
+    ]:
+        assert detector.detect(text) is None, text
+
+
+def test_short_strings_are_fast():
+    """Detection of a short line stays well under a millisecond"""
+    detector = LanguageDetector()
+    detector.detect('warm up')
+    
+    start = time.perf_counter()
+    for _ in range(200):
+        code = detector.detect('Permission denied while writing to the log')
+    assert (time.perf_counter() - start) / 200 < 0.001
+    assert code == 'en'
+
+
+def test_google_uses_local_detection():
+    """Google detection maps to Google codes without a request"""
+    engine = GoogleTranslateEngine(service_url='http://127.0.0.1:9')
+    assert engine.detect_language('这是一个测试') == 'zh-cn'
+    assert engine.detect_language('Bonjour tout le monde') == 'fr'
+    assert engine.detect_language('Permission denied') is None
+    assert detect_source_language(engine, 'Segmentation fault (core dumped)') == 'auto'
@@ -0,0 +1,79 @@
+"""
+Tests for the shared language registry
+"""
+
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.utils.languages import (LanguageRegistry, LanguageSet,
+                                       to_canonical_code, to_engine_code)
+
+
+class CountingEngine(TranslationEngine):
+    """Fake engine counting get_supported_languages calls"""
+    
+    def __init__(self, name, languages):
+        self.name = name
+        self.languages = languages
+        self.calls = 0
+    
+    def translate(self, text, source_lang, target_lang):
+        return text
+    
+    def get_supported_languages(self):
+        self.calls += 1
+        return list(self.languages)
+    
+    def detect_language(self, text):
+        return None
+    
+    def is_available(self):
+        return True
+
+
+def test_language_set_lookup():
+    """Languages are sorted by name and found by code in O(1)"""
+    languages = LanguageSet([('fr', 'French'), ('de', 'German'), ('en', 'English'),
+                             ('fr', 'Français')])
+    assert languages.codes() == ['en', 'fr', 'de']
+    assert languages.index_of('de') == 2
+    assert languages.index_of('xx') == -1
+    assert languages.name_of('fr') == 'French'
+    assert 'en' in languages and 'xx' not in languages
+
+
+def test_code_conversion():
+    """Codes are converted between engine conventions"""
+    assert to_engine_code('zh-cn', 'argos') == 'zh'
+    assert to_engine_code('ZH-TW', 'argos') == 'zh'
+    assert to_engine_code('zh', 'google') == 'zh-cn'
+    assert to_engine_code('fr', 'google') == 'fr'
+    assert to_canonical_code('zh') == 'zh-cn'
+    assert to_canonical_code('he') == 'iw'
+
+
+def test_registry_caches_and_invalidates():
+    """Languages are loaded once per engine until invalidated"""
+    registry = LanguageRegistry()
+    engine = CountingEngine('argos', [('en', 'English'), ('zh', 'Chinese')])
+    
+    registry.get(engine)
+    registry.get(engine)
+    assert engine.calls == 1
+    
+    engine.languages.append(('de', 'German'))
+    registry.invalidate('argos')
+    assert 'de' in registry.get(engine)
+    assert engine.calls == 2
+
+
+def test_registry_normalize():
+    """Codes are converted for the engine and checked against its languages"""
+    registry = LanguageRegistry()
+    argos = CountingEngine('argos', [('en', 'English'), ('zh', 'Chinese')])
+    google = CountingEngine('google', [('en', 'English'), ('zh-cn', 'Chinese (simplified)'),
+                                       ('iw', 'Hebrew')])
+    
+    assert registry.normalize('zh-cn', argos) == 'zh'
+    assert registry.normalize('zh', google) == 'zh-cn'
+    assert registry.normalize('he', google) == 'iw'
+    assert registry.normalize('auto', google) == 'auto'
+    assert registry.normalize('fr', argos) is None
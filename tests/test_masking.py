@@ -0,0 +1,145 @@
+"""
+Tests for do-not-translate masking
+"""
+
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.engines.masking_engine import MaskingTranslationEngine
+from lingosnap.utils.masking import AhoCorasick, Masker
+
+
+class RecordingEngine(TranslationEngine):
+    """Fake engine recording the texts it receives"""
+    
+    name = 'fake'
+    
+    def __init__(self, transform=None):
+        self.received = []
+        self.transform = transform or (lambda text: text.upper())
+    
+    def translate(self, text, source_lang, target_lang):
+        self.received.append(text)
+        return self.transform(text)
+    
+    def get_supported_languages(self):
+        return [('en', 'English'), ('de', 'German')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return True
+
+
+def test_aho_corasick_finds_whole_words():
+    """All terms are found in one pass, but not inside other words"""
+    automaton = AhoCorasick(['he', 'she', 'hers', 'LingoSnap'])
+    matches = [(start, end, term) for start, end, term in
+               automaton.finditer('she said hers; lingosnap, ushers')]
+    assert (0, 3, 'she') in matches
+    assert (9, 13, 'hers') in matches
+    assert (15, 24, 'LingoSnap') in matches
+    assert all(start < 26 for start, _, _ in matches)
+
+
+def test_offsets_survive_length_changing_lowercase():
+    """Characters whose lowercase is longer do not shift the matches"""
+    automaton = AhoCorasick(['Foo', 'İzmir'])
+    assert list(automaton.finditer('İİ Foo bar')) == [(3, 6, 'Foo')]
+    assert list(automaton.finditer('İİ İZMIR')) == [(3, 8, 'İzmir')]
+    assert Masker(glossary={'Foo': 'Foo'}).mask('İİ Foo bar', 'de') == ('İİ {0} bar', ['Foo'])
+
+
+def test_masks_technical_spans():
+    """Paths, URLs, hashes, identifiers and long numbers are masked"""
+    masker = Masker()
+    text = ('Failed to open /var/log/app.log (see https://example.com/help) '
+            'in commit 3fa9c2e1b: config_loader.read_file() returned 40412 for --verbose')
+    masked, replacements = masker.mask(text, 'de')
+    
+    assert replacements == ['/var/log/app.log', 'https://example.com/help', '3fa9c2e1b',
+                            'config_loader.read_file()', '40412', '--verbose']
+    assert masked == 'Failed to open {0} (see {1}) in commit {2}: {3} returned {4} for {5}'
+
+
+def test_plain_prose_is_left_alone():
+    """Ordinary sentences, short numbers and hyphenated words are not masked"""
+    masker = Masker()
+    text = 'A well-known fact: 3 cats and/or 12 dogs, e.g. in the garden.'
+    assert masker.mask(text, 'de') == (text, [])
+
+
+def test_restore_tolerates_engine_formatting():
+    """Spaced or full-width placeholders are restored, lost ones are rejected"""
+    replacements = ['/tmp/a', 'x_y']
+    assert Masker.restore('Datei { 0 } und ｛1｝', replacements) == 'Datei /tmp/a und x_y'
+    assert Masker.restore('Datei {0}', replacements) is None
+    assert Masker.restore('Datei {0} {0} {1}', replacements) is None
+
+
+def test_glossary_terms():
+    """Glossary terms are kept or replaced by their fixed translation"""
+    masker = Masker(glossary={'LingoSnap': None, 'pull request': {'de': 'Pull-Request'}})
+    masked, replacements = masker.mask('Open a Pull Request for lingosnap', 'de')
+    assert masked == 'Open a {0} for {1}'
+    assert replacements == ['Pull-Request', 'lingosnap']
+    
+    masked, replacements = masker.mask('Open a pull request', 'fr')
+    assert replacements == ['pull request']
+
+
+def test_engine_sends_masked_text_and_counts_savings():
+    """Only the masked text reaches the engine and the savings are reported"""
+    masker = Masker()
+    upstream = RecordingEngine()
+    engine = MaskingTranslationEngine(upstream, masker)
+    
+    text = 'Cannot find module /usr/lib/python3/site-packages/foo_bar.py'
+    assert engine.translate(text, 'en', 'de') == \
+        'CANNOT FIND MODULE /usr/lib/python3/site-packages/foo_bar.py'
+    assert upstream.received == ['Cannot find module {0}']
+    
+    stats = masker.get_stats()
+    assert stats['texts'] == 1
+    assert stats['chars_saved'] == len(text) - len('Cannot find module {0}')
+
+
+def test_untranslatable_text_skips_engine():
+    """Texts made only of masked spans never reach the engine"""
+    masker = Masker()
+    upstream = RecordingEngine()
+    engine = MaskingTranslationEngine(upstream, masker)
+    
+    assert engine.translate('/etc/hosts  0x7ffd4c2a', 'en', 'de') == '/etc/hosts  0x7ffd4c2a'
+    assert upstream.received == []
+    assert masker.get_stats()['skipped'] == 1
+
+
+def test_lost_placeholders_fall_back_to_plain_text():
+    """A translation that drops a placeholder is redone without masking"""
+    masker = Masker()
+    upstream = RecordingEngine(lambda text: text.replace('{0}', '').upper())
+    engine = MaskingTranslationEngine(upstream, masker)
+    
+    assert engine.translate('Deleted ./build/output.bin', 'en', 'de') == \
+        'DELETED ./BUILD/OUTPUT.BIN'
+    assert upstream.received == ['Deleted {0}', 'Deleted ./build/output.bin']
+    assert masker.get_stats()['fallbacks'] == 1
+
+
+def test_batch_masks_each_text():
+    """Batches send masked texts and restore every result"""
+    upstream = RecordingEngine()
+    engine = MaskingTranslationEngine(upstream, Masker())
+    
+    results = engine.translate_batch(['Saved to ~/notes.txt', 'Hello world', '/tmp/x'],
+                                     'en', 'de')
+    assert results == ['SAVED TO ~/notes.txt', 'HELLO WORLD', '/tmp/x']
+    assert upstream.received == ['Saved to {0}', 'Hello world']
+
+
+def test_format_placeholders_and_markup_are_masked():
+    """Catalog placeholders and subtitle tags survive, prose percentages are text"""
+    masker = Masker()
+    masked, replacements = masker.mask('<i>Hello %s</i>, %(count)d new {kind} in {{ folder }}', 'de')
+    assert replacements == ['<i>', '%s', '</i>', '%(count)d', '{kind}', '{{ folder }}']
+    assert masker.mask('I am 50% sure that a < b', 'de')[1] == []
@@ -0,0 +1,99 @@
+"""
+Tests for the profiling mode
+"""
+
+import json
+import pstats
+import threading
+from lingosnap.utils.profiling import Profiler
+
+
+def busy():
+    return sum(i * i for i in range(2000))
+
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    """Spans and operations are no-ops until profiling is enabled"""
+    profiler = Profiler(tmp_path)
+    with profiler.operation('translate'):
+        with profiler.span('google.http'):
+            busy()
+    assert profiler.get_spans() == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_operation_writes_profile_and_trace(tmp_path):
+    """An operation leaves a pstats file and a Chrome trace with its stages"""
+    profiler = Profiler(tmp_path, enabled=True)
+    with profiler.operation('translate', chars=5):
+        with profiler.span('history.write'):
+            busy()
+    
+    profiles = list(tmp_path.glob('*-translate.prof'))
+    assert len(profiles) == 1
+    stats = pstats.Stats(str(profiles[0]))
+    assert any(function[2] == 'busy' for function in stats.stats)
+    
+    trace = json.loads(profiler.trace_file.read_text())
+    spans = {event['name']: event for event in trace['traceEvents'] if event['ph'] == 'X'}
+    assert set(spans) == {'translate', 'history.write'}
+    assert spans['translate']['args'] == {'chars': 5}
+    assert spans['translate']['dur'] >= spans['history.write']['dur']
+    assert any(event['ph'] == 'M' and event['name'] == 'thread_name'
+               for event in trace['traceEvents'])
+
+
+def test_nested_operations_share_one_profile(tmp_path):
+    """Only the outermost operation of a thread runs cProfile"""
+    profiler = Profiler(tmp_path, enabled=True)
+    with profiler.operation('startup'):
+        with profiler.operation('translate'):
+            busy()
+    assert [path.name.split('-')[-1] for path in tmp_path.glob('*.prof')] == ['startup.prof']
+    assert len(profiler.get_spans()) == 2
+
+
+def test_overlapping_spans_get_separate_lanes(tmp_path):
+    """Concurrent spans on a lane never share a row of the trace"""
+    profiler = Profiler(tmp_path, enabled=True)
+    first = profiler.span('google.http', lane='google http')
+    second = profiler.span('google.http', lane='google http')
+    first.__enter__()
+    second.__enter__()
+    second.__exit__(None, None, None)
+    first.__exit__(None, None, None)
+    with profiler.span('google.http', lane='google http'):
+        pass
+    
+    tids = [span['tid'] for span in profiler.get_spans()]
+    assert tids[0] != tids[1]
+    assert tids[2] in tids[:2]
+
+
+def test_spans_from_threads(tmp_path):
+    """Spans keep the thread they ran on"""
+    profiler = Profiler(tmp_path, enabled=True)
+    def work():
+        with profiler.span('cache.write'):
+            pass
+    
+    thread = threading.Thread(target=work, name='worker')
+    thread.start()
+    thread.join()
+    with profiler.span('gui.show_translation'):
+        pass
+    
+    tids = {span['name']: span['tid'] for span in profiler.get_spans()}
+    assert tids['cache.write'] != tids['gui.show_translation']
+    trace = json.loads(profiler.write_trace().read_text())
+    names = {event['args']['name'] for event in trace['traceEvents'] if event['ph'] == 'M'}
+    assert 'worker' in names
+
+
+def test_old_profiles_are_deleted(tmp_path):
+    """Only max_files profiles are kept"""
+    profiler = Profiler(tmp_path, enabled=True, max_files=2)
+    for _ in range(4):
+        with profiler.operation('ocr'):
+            busy()
+    assert len(list(tmp_path.glob('*.prof'))) == 2
@@ -0,0 +1,161 @@
+"""
+Tests for rate limiting, retry and circuit breaking
+"""
+
+import asyncio
+import time
+import pytest
+from lingosnap.engines.google_engine import (
+    AsyncGoogleTranslateEngine, GoogleHTTPError, is_request_error, is_retryable_error
+)
+from lingosnap.engines.resilience import (
+    AdaptiveLimiter, CircuitOpenError, RequestGovernor, TokenBucket
+)
+
+
+def make_governor(**kwargs):
+    options = dict(rate=0, retry_base_delay=0, retry_max_delay=0,
+                   is_retryable=is_retryable_error, is_request_error=is_request_error)
+    options.update(kwargs)
+    return RequestGovernor(**options)
+
+
+def failing_request(errors, result='ok'):
+    """Coroutine function raising the given errors, then returning result"""
+    errors = list(errors)
+    
+    async def request():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return request
+
+
+def test_transient_errors_are_retried():
+    """429/5xx answers are retried and counted"""
+    governor = make_governor(max_retries=3)
+    request = failing_request([GoogleHTTPError(503), GoogleHTTPError(429)])
+    
+    assert asyncio.run(governor.call(request)) == 'ok'
+    stats = governor.get_stats()
+    assert stats['retries'] == 2
+    assert stats['failures'] == 2
+    assert stats['successes'] == 1
+
+
+def test_permanent_errors_fail_immediately():
+    """A 400 answer is not retried and does not trip the breaker"""
+    governor = make_governor(max_retries=3, failure_threshold=1)
+    
+    with pytest.raises(GoogleHTTPError):
+        asyncio.run(governor.call(failing_request([GoogleHTTPError(400)])))
+    assert governor.get_stats()['retries'] == 0
+    assert governor.get_stats()['circuit_state'] == 'closed'
+
+
+def test_blocked_upstream_opens_circuit():
+    """403 answers and unparsable responses are not retried but trip the breaker"""
+    for error in (GoogleHTTPError(403), ValueError('Expecting value')):
+        governor = make_governor(max_retries=3, failure_threshold=2)
+        for _ in range(2):
+            with pytest.raises(type(error)):
+                asyncio.run(governor.call(failing_request([error])))
+        assert governor.get_stats()['retries'] == 0
+        assert governor.get_stats()['circuit_state'] == 'open'
+
+
+def test_circuit_opens_and_recovers():
+    """The breaker fails fast while open and closes after a good trial"""
+    governor = make_governor(max_retries=0, failure_threshold=2, reset_timeout=0.05)
+    
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(GoogleHTTPError):
+                await governor.call(failing_request([GoogleHTTPError(500)]))
+        with pytest.raises(CircuitOpenError):
+            await governor.call(failing_request([]))
+        await asyncio.sleep(0.06)
+        return await governor.call(failing_request([]))
+    
+    assert asyncio.run(scenario()) == 'ok'
+    stats = governor.get_stats()
+    assert stats['rejected'] == 1
+    assert stats['circuit_state'] == 'closed'
+
+
+def test_cancelled_trial_is_released():
+    """A half-open trial that is cancelled lets the next request try again"""
+    governor = make_governor(max_retries=0, failure_threshold=1, reset_timeout=0.01)
+    
+    async def scenario():
+        with pytest.raises(GoogleHTTPError):
+            await governor.call(failing_request([GoogleHTTPError(500)]))
+        await asyncio.sleep(0.02)
+        
+        started = asyncio.Event()
+        
+        async def hanging_request():
+            started.set()
+            await asyncio.Event().wait()
+        
+        trial = asyncio.ensure_future(governor.call(hanging_request))
+        await started.wait()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        return await governor.call(failing_request([]))
+    
+    assert asyncio.run(scenario()) == 'ok'
+    assert governor.get_stats()['circuit_state'] == 'closed'
+
+
+def test_engine_errors_stay_typed():
+    """The engine passes circuit and status errors through with their type"""
+    governor = make_governor(max_retries=0, failure_threshold=1, reset_timeout=30)
+    engine = AsyncGoogleTranslateEngine(service_url='http://127.0.0.1:9', governor=governor)
+    
+    async def scenario():
+        async def refuse(*args):
+            raise GoogleHTTPError(503, retry_after=2)
+        
+        engine._request = refuse
+        with pytest.raises(GoogleHTTPError) as http_error:
+            await engine.translate('Hello', 'en', 'de')
+        assert http_error.value.retry_after == 2
+        
+        with pytest.raises(GoogleHTTPError):
+            await governor.call(failing_request([GoogleHTTPError(500)]))
+        del engine._request
+        with pytest.raises(CircuitOpenError) as circuit_error:
+            await engine.translate('Hello', 'en', 'de')
+        assert circuit_error.value.retry_in > 0
+    
+    asyncio.run(scenario())
+
+
+def test_aimd_limit():
+    """Congestion halves the limit, successes grow it back additively"""
+    limiter = AdaptiveLimiter(initial=8, minimum=1, maximum=8, latency_target=0)
+    limiter.on_congestion()
+    assert limiter.limit == 4
+    limiter.on_congestion()
+    assert limiter.limit == 2
+    
+    limiter.latency_target = 1.0
+    limiter.on_success(0.1)
+    assert limiter.limit == 2.5
+    limiter.on_success(5.0)  # slow answer counts as congestion
+    assert limiter.limit == 2.5  # ... but only once per window
+
+
+def test_token_bucket_throttles():
+    """Requests beyond the burst wait for new tokens"""
+    bucket = TokenBucket(rate=50, burst=1)
+    
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+    
+    start = time.monotonic()
+    asyncio.run(take(4))
+    assert time.monotonic() - start >= 0.05
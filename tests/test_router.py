@@ -0,0 +1,182 @@
+"""
+Tests for the latency-aware engine router
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.engines.lazy_engine import LazyTranslationEngine
+from lingosnap.engines.resilience import CircuitOpenError
+from lingosnap.engines.router_engine import RoutingTranslationEngine
+
+
+class FakeEngine(TranslationEngine):
+    """Fake backend with a configurable delay and failure"""
+    
+    def __init__(self, name, delay=0.0, error=None, available=True, per_char=0.0):
+        self.name = name
+        self.delay = delay
+        self.per_char = per_char
+        self.error = error
+        self.available = available
+        self.calls = []
+    
+    def translate(self, text, source_lang, target_lang):
+        self.calls.append((text, source_lang, target_lang))
+        time.sleep(self.delay + self.per_char * len(text))
+        if self.error:
+            raise self.error
+        return f'{self.name}:{text}'
+    
+    def get_supported_languages(self):
+        return [('en', 'English'), ('zh', 'Chinese')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return self.available
+
+
+def make_router(google, argos, **kwargs):
+    kwargs.setdefault('min_hedge_delay', 0.05)
+    return RoutingTranslationEngine({'google': google, 'argos': argos}, **kwargs)
+
+
+def test_short_text_prefers_local_engine():
+    """With the prior model, short texts go to Argos and long ones to Google"""
+    google = FakeEngine('google')
+    argos = FakeEngine('argos')
+    router = make_router(google, argos, hedging=False)
+    
+    assert router.translate('hi', 'en', 'zh-cn') == 'argos:hi'
+    assert router.translate('x' * 2000, 'en', 'zh-cn').startswith('google:')
+
+
+def test_language_codes_are_converted():
+    """Argos receives its own code for Chinese"""
+    argos = FakeEngine('argos')
+    router = make_router(FakeEngine('google'), argos, hedging=False)
+    
+    router.translate('hi', 'en', 'zh-cn')
+    assert argos.calls == [('hi', 'en', 'zh')]
+    assert ('zh-cn', 'Chinese') in router.get_supported_languages()
+
+
+def test_learns_from_latency():
+    """The length cut-over moves with the measured per-character cost"""
+    google = FakeEngine('google')
+    argos = FakeEngine('argos', per_char=0.0005)
+    router = make_router(google, argos, hedging=False)
+    
+    # The prior (2ms per character) sends medium texts to Google
+    assert router.translate('x' * 300, 'en', 'de').startswith('google:')
+    
+    for length in range(10, 110, 10):
+        router.translate('y' * length, 'en', 'de')
+    
+    # Argos turned out four times faster than assumed
+    assert router.translate('x' * 300, 'en', 'de').startswith('argos:')
+
+
+def test_hedged_request_wins():
+    """A stalled backend is raced by the other one"""
+    google = FakeEngine('google')
+    argos = FakeEngine('argos', delay=1.0)
+    router = make_router(google, argos)
+    
+    started = time.monotonic()
+    assert router.translate('hi', 'en', 'de') == 'google:hi'
+    assert time.monotonic() - started < 0.9
+    assert router.get_routing_stats()['hedges'] == 1
+
+
+def test_losing_hedge_is_cancelled():
+    """A hedge still waiting for a worker never runs once the first backend answers"""
+    google = FakeEngine('google')
+    argos = FakeEngine('argos', delay=0.3)
+    router = make_router(google, argos)
+    router._executor = ThreadPoolExecutor(max_workers=1)
+    
+    assert router.translate('hi', 'en', 'de') == 'argos:hi'
+    assert router.get_routing_stats()['hedges'] == 1
+    time.sleep(0.1)
+    assert google.calls == []
+
+
+def test_lazy_backends_are_not_loaded_by_routing():
+    """Ranking skips backends that are still loading instead of loading them"""
+    loads = []
+    
+    def factory(name):
+        def create():
+            loads.append(name)
+            return FakeEngine(name)
+        return create
+    
+    google = LazyTranslationEngine('google', factory('google'))
+    argos = LazyTranslationEngine('argos', factory('argos'))
+    router = make_router(google, argos, hedging=False)
+    
+    # Nothing loaded yet: only the preferred backend is loaded on demand
+    assert router.translate('hi', 'en', 'de') == 'google:hi'
+    assert loads == ['google']
+    assert router.translate('hi', 'en', 'de') == 'google:hi'
+    assert loads == ['google']
+    
+    # Once loaded in the background, Argos takes the short texts again
+    argos.load()
+    assert router.translate('hi', 'en', 'de') == 'argos:hi'
+
+
+def test_fallback_on_error():
+    """A failing backend falls back and is skipped afterwards"""
+    google = FakeEngine('google')
+    argos = FakeEngine('argos', error=Exception('Translation failed: broken'))
+    router = make_router(google, argos, hedging=False)
+    
+    assert router.translate('hi', 'en', 'de') == 'google:hi'
+    assert router.translate('hello', 'en', 'de') == 'google:hello'
+    assert len(argos.calls) == 1
+    
+    stats = router.get_routing_stats()
+    assert stats['fallbacks'] == 1
+    assert stats['argos']['errors'] == 1
+    assert not stats['argos']['healthy']
+
+
+def test_open_circuit_sets_cooldown():
+    """A backend with an open circuit is skipped only until it reopens"""
+    google = FakeEngine('google')
+    argos = FakeEngine('argos', error=CircuitOpenError(0.05))
+    router = make_router(google, argos, hedging=False)
+    
+    assert router.translate('hi', 'en', 'de') == 'google:hi'
+    assert not router.get_routing_stats()['argos']['healthy']
+    time.sleep(0.06)
+    assert router.get_routing_stats()['argos']['healthy']
+
+
+def test_unavailable_backend_is_skipped():
+    """Backends reporting unavailable are not tried first"""
+    google = FakeEngine('google')
+    argos = FakeEngine('argos', available=False)
+    router = make_router(google, argos, hedging=False)
+    
+    assert router.translate('hi', 'en', 'de') == 'google:hi'
+    assert argos.calls == []
+
+
+def test_all_backends_failing():
+    """The last error is raised, batches report it per item"""
+    router = make_router(FakeEngine('google', error=Exception('down')),
+                         FakeEngine('argos', error=Exception('down')))
+    
+    try:
+        router.translate('hi', 'en', 'de')
+        assert False, 'expected an exception'
+    except Exception as e:
+        assert str(e) == 'down'
+    
+    results = router.translate_batch(['a', 'b'], 'en', 'de')
+    assert all(isinstance(result, Exception) for result in results)
@@ -0,0 +1,120 @@
+"""
+Tests for speculative translation and the adaptive typing delay
+"""
+
+import pytest
+from lingosnap.utils.debounce import AdaptiveDebounce
+from lingosnap.utils.incremental import SegmentMap
+from lingosnap.utils.segmentation import ends_sentence
+from tests.fakes import BatchRecordingEngine
+
+
+def test_ends_sentence():
+    """Terminators, CJK full stops and line breaks complete a sentence"""
+    assert ends_sentence('Hello there.')
+    assert ends_sentence('Really?! ')
+    assert ends_sentence('He said "stop."')
+    assert ends_sentence('你好。')
+    assert ends_sentence('A line\n')
+    assert not ends_sentence('Hello there')
+    assert not ends_sentence('   ')
+    assert not ends_sentence('')
+
+
+def test_prefetch_translates_complete_sentences_only():
+    """The sentence being typed is left alone"""
+    engine = BatchRecordingEngine()
+    segments = SegmentMap()
+    
+    assert segments.prefetch(engine, 'First one. Second', 'en', 'de') == 1
+    assert engine.batches == [['First one.']]
+    
+    # Already prefetched: nothing to send
+    assert segments.prefetch(engine, 'First one. Second', 'en', 'de') == 0
+    
+    # The final translation only sends the rest
+    assert segments.translate(engine, 'First one. Second one.', 'en', 'de') == \
+        '<First one.> <Second one.>'
+    assert engine.batches[-1] == ['Second one.']
+    assert segments.reused == 1
+
+
+def test_prefetch_discards_changed_sentences():
+    """Speculative results of sentences that were edited are dropped"""
+    engine = BatchRecordingEngine()
+    segments = SegmentMap()
+    segments.prefetch(engine, 'Old sentence. ', 'en', 'de')
+    segments.prefetch(engine, 'New sentence. ', 'en', 'de')
+    
+    segments.translate(engine, 'Old sentence. New sentence.', 'en', 'de')
+    assert engine.batches[-1] == ['Old sentence.']
+
+
+def test_prefetch_failures_are_retried_later():
+    """A failed speculative sentence is sent again by translate()"""
+    engine = BatchRecordingEngine()
+    segments = SegmentMap()
+    segments.prefetch(engine, 'FAIL here. Fine here.', 'en', 'de')
+    
+    engine.batches.clear()
+    with pytest.raises(Exception):
+        segments.translate(engine, 'FAIL here. Fine here.', 'en', 'de')
+    assert engine.batches == [['FAIL here.']]
+
+
+def test_latency_is_reported():
+    """Every engine call reports its duration, cache hits do not"""
+    engine = BatchRecordingEngine()
+    latencies = []
+    segments = SegmentMap(on_latency=latencies.append)
+    segments.prefetch(engine, 'One. ', 'en', 'de')
+    segments.translate(engine, 'One. Two.', 'en', 'de')
+    segments.translate(engine, 'One. Two.', 'en', 'de')
+    assert len(latencies) == 2
+    assert all(latency >= 0 for latency in latencies)
+
+
+def test_adaptive_debounce():
+    """The delay follows the smoothed latency within its bounds"""
+    debounce = AdaptiveDebounce(initial_ms=2000, min_ms=300, max_ms=2000, factor=2.0,
+                                smoothing=0.5)
+    assert debounce.interval_ms() == 2000
+    
+    debounce.record(0.4)
+    assert debounce.interval_ms() == 800
+    debounce.record(0.2)
+    assert abs(debounce.latency - 0.3) < 1e-9
+    assert debounce.interval_ms() == 600
+    
+    debounce.record(0.06)
+    debounce.record(0.06)
+    assert debounce.interval_ms() == 300
+    debounce.record(10.0)
+    assert debounce.interval_ms() == 2000
+
+
+def test_debounce_from_config():
+    """adaptive_typing_delay False keeps the configured delay"""
+    fixed = AdaptiveDebounce.from_config({'typing_delay_ms': 1500,
+                                          'adaptive_typing_delay': False})
+    fixed.record(0.01)
+    assert fixed.interval_ms() == 1500
+    
+    adaptive = AdaptiveDebounce.from_config({'typing_delay_ms': 1500,
+                                             'typing_delay_min_ms': 200})
+    adaptive.record(0.06)
+    assert adaptive.interval_ms() == 200
+
+
+def test_debounce_ignores_cache_hits():
+    """Round trips answered without reaching the engine keep the delay"""
+    debounce = AdaptiveDebounce(initial_ms=2000, min_ms=300, max_ms=2000, factor=2.0)
+    debounce.record(0.0003)
+    assert debounce.latency is None
+    assert debounce.interval_ms() == 2000
+    
+    debounce.record(0.5)
+    for _ in range(20):
+        debounce.record(0.0003)
+    assert debounce.latency == 0.5
+    assert debounce.interval_ms() == 1000
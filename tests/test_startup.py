@@ -0,0 +1,166 @@
+"""
+Tests for lazy engine loading and startup timing
+"""
+
+import threading
+import time
+import pytest
+from lingosnap.engines.base import TranslationEngine, TranslationEngineWrapper
+from lingosnap.engines.factory import create_router
+from lingosnap.engines.lazy_engine import LazyTranslationEngine
+from lingosnap.utils.timing import PhaseTimer
+
+
+class FakeEngine(TranslationEngine):
+    """Fake engine counting how often it was created"""
+    
+    name = 'fake'
+    created = 0
+    
+    def __init__(self, delay=0.0):
+        time.sleep(delay)
+        FakeEngine.created += 1
+        self.closed = False
+    
+    def translate(self, text, source_lang, target_lang):
+        return text.upper()
+    
+    def get_supported_languages(self):
+        return [('en', 'English')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return True
+    
+    def get_character_count(self):
+        return 42
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def reset_counter():
+    FakeEngine.created = 0
+
+
+def test_engine_is_created_on_first_use():
+    """Nothing is built until the engine is used"""
+    lazy = LazyTranslationEngine('fake', FakeEngine)
+    assert lazy.name == 'fake'
+    assert not lazy.is_loaded()
+    assert FakeEngine.created == 0
+    
+    assert lazy.translate('hi', 'en', 'de') == 'HI'
+    assert lazy.get_character_count() == 42
+    assert lazy.is_loaded()
+    assert FakeEngine.created == 1
+    assert lazy.load_time is not None
+
+
+def test_concurrent_users_share_one_load():
+    """Threads using the engine while it loads wait for the same instance"""
+    lazy = LazyTranslationEngine('fake', lambda: FakeEngine(delay=0.05))
+    engines = []
+    threads = [threading.Thread(target=lambda: engines.append(lazy.load()))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert FakeEngine.created == 1
+    assert all(engine is engines[0] for engine in engines)
+
+
+def test_failed_load_is_retried():
+    """A factory error is raised to the caller and the next use tries again"""
+    attempts = []
+    
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ImportError('No module named argostranslate')
+        return FakeEngine()
+    
+    lazy = LazyTranslationEngine('fake', factory)
+    with pytest.raises(ImportError):
+        lazy.load()
+    assert not lazy.is_loaded()
+    assert lazy.translate('a', 'en', 'de') == 'A'
+
+
+def test_close_does_not_load():
+    """Closing an engine that was never used does not build it"""
+    lazy = LazyTranslationEngine('fake', FakeEngine)
+    lazy.close()
+    assert FakeEngine.created == 0
+    
+    engine = lazy.load()
+    lazy.close()
+    assert engine.closed
+
+
+def test_is_loaded_through_wrappers_and_router():
+    """Decorators and the router report the loading state of their engines"""
+    first = LazyTranslationEngine('google', FakeEngine)
+    second = LazyTranslationEngine('argos', FakeEngine)
+    wrapped = TranslationEngineWrapper(first)
+    router = create_router({'google': first, 'argos': second})
+    
+    assert not wrapped.is_loaded()
+    first.load()
+    assert wrapped.is_loaded()
+    assert not router.is_loaded()
+    second.load()
+    assert router.is_loaded()
+    assert FakeEngine.created == 2
+
+
+def test_phase_timer_report():
+    """Phases are reported in start order, background ones marked"""
+    timer = PhaseTimer()
+    with timer.phase('first'):
+        time.sleep(0.01)
+    thread = threading.Thread(target=lambda: timer.mark('loaded'))
+    thread.start()
+    thread.join()
+    
+    phases = timer.get_phases()
+    assert [phase['name'] for phase in phases] == ['first', 'loaded']
+    assert phases[0]['duration'] >= 0.01
+    assert not phases[0]['background'] and phases[1]['background']
+    
+    lines = timer.report().splitlines()
+    assert lines[0].startswith('phase')
+    assert lines[2].endswith('(background)')
+
+
+def test_engine_loader_reports_each_engine():
+    """The loader builds every engine in the background, the first one first"""
+    QtCore = pytest.importorskip('PyQt6.QtCore')
+    from lingosnap.gui.engine_loader import EngineLoader
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    
+    def broken():
+        raise ImportError('No module named argostranslate')
+    
+    engines = {'google': LazyTranslationEngine('google', FakeEngine),
+               'argos': LazyTranslationEngine('argos', broken)}
+    timer = PhaseTimer()
+    loader = EngineLoader(engines, timer)
+    events = []
+    loader.engine_loaded.connect(lambda name: events.append(('loaded', name)))
+    loader.engine_failed.connect(lambda name, message: events.append(('failed', name)))
+    loader.finished.connect(lambda: events.append(('finished',)))
+    
+    loader.start(first='argos')
+    deadline = time.monotonic() + 5
+    while ('finished',) not in events and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    
+    assert events == [('failed', 'argos'), ('loaded', 'google'), ('finished',)]
+    assert engines['google'].is_loaded()
+    assert 'load google engine' in [phase['name'] for phase in timer.get_phases()]
@@ -0,0 +1,217 @@
+"""
+Tests for streaming translation
+"""
+
+import argparse
+import io
+import os
+import threading
+import time
+from lingosnap.cli import terminal
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.utils.incremental import SegmentMap
+from lingosnap.utils.streaming import in_order, plan_batches, stream_batch, stream_lines
+
+
+class GatedEngine(TranslationEngine):
+    """Fake engine whose batches wait until their first text is released"""
+    
+    name = 'fake'
+    
+    def __init__(self):
+        self.gates = {}
+        self.batches = []
+    
+    def gate(self, text):
+        return self.gates.setdefault(text, threading.Event())
+    
+    def translate(self, text, source_lang, target_lang):
+        if 'FAIL' in text:
+            raise Exception('Translation failed: boom')
+        return text.upper()
+    
+    def translate_batch(self, texts, source_lang, target_lang):
+        self.batches.append(list(texts))
+        self.gate(texts[0]).wait(5)
+        if 'BATCHFAIL' in texts[0]:
+            raise Exception('Translation failed: batch')
+        return super().translate_batch(texts, source_lang, target_lang)
+    
+    def get_supported_languages(self):
+        return [('en', 'English')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return True
+
+
+def test_plan_batches():
+    """One small batch first, the rest spread over the other workers"""
+    texts = ['a' * 10] * 9 + ['']
+    batches = plan_batches(texts, first_batch=1, parallel=4)
+    assert batches[0] == [0]
+    assert len(batches) == 4
+    assert sorted(i for batch in batches for i in batch) == list(range(9))
+    
+    batches = plan_batches(texts, max_batch_chars=20, parallel=2)
+    assert all(len(batch) <= 2 for batch in batches)
+    assert plan_batches(['', '']) == []
+
+
+def test_results_arrive_in_completion_order():
+    """A slow first batch does not hold back later ones"""
+    engine = GatedEngine()
+    texts = ['one', 'two', '', 'three']
+    engine.gate('two').set()
+    
+    stream = stream_batch(engine, texts, 'en', 'de', max_workers=2)
+    received = [next(stream), next(stream)]
+    assert received == [(2, ''), (1, 'TWO')]
+    
+    engine.gate('one').set()
+    received += list(stream)
+    assert sorted(received) == [(0, 'ONE'), (1, 'TWO'), (2, ''), (3, 'THREE')]
+
+
+def test_batch_errors_become_item_errors():
+    """A failing batch call yields an exception for each of its texts"""
+    engine = GatedEngine()
+    engine.gate('BATCHFAIL').set()
+    engine.gate('ok').set()
+    results = dict(stream_batch(engine, ['BATCHFAIL', 'ok', 'FAIL'], 'en', 'de',
+                                max_workers=2))
+    assert isinstance(results[0], Exception)
+    assert results[1] == 'OK'
+    assert isinstance(results[2], Exception)
+
+
+def test_in_order():
+    """Results are released as soon as all earlier ones arrived"""
+    stream = iter([(1, 'b'), (0, 'a'), (3, 'd'), (2, 'c')])
+    assert list(in_order(stream)) == [(0, 'a'), (1, 'b'), (2, 'c'), (3, 'd')]
+
+
+def test_segment_map_reports_progress():
+    """Partial translations keep untranslated sentences in place"""
+    engine = GatedEngine()
+    for text in ('First.', 'Second.', 'Third.'):
+        engine.gate(text).set()
+    
+    partials = []
+    segments = SegmentMap()
+    segments.PROGRESS_INTERVAL = 0
+    result = segments.translate(engine, 'First. Second. Third.', 'en', 'de',
+                                on_progress=partials.append)
+    
+    assert result == 'FIRST. SECOND. THIRD.'
+    assert partials
+    for partial in partials:
+        parts = partial.split(' ')
+        assert len(parts) == 3
+        assert all(part.lower() == original.lower()
+                   for part, original in zip(parts, ['First.', 'Second.', 'Third.']))
+
+
+def test_stream_lines_keeps_input_order():
+    """A slow early batch holds back later results, blank lines pass through"""
+    release = threading.Event()
+    
+    def translate_batch(texts):
+        if 'slow' in texts:
+            release.wait(5)
+        if 'FAIL' in texts:
+            raise Exception('Translation failed: batch')
+        return [text.upper() for text in texts]
+    
+    lines = ['slow', '  ', 'b', 'c', 'd', 'FAIL']
+    stream = stream_lines(translate_batch, iter(lines), max_workers=2, max_batch_lines=2)
+    threading.Timer(0.1, release.set).start()
+    results = list(stream)
+    
+    assert [line for line, _ in results] == lines
+    assert [result for _, result in results[:5]] == ['SLOW', '  ', 'B', 'C', 'D']
+    assert isinstance(results[5][1], Exception)
+
+
+def test_stream_lines_reads_ahead_boundedly():
+    """Memory does not grow with the input: only a window is read ahead"""
+    read = [0]
+    
+    def lines():
+        for i in range(20000):
+            read[0] += 1
+            yield f'line {i}'
+    
+    ahead = 0
+    count = 0
+    for line, result in stream_lines(lambda texts: texts, lines(), max_workers=2,
+                                     max_batch_lines=10, max_buffered=20):
+        assert result == line
+        count += 1
+        ahead = max(ahead, read[0] - count)
+    
+    assert count == 20000
+    assert ahead <= 20 + 2 * 2 * 10 + 1
+
+
+def test_stream_lines_flushes_partial_batches():
+    """A producer that stalls still gets its output"""
+    got_first = threading.Event()
+    
+    def lines():
+        yield 'first'
+        got_first.wait(5)
+        yield 'second'
+    
+    started = time.monotonic()
+    stream = stream_lines(lambda texts: [text.upper() for text in texts], lines(),
+                          first_batch=10, max_batch_lines=10, flush_interval=0.05)
+    assert next(stream) == ('first', 'FIRST')
+    assert time.monotonic() - started < 2
+    got_first.set()
+    assert list(stream) == [('second', 'SECOND')]
+
+
+def piped_stdin(data):
+    """Text stream reading the given data from a pipe"""
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, data.encode('utf-8'))
+    os.close(write_fd)
+    return io.TextIOWrapper(os.fdopen(read_fd, 'rb'))
+
+
+def test_stdin_is_piped(monkeypatch, tmp_path):
+    """Pipes and files are input; /dev/null and a closed stdin are not"""
+    monkeypatch.setattr('sys.stdin', piped_stdin(''))
+    assert terminal.stdin_is_piped()
+    
+    path = tmp_path / 'input.txt'
+    path.write_text('hello\n')
+    with open(path) as f:
+        monkeypatch.setattr('sys.stdin', f)
+        assert terminal.stdin_is_piped()
+    
+    with open(os.devnull) as f:
+        monkeypatch.setattr('sys.stdin', f)
+        assert not terminal.stdin_is_piped()
+    
+    monkeypatch.setattr('sys.stdin', None)
+    assert not terminal.stdin_is_piped()
+
+
+def test_empty_stdin_captures_terminal(monkeypatch, capsys):
+    """lingo with nothing piped in (cron, key bindings) translates the terminal"""
+    monkeypatch.setattr(terminal, 'create_translator',
+                        lambda args, config, meter: lambda texts: [t.upper() for t in texts])
+    monkeypatch.setattr(terminal, 'get_previous_terminal_output', lambda n: 'captured line')
+    args = argparse.Namespace(target_line=None, language='de', no_daemon=True)
+    
+    monkeypatch.setattr('sys.stdin', piped_stdin(''))
+    terminal.translate_stdin(args, {}, None)
+    assert capsys.readouterr().out == 'CAPTURED LINE\n'
+    
+    monkeypatch.setattr('sys.stdin', piped_stdin('first\nsecond\n'))
+    terminal.translate_stdin(args, {}, None)
+    assert capsys.readouterr().out == 'FIRST\nSECOND\n'
@@ -0,0 +1,94 @@
+"""
+Tests for background translation jobs
+"""
+
+import threading
+import time
+import pytest
+
+QtCore = pytest.importorskip('PyQt6.QtCore')
+
+from lingosnap.gui.translation_jobs import TranslationJobQueue
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def wait_until(app, condition, timeout=5.0):
+    """Process Qt events until condition() is true"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def test_only_newest_result_is_delivered(app):
+    """A running job superseded by a newer one never reports its result"""
+    queue = TranslationJobQueue(max_threads=2)
+    results = []
+    queue.job_finished.connect(lambda job_id, result: results.append(result))
+    
+    release = threading.Event()
+    queue.submit(lambda job: release.wait(5) and 'stale')
+    newest = queue.submit(lambda job: 'fresh')
+    assert wait_until(app, lambda: results)
+    release.set()
+    
+    queue.shutdown()
+    app.processEvents()
+    assert results == ['fresh']
+    assert not queue.is_busy() and not queue.is_current(newest)
+
+
+def test_queued_jobs_are_skipped(app):
+    """Jobs superseded before they start are never run"""
+    queue = TranslationJobQueue(max_threads=1)
+    started = []
+    release = threading.Event()
+    
+    queue.submit(lambda job: started.append('first') or release.wait(5))
+    assert wait_until(app, lambda: started)
+    queue.submit(lambda job: started.append('second'))
+    queue.submit(lambda job: started.append('third'))
+    release.set()
+    
+    assert wait_until(app, lambda: not queue.is_busy())
+    queue.shutdown()
+    assert started == ['first', 'third']
+
+
+def test_running_job_sees_cancellation(app):
+    """Long jobs can stop early when they are superseded"""
+    queue = TranslationJobQueue()
+    seen = []
+    running = threading.Event()
+    
+    def slow(job):
+        running.set()
+        while not job.is_cancelled():
+            time.sleep(0.005)
+        seen.append('cancelled')
+    
+    queue.submit(slow)
+    assert running.wait(5)
+    queue.cancel()
+    queue.shutdown()
+    assert seen == ['cancelled']
+
+
+def test_errors_are_reported(app):
+    """Exceptions of the current job are delivered as messages"""
+    queue = TranslationJobQueue()
+    errors = []
+    queue.job_failed.connect(lambda job_id, message: errors.append(message))
+    
+    def failing(job):
+        raise Exception('Translation failed: offline')
+    
+    queue.submit(failing)
+    assert wait_until(app, lambda: errors)
+    queue.shutdown()
+    assert errors == ['Translation failed: offline']
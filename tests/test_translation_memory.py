@@ -0,0 +1,201 @@
+"""
+Tests for the fuzzy translation memory
+"""
+
+import sqlite3
+import time
+from lingosnap.engines.factory import wrap_engine
+from lingosnap.engines.memory_engine import MemoryTranslationEngine
+from lingosnap.utils.cache import TranslationCache
+from lingosnap.utils.history import HistoryDatabase
+from lingosnap.utils.translation_memory import TranslationMemory, adapt_numbers
+from tests.fakes import CountingEngine, FakeConfig
+
+
+def test_near_duplicate_ocr_text():
+    """A one-character OCR difference reuses the past translation"""
+    memory = TranslationMemory(threshold=0.8)
+    memory.add(1, 'en', 'de', 'The quick brown fox jumps over the lazy dog',
+               'Der schnelle braune Fuchs springt über den faulen Hund')
+    
+    match = memory.lookup('The quick brovn fox jumps over the lazy dog', 'auto', 'de')
+    assert match is not None
+    assert match['entry_id'] == 1
+    assert 0.8 <= match['similarity'] < 1
+    
+    assert memory.lookup('Something else entirely, not a fox', 'en', 'de') is None
+    assert memory.lookup('The quick brown fox jumps over the lazy dog', 'en', 'fr') is None
+
+
+def test_numbers_are_carried_over():
+    """Log lines differing only by numbers reuse the translation with new numbers"""
+    memory = TranslationMemory()
+    memory.add(1, 'en', 'de', 'Connection lost after 30 seconds (code 502)',
+               'Verbindung nach 30 Sekunden verloren (Code 502)')
+    
+    match = memory.lookup('Connection lost after 45 seconds (code 504)', 'en', 'de')
+    assert match['translated_text'] == 'Verbindung nach 45 Sekunden verloren (Code 504)'
+    assert match['similarity'] == 1.0
+
+
+def test_adapt_numbers_refuses_unsafe_mappings():
+    """Ambiguous or missing numbers prevent reuse"""
+    assert adapt_numbers('1 und 1', ['1', '1'], ['2', '3']) is None
+    assert adapt_numbers('eins', ['1'], ['2']) is None
+    assert adapt_numbers('a 1 b 2', ['1', '2'], ['3']) is None
+    assert adapt_numbers('2 vor 1', ['1', '2'], ['5', '6']) == '6 vor 5'
+
+
+def test_short_texts_need_exact_match():
+    """Short texts are not matched fuzzily"""
+    memory = TranslationMemory(threshold=0.5)
+    memory.add(1, 'en', 'de', 'Open file', 'Datei öffnen')
+    
+    assert memory.lookup('open  FILE', 'en', 'de')['translated_text'] == 'Datei öffnen'
+    assert memory.lookup('Open files', 'en', 'de') is None
+
+
+def test_follows_history_database(tmp_path):
+    """The index is built from history and updated on every change"""
+    history = HistoryDatabase(db_dir=tmp_path)
+    history.add_entry('en', 'zh', 'Press any key to continue', '按任意键继续')
+    
+    memory = TranslationMemory(history)
+    memory.load()
+    assert memory.lookup('press any key  to continue', 'en', 'zh-cn') is not None
+    
+    entry_id = history.add_entry('en', 'de', 'Build finished successfully',
+                                 'Build erfolgreich abgeschlossen')
+    assert memory.lookup('Build finished successfully', 'en', 'de') is not None
+    
+    history.delete_entry(entry_id)
+    assert memory.lookup('Build finished successfully', 'en', 'de') is None
+    
+    history.clear_history()
+    assert memory.get_stats()['entries'] == 0
+
+
+def test_eviction_keeps_recent_entries():
+    """Only max_entries most recent entries stay indexed"""
+    memory = TranslationMemory(max_entries=2)
+    for i, word in enumerate(['alpha', 'bravo', 'charlie']):
+        memory.add(i, 'en', 'de', f'{word} team is ready', f'{word} Team ist bereit')
+    
+    assert memory.lookup('alpha team is ready', 'en', 'de') is None
+    assert memory.lookup('charlie team is ready', 'en', 'de') is not None
+
+
+def test_engine_serves_matches():
+    """The decorator only sends texts without a match upstream"""
+    memory = TranslationMemory()
+    memory.add(1, 'en', 'de', 'Downloading package 3 of 10', 'Paket 3 von 10 wird geladen',
+               engine='fake')
+    upstream = CountingEngine()
+    engine = MemoryTranslationEngine(upstream, memory)
+    
+    assert engine.translate('Downloading package 4 of 10', 'en', 'de') == \
+        'Paket 4 von 10 wird geladen'
+    assert upstream.calls == 0
+    
+    results = engine.translate_batch(
+        ['Downloading package 5 of 10', 'Installing dependencies'], 'en', 'de'
+    )
+    assert results == ['Paket 5 von 10 wird geladen', 'de:Installing dependencies']
+    assert upstream.calls == 1
+
+
+def test_memory_hits_are_not_cached(tmp_path):
+    """A fuzzy match is not stored as the exact translation of the new text"""
+    memory = TranslationMemory(threshold=0.8)
+    memory.add(1, 'en', 'de', 'The quick brown fox jumps over the lazy dog',
+               'Der schnelle braune Fuchs springt über den faulen Hund', engine='fake')
+    cache = TranslationCache(db_dir=tmp_path)
+    upstream = CountingEngine()
+    engine = wrap_engine(upstream, FakeConfig(), cache=cache, memory=memory)
+    
+    text = 'The quick brovn fox jumps over the lazy dog'
+    assert engine.translate(text, 'en', 'de') == \
+        'Der schnelle braune Fuchs springt über den faulen Hund'
+    assert engine.translate_batch([text], 'en', 'de') == \
+        ['Der schnelle braune Fuchs springt über den faulen Hund']
+    assert upstream.calls == 0
+    assert cache.get('fake', text, 'en', 'de') is None
+    
+    # Real translations are still cached
+    assert engine.translate('Installing dependencies', 'en', 'de') == \
+        'de:Installing dependencies'
+    assert cache.get('fake', 'Installing dependencies', 'en', 'de') == \
+        'de:Installing dependencies'
+
+
+def test_full_stack_matches_history(tmp_path):
+    """Texts with masked spans match the unmasked text stored in history"""
+    history = HistoryDatabase(db_dir=tmp_path)
+    history.add_entry('en', 'de', 'Could not open /var/log/app.log after 3 attempts',
+                      'Konnte /var/log/app.log nach 3 Versuchen nicht öffnen', 'fake')
+    memory = TranslationMemory(history)
+    memory.load()
+    upstream = CountingEngine()
+    engine = wrap_engine(upstream, FakeConfig(chunk_max_chars=30), memory=memory,
+                         cache=TranslationCache(db_dir=tmp_path))
+    
+    assert engine.translate('Could not open /var/log/app.log after 4 attempts', 'en', 'de') == \
+        'Konnte /var/log/app.log nach 4 Versuchen nicht öffnen'
+    assert upstream.calls == 0
+
+
+def test_matches_are_kept_per_engine(tmp_path):
+    """Translations of one engine are not served while another is selected"""
+    history = HistoryDatabase(db_dir=tmp_path)
+    history.add_entry('en', 'de', 'Build finished successfully',
+                      'Build erfolgreich abgeschlossen', 'argos')
+    memory = TranslationMemory(history)
+    memory.load()
+    upstream = CountingEngine()
+    engine = MemoryTranslationEngine(upstream, memory)
+    
+    assert engine.translate('Build finished successfully', 'en', 'de') == \
+        'de:Build finished successfully'
+    assert memory.lookup('Build finished successfully', 'en', 'de', 'argos') is not None
+
+
+def test_history_without_engine_column(tmp_path):
+    """Databases of older versions gain the engine column"""
+    conn = sqlite3.connect(str(tmp_path / 'history.db'))
+    conn.execute('CREATE TABLE history (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                 'timestamp TEXT NOT NULL, source_lang TEXT NOT NULL, '
+                 'target_lang TEXT NOT NULL, source_text TEXT NOT NULL, '
+                 'translated_text TEXT NOT NULL)')
+    conn.execute("INSERT INTO history VALUES (1, '2024-01-01T00:00:00', 'en', 'de', 'Old', 'Alt')")
+    conn.commit()
+    conn.close()
+    
+    history = HistoryDatabase(db_dir=tmp_path)
+    history.add_entry('en', 'de', 'New', 'Neu', 'google')
+    assert [entry['engine'] for entry in history.get_history()] == ['google', '']
+
+
+def test_fresh_translations_are_learned():
+    """Texts translated through the engine are matched as they were sent"""
+    memory = TranslationMemory()
+    upstream = CountingEngine()
+    engine = MemoryTranslationEngine(upstream, memory)
+    
+    assert engine.translate_batch(['Uploaded 3 files to the server.'], 'en', 'de') == \
+        ['de:Uploaded 3 files to the server.']
+    assert engine.translate('Uploaded 7 files to the server.', 'en', 'de') == \
+        'de:Uploaded 7 files to the server.'
+    assert upstream.calls == 1
+
+
+def test_lookup_is_fast():
+    """Lookups stay in the millisecond range with thousands of entries"""
+    memory = TranslationMemory(max_entries=20000)
+    for i in range(5000):
+        memory.add(i, 'en', 'de', f'Worker {chr(65 + i % 26)}{i % 7} finished task '
+                   f'batch {i // 26} with status ok', f'translation {i}')
+    
+    started = time.perf_counter()
+    for i in range(100):
+        memory.lookup(f'Worker Q{i % 7} finished task batch {i} with status ok', 'en', 'de')
+    assert (time.perf_counter() - started) / 100 < 0.05
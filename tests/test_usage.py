@@ -0,0 +1,118 @@
+"""
+Tests for usage metering
+"""
+
+import sqlite3
+import time
+import pytest
+from lingosnap.engines.base import TranslationEngine
+from lingosnap.engines.metered_engine import MeteredTranslationEngine
+from lingosnap.utils.usage import UsageMeter
+
+
+class FlakyEngine(TranslationEngine):
+    """Fake engine failing on texts containing 'fail'"""
+    
+    name = 'google'
+    
+    def translate(self, text, source_lang, target_lang):
+        if 'fail' in text:
+            raise Exception('Translation failed: boom')
+        return text.upper()
+    
+    def get_supported_languages(self):
+        return [('en', 'English')]
+    
+    def detect_language(self, text):
+        return 'en'
+    
+    def is_available(self):
+        return True
+
+
+def stored_rows(meter):
+    conn = sqlite3.connect(str(meter.db_file))
+    rows = conn.execute('SELECT engine, characters, requests FROM usage').fetchall()
+    conn.close()
+    return rows
+
+
+def test_records_stay_in_memory_until_flush(tmp_path):
+    """record() does not touch the database; flush() writes one row per engine and day"""
+    meter = UsageMeter(db_dir=tmp_path, flush_interval=3600)
+    meter.record('google', 100, 0.2)
+    meter.record('google', 50, 0.4)
+    meter.record('argos', 10, 1.0, error=True)
+    
+    assert stored_rows(meter) == []
+    assert meter.get_totals('google')['characters'] == 150
+    
+    meter.flush()
+    assert sorted(stored_rows(meter)) == [('argos', 10, 1), ('google', 150, 2)]
+    
+    usage = {row['engine']: row for row in meter.get_usage()}
+    assert usage['google']['avg_latency'] == pytest.approx(0.3)
+    assert usage['google']['max_latency'] == pytest.approx(0.4)
+    assert usage['argos']['errors'] == 1
+    meter.close()
+
+
+def test_flushes_add_up_across_meters(tmp_path):
+    """Two processes metering into one database add their counters"""
+    first = UsageMeter(db_dir=tmp_path, flush_interval=3600)
+    second = UsageMeter(db_dir=tmp_path, flush_interval=3600)
+    first.record('google', 10, 0.1)
+    first.flush()
+    second.record('google', 5, 0.1)
+    second.flush()
+    first.record('google', 1, 0.1)
+    
+    assert first.get_totals('google')['characters'] == 16
+    assert first.get_totals('google')['requests'] == 3
+    first.close()
+    second.close()
+
+
+def test_threshold_triggers_background_flush(tmp_path):
+    """Enough pending requests wake the flush thread early"""
+    meter = UsageMeter(db_dir=tmp_path, flush_interval=3600, flush_threshold=5)
+    for _ in range(5):
+        meter.record('google', 1, 0.01)
+    
+    deadline = time.monotonic() + 5
+    while not stored_rows(meter) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stored_rows(meter) == [('google', 5, 5)]
+    meter.close()
+
+
+def test_reset_one_engine(tmp_path):
+    """Resetting an engine removes stored and pending counters"""
+    meter = UsageMeter(db_dir=tmp_path, flush_interval=3600)
+    meter.record('google', 10, 0.1)
+    meter.flush()
+    meter.record('google', 10, 0.1)
+    meter.record('argos', 7, 0.1)
+    
+    meter.reset('google')
+    assert meter.get_totals('google')['characters'] == 0
+    assert meter.get_totals('argos')['characters'] == 7
+    meter.close()
+
+
+def test_metered_engine(tmp_path):
+    """Upstream calls are recorded with their characters and failures"""
+    meter = UsageMeter(db_dir=tmp_path, flush_interval=3600)
+    engine = MeteredTranslationEngine(FlakyEngine(), meter)
+    
+    assert engine.translate('hello', 'en', 'de') == 'HELLO'
+    with pytest.raises(Exception):
+        engine.translate('fail', 'en', 'de')
+    results = engine.translate_batch(['abc', 'fail too'], 'en', 'de')
+    assert results[0] == 'ABC' and isinstance(results[1], Exception)
+    
+    totals = meter.get_totals('google')
+    assert totals['characters'] == len('hello') + len('abc')
+    assert totals['requests'] == 4
+    assert totals['errors'] == 2
+    meter.close()